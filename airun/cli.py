@@ -3,20 +3,29 @@ Command Line Interface for AIRun.
 """
 import sys
 import os
+import json
 import click
 from pathlib import Path
 from typing import Optional, List
 import time
 import logging
 
-from .core.detector import ScriptDetector, ScriptType
+from .core.detector import ScriptDetector, ScriptType, iter_files, DEFAULT_EXCLUDED_DIRS
 from .core.runners import RunnerFactory, ExecutionContext
+from .core.error_watcher import ErrorWatchSettings
+from .core.process import OutputLimits
+from .core.probe_cache import ProbeCache
+from .core.syntax_cache import SyntaxCache
 from .core.config import Config
 from .core.llm_router import LLMRouter
 from .core.ai_fixer import AIFixer
 from .utils.logging import setup_logging, get_logger
 from .utils.validation import validate_script_path, validate_llm_provider
 from .utils.file_ops import ensure_directory
+from .utils.batch_executor import BatchExecutor
+from .utils.syntax_checker import SyntaxChecker
+from .utils.batch_report import BatchReportWriter
+from .utils.batch_manifest import MANIFEST_FILENAME, BatchManifest, ManifestError, find_manifest
 
 logger = get_logger(__name__)
 
@@ -56,11 +65,16 @@ def cli(ctx, version):
               help='Enable verbose output')
 @click.option('--timeout', type=int,
               help='Execution timeout in seconds')
+@click.option('--full-scan', is_flag=True,
+              help='Analyse the whole file when detecting its type')
+@click.option('--stream/--no-stream', default=None,
+              help='Show script output live instead of after it exits')
 @click.argument('script_args', nargs=-1)
 def run(script_path: str, language: Optional[str], llm_provider: Optional[str],
         no_fix: bool, interactive: bool, max_retries: int,
         config_path: Optional[str], dry_run: bool, verbose: bool,
-        timeout: Optional[int], script_args: tuple):
+        timeout: Optional[int], full_scan: bool, stream: Optional[bool],
+        script_args: tuple):
     """
     Execute a script with AI-enhanced error fixing.
 
@@ -85,12 +99,16 @@ def run(script_path: str, language: Optional[str], llm_provider: Optional[str],
             config.default_llm = llm_provider
         if timeout:
             config.timeout = timeout
+        if full_scan:
+            config.detection['full_scan'] = True
+        if stream is not None:
+            config.stream_output = stream
 
         # Validate script path
         script_path = validate_script_path(script_path)
 
         # Detect script type
-        detector = ScriptDetector()
+        detector = ScriptDetector.from_config(config)
         if language:
             script_type = ScriptType(language)
             logger.info(f"Forced language: {script_type.value}")
@@ -103,9 +121,15 @@ def run(script_path: str, language: Optional[str], llm_provider: Optional[str],
             click.echo("Try using --lang to specify the language explicitly", err=True)
             sys.exit(1)
 
-        # Create runner
+        # Create runner, reusing the shebang interpreter when configured
         try:
-            runner = RunnerFactory.create_runner(script_type, config.runners)
+            shebang = detector.detect_shebang(script_path)
+            runner = RunnerFactory.create_runner(script_type, config.runners,
+                                                 shebang=shebang,
+                                                 stream_output=config.stream_output,
+                                                 output_limits=OutputLimits.from_config(config),
+                                                 probe_cache=ProbeCache.from_config(config),
+                                                 syntax_cache=SyntaxCache.from_config(config))
         except ValueError as e:
             click.echo(f"❌ {e}", err=True)
             sys.exit(1)
@@ -135,6 +159,10 @@ def run(script_path: str, language: Optional[str], llm_provider: Optional[str],
                         sys.exit(1)
                 config.auto_fix = False
 
+        # Watch for errors while the script runs so fixing can start early
+        if config.auto_fix:
+            runner.error_watch = ErrorWatchSettings.from_config(config)
+
         # Execute script
         click.echo(f"🚀 Executing {script_path} ({script_type.value})")
 
@@ -148,15 +176,24 @@ def run(script_path: str, language: Optional[str], llm_provider: Optional[str],
             max_retries=max_retries
         )
 
-        # Output results
-        if result.stdout:
-            click.echo(result.stdout, nl=False)
-        if result.stderr:
-            click.echo(result.stderr, file=sys.stderr, nl=False)
+        # Output results unless they were already shown live
+        if not result.streamed:
+            if result.stdout:
+                click.echo(result.stdout, nl=False)
+            if result.stderr:
+                click.echo(result.stderr, file=sys.stderr, nl=False)
 
         # Status summary
         status_emoji = "✅" if not result.error_detected else "❌"
         click.echo(f"\n{status_emoji} Execution completed in {result.execution_time:.2f}s")
+        usage = result.resource_usage
+        if verbose and usage is not None:
+            click.echo(f"   CPU {usage.user_time:.2f}s user + {usage.system_time:.2f}s system "
+                       f"({result.cpu_utilization:.0%} of wall time), "
+                       f"peak RSS {usage.max_rss / (1024 * 1024):.1f} MB")
+            click.echo(f"   Context switches {usage.voluntary_switches} voluntary, "
+                       f"{usage.involuntary_switches} involuntary; block I/O "
+                       f"{usage.read_bytes} bytes read, {usage.write_bytes} bytes written")
 
         sys.exit(result.exit_code)
 
@@ -183,6 +220,8 @@ def perform_dry_run(script_path: str, script_type: ScriptType, runner, detector)
 
     if file_info['shebang']:
         click.echo(f"#!/ Shebang: {file_info['shebang']}")
+    if file_info['interpreter']:
+        click.echo(f"🐚 Interpreter: {file_info['interpreter']}")
 
     # Confidence scores
     click.echo("\n📊 Detection confidence:")
@@ -233,6 +272,10 @@ def execute_with_fixing(script_path: str, script_type: ScriptType, runner,
                     click.echo("✅ Error fixed successfully!")
                 return result
 
+            if result.early_error:
+                click.echo(f"⚡ Error spotted {result.error_detected_after:.2f}s in: "
+                           f"{result.early_error}")
+
             if attempt < max_retries:
                 click.echo(f"❌ Error detected: {result.stderr.strip()}")
 
@@ -289,13 +332,31 @@ def doctor(config_path: Optional[str]):
 
     # Check executables
     click.echo("\n🛠️ Checking interpreters:")
-    validation_results = RunnerFactory.validate_all_executables(config.runners)
+    probe_cache = ProbeCache.from_config(config)
+    validation_results = RunnerFactory.validate_all_executables(config.runners,
+                                                                probe_cache=probe_cache)
 
     for script_type, available in validation_results.items():
         runner = RunnerFactory.create_runner(script_type, config.runners)
         executable = runner.get_executable()
         status = "✅" if available else "❌"
-        click.echo(f"  {script_type.value}: {executable} {status}")
+        probe = probe_cache.get(executable) if probe_cache is not None else None
+        version = f" ({probe.version})" if probe is not None and probe.version else ""
+        click.echo(f"  {script_type.value}: {executable}{version} {status}")
+
+    # Check detection cache
+    click.echo("\n🗂️ Detection cache:")
+    detector = ScriptDetector.from_config(config)
+    if detector.cache is not None:
+        stats = detector.cache.get_stats()
+        lookups = stats['hits'] + stats['misses']
+        hit_rate = stats['hits'] / lookups * 100 if lookups else 0.0
+        click.echo(f"  {detector.cache.path}")
+        click.echo(f"  Entries: {stats['entries']}/{detector.cache.max_entries}")
+        click.echo(f"  Hits: {stats['hits']}  Misses: {stats['misses']}  "
+                   f"Hit rate: {hit_rate:.1f}%")
+    else:
+        click.echo("  Disabled")
 
     # Check LLM providers
     click.echo("\n🤖 Checking LLM providers:")
@@ -304,8 +365,8 @@ def doctor(config_path: Optional[str]):
 
         for provider_name in config.llm_providers.keys():
             try:
-                provider = llm_router.get_provider(provider_name)
                 # Test basic connectivity
+                llm_router.check_provider(provider_name)
                 status = "✅ Available"
                 click.echo(f"  {provider_name}: {status}")
             except Exception as e:
@@ -350,6 +411,208 @@ def doctor(config_path: Optional[str]):
         click.echo("✅ All core functionality available")
 
 
+@cli.command()
+@click.argument('scripts', nargs=-1, type=click.Path(exists=True))
+@click.option('--manifest', '-m', type=click.Path(exists=True),
+              help=f'Dependency manifest to run (default: {MANIFEST_FILENAME} '
+                   'in the current directory when no scripts are given)')
+@click.option('--jobs', '-j', type=int,
+              help='Scripts to run at once (default: CPU count)')
+@click.option('--timeout', type=float, help='Per-script timeout in seconds')
+@click.option('--stop-on-error', is_flag=True,
+              help='Start no further scripts after the first failure')
+@click.option('--fix', is_flag=True,
+              help='Let the AI fixer repair failing scripts, without prompting')
+@click.option('--report', 'report_path', type=click.Path(),
+              help='Write a JSON or HTML report (by file extension)')
+@click.option('--config', 'config_path', type=click.Path(),
+              help='Path to configuration file')
+def batch(scripts: tuple, manifest: Optional[str], jobs: Optional[int],
+          timeout: Optional[float], stop_on_error: bool, fix: bool,
+          report_path: Optional[str], config_path: Optional[str]):
+    """
+    Run many scripts in parallel.
+
+    Each script's outcome is printed as soon as it finishes. With a
+    manifest, scripts run in dependency order and a failure cancels only
+    the scripts that depend on it, or every script not yet started with
+    --stop-on-error.
+
+    SCRIPTS: Scripts to execute
+    """
+    try:
+        config = Config.load(config_path)
+    except Exception as e:
+        click.echo(f"❌ Configuration error: {e}", err=True)
+        sys.exit(1)
+
+    if not scripts:
+        manifest = manifest or find_manifest(Path.cwd())
+        if manifest is None:
+            click.echo(f"❌ No scripts given and no {MANIFEST_FILENAME} found", err=True)
+            sys.exit(1)
+
+    fixer = None
+    if fix:
+        try:
+            config.interactive_mode = False
+            fixer = AIFixer(LLMRouter(config), config)
+        except Exception as e:
+            click.echo(f"⚠️ Running without AI fixing: {e}", err=True)
+
+    try:
+        report_writer = BatchReportWriter(report_path) if report_path else None
+    except (OSError, ValueError) as e:
+        click.echo(f"❌ Cannot write report: {e}", err=True)
+        sys.exit(1)
+
+    executor = BatchExecutor(config, max_workers=jobs, timeout=timeout, fixer=fixer)
+    try:
+        succeeded = _run_batch(executor, scripts, manifest, stop_on_error, report_writer)
+    finally:
+        if report_writer is not None:
+            report_writer.close()
+            click.echo(f"📄 Report written to {report_path}")
+    if not succeeded:
+        sys.exit(1)
+
+
+def _run_batch(executor: BatchExecutor, scripts: tuple, manifest: Optional[str],
+               stop_on_error: bool, report_writer: Optional[BatchReportWriter]) -> bool:
+    """Run a batch for the ``batch`` command; returns whether every script succeeded."""
+    def fixes(count: int) -> str:
+        return f", {count} fix{'es' if count != 1 else ''}" if count else ""
+
+    if manifest:
+        try:
+            batch_manifest = BatchManifest.load(manifest)
+        except ManifestError as e:
+            click.echo(f"❌ {e}", err=True)
+            return False
+
+        def report_node(outcome):
+            status = {"succeeded": "✅", "failed": "❌"}.get(outcome.status, "⏭️")
+            if outcome.result is None:
+                detail = f"cancelled, {outcome.cancelled_by} failed"
+            else:
+                detail = (f"exit {outcome.result.exit_code}, {outcome.duration:.2f}s"
+                          f"{fixes(outcome.fix_attempts)}")
+                if report_writer is not None:
+                    report_writer.add(outcome.result, outcome.fix_attempts)
+                outcome.result.close()
+            click.echo(f"{status} {outcome.name} ({detail})")
+
+        click.echo(f"🚀 Executing {len(batch_manifest.nodes)} scripts from {manifest}")
+        dag_report = executor.execute_manifest(batch_manifest, on_result=report_node,
+                                               stop_on_error=stop_on_error)
+        click.echo("\n" + dag_report.format())
+        return dag_report.succeeded
+
+    click.echo(f"🚀 Executing {len(scripts)} scripts")
+    successful = 0
+    for batch_result in executor.iter_batch(scripts, stop_on_error=stop_on_error):
+        result = batch_result.result
+        status = "❌" if result.error_detected else "✅"
+        click.echo(f"{status} {batch_result.script_path} "
+                   f"(exit {result.exit_code}, {result.execution_time:.2f}s"
+                   f"{fixes(batch_result.fix_attempts)})")
+        successful += not result.error_detected
+        if report_writer is not None:
+            report_writer.add(result, batch_result.fix_attempts)
+        result.close()
+
+    click.echo(f"\n📊 Successful: {successful}/{len(scripts)}")
+    return successful == len(scripts)
+
+
+@cli.command()
+@click.argument('directory', type=click.Path(exists=True))
+@click.option('--workers', '-j', type=int,
+              help='Worker processes for content sniffing (default: CPU count)')
+@click.option('--exclude', multiple=True, metavar='NAME',
+              help='Directory name to skip (repeatable)')
+@click.option('--hidden', is_flag=True,
+              help='Include hidden files and directories')
+@click.option('--skip-unknown', is_flag=True,
+              help='Do not report files of unknown type')
+@click.option('--config', 'config_path', type=click.Path(),
+              help='Path to configuration file')
+def detect(directory: str, workers: Optional[int], exclude: tuple, hidden: bool,
+           skip_unknown: bool, config_path: Optional[str]):
+    """
+    Detect the script type of every file under a directory.
+
+    Results are streamed as JSON lines: {"path": ..., "type": ...}
+
+    DIRECTORY: Directory tree (or single file) to classify
+    """
+    try:
+        config = Config.load(config_path)
+    except Exception as e:
+        click.echo(f"❌ Configuration error: {e}", err=True)
+        sys.exit(1)
+
+    detector = ScriptDetector.from_config(config)
+    paths = iter_files(
+        directory,
+        exclude_dirs=DEFAULT_EXCLUDED_DIRS | set(exclude),
+        include_hidden=hidden
+    )
+
+    for path, script_type in detector.detect_many(paths, workers=workers):
+        if skip_unknown and script_type == ScriptType.UNKNOWN:
+            continue
+        click.echo(json.dumps({'path': path, 'type': script_type.value}))
+
+
+@cli.command()
+@click.argument('directory', type=click.Path(exists=True))
+@click.option('--jobs', '-j', type=int,
+              help='Chunks of files checked at once (default: CPU count)')
+@click.option('--exclude', multiple=True, metavar='NAME',
+              help='Directory name to skip (repeatable)')
+@click.option('--hidden', is_flag=True,
+              help='Include hidden files and directories')
+@click.option('--config', 'config_path', type=click.Path(),
+              help='Path to configuration file')
+def check(directory: str, jobs: Optional[int], exclude: tuple, hidden: bool,
+          config_path: Optional[str]):
+    """
+    Check the syntax of every script under a directory without running it.
+
+    Results are streamed as JSON lines: {"path": ..., "type": ..., "ok": ...},
+    with "line", "column" and "error" for failures. Exits non-zero if any
+    file fails.
+
+    DIRECTORY: Directory tree (or single file) to check
+    """
+    try:
+        config = Config.load(config_path)
+    except Exception as e:
+        click.echo(f"❌ Configuration error: {e}", err=True)
+        sys.exit(1)
+
+    checker = SyntaxChecker(config, max_workers=jobs)
+    paths = iter_files(
+        directory,
+        exclude_dirs=DEFAULT_EXCLUDED_DIRS | set(exclude),
+        include_hidden=hidden
+    )
+
+    checked = failed = 0
+    try:
+        for file_check in checker.iter_checks(paths):
+            checked += 1
+            failed += not file_check.ok
+            click.echo(json.dumps(file_check.to_dict()))
+    finally:
+        checker.close()
+
+    click.echo(f"📊 Checked {checked} files, {failed} failed", err=True)
+    if failed:
+        sys.exit(1)
+
+
 @cli.command('config')
 @click.option('--init', is_flag=True, help='Initialize default configuration')
 @click.option('--edit', is_flag=True, help='Edit configuration file')
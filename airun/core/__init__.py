@@ -3,7 +3,16 @@ AIRun Core Module
 Core functionality for script execution and AI-powered error fixing.
 """
 
-from .detector import ScriptDetector, ScriptType
+from .detector import (
+    ScriptDetector,
+    ScriptType,
+    ContentClassifier,
+    FileProbe,
+    Shebang,
+    parse_shebang,
+    iter_files
+)
+from .detection_cache import DetectionCache, CachedDetection
 from .runners import (
     ExecutionResult,
     ExecutionError,
@@ -15,14 +24,39 @@ from .runners import (
     RunnerFactory,
     ExecutionContext
 )
+from .error_watcher import ErrorWatcher, ErrorWatchSettings
+from .process import (
+    CapturedStream,
+    OutputCapture,
+    OutputLimits,
+    pump_output,
+    pump_output_async
+)
+from .worker_pool import PythonWorkerPool, get_worker_pool
+from .probe_cache import ExecutableProbe, ProbeCache
+from .syntax_cache import SyntaxCache, SyntaxCheck, parse_python
+from .backends import (
+    BackendUnavailable,
+    ExecutionBackend,
+    ForkServerBackend,
+    get_fork_server
+)
 from .config import Config, ConfigManager, load_config, get_config
-from .llm_router import LLMRouter, LLMProvider
+from .llm_router import LLMRouter, LLMProvider, ProviderUnavailable
+from .provider_health import CircuitBreaker, ProviderHealth, ProviderHealthRegistry
 from .ai_fixer import AIFixer, ErrorContext, CodeFix
 
 __all__ = [
     # Script Detection
     "ScriptDetector",
     "ScriptType",
+    "ContentClassifier",
+    "FileProbe",
+    "Shebang",
+    "parse_shebang",
+    "iter_files",
+    "DetectionCache",
+    "CachedDetection",
 
     # Script Execution
     "ExecutionResult",
@@ -34,6 +68,24 @@ __all__ = [
     "PHPRunner",
     "RunnerFactory",
     "ExecutionContext",
+    "CapturedStream",
+    "OutputCapture",
+    "OutputLimits",
+    "ErrorWatcher",
+    "ErrorWatchSettings",
+    "PythonWorkerPool",
+    "get_worker_pool",
+    "ExecutionBackend",
+    "BackendUnavailable",
+    "ForkServerBackend",
+    "get_fork_server",
+    "ExecutableProbe",
+    "ProbeCache",
+    "SyntaxCache",
+    "SyntaxCheck",
+    "parse_python",
+    "pump_output",
+    "pump_output_async",
 
     # Configuration
     "Config",
@@ -44,6 +96,10 @@ __all__ = [
     # AI Integration
     "LLMRouter",
     "LLMProvider",
+    "ProviderUnavailable",
+    "ProviderHealth",
+    "CircuitBreaker",
+    "ProviderHealthRegistry",
     "AIFixer",
     "ErrorContext",
     "CodeFix",
@@ -1,15 +1,18 @@
 """
 AI-powered error fixing implementation.
 """
+import ast
+import asyncio
 import logging
 import time
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from dataclasses import dataclass
 
 from .detector import ScriptType
-from .runners import ExecutionResult
+from .runners import BaseRunner, ExecutionResult
 from .llm_router import LLMRouter, ErrorContext, CodeFix, create_error_context
+from .syntax_cache import parse_python
 
 logger = logging.getLogger(__name__)
 
@@ -65,78 +68,174 @@ class AIFixer:
         logger.info(f"Attempting to fix error in {script_path}")
 
         try:
-            # Read current script content
-            script_content = self._read_script(script_path)
-            if not script_content:
-                logger.error(f"Could not read script content from {script_path}")
+            error_context = self._prepare_error_context(script_path, script_type,
+                                                        execution_result)
+            if error_context is None:
                 return False
 
-            # Create error context
-            error_context = self._create_error_context(
-                script_type=script_type,
-                script_path=script_path,
-                script_content=script_content,
-                execution_result=execution_result
-            )
-
             # Generate fix using LLM
             start_time = time.time()
             try:
                 code_fix = self.llm_router.fix_error(error_context, provider_name)
             except Exception as e:
-                logger.error(f"Failed to generate fix: {e}")
-                self._record_fix_attempt(
-                    provider_used=provider_name or "unknown",
-                    confidence=0.0,
-                    success=False,
-                    error_message=str(e),
-                    execution_time=time.time() - start_time
-                )
+                self._record_generation_failure(provider_name, e, start_time)
                 return False
 
-            execution_time = time.time() - start_time
-
-            # Check confidence threshold
-            if code_fix.confidence < self.min_confidence_threshold:
-                logger.warning(f"Fix confidence {code_fix.confidence:.2f} below threshold {self.min_confidence_threshold}")
-                if not self._confirm_low_confidence_fix(code_fix):
-                    self._record_fix_attempt(
-                        provider_used=provider_name or "auto",
-                        confidence=code_fix.confidence,
-                        success=False,
-                        error_message="Below confidence threshold",
-                        execution_time=execution_time
-                    )
-                    return False
-
-            # Interactive confirmation if enabled
-            if self.interactive_mode and not self._confirm_fix_application(code_fix):
-                logger.info("Fix application cancelled by user")
-                return False
+            return self._handle_code_fix(script_path, code_fix, provider_name,
+                                         time.time() - start_time)
 
-            # Apply the fix
-            success = self._apply_fix(script_path, code_fix)
+        except Exception as e:
+            logger.error(f"Unexpected error during fix attempt: {e}")
+            return False
 
-            self._record_fix_attempt(
-                provider_used=provider_name or "auto",
-                confidence=code_fix.confidence,
-                success=success,
-                execution_time=execution_time,
-                changes_applied=code_fix.changes_made
-            )
+    async def fix_script_error_async(self, script_path: str, script_type: ScriptType,
+                                     execution_result: ExecutionResult,
+                                     provider_name: Optional[str] = None) -> bool:
+        """
+        Async counterpart of ``fix_script_error``.
 
-            if success:
-                logger.info(f"Successfully applied fix to {script_path}")
-                logger.debug(f"Fix explanation: {code_fix.explanation}")
-            else:
-                logger.error(f"Failed to apply fix to {script_path}")
+        The LLM request is awaited through ``LLMRouter.fix_error_async``;
+        everything else matches the synchronous path.
 
-            return success
+        Args:
+            script_path: Path to the script with error
+            script_type: Type of the script
+            execution_result: Result of the failed execution
+            provider_name: Optional specific LLM provider to use
+
+        Returns:
+            True if fix was successfully applied, False otherwise
+        """
+        logger.info(f"Attempting to fix error in {script_path}")
+
+        try:
+            error_context = self._prepare_error_context(script_path, script_type,
+                                                        execution_result)
+            if error_context is None:
+                return False
+
+            start_time = time.time()
+            try:
+                code_fix = await self.llm_router.fix_error_async(error_context, provider_name)
+            except Exception as e:
+                self._record_generation_failure(provider_name, e, start_time)
+                return False
+
+            return self._handle_code_fix(script_path, code_fix, provider_name,
+                                         time.time() - start_time)
 
         except Exception as e:
             logger.error(f"Unexpected error during fix attempt: {e}")
             return False
 
+    async def run_with_fixing_async(self, runner: BaseRunner, script_path: str,
+                                    script_type: ScriptType,
+                                    args: Optional[List[str]] = None,
+                                    provider_name: Optional[str] = None,
+                                    max_retries: Optional[int] = None,
+                                    retry_delay: float = 0.5) -> ExecutionResult:
+        """
+        Run a script, fixing and re-running it until it succeeds.
+
+        The awaitable equivalent of ``airun run`` with auto-fix: execution
+        and LLM calls never block the event loop, so many scripts can be
+        handled concurrently.
+
+        Args:
+            runner: Runner for the script
+            script_path: Path to the script
+            script_type: Type of the script
+            args: Script arguments
+            provider_name: Optional specific LLM provider to use
+            max_retries: Fix attempts; defaults to the configured ``max_retries``
+            retry_delay: Seconds to pause after applying a fix
+
+        Returns:
+            Result of the last execution
+        """
+        if max_retries is None:
+            max_retries = self.max_retries
+
+        for attempt in range(max_retries + 1):
+            result = await runner.execute_async(script_path, args)
+            if not result.error_detected or attempt == max_retries:
+                break
+
+            if not await self.fix_script_error_async(script_path, script_type, result,
+                                                     provider_name):
+                break
+            logger.info(f"Applied fix to {script_path}, retry {attempt + 1}/{max_retries}")
+            await asyncio.sleep(retry_delay)
+
+        return result
+
+    def _prepare_error_context(self, script_path: str, script_type: ScriptType,
+                               execution_result: ExecutionResult) -> Optional[ErrorContext]:
+        """Read the script and build the error context sent to the LLM."""
+        script_content = self._read_script(script_path)
+        if not script_content:
+            logger.error(f"Could not read script content from {script_path}")
+            return None
+
+        return self._create_error_context(
+            script_type=script_type,
+            script_path=script_path,
+            script_content=script_content,
+            execution_result=execution_result
+        )
+
+    def _record_generation_failure(self, provider_name: Optional[str],
+                                   error: Exception, start_time: float) -> None:
+        """Record a fix attempt whose LLM request failed."""
+        logger.error(f"Failed to generate fix: {error}")
+        self._record_fix_attempt(
+            provider_used=provider_name or "unknown",
+            confidence=0.0,
+            success=False,
+            error_message=str(error),
+            execution_time=time.time() - start_time
+        )
+
+    def _handle_code_fix(self, script_path: str, code_fix: CodeFix,
+                         provider_name: Optional[str], execution_time: float) -> bool:
+        """Check, confirm and apply a generated fix."""
+        # Check confidence threshold
+        if code_fix.confidence < self.min_confidence_threshold:
+            logger.warning(f"Fix confidence {code_fix.confidence:.2f} below threshold {self.min_confidence_threshold}")
+            if not self._confirm_low_confidence_fix(code_fix):
+                self._record_fix_attempt(
+                    provider_used=provider_name or "auto",
+                    confidence=code_fix.confidence,
+                    success=False,
+                    error_message="Below confidence threshold",
+                    execution_time=execution_time
+                )
+                return False
+
+        # Interactive confirmation if enabled
+        if self.interactive_mode and not self._confirm_fix_application(code_fix):
+            logger.info("Fix application cancelled by user")
+            return False
+
+        # Apply the fix
+        success = self._apply_fix(script_path, code_fix)
+
+        self._record_fix_attempt(
+            provider_used=provider_name or "auto",
+            confidence=code_fix.confidence,
+            success=success,
+            execution_time=execution_time,
+            changes_applied=code_fix.changes_made
+        )
+
+        if success:
+            logger.info(f"Successfully applied fix to {script_path}")
+            logger.debug(f"Fix explanation: {code_fix.explanation}")
+        else:
+            logger.error(f"Failed to apply fix to {script_path}")
+
+        return success
+
     def _read_script(self, script_path: str) -> Optional[str]:
         """Read script content from file."""
         try:
@@ -153,9 +252,13 @@ class AIFixer:
         # Extract line number from error message if possible
         line_number = self._extract_line_number(execution_result.stderr)
 
-        # Get relevant code snippet (around error line if known)
+        # Get relevant code snippet (around error line if known), widened
+        # to the enclosing Python function or class
+        scope = None
+        if script_type == ScriptType.PYTHON and line_number is not None:
+            scope = self._find_python_scope(script_content, script_path, line_number)
         code_snippet = self._get_relevant_code_snippet(
-            script_content, line_number
+            script_content, line_number, scope=scope
         )
 
         return create_error_context(
@@ -189,10 +292,39 @@ class AIFixer:
 
         return None
 
+    def _find_python_scope(self, script_content: str, script_path: str,
+                           line_number: int) -> Optional[Tuple[int, int]]:
+        """
+        Find the innermost function or class containing a line.
+
+        The parse tree is shared with syntax checking, so a script that was
+        just validated is not parsed again.
+
+        Returns:
+            First and last line of the scope, or None if the script does
+            not parse or the line is at module level
+        """
+        try:
+            tree = parse_python(script_content, script_path)
+        except (SyntaxError, ValueError):
+            return None
+
+        scope = None
+        for node in ast.walk(tree):
+            if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                continue
+            start = min([node.lineno] + [d.lineno for d in node.decorator_list])
+            end = getattr(node, 'end_lineno', None) or node.lineno
+            if start <= line_number <= end and (scope is None or start >= scope[0]):
+                scope = (start, end)
+        return scope
+
     def _get_relevant_code_snippet(self, script_content: str,
                                   line_number: Optional[int] = None,
-                                  context_lines: int = 5) -> str:
-        """Get relevant code snippet around error line."""
+                                  context_lines: int = 5,
+                                  scope: Optional[Tuple[int, int]] = None,
+                                  max_scope_lines: int = 60) -> str:
+        """Get relevant code snippet around error line and its enclosing scope."""
         lines = script_content.split('\n')
 
         if line_number is None:
@@ -206,6 +338,9 @@ class AIFixer:
         # Get context around the error line
         start_line = max(0, line_number - context_lines - 1)
         end_line = min(len(lines), line_number + context_lines)
+        if scope is not None and scope[1] - scope[0] < max_scope_lines:
+            start_line = min(start_line, scope[0] - 1)
+            end_line = min(len(lines), max(end_line, scope[1]))
 
         snippet_lines = lines[start_line:end_line]
 
@@ -0,0 +1,376 @@
+"""
+Execution backends for AIRun runners.
+
+A backend runs scripts without starting a fresh interpreter for each run.
+Runners fall back to a plain subprocess whenever their backend raises
+BackendUnavailable.
+"""
+import atexit
+import json
+import logging
+import os
+import select
+import shutil
+import signal
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, IO, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+FORK_SERVER_SOURCES = {
+    'nodejs': Path(__file__).with_name('fork_server.js'),
+    'php': Path(__file__).with_name('fork_server.php'),
+}
+
+
+class BackendUnavailable(Exception):
+    """Raised when a backend cannot run a job; callers fall back to subprocess."""
+
+
+class ExecutionBackend(ABC):
+    """
+    Runs scripts on behalf of a runner.
+
+    ``spawn`` returns a handle with the ``subprocess.Popen`` subset used by
+    ``BaseRunner._run_streaming``: ``pid``, ``stdout``, ``stderr`` (pipes
+    opened in binary mode), ``returncode``, ``poll``, ``wait`` and ``kill``.
+    """
+
+    @abstractmethod
+    def spawn(self, script_path: str, args: Optional[List[str]], cwd: Optional[str],
+              env: Dict[str, str]) -> Any:
+        """
+        Start a script.
+
+        Args:
+            script_path: Script to run
+            args: Script arguments
+            cwd: Working directory, None for ours
+            env: Complete child environment
+
+        Returns:
+            Popen-like handle of the running script
+
+        Raises:
+            BackendUnavailable: If the backend cannot take the job
+        """
+        pass
+
+    def close(self) -> None:
+        """Release the backend's resources."""
+        pass
+
+
+class MessageChannel:
+    """JSON-lines messages over a stream socket."""
+
+    def __init__(self, sock: socket.socket):
+        """
+        Initialize the channel.
+
+        Args:
+            sock: Connected stream socket
+        """
+        self.sock = sock
+        self._buffer = b''
+
+    def send(self, message: Dict[str, Any]) -> None:
+        """Send one message."""
+        self.sock.sendall((json.dumps(message) + '\n').encode('utf-8'))
+
+    def read(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Read the next message.
+
+        Args:
+            timeout: Seconds to wait, None for no limit
+
+        Returns:
+            Decoded message, or None if the peer closed the connection
+
+        Raises:
+            subprocess.TimeoutExpired: If no full message arrives in time
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while b'\n' not in self._buffer:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            readable, _, _ = select.select([self.sock], [], [], remaining)
+            if not readable:
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise subprocess.TimeoutExpired('backend', timeout)
+                continue
+            chunk = self.sock.recv(65536)
+            if not chunk:
+                return None
+            self._buffer += chunk
+
+        line, self._buffer = self._buffer.split(b'\n', 1)
+        return json.loads(line.decode('utf-8'))
+
+    def close(self) -> None:
+        """Close the socket."""
+        self.sock.close()
+
+
+class ForkServerProcess:
+    """``subprocess.Popen`` look-alike for a job running in a fork server."""
+
+    def __init__(self, backend: "ForkServerBackend", channel: MessageChannel,
+                 pid: int, process_group: Optional[int],
+                 stdout: IO[bytes], stderr: IO[bytes]):
+        self.args = [f'<{backend.name} fork server>']
+        self.pid = pid
+        self.stdout = stdout
+        self.stderr = stderr
+        self.returncode: Optional[int] = None
+        self._backend = backend
+        self._channel = channel
+        self._process_group = process_group
+
+    def poll(self) -> Optional[int]:
+        """Return the exit code if the job has finished, else None."""
+        if self.returncode is None:
+            try:
+                self.wait(timeout=0)
+            except subprocess.TimeoutExpired:
+                pass
+        return self.returncode
+
+    def wait(self, timeout: Optional[float] = None) -> int:
+        """Wait for the job to finish and return its exit code."""
+        if self.returncode is not None:
+            return self.returncode
+
+        try:
+            message = self._channel.read(timeout)
+        except (OSError, ValueError):
+            message = None
+
+        if message is None or 'exit' not in message:
+            logger.warning(f"Lost the {self._backend.name} fork server during a job")
+            if self._process_group is not None:
+                try:
+                    os.killpg(self._process_group, signal.SIGKILL)
+                except (ProcessLookupError, PermissionError):
+                    pass
+            self._backend.mark_failed()
+            self.returncode = -signal.SIGKILL
+        else:
+            self.returncode = message['exit']
+        self._channel.close()
+        return self.returncode
+
+    def kill(self) -> None:
+        """Ask the server to kill the job; half-closing the connection does it."""
+        if self.returncode is None:
+            try:
+                self._channel.sock.shutdown(socket.SHUT_WR)
+            except OSError:
+                pass
+
+    terminate = kill
+
+
+class ForkServerBackend(ExecutionBackend):
+    """
+    Long-lived runtime process that runs scripts in isolated child contexts.
+
+    The server is started on first use and listens on a Unix socket. Each job
+    gets its own connection; the job's output is written by the server into
+    two FIFOs that this process reads like ordinary pipes. If the server
+    cannot be started or stops answering, it is marked failed and runs fall
+    back to subprocess until ``retry_after`` seconds have passed.
+    """
+
+    def __init__(self, name: str, command: List[str], start_timeout: float = 10.0,
+                 retry_after: float = 30.0):
+        """
+        Initialize the backend.
+
+        Args:
+            name: Language name, for logs
+            command: Server command; the socket path is appended
+            start_timeout: Seconds to wait for the server to become ready
+            retry_after: Seconds before a failed server is started again
+        """
+        self.name = name
+        self.command = list(command)
+        self.start_timeout = start_timeout
+        self.retry_after = retry_after
+
+        self._lock = threading.Lock()
+        self._process: Optional[subprocess.Popen] = None
+        self._directory: Optional[str] = None
+        self._failed_at: Optional[float] = None
+
+    @property
+    def socket_path(self) -> Optional[str]:
+        """Path of the server's socket, once started."""
+        return os.path.join(self._directory, 'server.sock') if self._directory else None
+
+    @property
+    def healthy(self) -> bool:
+        """Whether the server is running."""
+        return self._process is not None and self._process.poll() is None
+
+    def mark_failed(self) -> None:
+        """Stop using the server until ``retry_after`` has passed."""
+        with self._lock:
+            self._failed_at = time.monotonic()
+            self._stop_server()
+
+    def _ensure_started(self) -> None:
+        """Start the server if it is not running."""
+        with self._lock:
+            if self.healthy:
+                return
+            if (self._failed_at is not None
+                    and time.monotonic() - self._failed_at < self.retry_after):
+                raise BackendUnavailable(f"{self.name} fork server recently failed")
+
+            self._stop_server()
+            self._directory = tempfile.mkdtemp(prefix=f'airun-{self.name}-')
+            try:
+                self._process = subprocess.Popen(
+                    self.command + [self.socket_path],
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                    start_new_session=True
+                )
+                readable, _, _ = select.select([self._process.stdout], [], [],
+                                               self.start_timeout)
+                ready = self._process.stdout.readline() if readable else b''
+            except OSError as e:
+                ready = b''
+                logger.debug(f"Cannot start {self.name} fork server: {e}")
+
+            if ready.strip() != b'ready':
+                self._failed_at = time.monotonic()
+                self._stop_server()
+                raise BackendUnavailable(f"{self.name} fork server did not start")
+
+            self._failed_at = None
+            logger.debug(f"Started {self.name} fork server {self._process.pid}")
+
+    def _stop_server(self) -> None:
+        """Stop the server and remove its socket directory."""
+        process, self._process = self._process, None
+        if process is not None:
+            # Closing stdin tells the server to exit
+            for pipe in (process.stdin, process.stdout):
+                try:
+                    pipe.close()
+                except OSError:
+                    pass
+            try:
+                process.wait(timeout=1.0)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+        if self._directory is not None:
+            shutil.rmtree(self._directory, ignore_errors=True)
+            self._directory = None
+
+    def spawn(self, script_path: str, args: Optional[List[str]], cwd: Optional[str],
+              env: Dict[str, str]) -> ForkServerProcess:
+        """Send a job to the server."""
+        self._ensure_started()
+
+        job_dir = tempfile.mkdtemp(dir=self._directory)
+        fifos = [os.path.join(job_dir, name) for name in ('stdout', 'stderr')]
+        readers: List[int] = []
+        writers: List[int] = []
+        channel = None
+        try:
+            for path in fifos:
+                os.mkfifo(path, 0o600)
+                readers.append(os.open(path, os.O_RDONLY | os.O_NONBLOCK))
+                # Held until the server has its own writer, so we do not see EOF early
+                writers.append(os.open(path, os.O_WRONLY | os.O_NONBLOCK))
+
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            channel = MessageChannel(sock)
+            sock.settimeout(self.start_timeout)
+            sock.connect(self.socket_path)
+            sock.settimeout(None)
+            channel.send({
+                'script': os.path.abspath(script_path),
+                'args': list(args or []),
+                'cwd': os.path.abspath(cwd or os.getcwd()),
+                'env': env,
+                'stdout': fifos[0],
+                'stderr': fifos[1],
+            })
+            started = channel.read(self.start_timeout)
+        except (OSError, ValueError, subprocess.TimeoutExpired) as e:
+            self._discard(channel, readers)
+            self.mark_failed()
+            raise BackendUnavailable(f"{self.name} fork server failed: {e}")
+        finally:
+            for fd in writers:
+                os.close(fd)
+            shutil.rmtree(job_dir, ignore_errors=True)
+
+        if not started or not started.get('started'):
+            # The job was refused (bad cwd, unusable output); the server itself is fine
+            self._discard(channel, readers)
+            reason = started.get('error', 'unknown') if started else 'connection closed'
+            raise BackendUnavailable(f"{self.name} fork server refused job: {reason}")
+
+        return ForkServerProcess(self, channel, started['pid'], started.get('pgid'),
+                                 open(readers[0], 'rb', buffering=0),
+                                 open(readers[1], 'rb', buffering=0))
+
+    @staticmethod
+    def _discard(channel: Optional[MessageChannel], readers: List[int]) -> None:
+        if channel is not None:
+            channel.close()
+        for fd in readers:
+            os.close(fd)
+
+    def close(self) -> None:
+        """Stop the server."""
+        with self._lock:
+            self._stop_server()
+
+
+_fork_servers: Dict[Tuple[str, ...], ForkServerBackend] = {}
+_fork_servers_lock = threading.Lock()
+
+
+def get_fork_server(language: str, interpreter: List[str]) -> ForkServerBackend:
+    """
+    Get the process-wide fork server for a language and interpreter command.
+
+    Args:
+        language: 'nodejs' or 'php'
+        interpreter: Executable followed by its flags
+
+    Returns:
+        Shared backend; its server starts on first use
+    """
+    command = list(interpreter) + [str(FORK_SERVER_SOURCES[language])]
+    key = tuple(command)
+    with _fork_servers_lock:
+        backend = _fork_servers.get(key)
+        if backend is None:
+            backend = ForkServerBackend(language, command)
+            _fork_servers[key] = backend
+    return backend
+
+
+@atexit.register
+def shutdown_fork_servers() -> None:
+    """Stop every shared fork server."""
+    with _fork_servers_lock:
+        backends = list(_fork_servers.values())
+        _fork_servers.clear()
+    for backend in backends:
+        backend.close()
@@ -7,6 +7,8 @@ from pathlib import Path
 from typing import Dict, Any, Optional
 from dataclasses import dataclass, field
 
+from .process import ResourceLimits
+
 
 @dataclass
 class Config:
@@ -17,14 +19,27 @@ class Config:
     interactive_mode: bool = False
     timeout: int = 300
     max_retries: int = 3
+    stream_output: bool = True
+    probe_cache: bool = True
+    syntax_cache: bool = True
 
     # LLM settings
     default_llm: str = "ollama:codellama"
     llm_providers: Dict[str, Any] = field(default_factory=dict)
+    llm_routing: Dict[str, Any] = field(default_factory=dict)
 
     # Runner settings
     runners: Dict[str, Any] = field(default_factory=dict)
 
+    # Script detection settings
+    detection: Dict[str, Any] = field(default_factory=dict)
+
+    # Output capture settings
+    output: Dict[str, Any] = field(default_factory=dict)
+
+    # Early error detection settings
+    early_error: Dict[str, Any] = field(default_factory=dict)
+
     # Paths and directories
     config_dir: Path = field(default_factory=lambda: Path.home() / ".airun")
     log_dir: Path = field(default_factory=lambda: Path.home() / ".airun" / "logs")
@@ -109,11 +124,26 @@ class Config:
             }
         }
 
+        # Default provider health tracking
+        config.llm_routing = {
+            'health_ttl': 60,
+            'health_refresh_interval': 0,
+            'failure_threshold': 3,
+            'backoff_base': 10,
+            'backoff_max': 300,
+            'backoff_jitter': 0.5,
+        }
+
         # Default runners
         config.runners = {
             'python': {
                 'executable': 'python3',
-                'flags': ['-u']
+                'flags': ['-u'],
+                'warm_pool': False,
+                'pool_size': 4,
+                'pool_recycle_after': 100,
+                'pool_preload': ['argparse', 'collections', 'datetime', 'json',
+                                 'logging', 'pathlib', 're', 'subprocess', 'typing']
             },
             'shell': {
                 'executable': 'bash',
@@ -121,14 +151,39 @@ class Config:
             },
             'nodejs': {
                 'executable': 'node',
-                'flags': []
+                'flags': [],
+                'fork_server': False
             },
             'php': {
                 'executable': 'php',
-                'flags': []
+                'flags': [],
+                'fork_server': False
             }
         }
 
+        # Default script detection
+        config.detection = {
+            'sniff_bytes': 65536,
+            'tail_bytes': 0,
+            'full_scan': False,
+            'cache': True,
+            'cache_max_entries': 10000,
+        }
+
+        # Default output capture limits, in characters
+        config.output = {
+            'memory_limit': 8 * 1024 * 1024,
+            'head_size': 16 * 1024,
+            'tail_size': 64 * 1024,
+        }
+
+        # Default early error detection while fixing
+        config.early_error = {
+            'enabled': True,
+            'kill': False,
+            'settle_time': 2.0,
+        }
+
         return config
 
     def save(self, config_path: Optional[Path] = None) -> None:
@@ -301,6 +356,11 @@ class Config:
             if 'executable' not in runner_config:
                 errors.append(f"runner '{runner_name}' missing 'executable' key")
 
+            try:
+                ResourceLimits.from_config(runner_config)
+            except ValueError as e:
+                errors.append(f"runner '{runner_name}' {e}")
+
         if errors:
             raise ValueError("Configuration validation failed: " + "; ".join(errors))
 
@@ -335,6 +395,7 @@ class Config:
             'AIRUN_INTERACTIVE': ('interactive_mode', bool),
             'AIRUN_TIMEOUT': ('timeout', int),
             'AIRUN_MAX_RETRIES': ('max_retries', int),
+            'AIRUN_STREAM_OUTPUT': ('stream_output', bool),
             'AIRUN_DEFAULT_LLM': ('default_llm', str),
             'AIRUN_DEBUG': ('debug', bool),
             'AIRUN_LOG_LEVEL': ('log_level', str),
@@ -522,6 +583,9 @@ auto_fix: true                    # Enable automatic error fixing
 interactive_mode: false           # Prompt before applying fixes
 timeout: 300                      # Script execution timeout (seconds)
 max_retries: 3                    # Maximum fix attempts
+stream_output: true               # Show script output live instead of after exit
+probe_cache: true                 # Remember interpreter checks in cache_dir until the binary changes
+syntax_cache: true                # Remember syntax checks in cache_dir keyed by file content
 
 # Default LLM Provider
 default_llm: "ollama:codellama"   # Format: provider:model
@@ -530,6 +594,9 @@ default_llm: "ollama:codellama"   # Format: provider:model
 llm_providers:
   ollama:
     base_url: "http://localhost:11434"
+    timeout: 30                   # Seconds to wait for a response (any provider)
+    connect_timeout: 5            # Seconds to wait for a connection (any provider)
+    pool_size: 4                  # Keep-alive connections reused across requests (any provider)
     models:
       python: "codellama:7b"
       shell: "codellama:7b"
@@ -544,11 +611,26 @@ llm_providers:
     api_key: "${ANTHROPIC_API_KEY}"
     model: "claude-3-sonnet-20240229"
 
+# LLM Provider Routing
+llm_routing:
+  health_ttl: 60                  # Seconds a provider's last known status is trusted
+  health_refresh_interval: 0      # Re-check providers in the background every N seconds; 0 disables
+  failure_threshold: 3            # Consecutive failed requests that open a provider's circuit
+  backoff_base: 10                # Seconds a circuit first stays open; doubles each time it reopens
+  backoff_max: 300                # Longest a circuit stays open, in seconds
+  backoff_jitter: 0.5             # Up to this fraction is taken off each wait to spread retries
+
 # Script Runners Configuration
 runners:
   python:
     executable: "python3"
     flags: ["-u"]                 # Unbuffered output
+    use_shebang: false            # Run with the script's shebang interpreter instead
+    warm_pool: false              # Fork scripts from pre-started interpreters (POSIX)
+    pool_size: 4                  # Warm interpreters, and concurrent pooled runs
+    pool_recycle_after: 100       # Replace a warm interpreter after this many runs
+    pool_preload: [argparse, collections, datetime, json, logging, pathlib, re, subprocess, typing]
+    limits: {}                    # Any runner (POSIX): memory (bytes of address space), cpu_time (s), open_files
   
   shell:
     executable: "bash"
@@ -557,10 +639,32 @@ runners:
   nodejs:
     executable: "node"
     flags: []
+    fork_server: false            # Run scripts in pre-booted node children (POSIX)
   
   php:
     executable: "php"
     flags: []
+    fork_server: false            # Fork scripts from a warm php; needs pcntl, posix, FFI
+
+# Script Detection
+detection:
+  sniff_bytes: 65536              # Bytes read from the file head for content analysis
+  tail_bytes: 0                   # Extra bytes sampled from the end of large files
+  full_scan: false                # Analyse whole files (slow on huge scripts)
+  cache: true                     # Cache results in cache_dir keyed by file identity
+  cache_max_entries: 10000        # Least recently used entries are evicted beyond this
+
+# Output Capture
+output:
+  memory_limit: 8388608           # Characters kept in memory per stream; the rest spills to cache_dir
+  head_size: 16384                # Characters kept from the start of spilled output
+  tail_size: 65536                # Characters kept from the end of spilled output
+
+# Early Error Detection (when auto_fix is on)
+early_error:
+  enabled: true                   # Watch live output for tracebacks and fatal errors
+  kill: false                     # Stop a script left at a fatal error and start fixing early
+  settle_time: 2.0                # Seconds of quiet output after the error before stopping
 
 # Directories (relative to ~/.airun/)
 log_dir: "logs"
@@ -0,0 +1,336 @@
+"""
+Persistent script detection cache for AIRun.
+"""
+import atexit
+import json
+import logging
+import os
+import sqlite3
+import time
+import weakref
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+FileKey = Tuple[int, int, int, int]
+
+# Failures that degrade the cache to a miss: database errors, and an
+# unwritable or missing cache directory
+CACHE_ERRORS = (sqlite3.Error, OSError)
+
+# Caches with an open connection, flushed and closed at interpreter exit
+_open_caches: "weakref.WeakSet[DetectionCache]" = weakref.WeakSet()
+
+
+@atexit.register
+def _close_open_caches() -> None:
+    """Flush and close every detection cache still open at exit."""
+    for cache in list(_open_caches):
+        cache.close()
+
+
+@dataclass
+class CachedDetection:
+    """Detection results stored for one file version."""
+    script_type: Optional[str] = None
+    shebang: Optional[str] = None
+    confidence_scores: Optional[Dict[str, float]] = None
+
+
+class DetectionCache:
+    """
+    On-disk cache of detection results keyed by file identity.
+
+    Entries are keyed by ``(st_dev, st_ino, st_size, st_mtime_ns)`` plus a
+    detector settings fingerprint, so an edited, replaced or truncated file
+    misses automatically. The cache is a SQLite database in WAL mode, which
+    lets many airun processes read and update it concurrently; any database
+    error degrades to a cache miss, and a cache that cannot be opened is
+    disabled for the rest of the instance's life. The least recently used entries are
+    evicted once ``max_entries`` is exceeded.
+
+    Lookups are plain reads that never take the write lock. Hit and miss
+    counters and LRU timestamps are buffered in memory and written with the
+    next ``put``, every ``FLUSH_INTERVAL`` lookups, and on ``flush`` or
+    ``close``.
+    """
+
+    DEFAULT_FILENAME = "detection.sqlite3"
+    DEFAULT_MAX_ENTRIES = 10000
+    # Buffered lookups written out in one transaction
+    FLUSH_INTERVAL = 64
+    # Stores between re-reading the entry count written by other processes
+    RECOUNT_INTERVAL = 256
+
+    def __init__(self, cache_dir: Union[str, Path],
+                 max_entries: int = DEFAULT_MAX_ENTRIES,
+                 filename: str = DEFAULT_FILENAME):
+        """
+        Initialize the detection cache.
+
+        Args:
+            cache_dir: Directory holding the cache database
+            max_entries: Maximum number of entries kept before LRU eviction
+            filename: Database file name inside ``cache_dir``
+        """
+        self.path = Path(cache_dir) / filename
+        self.max_entries = max_entries
+        self._connection: Optional[sqlite3.Connection] = None
+        self._disabled = False
+        self._pending_hits = 0
+        self._pending_misses = 0
+        self._pending_touches: Dict[Tuple, float] = {}
+        # Running entry count, re-read from the database periodically
+        self._entry_count: Optional[int] = None
+        self._puts_since_recount = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Open the database lazily and create the schema if needed.
+
+        Raises:
+            sqlite3.Error, OSError: If the database cannot be opened; the
+                cache is then disabled and later calls fail immediately
+        """
+        if self._connection is None:
+            if self._disabled:
+                raise sqlite3.OperationalError(f"Detection cache disabled: {self.path}")
+            connection = None
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                connection = sqlite3.connect(str(self.path), timeout=5.0,
+                                             isolation_level=None)
+                self._create_schema(connection)
+            except CACHE_ERRORS as e:
+                self._disabled = True
+                if connection is not None:
+                    connection.close()
+                logger.debug(f"Detection cache unavailable, disabling it: {e}")
+                raise
+            self._connection = connection
+            _open_caches.add(self)
+        return self._connection
+
+    @staticmethod
+    def _create_schema(connection: sqlite3.Connection) -> None:
+        """Configure the connection and create the tables if needed."""
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript("""
+            CREATE TABLE IF NOT EXISTS detections (
+                dev INTEGER NOT NULL,
+                ino INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                variant TEXT NOT NULL,
+                path TEXT,
+                script_type TEXT,
+                shebang TEXT,
+                confidence_scores TEXT,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (dev, ino, size, mtime_ns, variant)
+            );
+            CREATE INDEX IF NOT EXISTS detections_last_used
+                ON detections (last_used);
+            CREATE TABLE IF NOT EXISTS counters (
+                name TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            );
+            INSERT OR IGNORE INTO counters (name, value) VALUES ('hits', 0);
+            INSERT OR IGNORE INTO counters (name, value) VALUES ('misses', 0);
+        """)
+
+    @staticmethod
+    def file_key(stat_result: os.stat_result) -> FileKey:
+        """Build the identity key for a file from its stat result."""
+        return (stat_result.st_dev, stat_result.st_ino,
+                stat_result.st_size, stat_result.st_mtime_ns)
+
+    def get(self, key: FileKey, variant: str = "") -> Optional[CachedDetection]:
+        """
+        Look up cached detection results.
+
+        Args:
+            key: File identity key from ``file_key``
+            variant: Detector settings fingerprint
+
+        Returns:
+            Cached results, or None on a miss
+        """
+        try:
+            row = self._connect().execute(
+                "SELECT script_type, shebang, confidence_scores FROM detections "
+                "WHERE dev = ? AND ino = ? AND size = ? AND mtime_ns = ? "
+                "AND variant = ?",
+                (*key, variant)
+            ).fetchone()
+        except CACHE_ERRORS as e:
+            logger.debug(f"Detection cache lookup failed: {e}")
+            return None
+
+        if row is None:
+            self._pending_misses += 1
+        else:
+            self._pending_hits += 1
+            self._pending_touches[(*key, variant)] = time.time()
+        if self._pending_hits + self._pending_misses >= self.FLUSH_INTERVAL:
+            self.flush()
+
+        if row is None:
+            return None
+
+        script_type, shebang, scores = row
+        return CachedDetection(
+            script_type=script_type,
+            shebang=shebang,
+            confidence_scores=json.loads(scores) if scores else None
+        )
+
+    def put(self, key: FileKey, entry: CachedDetection, variant: str = "",
+            path: Optional[str] = None) -> None:
+        """
+        Store detection results, merging with any existing entry.
+
+        Fields left as None in ``entry`` keep their previously cached value.
+
+        Args:
+            key: File identity key from ``file_key``
+            entry: Detection results to store
+            variant: Detector settings fingerprint
+            path: File path, kept for diagnostics only
+        """
+        scores = (json.dumps(entry.confidence_scores)
+                  if entry.confidence_scores is not None else None)
+        try:
+            connection = self._connect()
+            with connection:
+                connection.execute("BEGIN IMMEDIATE")
+                self._write_pending(connection)
+                inserted = connection.execute(
+                    "INSERT OR IGNORE INTO detections (dev, ino, size, mtime_ns, "
+                    "variant, path, script_type, shebang, confidence_scores, last_used) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (*key, variant, path, entry.script_type, entry.shebang,
+                     scores, time.time())
+                ).rowcount
+                if not inserted:
+                    connection.execute(
+                        "UPDATE detections SET path = ?, "
+                        "script_type = COALESCE(?, script_type), "
+                        "shebang = COALESCE(?, shebang), "
+                        "confidence_scores = COALESCE(?, confidence_scores), "
+                        "last_used = ? "
+                        "WHERE dev = ? AND ino = ? AND size = ? AND mtime_ns = ? "
+                        "AND variant = ?",
+                        (path, entry.script_type, entry.shebang, scores,
+                         time.time(), *key, variant)
+                    )
+                self._evict(connection, inserted)
+        except CACHE_ERRORS as e:
+            self._entry_count = None
+            logger.debug(f"Detection cache update failed: {e}")
+
+    def _evict(self, connection: sqlite3.Connection, inserted: int) -> None:
+        """Delete least recently used entries above ``max_entries``."""
+        self._puts_since_recount += 1
+        if self._entry_count is None or self._puts_since_recount >= self.RECOUNT_INTERVAL:
+            self._entry_count = connection.execute(
+                "SELECT COUNT(*) FROM detections"
+            ).fetchone()[0]
+            self._puts_since_recount = 0
+        else:
+            self._entry_count += inserted
+
+        excess = self._entry_count - self.max_entries
+        if excess > 0:
+            self._entry_count -= connection.execute(
+                "DELETE FROM detections WHERE rowid IN ("
+                "SELECT rowid FROM detections ORDER BY last_used LIMIT ?)",
+                (excess,)
+            ).rowcount
+
+    def _write_pending(self, connection: sqlite3.Connection) -> None:
+        """Write buffered counters and LRU touches inside an open transaction."""
+        counters: List[Tuple[int, str]] = [
+            (value, name)
+            for name, value in (('hits', self._pending_hits),
+                                ('misses', self._pending_misses))
+            if value
+        ]
+        if counters:
+            connection.executemany(
+                "UPDATE counters SET value = value + ? WHERE name = ?", counters
+            )
+        if self._pending_touches:
+            connection.executemany(
+                "UPDATE detections SET last_used = MAX(last_used, ?) WHERE dev = ? "
+                "AND ino = ? AND size = ? AND mtime_ns = ? AND variant = ?",
+                [(used, *touch) for touch, used in self._pending_touches.items()]
+            )
+        self._discard_pending()
+
+    def _discard_pending(self) -> None:
+        """Drop buffered counters and LRU touches."""
+        self._pending_hits = 0
+        self._pending_misses = 0
+        self._pending_touches = {}
+
+    def flush(self) -> None:
+        """Write buffered hit/miss counters and LRU touches to the database."""
+        if not (self._pending_hits or self._pending_misses):
+            return
+        try:
+            connection = self._connect()
+            with connection:
+                connection.execute("BEGIN IMMEDIATE")
+                self._write_pending(connection)
+        except CACHE_ERRORS as e:
+            self._discard_pending()
+            logger.debug(f"Detection cache flush failed: {e}")
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with entry count and hit/miss counters
+        """
+        stats = {'entries': 0, 'hits': 0, 'misses': 0}
+        self.flush()
+        try:
+            connection = self._connect()
+            stats['entries'] = connection.execute(
+                "SELECT COUNT(*) FROM detections"
+            ).fetchone()[0]
+            for name, value in connection.execute("SELECT name, value FROM counters"):
+                stats[name] = value
+        except CACHE_ERRORS as e:
+            logger.debug(f"Detection cache stats unavailable: {e}")
+        return stats
+
+    def clear(self) -> None:
+        """Remove all entries and reset the counters."""
+        self._discard_pending()
+        try:
+            connection = self._connect()
+            with connection:
+                connection.execute("BEGIN IMMEDIATE")
+                connection.execute("DELETE FROM detections")
+                connection.execute("UPDATE counters SET value = 0")
+            self._entry_count = 0
+        except CACHE_ERRORS as e:
+            logger.debug(f"Detection cache clear failed: {e}")
+
+    def close(self) -> None:
+        """Flush buffered updates and close the database connection."""
+        if self._connection is not None:
+            self.flush()
+            _open_caches.discard(self)
+            try:
+                self._connection.close()
+            except CACHE_ERRORS as e:
+                logger.debug(f"Detection cache close failed: {e}")
+            self._connection = None
+            self._entry_count = None
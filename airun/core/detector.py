@@ -1,11 +1,17 @@
 """
 Script type detection module for AIRun.
 """
+import os
 import re
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional
+from stat import S_ISREG
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 from enum import Enum
 
+from .detection_cache import CachedDetection, DetectionCache, FileKey
+
 
 class ScriptType(Enum):
     """Supported script types."""
@@ -16,6 +22,197 @@ class ScriptType(Enum):
     UNKNOWN = "unknown"
 
 
+class ContentClassifier:
+    """
+    Scores text against a set of per-type content patterns.
+
+    Every distinct pattern is compiled once, and patterns shared between
+    script types (``echo``, ``function``) are scanned only once and credited
+    to each type. The content is case-folded a single time up front so the
+    scans can run case-sensitively, which lets the regex engine use its
+    literal-prefix search instead of per-character case-insensitive matching.
+    Scores are identical to running ``re.findall(pattern, content,
+    re.MULTILINE | re.IGNORECASE)`` for every pattern.
+    """
+
+    # Non-ASCII characters that IGNORECASE matching treats as equal to an
+    # ASCII letter (İ, ı, ſ, Kelvin sign). Folding ASCII only would miss them.
+    _ASCII_CASE_ALIASES = re.compile('[\u0130\u0131\u017f\u212a]')
+    _ASCII_FOLD_TABLE = str.maketrans(
+        'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'
+    )
+    _ESCAPE_SEQUENCE = re.compile(r'\\.')
+
+    def __init__(self, patterns: Dict[ScriptType, List[str]]):
+        """
+        Compile the classifier.
+
+        Args:
+            patterns: Mapping of script type to its content regexes
+        """
+        self.script_types: List[ScriptType] = list(patterns)
+
+        credited: Dict[str, List[ScriptType]] = {}
+        for script_type, type_patterns in patterns.items():
+            for pattern in type_patterns:
+                credited.setdefault(pattern, []).append(script_type)
+
+        # (folded-content regex, case-insensitive regex, credited types)
+        self._scanners: List[Tuple[re.Pattern, re.Pattern, List[ScriptType]]] = []
+        for pattern, script_types in credited.items():
+            # Patterns with upper-case (``$_GET``) or non-ASCII literals still
+            # need IGNORECASE to match the folded content.
+            flags = re.MULTILINE
+            literals = self._ESCAPE_SEQUENCE.sub('', pattern)
+            if not literals.isascii() or re.search('[A-Z]', literals):
+                flags |= re.IGNORECASE
+            self._scanners.append((
+                re.compile(pattern, flags),
+                re.compile(pattern, re.MULTILINE | re.IGNORECASE),
+                script_types,
+            ))
+
+    def _fold(self, content: str) -> Optional[str]:
+        """Lower-case ASCII letters, or return None if folding is not exact."""
+        if content.isascii():
+            return content.lower()
+        if self._ASCII_CASE_ALIASES.search(content):
+            return None
+        return content.translate(self._ASCII_FOLD_TABLE)
+
+    def count_matches(self, content: str) -> Dict[ScriptType, int]:
+        """
+        Count pattern matches per script type.
+
+        Args:
+            content: Text to classify
+
+        Returns:
+            Dictionary mapping script types to total match counts
+        """
+        counts = {script_type: 0 for script_type in self.script_types}
+        folded = self._fold(content)
+
+        for folded_regex, ignorecase_regex, script_types in self._scanners:
+            if folded is not None:
+                matches = len(folded_regex.findall(folded))
+            else:
+                matches = len(ignorecase_regex.findall(content))
+            for script_type in script_types:
+                counts[script_type] += matches
+
+        return counts
+
+    def score(self, content: str) -> Dict[ScriptType, float]:
+        """
+        Score content for every script type.
+
+        Args:
+            content: Text to classify
+
+        Returns:
+            Dictionary mapping script types to match counts per line
+        """
+        line_count = content.count('\n') + 1
+        return {
+            script_type: matches / line_count
+            for script_type, matches in self.count_matches(content).items()
+        }
+
+
+# Longest shebang line the Linux kernel honours
+MAX_SHEBANG_BYTES = 256
+
+# Interpreter basename split into name and version (``python3.12``, ``php8``)
+_INTERPRETER_NAME = re.compile(r'^(?P<name>.*?[a-z])-?(?P<version>\d+(?:\.\d+)*)?$')
+
+# ``env`` options that consume the following token
+_ENV_OPTIONS_WITH_ARGUMENT = frozenset({'-u', '--unset', '-C', '--chdir'})
+
+
+@dataclass
+class Shebang:
+    """A parsed shebang line."""
+    line: str
+    interpreter: str
+    interpreter_name: str
+    version: Optional[str] = None
+    flags: List[str] = field(default_factory=list)
+    uses_env: bool = False
+    script_type: ScriptType = ScriptType.UNKNOWN
+
+    @property
+    def command(self) -> List[str]:
+        """Interpreter and flags as a command prefix."""
+        return [self.interpreter] + self.flags
+
+
+def parse_shebang(line: Optional[str],
+                  interpreters: Optional[Dict[str, ScriptType]] = None) -> Optional[Shebang]:
+    """
+    Parse a shebang line into interpreter, version and flags.
+
+    The line is tokenised once and the interpreter basename is looked up in
+    a table, so ``/usr/local/bin/node``, ``python3.12`` and
+    ``/usr/bin/env -S python3 -u`` are all recognised. For ``env`` shebangs
+    the interpreter is the program ``env`` would run, with ``env``'s own
+    options and ``NAME=value`` assignments skipped.
+
+    Args:
+        line: First line of a file
+        interpreters: Interpreter name to script type table
+            (defaults to ``ScriptDetector.SHEBANG_INTERPRETERS``)
+
+    Returns:
+        Parsed shebang, or None if the line is not a shebang
+    """
+    if not line or not line.startswith('#!'):
+        return None
+
+    tokens = line[2:].split()
+    if not tokens:
+        return None
+
+    if interpreters is None:
+        interpreters = ScriptDetector.SHEBANG_INTERPRETERS
+
+    uses_env = os.path.basename(tokens[0]) == 'env'
+    if uses_env:
+        args = tokens[1:]
+        index = 0
+        while index < len(args):
+            token = args[index]
+            if token in _ENV_OPTIONS_WITH_ARGUMENT:
+                index += 2
+            elif token.startswith('-S') and len(token) > 2:
+                # ``-Spython3`` form of --split-string
+                args[index] = token[2:]
+                break
+            elif token.startswith('-') or '=' in token:
+                index += 1
+            else:
+                break
+        tokens = args[index:]
+        if not tokens:
+            return None
+
+    interpreter = tokens[0]
+    interpreter_name = os.path.basename(interpreter)
+    match = _INTERPRETER_NAME.match(interpreter_name.lower())
+    name = match.group('name') if match else interpreter_name.lower()
+    version = match.group('version') if match else None
+
+    return Shebang(
+        line=line,
+        interpreter=interpreter,
+        interpreter_name=interpreter_name,
+        version=version,
+        flags=tokens[1:],
+        uses_env=uses_env,
+        script_type=interpreters.get(name, ScriptType.UNKNOWN),
+    )
+
+
 class ScriptDetector:
     """Detects script type based on file extension, shebang, and content analysis."""
 
@@ -39,18 +236,19 @@ class ScriptDetector:
         '.phtml': ScriptType.PHP,
     }
 
-    SHEBANG_PATTERNS = {
-        r'#!/usr/bin/python\d*': ScriptType.PYTHON,
-        r'#!/usr/bin/env python\d*': ScriptType.PYTHON,
-        r'#!/bin/bash': ScriptType.SHELL,
-        r'#!/bin/sh': ScriptType.SHELL,
-        r'#!/usr/bin/env bash': ScriptType.SHELL,
-        r'#!/bin/zsh': ScriptType.SHELL,
-        r'#!/usr/bin/env zsh': ScriptType.SHELL,
-        r'#!/usr/bin/node': ScriptType.NODEJS,
-        r'#!/usr/bin/env node': ScriptType.NODEJS,
-        r'#!/usr/bin/php': ScriptType.PHP,
-        r'#!/usr/bin/env php': ScriptType.PHP,
+    # Shebang interpreter names (without version suffix) per script type
+    SHEBANG_INTERPRETERS = {
+        'python': ScriptType.PYTHON,
+        'pypy': ScriptType.PYTHON,
+        'bash': ScriptType.SHELL,
+        'sh': ScriptType.SHELL,
+        'zsh': ScriptType.SHELL,
+        'dash': ScriptType.SHELL,
+        'ksh': ScriptType.SHELL,
+        'fish': ScriptType.SHELL,
+        'node': ScriptType.NODEJS,
+        'nodejs': ScriptType.NODEJS,
+        'php': ScriptType.PHP,
     }
 
     CONTENT_PATTERNS = {
@@ -93,14 +291,179 @@ class ScriptDetector:
         ]
     }
 
-    def __init__(self, confidence_threshold: float = 0.5):
+    # Default content sniff window: first 64 KiB, no tail sample
+    DEFAULT_SNIFF_BYTES = 64 * 1024
+    DEFAULT_TAIL_BYTES = 0
+
+    def __init__(self, confidence_threshold: float = 0.5,
+                 sniff_bytes: int = DEFAULT_SNIFF_BYTES,
+                 tail_bytes: int = DEFAULT_TAIL_BYTES,
+                 full_scan: bool = False,
+                 cache: Optional[DetectionCache] = None):
         """
         Initialize the script detector.
 
         Args:
             confidence_threshold: Minimum confidence score for content-based detection
+            sniff_bytes: Bytes read from the start of the file for content analysis
+            tail_bytes: Bytes additionally sampled from the end of large files
+            full_scan: Analyse the whole file instead of a bounded sample
+            cache: Optional persistent cache of detection results
         """
         self.confidence_threshold = confidence_threshold
+        self.sniff_bytes = sniff_bytes
+        self.tail_bytes = tail_bytes
+        self.full_scan = full_scan
+        self.cache = cache
+        self.classifier = self._get_classifier()
+        # Cached results are only valid for identical detection settings
+        self._cache_variant = (
+            f"{confidence_threshold}:{sniff_bytes}:{tail_bytes}:{int(full_scan)}"
+        )
+
+    @classmethod
+    def from_config(cls, config: Any, **overrides) -> "ScriptDetector":
+        """
+        Create a detector from the ``detection`` section of a configuration.
+
+        Args:
+            config: Configuration object
+            **overrides: Keyword arguments taking precedence over the config
+
+        Returns:
+            Configured ScriptDetector instance
+        """
+        detection = getattr(config, 'detection', None)
+        detection = dict(detection) if isinstance(detection, dict) else {}
+        detection.update(overrides)
+
+        cache = None
+        cache_dir = getattr(config, 'cache_dir', None)
+        if detection.get('cache', True) and cache_dir:
+            cache = DetectionCache(
+                cache_dir,
+                max_entries=detection.get('cache_max_entries',
+                                          DetectionCache.DEFAULT_MAX_ENTRIES)
+            )
+
+        return cls(
+            confidence_threshold=detection.get('confidence_threshold', 0.5),
+            sniff_bytes=detection.get('sniff_bytes', cls.DEFAULT_SNIFF_BYTES),
+            tail_bytes=detection.get('tail_bytes', cls.DEFAULT_TAIL_BYTES),
+            full_scan=detection.get('full_scan', False),
+            cache=cache,
+        )
+
+    @classmethod
+    def _get_classifier(cls) -> ContentClassifier:
+        """Get the compiled content classifier shared by this detector class."""
+        classifier = cls.__dict__.get('_classifier')
+        if classifier is None:
+            classifier = ContentClassifier(cls.CONTENT_PATTERNS)
+            cls._classifier = classifier
+        return classifier
+
+    def _get_settings(self) -> Dict[str, Any]:
+        """Get picklable settings to rebuild this detector in a worker process."""
+        settings = {
+            'confidence_threshold': self.confidence_threshold,
+            'sniff_bytes': self.sniff_bytes,
+            'tail_bytes': self.tail_bytes,
+            'full_scan': self.full_scan,
+        }
+        if self.cache is not None:
+            settings['cache_dir'] = str(self.cache.path.parent)
+            settings['cache_max_entries'] = self.cache.max_entries
+        return settings
+
+    def detect_many(self, paths: Iterable[str], workers: Optional[int] = None,
+                    chunk_size: int = 256) -> Iterator[Tuple[str, ScriptType]]:
+        """
+        Detect the types of many files, yielding results as they are known.
+
+        Files with a known extension are answered immediately without any
+        I/O. The remaining ambiguous files are sniffed in chunks on a process
+        pool, so results are not yielded in input order. With ``workers`` of
+        1 every file is sniffed in this process as it is read, in input
+        order; when fewer than ``chunk_size`` files are ambiguous they are
+        also sniffed here.
+
+        Args:
+            paths: File paths to classify
+            workers: Worker process count (defaults to the CPU count)
+            chunk_size: Ambiguous files sent to a worker per task
+
+        Yields:
+            Tuples of (path, detected script type)
+        """
+        workers = workers or os.cpu_count() or 1
+        executor: Optional[ProcessPoolExecutor] = None
+        pending = set()
+        batch: List[str] = []
+
+        try:
+            for path in paths:
+                extension_type = self._detect_by_extension(Path(path))
+                if extension_type != ScriptType.UNKNOWN:
+                    yield path, extension_type
+                    continue
+
+                if workers <= 1:
+                    yield path, self.detect_type(path)
+                    continue
+
+                batch.append(path)
+                if len(batch) < chunk_size:
+                    continue
+
+                if executor is None:
+                    executor = ProcessPoolExecutor(
+                        max_workers=workers,
+                        initializer=_init_detect_worker,
+                        initargs=(self._get_settings(),)
+                    )
+                pending.add(executor.submit(_detect_chunk, batch))
+                batch = []
+
+                # Bound the work in flight and stream finished chunks
+                done, pending = wait(
+                    pending, timeout=0 if len(pending) < workers * 2 else None,
+                    return_when=FIRST_COMPLETED
+                )
+                for future in done:
+                    yield from _as_script_types(future.result())
+
+            if batch:
+                if executor is None:
+                    for path in batch:
+                        yield path, self.detect_type(path)
+                else:
+                    pending.add(executor.submit(_detect_chunk, batch))
+
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from _as_script_types(future.result())
+        finally:
+            if executor is not None:
+                for future in pending:
+                    future.cancel()
+                executor.shutdown(wait=True)
+            if self.cache is not None:
+                self.cache.flush()
+
+    def probe(self, filepath: str) -> "FileProbe":
+        """
+        Create a file probe using this detector's sniff settings.
+
+        Args:
+            filepath: Path to the script file
+
+        Returns:
+            Lazy FileProbe for the file
+        """
+        return FileProbe(filepath, sniff_bytes=self.sniff_bytes,
+                         tail_bytes=self.tail_bytes, full_scan=self.full_scan)
 
     def detect_type(self, filepath: str) -> ScriptType:
         """
@@ -112,24 +475,43 @@ class ScriptDetector:
         Returns:
             Detected script type
         """
-        path = Path(filepath)
+        return self._detect_probe(self.probe(filepath))
 
+    def _detect_probe(self, probe: "FileProbe") -> ScriptType:
+        """Detect script type from a file probe."""
         # 1. Check file extension
-        extension_type = self._detect_by_extension(path)
+        extension_type = self._detect_by_extension(probe.path)
         if extension_type != ScriptType.UNKNOWN:
             return extension_type
 
+        cache_key = self._get_cache_key(probe)
+        if cache_key is not None:
+            cached = self.cache.get(cache_key, self._cache_variant)
+            if cached is not None and cached.script_type is not None:
+                return ScriptType(cached.script_type)
+
         # 2. Check shebang
-        shebang_type = self._detect_by_shebang(filepath)
-        if shebang_type != ScriptType.UNKNOWN:
-            return shebang_type
+        script_type = self._match_shebang(probe.first_line)
 
         # 3. Content analysis
-        content_type = self._detect_by_content(filepath)
-        if content_type != ScriptType.UNKNOWN:
-            return content_type
+        if script_type == ScriptType.UNKNOWN:
+            script_type = self._classify_content(probe.content)
 
-        return ScriptType.UNKNOWN
+        if cache_key is not None:
+            self.cache.put(
+                cache_key,
+                CachedDetection(script_type=script_type.value, shebang=probe.shebang),
+                self._cache_variant,
+                path=probe.filepath
+            )
+
+        return script_type
+
+    def _get_cache_key(self, probe: "FileProbe") -> Optional[FileKey]:
+        """Get the detection cache key for a file, or None if not cacheable."""
+        if self.cache is None or probe.stat is None:
+            return None
+        return DetectionCache.file_key(probe.stat)
 
     def _detect_by_extension(self, path: Path) -> ScriptType:
         """Detect script type by file extension."""
@@ -138,38 +520,50 @@ class ScriptDetector:
 
     def _detect_by_shebang(self, filepath: str) -> ScriptType:
         """Detect script type by shebang line."""
-        try:
-            with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                first_line = f.readline().strip()
+        return self._match_shebang(self.probe(filepath).first_line)
 
-            for pattern, script_type in self.SHEBANG_PATTERNS.items():
-                if re.match(pattern, first_line):
-                    return script_type
+    def _match_shebang(self, first_line: Optional[str]) -> ScriptType:
+        """Match a first line against the known shebang interpreters."""
+        shebang = parse_shebang(first_line, self.SHEBANG_INTERPRETERS)
+        return shebang.script_type if shebang else ScriptType.UNKNOWN
 
-        except (IOError, UnicodeDecodeError):
-            pass
+    def detect_shebang(self, filepath: str) -> Optional["Shebang"]:
+        """
+        Parse the shebang line of a file.
 
-        return ScriptType.UNKNOWN
+        Only the first ``MAX_SHEBANG_BYTES`` of the file are read.
+
+        Args:
+            filepath: Path to the script file
+
+        Returns:
+            Parsed shebang, or None if the file has no shebang
+        """
+        probe = FileProbe(filepath, sniff_bytes=MAX_SHEBANG_BYTES)
+        return parse_shebang(probe.first_line, self.SHEBANG_INTERPRETERS)
+
+    def _read_sample(self, filepath: str) -> Optional[str]:
+        """
+        Read the part of a file used for content analysis.
+
+        Args:
+            filepath: Path to the script file
+
+        Returns:
+            Decoded sample with normalised newlines, or None if unreadable
+        """
+        return self.probe(filepath).content
 
     def _detect_by_content(self, filepath: str) -> ScriptType:
         """Detect script type by analyzing file content."""
-        try:
-            with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-        except (IOError, UnicodeDecodeError):
-            return ScriptType.UNKNOWN
-
-        scores = {}
+        return self._classify_content(self.probe(filepath).content)
 
-        for script_type, patterns in self.CONTENT_PATTERNS.items():
-            score = 0
-            for pattern in patterns:
-                matches = len(re.findall(pattern, content, re.MULTILINE | re.IGNORECASE))
-                score += matches
+    def _classify_content(self, content: Optional[str]) -> ScriptType:
+        """Pick the best scoring script type for a content sample."""
+        if content is None:
+            return ScriptType.UNKNOWN
 
-            # Normalize score by content length
-            normalized_score = score / max(len(content.split('\n')), 1)
-            scores[script_type] = normalized_score
+        scores = self.classifier.score(content)
 
         # Find the type with highest score
         if scores:
@@ -189,75 +583,303 @@ class ScriptDetector:
         Returns:
             Dictionary mapping script types to confidence scores
         """
-        scores = {script_type: 0.0 for script_type in ScriptType}
+        return self._confidence_scores_probe(self.probe(filepath))
 
-        path = Path(filepath)
+    def _confidence_scores_probe(self, probe: "FileProbe") -> Dict[ScriptType, float]:
+        """Get confidence scores for all script types from a file probe."""
+        scores = {script_type: 0.0 for script_type in ScriptType}
 
         # Extension-based score
-        extension_type = self._detect_by_extension(path)
+        extension_type = self._detect_by_extension(probe.path)
         if extension_type != ScriptType.UNKNOWN:
             scores[extension_type] += 1.0
 
+        cache_key = self._get_cache_key(probe)
+        cached = None
+        if cache_key is not None:
+            cached = self.cache.get(cache_key, self._cache_variant)
+
+        if cached is not None and cached.confidence_scores is not None:
+            shebang = cached.shebang
+            content_scores = {
+                ScriptType(name): score
+                for name, score in cached.confidence_scores.items()
+            }
+        else:
+            shebang = probe.shebang
+            content_scores = self._get_content_scores(probe.content)
+            if cache_key is not None:
+                self.cache.put(
+                    cache_key,
+                    CachedDetection(
+                        shebang=shebang,
+                        confidence_scores={
+                            script_type.value: score
+                            for script_type, score in content_scores.items()
+                        }
+                    ),
+                    self._cache_variant,
+                    path=probe.filepath
+                )
+
         # Shebang-based score
-        shebang_type = self._detect_by_shebang(filepath)
+        shebang_type = self._match_shebang(shebang)
         if shebang_type != ScriptType.UNKNOWN:
             scores[shebang_type] += 0.8
 
         # Content-based scores
-        try:
-            with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-
-            for script_type, patterns in self.CONTENT_PATTERNS.items():
-                pattern_score = 0
-                for pattern in patterns:
-                    matches = len(re.findall(pattern, content, re.MULTILINE | re.IGNORECASE))
-                    pattern_score += matches
+        for script_type, content_score in content_scores.items():
+            scores[script_type] += content_score
 
-                # Normalize by content length
-                normalized_score = pattern_score / max(len(content.split('\n')), 1)
-                scores[script_type] += min(normalized_score, 0.5)  # Cap content score
+        return scores
 
-        except (IOError, UnicodeDecodeError):
-            pass
+    def _get_content_scores(self, content: Optional[str]) -> Dict[ScriptType, float]:
+        """Get capped content-based confidence scores for a content sample."""
+        if content is None:
+            return {}
 
-        return scores
+        return {
+            script_type: min(normalized_score, 0.5)  # Cap content score
+            for script_type, normalized_score in self.classifier.score(content).items()
+        }
 
     def is_executable(self, filepath: str) -> bool:
         """Check if file has executable permissions."""
-        try:
-            path = Path(filepath)
-            return path.is_file() and path.stat().st_mode & 0o111
-        except (OSError, AttributeError):
-            return False
+        return self.probe(filepath).is_executable
 
-    def get_file_info(self, filepath: str) -> Dict[str, any]:
+    def get_file_info(self, filepath: str) -> Dict[str, Any]:
         """
         Get comprehensive file information for debugging.
 
+        All checks share one FileProbe, so the file is stat'ed once and read
+        once with a bounded read.
+
         Args:
             filepath: Path to the script file
 
         Returns:
             Dictionary with file information
         """
-        path = Path(filepath)
-        info = {
-            'filepath': str(path.absolute()),
-            'exists': path.exists(),
-            'size': path.stat().st_size if path.exists() else 0,
-            'extension': path.suffix,
-            'is_executable': self.is_executable(filepath),
-            'detected_type': self.detect_type(filepath),
-            'confidence_scores': self.get_confidence_scores(filepath),
+        probe = self.probe(filepath)
+        probe.load()
+        shebang = parse_shebang(probe.shebang, self.SHEBANG_INTERPRETERS)
+
+        return {
+            'filepath': str(probe.path.absolute()),
+            'exists': probe.exists,
+            'size': probe.size,
+            'extension': probe.path.suffix,
+            'is_executable': probe.is_executable,
+            'detected_type': self._detect_probe(probe),
+            'confidence_scores': self._confidence_scores_probe(probe),
+            'shebang': probe.shebang,
+            'interpreter': shebang.interpreter if shebang else None,
         }
 
-        # Add shebang info
-        try:
-            with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                first_line = f.readline().strip()
-            info['shebang'] = first_line if first_line.startswith('#!') else None
-        except (IOError, UnicodeDecodeError):
-            info['shebang'] = None
 
-        return info
\ No newline at end of file
+class FileProbe:
+    """
+    Lazily gathered facts about a file for script detection.
+
+    A probe performs at most one ``stat`` and one bounded read, no matter how
+    many detection steps consult it. Extension checks need neither, cache
+    lookups only need the stat, and shebang, content and executable-bit checks
+    are served from the single read (which also provides the stat via
+    ``fstat``).
+    """
+
+    def __init__(self, filepath: str,
+                 sniff_bytes: int = ScriptDetector.DEFAULT_SNIFF_BYTES,
+                 tail_bytes: int = ScriptDetector.DEFAULT_TAIL_BYTES,
+                 full_scan: bool = False):
+        """
+        Initialize the probe without touching the filesystem.
+
+        Args:
+            filepath: Path to the file
+            sniff_bytes: Bytes read from the start of the file
+            tail_bytes: Bytes additionally sampled from the end of large files
+            full_scan: Read the whole file instead of a bounded sample
+        """
+        self.filepath = str(filepath)
+        self.path = Path(filepath)
+        self.sniff_bytes = sniff_bytes
+        self.tail_bytes = tail_bytes
+        self.full_scan = full_scan
+
+        self._stat: Optional[os.stat_result] = None
+        self._stat_done = False
+        self._content: Optional[str] = None
+        self._read_done = False
+
+    @property
+    def stat(self) -> Optional[os.stat_result]:
+        """Stat result of the file, or None if it does not exist."""
+        if not self._stat_done:
+            self._stat_done = True
+            try:
+                self._stat = os.stat(self.filepath)
+            except OSError:
+                self._stat = None
+        return self._stat
+
+    @property
+    def exists(self) -> bool:
+        """Whether the file exists."""
+        return self.stat is not None
+
+    @property
+    def size(self) -> int:
+        """File size in bytes, or 0 if it does not exist."""
+        return self.stat.st_size if self.stat is not None else 0
+
+    @property
+    def is_executable(self) -> bool:
+        """Whether the path is a regular file with any executable bit set."""
+        return (self.stat is not None and S_ISREG(self.stat.st_mode)
+                and bool(self.stat.st_mode & 0o111))
+
+    @property
+    def content(self) -> Optional[str]:
+        """Decoded content sample with normalised newlines, or None if unreadable."""
+        self.load()
+        return self._content
+
+    @property
+    def first_line(self) -> Optional[str]:
+        """Stripped first line of the file, or None if unreadable."""
+        content = self.content
+        if content is None:
+            return None
+        return content.split('\n', 1)[0].strip()
+
+    @property
+    def shebang(self) -> Optional[str]:
+        """The first line if it is a shebang."""
+        first_line = self.first_line
+        return first_line if first_line and first_line.startswith('#!') else None
+
+    def load(self) -> None:
+        """
+        Read the content sample, taking the stat from the open file.
+
+        Reads at most ``sniff_bytes`` from the start of the file, plus
+        ``tail_bytes`` from its end when the file is larger than both windows
+        combined. With ``full_scan`` enabled the whole file is read.
+        """
+        if self._read_done:
+            return
+        self._read_done = True
+
+        try:
+            with open(self.filepath, 'rb') as f:
+                if not self._stat_done:
+                    self._stat = os.fstat(f.fileno())
+                    self._stat_done = True
+
+                if self.full_scan:
+                    data = f.read()
+                else:
+                    data = f.read(self.sniff_bytes)
+                    if self.tail_bytes > 0 and len(data) == self.sniff_bytes:
+                        size = self._stat.st_size if self._stat else os.fstat(f.fileno()).st_size
+                        tail_start = max(size - self.tail_bytes, self.sniff_bytes)
+                        f.seek(tail_start)
+                        tail = f.read(self.tail_bytes)
+                        if tail_start > self.sniff_bytes:
+                            # Drop the partial first line of a detached tail
+                            tail = b'\n' + tail[tail.find(b'\n') + 1:]
+                        data += tail
+        except (IOError, OSError):
+            return
+
+        content = data.decode('utf-8', errors='ignore')
+        self._content = content.replace('\r\n', '\n').replace('\r', '\n')
+
+
+# Detector used by detect_many worker processes, built once per process
+_worker_detector: Optional[ScriptDetector] = None
+
+
+def _init_detect_worker(settings: Dict[str, Any]) -> None:
+    """Build the detector for a detect_many worker process."""
+    global _worker_detector
+    settings = dict(settings)
+    cache_dir = settings.pop('cache_dir', None)
+    max_entries = settings.pop('cache_max_entries', DetectionCache.DEFAULT_MAX_ENTRIES)
+    if cache_dir:
+        settings['cache'] = DetectionCache(cache_dir, max_entries=max_entries)
+    _worker_detector = ScriptDetector(**settings)
+
+
+def _detect_chunk(paths: List[str]) -> List[Tuple[str, str]]:
+    """Detect a chunk of files in a worker process."""
+    results = [(path, _worker_detector.detect_type(path).value) for path in paths]
+    if _worker_detector.cache is not None:
+        _worker_detector.cache.flush()
+    return results
+
+
+def _as_script_types(results: List[Tuple[str, str]]) -> Iterator[Tuple[str, ScriptType]]:
+    """Convert worker results back to ScriptType values."""
+    for path, script_type in results:
+        yield path, ScriptType(script_type)
+
+
+# Directories never descended into by iter_files
+DEFAULT_EXCLUDED_DIRS = frozenset({'.git', '.hg', '.svn', '__pycache__'})
+
+
+def iter_files(root: str, exclude_dirs: Optional[Set[str]] = None,
+               include_hidden: bool = False,
+               follow_symlinks: bool = False) -> Iterator[str]:
+    """
+    Walk a directory tree and yield regular file paths.
+
+    Uses ``os.scandir`` so file-type checks come from the directory entries
+    themselves and need no extra ``stat`` call on most filesystems.
+
+    Args:
+        root: Directory to walk (a file path is yielded as is)
+        exclude_dirs: Directory names to skip (defaults to VCS and cache dirs)
+        include_hidden: Include dot-files and descend into dot-directories
+        follow_symlinks: Follow symbolic links to files and directories
+
+    Yields:
+        File paths under ``root``
+    """
+    if os.path.isfile(root):
+        yield root
+        return
+
+    if exclude_dirs is None:
+        exclude_dirs = DEFAULT_EXCLUDED_DIRS
+
+    stack = [root]
+    visited = set()
+    while stack:
+        directory = stack.pop()
+        try:
+            if follow_symlinks:
+                # Guard against symlink cycles
+                dir_stat = os.stat(directory)
+                if (dir_stat.st_dev, dir_stat.st_ino) in visited:
+                    continue
+                visited.add((dir_stat.st_dev, dir_stat.st_ino))
+
+            with os.scandir(directory) as entries:
+                subdirs = []
+                for entry in entries:
+                    if not include_hidden and entry.name.startswith('.'):
+                        continue
+                    try:
+                        if entry.is_dir(follow_symlinks=follow_symlinks):
+                            if entry.name not in exclude_dirs:
+                                subdirs.append(entry.path)
+                        elif entry.is_file(follow_symlinks=follow_symlinks):
+                            yield entry.path
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+        stack.extend(reversed(subdirs))
@@ -0,0 +1,214 @@
+"""
+Early error detection on live script output for AIRun.
+"""
+import logging
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Pattern, Set, Tuple
+
+from .detector import ScriptType
+
+logger = logging.getLogger(__name__)
+
+# Lines reported as the script's first error
+ERROR_PATTERNS: Dict[ScriptType, List[str]] = {
+    ScriptType.PYTHON: [
+        r'^Traceback \(most recent call last\):',
+        r'^  File ".+", line \d+',
+    ],
+    ScriptType.SHELL: [
+        r'^.+: line \d+: .+',
+    ],
+    ScriptType.NODEJS: [
+        r'^(?:Uncaught )?[A-Z]?[A-Za-z]*Error(?: \[[A-Z_]+\])?: ',
+    ],
+    ScriptType.PHP: [
+        r'^(?:PHP )?(?:Fatal error|Parse error): ',
+    ],
+}
+
+# Lines after which the script is not expected to continue, as
+# (opening line, fatal line, trailing lines) patterns. With an opening
+# pattern, the fatal line only counts when it ends an indented block started
+# by the opening line, such as the exception line closing an uncaught Python
+# traceback. Trailing lines are still part of the fatal report, such as the
+# stack trace PHP prints after an uncaught exception.
+FATAL_PATTERNS: Dict[ScriptType, Tuple[Optional[str], str, Optional[str]]] = {
+    ScriptType.PYTHON: (
+        r'^Traceback \(most recent call last\):',
+        r'^(?:[A-Za-z_][\w.]*\.)?[A-Z]\w*(?:Error|Exception|Exit|Interrupt)(?::|$)',
+        None,
+    ),
+    # Printed by Node.js after the stack of an uncaught exception
+    ScriptType.NODEJS: (None, r'^Node\.js v\d+\.\d+\.\d+$', None),
+    ScriptType.PHP: (
+        None,
+        r'^(?:PHP )?(?:Fatal error|Parse error): ',
+        r'^(?:PHP )?(?:Stack trace:|#\d+ |\s+thrown in |\s+\d+\. |\s*$)',
+    ),
+}
+
+# The PHP CLI prints fatal errors to stdout unless display_errors=stderr
+WATCHED_STREAMS: Dict[ScriptType, Tuple[str, ...]] = {
+    ScriptType.PHP: ('stdout', 'stderr'),
+}
+DEFAULT_WATCHED_STREAMS = ('stderr',)
+
+
+@dataclass(frozen=True)
+class ErrorWatchSettings:
+    """
+    How the runner reacts to errors spotted in live output.
+
+    Errors are always recorded. With ``kill`` set, once a fatal line has been
+    seen and the script has produced no output for ``settle_time`` seconds,
+    the script is killed so its partial result can be handed to the fixer
+    straight away. Any output after the fatal line, other than the rest of
+    its error report, means the script recovered and cancels the kill. Killing is opt-in because a script that
+    reports a handled error and then waits quietly looks the same.
+    """
+    kill: bool = False
+    settle_time: float = 2.0
+
+    @classmethod
+    def from_config(cls, config: Any) -> Optional["ErrorWatchSettings"]:
+        """
+        Create settings from the ``early_error`` section of a configuration.
+
+        Args:
+            config: Configuration object
+
+        Returns:
+            Watch settings, or None if the section is missing or disabled
+        """
+        early_error = getattr(config, 'early_error', None)
+        if not isinstance(early_error, dict) or not early_error.get('enabled', False):
+            return None
+
+        return cls(
+            kill=early_error.get('kill', cls.kill),
+            settle_time=early_error.get('settle_time', cls.settle_time),
+        )
+
+
+class ErrorWatcher:
+    """
+    Output callback that watches for a script's first error.
+
+    Lines are matched as they complete, so a match is seen while the script
+    is still running rather than after it exits.
+    """
+
+    def __init__(self, script_type: ScriptType,
+                 settings: Optional[ErrorWatchSettings] = None,
+                 patterns: Optional[List[str]] = None,
+                 fatal: Optional[Tuple[Optional[str], str, Optional[str]]] = None):
+        """
+        Initialize the watcher.
+
+        Args:
+            script_type: Language of the watched script
+            settings: Reaction settings; defaults to ErrorWatchSettings()
+            patterns: Regular expressions overriding ERROR_PATTERNS
+            fatal: (opening, fatal line, trailing) expressions overriding
+                FATAL_PATTERNS
+        """
+        self.settings = settings or ErrorWatchSettings()
+        if patterns is None:
+            patterns = ERROR_PATTERNS.get(script_type, [])
+        self._pattern: Optional[Pattern[str]] = (
+            re.compile('|'.join(f'(?:{p})' for p in patterns)) if patterns else None
+        )
+        if fatal is None:
+            fatal = FATAL_PATTERNS.get(script_type)
+        self._fatal_opening: Optional[Pattern[str]] = (
+            re.compile(fatal[0]) if fatal and fatal[0] else None
+        )
+        self._fatal_pattern: Optional[Pattern[str]] = (
+            re.compile(fatal[1]) if fatal else None
+        )
+        self._fatal_trailing: Optional[Pattern[str]] = (
+            re.compile(fatal[2]) if fatal and fatal[2] else None
+        )
+        self._streams = WATCHED_STREAMS.get(script_type, DEFAULT_WATCHED_STREAMS)
+        self._partial: Dict[str, str] = {}
+        self._opened: Dict[str, bool] = {}
+        # Streams holding an unfinished line written since the last fatal line
+        self._unfinished: Set[str] = set()
+        self._started = time.monotonic()
+        self._last_output = self._started
+
+        self.error_line: Optional[str] = None
+        self.detected_after: Optional[float] = None
+        # Most recent fatal line, cleared again by any later output that is
+        # not part of its report
+        self.fatal_line: Optional[str] = None
+
+    @property
+    def triggered(self) -> bool:
+        """Whether an error line has been seen."""
+        return self.error_line is not None
+
+    def __call__(self, stream: str, text: str) -> None:
+        """Inspect a chunk of output."""
+        self._last_output = time.monotonic()
+        if stream not in self._streams:
+            if text:
+                # The script is still producing output, so it has not died
+                self.fatal_line = None
+            return
+
+        lines = (self._partial.get(stream, '') + text).splitlines(keepends=True)
+        self._partial[stream] = lines.pop() if lines and not lines[-1].endswith(
+            ('\n', '\r')) else ''
+
+        for line in lines:
+            line = line.rstrip('\r\n')
+            self._check_fatal(stream, line)
+            if not self.triggered and self._pattern and self._pattern.search(line):
+                self.error_line = line
+                self.detected_after = self._last_output - self._started
+                logger.debug(f"Error detected after {self.detected_after:.2f}s: "
+                             f"{self.error_line}")
+
+        if self._partial[stream]:
+            self._unfinished.add(stream)
+        else:
+            self._unfinished.discard(stream)
+
+    def _check_fatal(self, stream: str, line: str) -> None:
+        """Track whether ``line`` leaves the script at a fatal error."""
+        if self.fatal_line is not None and self._is_trailing(line):
+            return
+        self.fatal_line = None
+        if self._fatal_pattern is None:
+            return
+
+        if self._fatal_opening is None or self._opened.get(stream):
+            if self._fatal_pattern.search(line):
+                self.fatal_line = line
+                self._unfinished.clear()
+
+        if self._fatal_opening is not None:
+            if self._fatal_opening.search(line):
+                self._opened[stream] = True
+            elif not line[:1].isspace():
+                self._opened[stream] = False
+
+    def _is_trailing(self, line: str) -> bool:
+        """Whether ``line`` belongs to the report of a fatal error."""
+        return self._fatal_trailing is not None and bool(self._fatal_trailing.search(line))
+
+    def should_stop(self) -> bool:
+        """
+        Whether the script should be stopped now.
+
+        True once the last output was a fatal line or its report, killing is
+        enabled and the output has been quiet since for the settle time. An
+        unfinished line after the fatal one means the script is still alive.
+        """
+        return (self.fatal_line is not None and self.settings.kill
+                and time.monotonic() - self._last_output >= self.settings.settle_time
+                and all(self._is_trailing(self._partial[stream])
+                        for stream in self._unfinished))
@@ -0,0 +1,210 @@
+/*
+ * Node.js fork server for AIRun's NodeJSRunner.
+ *
+ * Started as `node fork_server.js <socket path>` and kept alive between
+ * runs. Node cannot fork() a running process, so the server keeps one
+ * spare child, started with child_process.fork and already booted, waiting
+ * for a job; each job takes the spare and a new one is started behind it.
+ * The child enters the job's cwd, takes its environment and argv, and
+ * runs the script as its main module, so every job gets its own process,
+ * globals and module cache, like a plain `node script.js`.
+ *
+ * Each connection carries one job as a JSON line {"script", "args", "cwd",
+ * "env", "stdout", "stderr"}, where stdout/stderr are FIFO paths opened by
+ * AIRun. The child's output is piped into the FIFOs and its stdin is
+ * empty. Replies are JSON lines: {"started": true, "pid": N, "pgid": N}
+ * once the child is set up, then {"exit": code}, negative for a signal.
+ * Half-closing the connection kills the job's process group.
+ *
+ * Children are started before their job is known, so they run with the
+ * server's node flags; NODE_OPTIONS in the job environment has no effect.
+ */
+'use strict';
+
+const { fork } = require('child_process');
+const fs = require('fs');
+const net = require('net');
+const os = require('os');
+const path = require('path');
+
+const CHILD_FLAG = '--airun-job';
+
+function runChild() {
+  process.once('message', (job) => {
+    try {
+      process.chdir(job.cwd);
+    } catch (err) {
+      process.send({ error: `cannot enter ${job.cwd}: ${err.message}` }, () => process.exit(1));
+      return;
+    }
+    for (const name of Object.keys(process.env)) {
+      delete process.env[name];
+    }
+    Object.assign(process.env, job.env);
+    process.argv = [process.argv[0], path.resolve(job.script), ...job.args];
+
+    process.send({ ready: true }, () => {
+      // Leave no trace of the IPC channel, which would also keep the job alive
+      process.disconnect();
+      delete process.send;
+      delete process.disconnect;
+      require('module').runMain();
+    });
+  });
+}
+
+let spare = null;
+const running = new Set();
+
+function startSpare() {
+  spare = fork(__filename, [CHILD_FLAG], {
+    // Detached children lead their own process group, killed as a whole
+    detached: true,
+    stdio: ['ignore', 'pipe', 'pipe', 'ipc'],
+  });
+  spare.on('error', () => {});
+}
+
+function takeSpare() {
+  let child = spare;
+  if (!child || !child.connected || child.exitCode !== null || child.signalCode !== null) {
+    startSpare();
+    child = spare;
+  }
+  startSpare();
+  return child;
+}
+
+function killGroup(child) {
+  if (child.exitCode === null && child.signalCode === null) {
+    try {
+      process.kill(-child.pid, 'SIGKILL');
+    } catch (err) {
+      // Already gone
+    }
+  }
+}
+
+function reply(conn, message) {
+  if (!conn.destroyed) {
+    conn.write(JSON.stringify(message) + '\n');
+  }
+}
+
+function openStream(file) {
+  return new Promise((resolve, reject) => {
+    const stream = fs.createWriteStream(file);
+    stream.once('open', () => resolve(stream));
+    stream.once('error', reject);
+  });
+}
+
+function closeStream(stream) {
+  return new Promise((resolve) => {
+    if (stream.closed) {
+      resolve();
+      return;
+    }
+    stream.once('close', resolve);
+    stream.end();
+  });
+}
+
+async function run(job, conn) {
+  let stdout;
+  let stderr;
+  try {
+    stdout = await openStream(job.stdout);
+    stderr = await openStream(job.stderr);
+  } catch (err) {
+    if (stdout) {
+      stdout.destroy();
+    }
+    reply(conn, { error: `cannot open output: ${err.message}` });
+    conn.end();
+    return;
+  }
+
+  const child = takeSpare();
+  running.add(child);
+  const closed = new Promise((resolve) => {
+    child.once('close', (code, signal) => resolve(
+      code !== null ? code : -(os.constants.signals[signal] || 9)));
+  });
+  child.stdout.pipe(stdout);
+  child.stderr.pipe(stderr);
+
+  const prepared = await Promise.race([
+    new Promise((resolve) => {
+      child.once('message', resolve);
+      child.send(job);
+    }),
+    closed.then(() => ({ error: 'job process exited' })),
+  ]);
+  if (!prepared.ready) {
+    killGroup(child);
+    await closed;
+    running.delete(child);
+    await Promise.all([closeStream(stdout), closeStream(stderr)]);
+    reply(conn, { error: prepared.error });
+    conn.end();
+    return;
+  }
+
+  reply(conn, { started: true, pid: child.pid, pgid: child.pid });
+  // The client half-closes the connection to kill the job
+  conn.once('end', () => killGroup(child));
+
+  const code = await closed;
+  running.delete(child);
+  await Promise.all([closeStream(stdout), closeStream(stderr)]);
+  reply(conn, { exit: code });
+  conn.end();
+}
+
+function runServer() {
+  const server = net.createServer({ allowHalfOpen: true }, (conn) => {
+    let buffer = '';
+    conn.setEncoding('utf8');
+    conn.on('error', () => conn.destroy());
+    conn.on('data', function onData(chunk) {
+      buffer += chunk;
+      const newline = buffer.indexOf('\n');
+      if (newline < 0) {
+        return;
+      }
+      conn.removeListener('data', onData);
+      let job;
+      try {
+        job = JSON.parse(buffer.slice(0, newline));
+      } catch (err) {
+        reply(conn, { error: `bad job: ${err.message}` });
+        conn.end();
+        return;
+      }
+      run(job, conn);
+    });
+  });
+
+  startSpare();
+  server.listen(process.argv[2], () => {
+    process.stdout.write('ready\n');
+  });
+
+  // AIRun closes our stdin when it no longer needs the server
+  process.stdin.on('end', () => {
+    for (const child of [spare, ...running]) {
+      if (child) {
+        killGroup(child);
+      }
+    }
+    process.exit(0);
+  });
+  process.stdin.resume();
+}
+
+if (process.argv[2] === CHILD_FLAG) {
+  runChild();
+} else {
+  runServer();
+}
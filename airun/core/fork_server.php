@@ -0,0 +1,252 @@
+<?php
+/*
+ * PHP fork server for AIRun's PHPRunner.
+ *
+ * Started as `php fork_server.php <socket path>` and kept alive between
+ * runs, so scripts skip runtime boot. Each connection carries one job as
+ * a JSON line {"script", "args", "cwd", "env", "stdout", "stderr"}, where
+ * stdout/stderr are FIFO paths opened by AIRun. The server forks a child
+ * per job; the child points its stdout and stderr at the FIFOs and
+ * includes the script, with any shebang line stripped before it is
+ * compiled.
+ *
+ * Replies are JSON lines: {"started": true, "pid": N, "pgid": N} from the
+ * child once its output is redirected, then {"exit": code} from the server.
+ * Half-closing the connection kills the job.
+ *
+ * Needs the pcntl, posix and FFI extensions (FFI for dup2); without them
+ * the server reports "unavailable" and AIRun runs PHP as a subprocess.
+ */
+
+function airun_reply($conn, array $message)
+{
+    @fwrite($conn, json_encode($message) . "\n");
+}
+
+function airun_redirect_output(array $job)
+{
+    $libc = FFI::cdef('int open(const char *path, int flags, ...); '
+        . 'int dup2(int oldfd, int newfd); int close(int fd);');
+    $targets = [
+        0 => ['/dev/null', 0],        // O_RDONLY; our stdin is AIRun's lifeline
+        1 => [$job['stdout'], 1],     // O_WRONLY
+        2 => [$job['stderr'], 1],
+    ];
+    foreach ($targets as $target => list($path, $flags)) {
+        $fd = $libc->open($path, $flags);
+        if ($fd < 0 || $libc->dup2($fd, $target) < 0) {
+            return false;
+        }
+        $libc->close($fd);
+    }
+    return true;
+}
+
+/*
+ * Serves the job's script with its shebang line taken out, so that
+ * `require` does not print it. It stands in for the file:// wrapper for
+ * that one include only, so __FILE__ and __DIR__ keep the real path; the
+ * built-in wrapper is restored as soon as the script is opened.
+ */
+final class AirunShebangStream
+{
+    public $context;
+    private $code = '';
+    private $position = 0;
+
+    public static function wrap()
+    {
+        stream_wrapper_unregister('file');
+        stream_wrapper_register('file', self::class);
+    }
+
+    public static function unwrap()
+    {
+        @stream_wrapper_restore('file');
+    }
+
+    public static function strip($code)
+    {
+        if (strncmp($code, '#!', 2) !== 0) {
+            return $code;
+        }
+        $newline = strpos($code, "\n");
+        $rest = $newline === false ? '' : substr($code, $newline + 1);
+        // Open PHP on the shebang's line instead, so line numbers stay right
+        if (preg_match('/^<\?php\s/i', $rest)) {
+            return '<?php' . "\n" . substr($rest, 5);
+        }
+        return $rest;
+    }
+
+    public function stream_open($path, $mode, $options, &$openedPath)
+    {
+        self::unwrap();
+        $code = ($options & STREAM_REPORT_ERRORS)
+            ? file_get_contents($path) : @file_get_contents($path);
+        if ($code === false) {
+            return false;
+        }
+        $this->code = self::strip($code);
+        $openedPath = $path;
+        return true;
+    }
+
+    public function stream_read($count)
+    {
+        $chunk = (string) substr($this->code, $this->position, $count);
+        $this->position += strlen($chunk);
+        return $chunk;
+    }
+
+    public function stream_eof()
+    {
+        return $this->position >= strlen($this->code);
+    }
+
+    public function stream_stat()
+    {
+        return ['size' => strlen($this->code)];
+    }
+
+    public function stream_set_option($option, $arg1, $arg2)
+    {
+        return false;
+    }
+
+    public function url_stat($path, $flags)
+    {
+        self::unwrap();
+        $stat = @stat($path);
+        self::wrap();
+        return $stat;
+    }
+}
+
+function airun_run_child($server, $conn, array $job)
+{
+    fclose($server);
+    posix_setsid();
+    pcntl_signal(SIGINT, SIG_DFL);
+    pcntl_signal(SIGTERM, SIG_DFL);
+
+    if (!airun_redirect_output($job) || !@chdir($job['cwd'])) {
+        airun_reply($conn, ['error' => 'cannot prepare job']);
+        exit(1);
+    }
+
+    foreach (array_keys(getenv()) as $name) {
+        putenv($name);
+    }
+    foreach ($job['env'] as $name => $value) {
+        putenv("$name=$value");
+    }
+
+    $argv = array_merge([$job['script']], $job['args']);
+    $_ENV = $job['env'];
+    $_SERVER = array_merge($_SERVER, $job['env'], [
+        'argv' => $argv,
+        'argc' => count($argv),
+        'PHP_SELF' => $job['script'],
+        'SCRIPT_NAME' => $job['script'],
+        'SCRIPT_FILENAME' => $job['script'],
+        'PWD' => $job['cwd'],
+    ]);
+
+    // The child leads its own session, so its pid is also its process group
+    airun_reply($conn, ['started' => true, 'pid' => getmypid(), 'pgid' => getmypid()]);
+    fclose($conn);
+    return $argv;
+}
+
+$airunServer = @stream_socket_server('unix://' . $argv[1], $errno, $errstr);
+if (!function_exists('pcntl_fork') || !function_exists('posix_setsid')
+        || !class_exists('FFI') || $airunServer === false) {
+    fwrite(STDOUT, "unavailable\n");
+    exit(1);
+}
+try {
+    FFI::cdef('int dup2(int oldfd, int newfd);');
+} catch (Throwable $e) {
+    fwrite(STDOUT, "unavailable\n");
+    exit(1);
+}
+fwrite(STDOUT, "ready\n");
+
+$airunJobs = [];     // child pid => connection
+$airunWatched = [];  // child pid => connection still open for reading
+while (true) {
+    $read = [$airunServer, STDIN];
+    foreach ($airunWatched as $conn) {
+        $read[] = $conn;
+    }
+    $write = $except = null;
+    if (@stream_select($read, $write, $except, 0, 50000) === false) {
+        $read = [];
+    }
+
+    foreach ($read as $stream) {
+        if ($stream === STDIN) {
+            // AIRun closes our stdin when it no longer needs the server
+            if (fread(STDIN, 8192) === '' && feof(STDIN)) {
+                foreach (array_keys($airunJobs) as $pid) {
+                    posix_kill(-$pid, SIGKILL);
+                }
+                exit(0);
+            }
+        } elseif ($stream === $airunServer) {
+            $conn = @stream_socket_accept($airunServer, 0);
+            if ($conn === false) {
+                continue;
+            }
+            $job = json_decode((string) fgets($conn), true);
+            if (!is_array($job)) {
+                airun_reply($conn, ['error' => 'bad job']);
+                fclose($conn);
+                continue;
+            }
+            $pid = pcntl_fork();
+            if ($pid === 0) {
+                $argv = airun_run_child($airunServer, $conn, $job);
+                $argc = count($argv);
+                unset($airunServer, $airunJobs, $airunWatched, $read, $write, $except,
+                    $stream, $conn, $pid, $status, $errno, $errstr);
+
+                // A plain `php script` skips the shebang line; include does not
+                $airunScript = $job['script'];
+                unset($job);
+                AirunShebangStream::wrap();
+                require $airunScript;
+                exit(0);
+            }
+            if ($pid < 0) {
+                airun_reply($conn, ['error' => 'fork failed']);
+                fclose($conn);
+                continue;
+            }
+            $airunJobs[$pid] = $conn;
+            $airunWatched[$pid] = $conn;
+        } else {
+            // Readable job connection: the client half-closed it to kill the job
+            if (fread($stream, 8192) === '' && feof($stream)) {
+                $pid = array_search($stream, $airunWatched, true);
+                if ($pid !== false) {
+                    unset($airunWatched[$pid]);
+                    posix_kill(-$pid, SIGKILL);
+                }
+            }
+        }
+    }
+
+    while (($pid = pcntl_waitpid(-1, $status, WNOHANG)) > 0) {
+        if (!isset($airunJobs[$pid])) {
+            continue;
+        }
+        $code = pcntl_wifsignaled($status)
+            ? -pcntl_wtermsig($status)
+            : pcntl_wexitstatus($status);
+        airun_reply($airunJobs[$pid], ['exit' => $code]);
+        fclose($airunJobs[$pid]);
+        unset($airunJobs[$pid], $airunWatched[$pid]);
+    }
+}
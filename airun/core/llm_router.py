@@ -1,12 +1,15 @@
 """
 LLM Router for managing multiple AI providers.
 """
+import asyncio
 import logging
+import threading
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional, List
 from dataclasses import dataclass
 
 from .detector import ScriptType
+from .provider_health import HEALTH_PROBE, CircuitBreaker, ProviderHealthRegistry
 
 logger = logging.getLogger(__name__)
 
@@ -33,9 +36,17 @@ class CodeFix:
     alternative_fixes: Optional[List[str]] = None
 
 
+class ProviderUnavailable(ValueError):
+    """Raised when a provider may not be used right now."""
+
+
 class LLMProvider(ABC):
     """Abstract base class for LLM providers."""
 
+    # Keep-alive connections per provider, and seconds to wait for a connection
+    DEFAULT_POOL_SIZE = 4
+    DEFAULT_CONNECT_TIMEOUT = 5
+
     def __init__(self, config: Dict[str, Any]):
         """
         Initialize the LLM provider.
@@ -45,6 +56,97 @@ class LLMProvider(ABC):
         """
         self.config = config
         self.name = self.__class__.__name__.lower().replace('provider', '')
+        self.timeout = config.get('timeout', 30)
+        self.connect_timeout = config.get('connect_timeout', self.DEFAULT_CONNECT_TIMEOUT)
+        self.pool_size = config.get('pool_size', self.DEFAULT_POOL_SIZE)
+        self._client: Any = None
+        self._client_lock = threading.Lock()
+        # Async clients are bound to the event loop they were created on
+        self._async_client: Any = None
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def client(self) -> Any:
+        """
+        HTTP client shared by all of this provider's requests.
+
+        It is created on first use and keeps its connections alive, so only
+        the first request pays for the TCP and TLS handshakes.
+        """
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = self._create_client()
+        return self._client
+
+    def _create_client(self) -> Any:
+        """Create the provider's pooled HTTP client."""
+        raise NotImplementedError(f"{self.__class__.__name__} has no HTTP client")
+
+    def _create_http_client(self) -> Any:
+        """Create a pooled ``httpx`` client for providers built on an HTTP SDK."""
+        import httpx
+        return httpx.Client(
+            limits=httpx.Limits(max_connections=self.pool_size,
+                                max_keepalive_connections=self.pool_size),
+            timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout)
+        )
+
+    @property
+    def async_client(self) -> Any:
+        """
+        Async HTTP client shared by this provider's requests on the running loop.
+
+        A new client is created when called from a different event loop,
+        since connections cannot move between loops.
+
+        Raises:
+            ImportError: If the async client's dependencies are not installed
+        """
+        loop = asyncio.get_running_loop()
+        with self._client_lock:
+            if self._async_client is None or self._async_loop is not loop:
+                self._async_client = self._create_async_client()
+                self._async_loop = loop
+            return self._async_client
+
+    def _create_async_client(self) -> Any:
+        """Create the provider's pooled async HTTP client."""
+        raise NotImplementedError(f"{self.__class__.__name__} has no async HTTP client")
+
+    def _create_async_http_client(self) -> Any:
+        """Create a pooled ``httpx`` async client, the async twin of ``_create_http_client``."""
+        import httpx
+        return httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=self.pool_size,
+                                max_keepalive_connections=self.pool_size),
+            timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout)
+        )
+
+    def close(self) -> None:
+        """Close the HTTP client and its connections; the next request opens a new one."""
+        with self._client_lock:
+            client, self._client = self._client, None
+            # Async clients can only be closed on their loop, see ``aclose``
+            self._async_client = self._async_loop = None
+        if client is not None and hasattr(client, 'close'):
+            try:
+                client.close()
+            except Exception as e:
+                logger.debug(f"Closing {self.name} client failed: {e}")
+
+    async def aclose(self) -> None:
+        """Close the async client, if it belongs to the running loop, and the sync client."""
+        loop = asyncio.get_running_loop()
+        with self._client_lock:
+            client = self._async_client if self._async_loop is loop else None
+            self._async_client = self._async_loop = None
+        if client is not None:
+            try:
+                await (client.aclose() if hasattr(client, 'aclose') else client.close())
+            except Exception as e:
+                logger.debug(f"Closing {self.name} async client failed: {e}")
+        self.close()
 
     @abstractmethod
     def generate_fix(self, error_context: ErrorContext) -> CodeFix:
@@ -64,11 +166,52 @@ class LLMProvider(ABC):
         """
         Check if the provider is available and properly configured.
 
+        This contacts the provider, so routing relies on the health registry
+        instead of calling it before every request.
+
         Returns:
             True if provider can be used
         """
         pass
 
+    def is_configured(self) -> bool:
+        """
+        Check the provider's configuration without contacting it.
+
+        Returns:
+            True if the provider has what it needs to make requests
+        """
+        return True
+
+    async def _generate_fix_in_executor(self, error_context: ErrorContext) -> CodeFix:
+        """Run the blocking ``generate_fix`` in the loop's default executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.generate_fix, error_context)
+
+    def _get_async_client_or_none(self) -> Any:
+        """Get ``async_client``, or None when its dependencies are not installed."""
+        try:
+            return self.async_client
+        except ImportError as e:
+            logger.debug(f"No async client for {self.name}, using a thread: {e}")
+            return None
+
+    async def generate_fix_async(self, error_context: ErrorContext) -> CodeFix:
+        """
+        Generate a code fix without blocking the event loop.
+
+        Runs ``generate_fix`` in the loop's default executor, one thread per
+        concurrent request. Providers with a native async client override
+        this and only fall back here when its dependencies are missing.
+
+        Args:
+            error_context: Information about the error and code
+
+        Returns:
+            CodeFix with suggested solution
+        """
+        return await self._generate_fix_in_executor(error_context)
+
     def get_model_for_language(self, script_type: ScriptType) -> str:
         """
         Get the appropriate model for a given script type.
@@ -136,47 +279,75 @@ class OllamaProvider(LLMProvider):
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         self.base_url = config.get('base_url', 'http://localhost:11434')
-        self.timeout = config.get('timeout', 30)
+
+    def _create_client(self) -> Any:
+        """Create a session whose connection pool holds ``pool_size`` connections."""
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
 
     def is_available(self) -> bool:
         """Check if Ollama service is available."""
         try:
-            import requests
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
+            response = self.client.get(f"{self.base_url}/api/tags",
+                                       timeout=(self.connect_timeout, 5))
             return response.status_code == 200
         except Exception as e:
             logger.debug(f"Ollama not available: {e}")
             return False
 
+    def _create_async_client(self) -> Any:
+        """Create an ``httpx`` async client; requires httpx."""
+        return self._create_async_http_client()
+
+    def _build_request(self, error_context: ErrorContext) -> Dict[str, Any]:
+        """Build the /api/generate request body."""
+        return {
+            "model": self.get_model_for_language(error_context.script_type),
+            "prompt": self.build_prompt(error_context),
+            "stream": False
+        }
+
+    def _handle_response(self, response: Any) -> CodeFix:
+        """Turn an /api/generate response into a CodeFix."""
+        if response.status_code == 200:
+            result = response.json()
+            return self._parse_response(result.get('response', ''))
+        raise RuntimeError(f"Ollama API error: {response.status_code}")
+
     def generate_fix(self, error_context: ErrorContext) -> CodeFix:
         """Generate fix using Ollama."""
-        if not self.is_available():
-            raise RuntimeError("Ollama service is not available")
-
         import requests
 
-        model = self.get_model_for_language(error_context.script_type)
-        prompt = self.build_prompt(error_context)
-
         try:
-            response = requests.post(
+            response = self.client.post(
                 f"{self.base_url}/api/generate",
-                json={
-                    "model": model,
-                    "prompt": prompt,
-                    "stream": False
-                },
-                timeout=self.timeout
+                json=self._build_request(error_context),
+                timeout=(self.connect_timeout, self.timeout)
             )
+        except requests.RequestException as e:
+            raise RuntimeError(f"Ollama request failed: {e}")
+        return self._handle_response(response)
 
-            if response.status_code == 200:
-                result = response.json()
-                return self._parse_response(result.get('response', ''))
-            else:
-                raise RuntimeError(f"Ollama API error: {response.status_code}")
+    async def generate_fix_async(self, error_context: ErrorContext) -> CodeFix:
+        """Generate fix using Ollama on the async client, or a thread without httpx."""
+        client = self._get_async_client_or_none()
+        if client is None:
+            return await self._generate_fix_in_executor(error_context)
 
-        except requests.RequestException as e:
+        import httpx
+
+        try:
+            response = await client.post(f"{self.base_url}/api/generate",
+                                         json=self._build_request(error_context))
+        except httpx.HTTPError as e:
             raise RuntimeError(f"Ollama request failed: {e}")
+        return self._handle_response(response)
 
     def _parse_response(self, response: str) -> CodeFix:
         """Parse Ollama response into CodeFix."""
@@ -227,22 +398,31 @@ class OpenAIProvider(LLMProvider):
         super().__init__(config)
         self.api_key = config.get('api_key')
         self.model = config.get('model', 'gpt-4')
-        self.timeout = config.get('timeout', 30)
+
+    def _create_client(self) -> Any:
+        """Create the OpenAI client on a pooled HTTP connection."""
+        import openai
+        return openai.OpenAI(api_key=self.api_key, timeout=self.timeout,
+                             http_client=self._create_http_client())
+
+    def _create_async_client(self) -> Any:
+        """Create the async OpenAI client on a pooled ``httpx`` async client."""
+        import openai
+        return openai.AsyncOpenAI(api_key=self.api_key, timeout=self.timeout,
+                                  http_client=self._create_async_http_client())
+
+    def is_configured(self) -> bool:
+        """OpenAI needs an API key."""
+        return bool(self.api_key)
 
     def is_available(self) -> bool:
         """Check if OpenAI API is available."""
-        if not self.api_key:
+        if not self.is_configured():
             return False
 
         try:
-            import openai
-            client = openai.OpenAI(api_key=self.api_key)
-            # Try a simple completion to test API
-            client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": "test"}],
-                max_tokens=1
-            )
+            # Looking up the model is free, unlike a test completion
+            self.client.models.retrieve(self.model)
             return True
         except Exception as e:
             logger.debug(f"OpenAI not available: {e}")
@@ -250,31 +430,48 @@ class OpenAIProvider(LLMProvider):
 
     def generate_fix(self, error_context: ErrorContext) -> CodeFix:
         """Generate fix using OpenAI."""
-        if not self.is_available():
-            raise RuntimeError("OpenAI API is not available")
+        if not self.is_configured():
+            raise RuntimeError("OpenAI API key is not configured")
 
         try:
-            import openai
-            client = openai.OpenAI(api_key=self.api_key)
-
-            prompt = self.build_prompt(error_context)
-
-            response = client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are an expert programmer who fixes code errors."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.1,
-                max_tokens=2000
-            )
+            response = self.client.chat.completions.create(
+                **self._build_request(error_context))
+            content = response.choices[0].message.content
+            return self._parse_response(content)
+
+        except Exception as e:
+            raise RuntimeError(f"OpenAI request failed: {e}")
 
+    async def generate_fix_async(self, error_context: ErrorContext) -> CodeFix:
+        """Generate fix using the async OpenAI client, or a thread without it."""
+        if not self.is_configured():
+            raise RuntimeError("OpenAI API key is not configured")
+
+        client = self._get_async_client_or_none()
+        if client is None:
+            return await self._generate_fix_in_executor(error_context)
+
+        try:
+            response = await client.chat.completions.create(
+                **self._build_request(error_context))
             content = response.choices[0].message.content
             return self._parse_response(content)
 
         except Exception as e:
             raise RuntimeError(f"OpenAI request failed: {e}")
 
+    def _build_request(self, error_context: ErrorContext) -> Dict[str, Any]:
+        """Build the chat completion arguments."""
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": "You are an expert programmer who fixes code errors."},
+                {"role": "user", "content": self.build_prompt(error_context)}
+            ],
+            "temperature": 0.1,
+            "max_tokens": 2000
+        }
+
     def _parse_response(self, response: str) -> CodeFix:
         """Parse OpenAI response into CodeFix."""
         # Similar parsing logic as Ollama
@@ -294,22 +491,40 @@ class ClaudeProvider(LLMProvider):
         super().__init__(config)
         self.api_key = config.get('api_key')
         self.model = config.get('model', 'claude-3-sonnet-20240229')
-        self.timeout = config.get('timeout', 30)
+
+    def _create_client(self) -> Any:
+        """Create the Anthropic client on a pooled HTTP connection."""
+        import anthropic
+        return anthropic.Anthropic(api_key=self.api_key, timeout=self.timeout,
+                                   http_client=self._create_http_client())
+
+    def _create_async_client(self) -> Any:
+        """Create the async Anthropic client on a pooled ``httpx`` async client."""
+        import anthropic
+        return anthropic.AsyncAnthropic(api_key=self.api_key, timeout=self.timeout,
+                                        http_client=self._create_async_http_client())
+
+    def is_configured(self) -> bool:
+        """Claude needs an API key."""
+        return bool(self.api_key)
 
     def is_available(self) -> bool:
         """Check if Claude API is available."""
-        if not self.api_key:
+        if not self.is_configured():
             return False
 
         try:
-            import anthropic
-            client = anthropic.Anthropic(api_key=self.api_key)
-            # Test API availability
-            client.messages.create(
-                model=self.model,
-                max_tokens=1,
-                messages=[{"role": "user", "content": "test"}]
-            )
+            client = self.client
+            if hasattr(client, 'models'):
+                # Looking up the model is free, unlike a test message
+                client.models.retrieve(self.model)
+            else:
+                # SDKs without the models API
+                client.messages.create(
+                    model=self.model,
+                    max_tokens=1,
+                    messages=[{"role": "user", "content": "test"}]
+                )
             return True
         except Exception as e:
             logger.debug(f"Claude not available: {e}")
@@ -317,27 +532,42 @@ class ClaudeProvider(LLMProvider):
 
     def generate_fix(self, error_context: ErrorContext) -> CodeFix:
         """Generate fix using Claude."""
-        if not self.is_available():
-            raise RuntimeError("Claude API is not available")
+        if not self.is_configured():
+            raise RuntimeError("Claude API key is not configured")
 
         try:
-            import anthropic
-            client = anthropic.Anthropic(api_key=self.api_key)
+            response = self.client.messages.create(**self._build_request(error_context))
+            content = response.content[0].text
+            return self._parse_response(content)
 
-            prompt = self.build_prompt(error_context)
+        except Exception as e:
+            raise RuntimeError(f"Claude request failed: {e}")
 
-            response = client.messages.create(
-                model=self.model,
-                max_tokens=2000,
-                messages=[{"role": "user", "content": prompt}]
-            )
+    async def generate_fix_async(self, error_context: ErrorContext) -> CodeFix:
+        """Generate fix using the async Anthropic client, or a thread without it."""
+        if not self.is_configured():
+            raise RuntimeError("Claude API key is not configured")
 
+        client = self._get_async_client_or_none()
+        if client is None:
+            return await self._generate_fix_in_executor(error_context)
+
+        try:
+            response = await client.messages.create(**self._build_request(error_context))
             content = response.content[0].text
             return self._parse_response(content)
 
         except Exception as e:
             raise RuntimeError(f"Claude request failed: {e}")
 
+    def _build_request(self, error_context: ErrorContext) -> Dict[str, Any]:
+        """Build the message creation arguments."""
+        return {
+            "model": self.model,
+            "max_tokens": 2000,
+            "messages": [{"role": "user", "content": self.build_prompt(error_context)}]
+        }
+
     def _parse_response(self, response: str) -> CodeFix:
         """Parse Claude response into CodeFix."""
         # Similar parsing logic as Ollama
@@ -350,7 +580,19 @@ class ClaudeProvider(LLMProvider):
 
 
 class LLMRouter:
-    """Routes requests to appropriate LLM providers."""
+    """
+    Routes requests to appropriate LLM providers.
+
+    Routing never contacts a provider just to decide whether to use it.
+    Each provider has a circuit breaker fed by the outcome of real
+    requests: after repeated failures its circuit opens and requests skip
+    it immediately for a growing backoff, going straight to the fallbacks.
+    A health registry also records every outcome, and a failed live check
+    takes a provider out of routing until its status expires. Live checks
+    are made only by ``check_provider``, ``test_providers`` and
+    ``validate_configuration``, and by the optional background refresh
+    (``llm_routing.health_refresh_interval``).
+    """
 
     def __init__(self, config: Any):
         """
@@ -361,8 +603,18 @@ class LLMRouter:
         """
         self.config = config
         self.providers: Dict[str, LLMProvider] = {}
+        routing = getattr(config, 'llm_routing', None)
+        self.routing: Dict[str, Any] = routing if isinstance(routing, dict) else {}
+        self.health = ProviderHealthRegistry(
+            ttl=self.routing.get('health_ttl', ProviderHealthRegistry.DEFAULT_TTL)
+        )
+        self.breakers: Dict[str, CircuitBreaker] = {}
         self._initialize_providers()
 
+        refresh_interval = self.routing.get('health_refresh_interval', 0)
+        if refresh_interval and self.providers:
+            self.health.start_refresh(self.providers, refresh_interval)
+
     def _initialize_providers(self) -> None:
         """Initialize available LLM providers."""
         provider_configs = getattr(self.config, 'llm_providers', {})
@@ -392,10 +644,68 @@ class LLMRouter:
             except Exception as e:
                 logger.warning(f"Failed to initialize Claude provider: {e}")
 
+    def _resolve_provider_name(self, provider_name: Optional[str]) -> str:
+        """Name of the given provider, or of the configured default."""
+        if provider_name is None:
+            # Use default provider from config
+            default_llm = getattr(self.config, 'default_llm', 'ollama:codellama')
+            provider_name = default_llm.split(':')[0]
+        return provider_name
+
     def get_provider(self, provider_name: Optional[str] = None) -> LLMProvider:
         """
         Get a specific LLM provider.
 
+        Only the provider's configuration and cached health are consulted;
+        nothing is sent to the provider.
+
+        Args:
+            provider_name: Name of the provider. If None, uses default.
+
+        Returns:
+            LLM provider instance
+
+        Raises:
+            ValueError: If provider not found or known to be unavailable
+        """
+        provider_name = self._resolve_provider_name(provider_name)
+
+        if provider_name not in self.providers:
+            raise ProviderUnavailable(f"Unknown LLM provider: {provider_name}")
+
+        provider = self.providers[provider_name]
+        health = self.health.get(provider_name)
+        if (not provider.is_configured()
+                or (health is not None and not health.available and health.source == HEALTH_PROBE)):
+            raise ProviderUnavailable(f"LLM provider '{provider_name}' is not available")
+
+        breaker = self.get_breaker(provider_name)
+        if breaker.is_open():
+            raise ProviderUnavailable(f"LLM provider '{provider_name}' is not available "
+                             f"(circuit open, retry in {breaker.snapshot()['retry_in']:.0f}s)")
+
+        return provider
+
+    def get_breaker(self, provider_name: str) -> CircuitBreaker:
+        """
+        Get a provider's circuit breaker, configured by ``llm_routing``.
+
+        Args:
+            provider_name: Name of the provider
+
+        Returns:
+            The provider's circuit breaker
+        """
+        breaker = self.breakers.get(provider_name)
+        if breaker is None:
+            breaker = self.breakers.setdefault(provider_name,
+                                               CircuitBreaker.from_config(self.routing))
+        return breaker
+
+    def check_provider(self, provider_name: Optional[str] = None) -> LLMProvider:
+        """
+        Get a provider after checking it live, recording the result.
+
         Args:
             provider_name: Name of the provider. If None, uses default.
 
@@ -405,38 +715,107 @@ class LLMRouter:
         Raises:
             ValueError: If provider not found or not available
         """
-        if provider_name is None:
-            # Use default provider from config
-            default_llm = getattr(self.config, 'default_llm', 'ollama:codellama')
-            provider_name = default_llm.split(':')[0]
+        provider_name = self._resolve_provider_name(provider_name)
 
         if provider_name not in self.providers:
-            raise ValueError(f"Unknown LLM provider: {provider_name}")
+            raise ProviderUnavailable(f"Unknown LLM provider: {provider_name}")
 
         provider = self.providers[provider_name]
-        if not provider.is_available():
-            raise ValueError(f"LLM provider '{provider_name}' is not available")
+        if not self.health.probe(provider_name, provider):
+            raise ProviderUnavailable(f"LLM provider '{provider_name}' is not available")
 
         return provider
 
     def get_available_providers(self) -> List[str]:
         """
-        Get list of available LLM providers.
+        Get list of LLM providers that may be used.
 
         Returns:
-            List of provider names that are currently available
+            Names of providers that ``get_provider`` would return, found
+            without contacting any of them
         """
         available = []
-        for name, provider in self.providers.items():
-            if provider.is_available():
-                available.append(name)
+        for name in self.providers:
+            try:
+                self.get_provider(name)
+            except ProviderUnavailable:
+                continue
+            available.append(name)
         return available
 
+    def _candidates(self, provider_name: Optional[str]) -> List[str]:
+        """The requested or default provider, then the other usable providers."""
+        primary = self._resolve_provider_name(provider_name)
+        return [primary] + [name for name in self.get_available_providers() if name != primary]
+
+    def _generate(self, provider_name: str, error_context: ErrorContext) -> CodeFix:
+        """
+        Request a fix from one provider, recording the outcome.
+
+        Raises:
+            ProviderUnavailable: If the provider may not be used right now
+            Exception: Whatever the provider raised
+        """
+        provider = self.get_provider(provider_name)
+        breaker = self.get_breaker(provider_name)
+        if not breaker.allow_request():
+            raise ProviderUnavailable(
+                f"LLM provider '{provider_name}' is not available (circuit open)")
+
+        logger.info(f"Using {provider.name} to fix {error_context.script_type.value} error")
+        try:
+            fix = provider.generate_fix(error_context)
+        except Exception as e:
+            breaker.record_failure()
+            self.health.record_failure(provider_name, e)
+            raise
+        except BaseException:
+            breaker.abandon()
+            raise
+        breaker.record_success()
+        self.health.record_success(provider_name)
+        return fix
+
+    async def _generate_async(self, provider_name: str,
+                              error_context: ErrorContext) -> CodeFix:
+        """Async counterpart of ``_generate``."""
+        provider = self.get_provider(provider_name)
+        breaker = self.get_breaker(provider_name)
+        if not breaker.allow_request():
+            raise ProviderUnavailable(
+                f"LLM provider '{provider_name}' is not available (circuit open)")
+
+        logger.info(f"Using {provider.name} to fix {error_context.script_type.value} error")
+        try:
+            fix = await provider.generate_fix_async(error_context)
+        except Exception as e:
+            breaker.record_failure()
+            self.health.record_failure(provider_name, e)
+            raise
+        except BaseException:
+            # Cancelled; not the provider's fault
+            breaker.abandon()
+            raise
+        breaker.record_success()
+        self.health.record_success(provider_name)
+        return fix
+
+    @staticmethod
+    def _all_failed(attempted: bool, errors: List[str]) -> RuntimeError:
+        """Error raised when no provider produced a fix."""
+        if not attempted:
+            return RuntimeError("No LLM providers are available")
+        return RuntimeError(f"All LLM providers failed to generate a fix ({'; '.join(errors)})")
+
     def fix_error(self, error_context: ErrorContext,
                   provider_name: Optional[str] = None) -> CodeFix:
         """
         Fix an error using the specified or default LLM provider.
 
+        If that provider cannot be used or its request fails, the other
+        usable providers are tried in turn. Providers whose circuit is
+        open are skipped without being contacted.
+
         Args:
             error_context: Context information about the error
             provider_name: Optional provider to use
@@ -447,67 +826,116 @@ class LLMRouter:
         Raises:
             RuntimeError: If no providers are available or fix fails
         """
-        try:
-            provider = self.get_provider(provider_name)
-            logger.info(f"Using {provider.name} to fix {error_context.script_type.value} error")
-
-            fix = provider.generate_fix(error_context)
+        candidates = self._candidates(provider_name)
+        attempted = False
+        errors = []
+        for index, name in enumerate(candidates):
+            try:
+                fix = self._generate(name, error_context)
+            except ProviderUnavailable as e:
+                logger.debug(f"Skipping provider {name}: {e}")
+                errors.append(f"{name}: {e}")
+                continue
+            except Exception as e:
+                attempted = True
+                logger.warning(f"Provider {name} failed: {e}")
+                errors.append(f"{name}: {e}")
+                continue
 
+            if index > 0:
+                logger.info(f"Fallback provider {name} succeeded")
             logger.info(f"Generated fix with confidence {fix.confidence:.2f}")
             return fix
 
-        except ValueError as e:
-            # Try fallback providers
-            available_providers = self.get_available_providers()
-            if not available_providers:
-                raise RuntimeError("No LLM providers are available")
+        raise self._all_failed(attempted, errors)
 
-            logger.warning(f"Primary provider failed: {e}. Trying fallback providers.")
+    async def fix_error_async(self, error_context: ErrorContext,
+                              provider_name: Optional[str] = None) -> CodeFix:
+        """
+        Async counterpart of ``fix_error``, with the same fallback order.
 
-            for fallback_provider in available_providers:
-                try:
-                    provider = self.get_provider(fallback_provider)
-                    fix = provider.generate_fix(error_context)
-                    logger.info(f"Fallback provider {fallback_provider} succeeded")
-                    return fix
-                except Exception as fallback_error:
-                    logger.debug(f"Fallback provider {fallback_provider} failed: {fallback_error}")
-                    continue
+        HTTP providers are awaited on their native ``httpx`` async clients,
+        so concurrent fixes share one loop instead of a thread each. Without
+        httpx (or the provider's SDK) a provider falls back to running its
+        blocking request in the loop's default executor.
 
-            raise RuntimeError("All LLM providers failed to generate a fix")
+        Args:
+            error_context: Context information about the error
+            provider_name: Optional provider to use
+
+        Returns:
+            Code fix suggestion
+
+        Raises:
+            RuntimeError: If no providers are available or fix fails
+        """
+        candidates = self._candidates(provider_name)
+        attempted = False
+        errors = []
+        for index, name in enumerate(candidates):
+            try:
+                fix = await self._generate_async(name, error_context)
+            except ProviderUnavailable as e:
+                logger.debug(f"Skipping provider {name}: {e}")
+                errors.append(f"{name}: {e}")
+                continue
+            except Exception as e:
+                attempted = True
+                logger.warning(f"Provider {name} failed: {e}")
+                errors.append(f"{name}: {e}")
+                continue
+
+            if index > 0:
+                logger.info(f"Fallback provider {name} succeeded")
+            logger.info(f"Generated fix with confidence {fix.confidence:.2f}")
+            return fix
+
+        raise self._all_failed(attempted, errors)
 
     def test_providers(self) -> Dict[str, bool]:
         """
-        Test all configured providers.
+        Test all configured providers live, recording the results.
 
         Returns:
             Dictionary mapping provider names to availability status
         """
-        results = {}
-        for name, provider in self.providers.items():
-            try:
-                results[name] = provider.is_available()
-            except Exception:
-                results[name] = False
-        return results
+        return {name: self.health.probe(name, provider)
+                for name, provider in self.providers.items()}
 
     def get_provider_info(self) -> Dict[str, Dict[str, Any]]:
         """
-        Get information about all providers.
+        Get information about all providers, without contacting them.
 
         Returns:
-            Dictionary with provider information
+            Dictionary with provider information; ``available`` is the
+            cached status, None when unknown or expired
         """
+        health = self.health.snapshot()
         info = {}
         for name, provider in self.providers.items():
             info[name] = {
-                'available': provider.is_available(),
+                'available': self.health.is_available(name),
+                'configured': provider.is_configured(),
+                'health': health.get(name),
+                'circuit': self.get_breaker(name).snapshot(),
                 'config_keys': list(provider.config.keys()),
                 'models': provider.config.get('models', {}),
                 'class': provider.__class__.__name__
             }
         return info
 
+    def close(self) -> None:
+        """Stop the health refresh and close every provider's HTTP client."""
+        self.health.stop_refresh()
+        for provider in self.providers.values():
+            provider.close()
+
+    async def aclose(self) -> None:
+        """Async counterpart of ``close``, also closing async clients on this loop."""
+        self.health.stop_refresh()
+        for provider in self.providers.values():
+            await provider.aclose()
+
     def validate_configuration(self) -> List[str]:
         """
         Validate provider configurations.
@@ -518,11 +946,8 @@ class LLMRouter:
         errors = []
 
         for name, provider in self.providers.items():
-            try:
-                if not provider.is_available():
-                    errors.append(f"Provider '{name}' is not available")
-            except Exception as e:
-                errors.append(f"Provider '{name}' configuration error: {e}")
+            if not self.health.probe(name, provider):
+                errors.append(f"Provider '{name}' is not available")
 
         if not self.providers:
             errors.append("No LLM providers configured")
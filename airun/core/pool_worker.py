@@ -0,0 +1,161 @@
+"""
+Warm Python worker for AIRun's PythonRunner pool.
+
+This file is executed with ``python -c`` by the target interpreter, so it
+must only use the standard library and must not import airun. The worker
+imports the preload modules once, then serves jobs received on a Unix
+socket. Each job runs in a freshly forked child, which keeps scripts
+isolated from each other while skipping interpreter startup.
+
+Protocol, on the socket whose descriptor is ``argv[1]``:
+
+* worker -> airun: ``{"ready": true, "preloaded": [...]}`` once started
+* airun -> worker: a 4-byte big-endian length carrying the job's stdin,
+  stdout and stderr descriptors as SCM_RIGHTS, then that many bytes of
+  JSON ``{"script", "argv0", "args", "cwd", "env"}``
+* worker -> airun: ``{"pid": N}`` after forking, then ``{"returncode": N}``
+
+Messages from the worker are JSON lines.
+"""
+import array
+import json
+import os
+import runpy
+import signal
+import socket
+import struct
+import sys
+import traceback
+
+
+def send(sock, message):
+    sock.sendall((json.dumps(message) + '\n').encode('utf-8'))
+
+
+def recv_exactly(sock, size):
+    data = b''
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            return None
+        data += chunk
+    return data
+
+
+def recv_job(sock):
+    """Receive one job and its descriptors; None once airun has gone."""
+    fds = array.array('i')
+    header, ancdata, _, _ = sock.recvmsg(4, socket.CMSG_LEN(3 * fds.itemsize))
+    if not header:
+        return None, []
+    for level, kind, data in ancdata:
+        if level == socket.SOL_SOCKET and kind == socket.SCM_RIGHTS:
+            fds.frombytes(data[:len(data) - (len(data) % fds.itemsize)])
+    if len(header) < 4:
+        header += recv_exactly(sock, 4 - len(header)) or b''
+    payload = recv_exactly(sock, struct.unpack('>I', header)[0])
+    if payload is None:
+        return None, list(fds)
+    return json.loads(payload.decode('utf-8')), list(fds)
+
+
+def exit_code(code):
+    """Translate a SystemExit code the way the interpreter does."""
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    sys.stderr.write(str(code) + '\n')
+    return 1
+
+
+def run_child(job, fds):
+    """Body of the forked child: become the script and never return."""
+    code = 1
+    try:
+        os.setsid()
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        for target, fd in enumerate(fds):
+            os.dup2(fd, target)
+            os.close(fd)
+
+        # Unbuffered like ``python -u``
+        sys.stdin = os.fdopen(0, 'r', closefd=False)
+        sys.stdout = os.fdopen(1, 'w', buffering=1, closefd=False)
+        sys.stderr = os.fdopen(2, 'w', buffering=1, closefd=False)
+        sys.stdout.reconfigure(write_through=True)
+        sys.stderr.reconfigure(write_through=True)
+
+        script = job['script']
+        os.chdir(job['cwd'])
+        os.environ.clear()
+        os.environ.update(job['env'])
+        sys.argv = [job['argv0']] + job['args']
+        sys.path[0] = os.path.dirname(script)
+
+        try:
+            runpy.run_path(script, run_name='__main__')
+            code = 0
+        except SystemExit as e:
+            code = exit_code(e.code)
+        except BaseException as e:
+            # Hide the worker and runpy frames, as a plain interpreter would
+            tb = e.__traceback__
+            while tb is not None and tb.tb_frame.f_code.co_filename != script:
+                tb = tb.tb_next
+            sys.excepthook(type(e), e.with_traceback(tb), tb)
+            code = 1
+    except BaseException:
+        traceback.print_exc()
+    finally:
+        try:
+            import atexit
+            import threading
+            shutdown = getattr(threading, '_shutdown', None)
+            if shutdown is not None:
+                shutdown()
+            atexit._run_exitfuncs()
+            sys.stdout.flush()
+            sys.stderr.flush()
+        finally:
+            os._exit(code & 0xFF)
+
+
+def main():
+    sock = socket.socket(fileno=int(sys.argv[1]))
+    preloaded = []
+    for name in json.loads(sys.argv[2]):
+        try:
+            __import__(name)
+            preloaded.append(name)
+        except Exception:
+            pass
+    send(sock, {'ready': True, 'preloaded': preloaded})
+
+    while True:
+        job, fds = recv_job(sock)
+        if job is None:
+            for fd in fds:
+                os.close(fd)
+            return
+
+        pid = os.fork()
+        if pid == 0:
+            sock.close()
+            run_child(job, fds)
+        for fd in fds:
+            os.close(fd)
+
+        send(sock, {'pid': pid})
+        _, status = os.waitpid(pid, 0)
+        if os.WIFSIGNALED(status):
+            returncode = -os.WTERMSIG(status)
+        else:
+            returncode = os.WEXITSTATUS(status)
+        send(sock, {'returncode': returncode})
+
+
+if __name__ == '__main__':
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    main()
@@ -0,0 +1,207 @@
+"""
+Interpreter availability probe cache for AIRun.
+"""
+import json
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+PROBE_TIMEOUT = 5
+
+
+@dataclass
+class ExecutableProbe:
+    """Result of checking an interpreter with ``--version``."""
+    available: bool
+    version: Optional[str] = None
+    path: Optional[str] = None
+
+
+def resolve_executable(executable: str) -> Optional[Tuple[str, int]]:
+    """
+    Resolve an executable name to its real path and modification time.
+
+    Args:
+        executable: Name on PATH or path to the interpreter
+
+    Returns:
+        ``(real path, st_mtime_ns)``, or None if it cannot be found
+    """
+    found = shutil.which(executable)
+    if found is None:
+        return None
+    path = os.path.realpath(found)
+    try:
+        return path, os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def probe_executable(executable: str, timeout: float = PROBE_TIMEOUT) -> ExecutableProbe:
+    """
+    Check an interpreter by running ``<executable> --version``.
+
+    Args:
+        executable: Interpreter to check
+        timeout: Seconds to wait for the version output
+
+    Returns:
+        Probe result with the first line of the version output
+    """
+    try:
+        result = subprocess.run(
+            [executable, '--version'],
+            capture_output=True,
+            timeout=timeout
+        )
+    except (subprocess.TimeoutExpired, FileNotFoundError, subprocess.SubprocessError, OSError):
+        return ExecutableProbe(available=False)
+
+    # Some interpreters print their version on stderr
+    version = None
+    for output in (result.stdout, result.stderr):
+        if isinstance(output, bytes) and output.strip():
+            version = output.decode('utf-8', errors='replace').strip().splitlines()[0].strip()
+            break
+    return ExecutableProbe(available=result.returncode == 0, version=version)
+
+
+class ProbeCache:
+    """
+    On-disk cache of interpreter probes.
+
+    Entries are keyed by the resolved interpreter path and its mtime, so
+    upgrading or replacing an interpreter misses automatically while a warm
+    cache answers without spawning anything. Only successful probes are
+    stored: a failure may be transient, such as a timeout on a loaded
+    machine, and must not outlive the run that saw it. The cache is a small JSON file
+    replaced atomically on update; an unreadable file is treated as empty.
+    """
+
+    DEFAULT_FILENAME = "probes.json"
+
+    def __init__(self, cache_dir: Union[str, Path], filename: str = DEFAULT_FILENAME):
+        """
+        Initialize the probe cache.
+
+        Args:
+            cache_dir: Directory holding the cache file
+            filename: Cache file name inside ``cache_dir``
+        """
+        self.path = Path(cache_dir) / filename
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Any) -> Optional["ProbeCache"]:
+        """
+        Create the cache configured by ``probe_cache`` and ``cache_dir``.
+
+        Args:
+            config: Configuration object
+
+        Returns:
+            ProbeCache instance, or None when disabled
+        """
+        cache_dir = getattr(config, 'cache_dir', None)
+        if not getattr(config, 'probe_cache', True) or not isinstance(cache_dir, (str, Path)):
+            return None
+        return cls(cache_dir)
+
+    @staticmethod
+    def _key(path: str, mtime_ns: int) -> str:
+        return f"{path}:{mtime_ns}"
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+            return entries if isinstance(entries, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _store(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix='.probes-')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entries, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.debug(f"Cannot write probe cache {self.path}: {e}")
+
+    def get(self, executable: str) -> Optional[ExecutableProbe]:
+        """
+        Get the cached probe for an interpreter without probing it.
+
+        Args:
+            executable: Interpreter name or path
+
+        Returns:
+            Cached probe, or None on a miss
+        """
+        resolved = resolve_executable(executable)
+        if resolved is None:
+            return None
+        return self._from_entry(self._load().get(self._key(*resolved)), resolved[0])
+
+    @staticmethod
+    def _from_entry(entry: Any, path: str) -> Optional[ExecutableProbe]:
+        """Build a probe from a cache entry; entries of failed probes are ignored."""
+        if not isinstance(entry, dict) or not entry.get('available'):
+            return None
+        return ExecutableProbe(available=True, version=entry.get('version'), path=path)
+
+    def probe(self, executable: str, timeout: float = PROBE_TIMEOUT) -> ExecutableProbe:
+        """
+        Probe an interpreter, answering from the cache when possible.
+
+        An interpreter that cannot be found is reported unavailable without
+        spawning anything. Unavailable results are never cached.
+
+        Args:
+            executable: Interpreter name or path
+            timeout: Seconds to wait for the version output on a miss
+
+        Returns:
+            Probe result
+        """
+        resolved = resolve_executable(executable)
+        if resolved is None:
+            return ExecutableProbe(available=False)
+
+        key = self._key(*resolved)
+        cached = self._from_entry(self._load().get(key), resolved[0])
+        if cached is not None:
+            return cached
+
+        # Probe the name as given; multi-call binaries behave by argv[0]
+        result = probe_executable(executable, timeout)
+        result.path = resolved[0]
+        if not result.available:
+            return result
+        with self._lock:
+            entries = self._load()
+            # Drop entries for older versions of the same interpreter
+            prefix = f"{resolved[0]}:"
+            entries = {k: v for k, v in entries.items() if not k.startswith(prefix)}
+            entries[key] = dict(asdict(result), checked_at=time.time())
+            self._store(entries)
+        return result
+
+    def clear(self) -> None:
+        """Remove every cached probe."""
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.debug(f"Cannot remove probe cache {self.path}: {e}")
@@ -0,0 +1,657 @@
+"""
+Streaming subprocess I/O for AIRun runners.
+"""
+import asyncio
+import codecs
+import io
+import locale
+import logging
+import os
+import selectors
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+import weakref
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, TextIO
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# Receives (stream name, decoded text chunk); stream name is 'stdout' or 'stderr'
+OutputCallback = Callable[[str, str], None]
+
+READ_CHUNK_SIZE = 64 * 1024
+
+# Seconds between ``stop`` checks while waiting on a child
+STOP_POLL_INTERVAL = 0.1
+
+# pump_output outcomes
+PUMP_EXITED = 'exited'
+PUMP_TIMEOUT = 'timeout'
+PUMP_STOPPED = 'stopped'
+
+STREAMING_SUPPORTED = os.name == 'posix'
+RUSAGE_SUPPORTED = hasattr(os, 'wait4')
+RLIMITS_SUPPORTED = resource is not None
+
+# ru_maxrss is in kilobytes on Linux and the BSDs but in bytes on macOS
+_MAXRSS_SCALE = 1 if sys.platform == 'darwin' else 1024
+# ru_inblock/ru_oublock count 512-byte blocks
+_BLOCK_SIZE = 512
+
+
+@dataclass
+class ResourceUsage:
+    """Resources used by a child and the descendants it waited for."""
+    user_time: float
+    system_time: float
+    max_rss: int  # Peak resident set size in bytes
+    voluntary_switches: int
+    involuntary_switches: int
+    read_bytes: int  # Block input, in bytes
+    write_bytes: int  # Block output, in bytes
+
+    @property
+    def cpu_time(self) -> float:
+        """User plus system CPU seconds."""
+        return self.user_time + self.system_time
+
+    @classmethod
+    def from_rusage(cls, rusage: Any) -> "ResourceUsage":
+        """Convert a ``resource.struct_rusage``."""
+        return cls(
+            user_time=rusage.ru_utime,
+            system_time=rusage.ru_stime,
+            max_rss=rusage.ru_maxrss * _MAXRSS_SCALE,
+            voluntary_switches=rusage.ru_nvcsw,
+            involuntary_switches=rusage.ru_nivcsw,
+            read_bytes=rusage.ru_inblock * _BLOCK_SIZE,
+            write_bytes=rusage.ru_oublock * _BLOCK_SIZE,
+        )
+
+
+_resource_usage: "weakref.WeakKeyDictionary[Any, ResourceUsage]" = weakref.WeakKeyDictionary()
+
+
+def _exit_code(status: int) -> int:
+    """Return code in ``subprocess`` convention from a wait status."""
+    if os.WIFSIGNALED(status):
+        return -os.WTERMSIG(status)
+    return os.WEXITSTATUS(status)
+
+
+def wait_process(process: subprocess.Popen, timeout: Optional[float] = None) -> bool:
+    """
+    Wait for a child to exit, recording its resource usage.
+
+    Children started with ``subprocess.Popen`` are reaped with ``os.wait4``
+    so their usage can be read back with ``get_resource_usage``; other
+    handles are waited for normally.
+
+    Args:
+        process: Child to wait for
+        timeout: Seconds to wait, None for no limit
+
+    Returns:
+        True once the child has exited, False if the timeout passed first
+    """
+    if not (RUSAGE_SUPPORTED and isinstance(process, subprocess.Popen)):
+        try:
+            process.wait(timeout=timeout)
+            return True
+        except subprocess.TimeoutExpired:
+            return False
+
+    deadline = None if timeout is None else time.monotonic() + timeout
+    delay = 0.0005
+    while process.returncode is None:
+        try:
+            pid, status, rusage = os.wait4(process.pid, 0 if deadline is None else os.WNOHANG)
+        except ChildProcessError:
+            # Reaped elsewhere; Popen settles the return code itself
+            process.wait()
+            break
+        if pid == process.pid:
+            process.returncode = _exit_code(status)
+            _resource_usage[process] = ResourceUsage.from_rusage(rusage)
+            break
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, STOP_POLL_INTERVAL / 2)
+    return True
+
+
+def get_resource_usage(process: Any) -> Optional[ResourceUsage]:
+    """
+    Get the resource usage recorded when ``wait_process`` reaped a child.
+
+    Args:
+        process: Child handle
+
+    Returns:
+        Resource usage, or None if it was not recorded for this child
+    """
+    try:
+        return _resource_usage.get(process)
+    except TypeError:
+        return None
+
+
+@dataclass(frozen=True)
+class ResourceLimits:
+    """
+    Kernel resource limits applied to a script before it starts.
+
+    A script exceeding ``memory`` fails its allocations; one exceeding
+    ``cpu_time`` gets SIGXCPU, then SIGKILL a second later; one exceeding
+    ``open_files`` cannot open more. ``memory`` caps address space rather
+    than RSS, so runtimes that reserve large ranges up front, such as
+    Node.js, need a generous value.
+    """
+    memory: Optional[int] = None  # RLIMIT_AS, bytes of address space
+    cpu_time: Optional[int] = None  # RLIMIT_CPU, seconds
+    open_files: Optional[int] = None  # RLIMIT_NOFILE
+
+    @classmethod
+    def from_config(cls, runner_config: Any) -> Optional["ResourceLimits"]:
+        """
+        Create limits from the ``limits`` section of a runner's configuration.
+
+        Args:
+            runner_config: Configuration of one runner
+
+        Returns:
+            Resource limits, or None if none are set
+
+        Raises:
+            ValueError: If a limit is not a positive integer
+        """
+        limits = runner_config.get('limits') if isinstance(runner_config, dict) else None
+        if not isinstance(limits, dict):
+            return None
+
+        values = {}
+        for key in ('memory', 'cpu_time', 'open_files'):
+            value = limits.get(key)
+            if value is None:
+                continue
+            if isinstance(value, bool) or not isinstance(value, int) or value <= 0:
+                raise ValueError(f"limits.{key} must be a positive integer, got {value!r}")
+            values[key] = value
+
+        unknown = set(limits) - {'memory', 'cpu_time', 'open_files'}
+        if unknown:
+            logger.warning(f"Ignoring unknown resource limits: {', '.join(sorted(unknown))}")
+        return cls(**values) if values else None
+
+    def apply(self) -> None:
+        """
+        Set the limits on the current process.
+
+        Runs in the child between fork and exec, as ``preexec_fn``; a limit
+        can only be lowered there, never raised above the inherited one.
+        """
+        for name, soft, grace in ((resource.RLIMIT_AS, self.memory, 0),
+                                  (resource.RLIMIT_CPU, self.cpu_time, 1),
+                                  (resource.RLIMIT_NOFILE, self.open_files, 0)):
+            if soft is None:
+                continue
+            _, hard = resource.getrlimit(name)
+            if hard != resource.RLIM_INFINITY:
+                soft = min(soft, hard)
+                resource.setrlimit(name, (soft, min(soft + grace, hard)))
+            else:
+                resource.setrlimit(name, (soft, soft + grace))
+
+
+def echo_to_terminal(stream: str, text: str) -> None:
+    """Forward a chunk of child output to the matching terminal stream."""
+    target = sys.stderr if stream == 'stderr' else sys.stdout
+    target.write(text)
+    target.flush()
+
+
+def normalize_newlines(text: str) -> str:
+    """Translate line endings the way ``subprocess`` text mode does."""
+    return text.replace('\r\n', '\n').replace('\r', '\n')
+
+
+@dataclass(frozen=True)
+class OutputLimits:
+    """
+    Memory bounds for captured output.
+
+    Sizes are in characters. Once a stream exceeds ``memory_limit`` it is
+    spilled to a temporary file in ``spill_dir`` and only its first
+    ``head_size`` and last ``tail_size`` characters stay in memory.
+    """
+    memory_limit: int = 8 * 1024 * 1024
+    head_size: int = 16 * 1024
+    tail_size: int = 64 * 1024
+    spill_dir: Optional[Path] = None
+
+    @classmethod
+    def from_config(cls, config: Any) -> Optional["OutputLimits"]:
+        """
+        Create limits from the ``output`` section of a configuration.
+
+        Args:
+            config: Configuration object
+
+        Returns:
+            Output limits, or None if the config sets no memory limit
+        """
+        output = getattr(config, 'output', None)
+        if not isinstance(output, dict):
+            return None
+
+        memory_limit = output.get('memory_limit', cls.memory_limit)
+        if not memory_limit:
+            return None
+
+        cache_dir = getattr(config, 'cache_dir', None)
+        return cls(
+            memory_limit=memory_limit,
+            head_size=output.get('head_size', cls.head_size),
+            tail_size=output.get('tail_size', cls.tail_size),
+            spill_dir=(Path(cache_dir) / 'output'
+                       if isinstance(cache_dir, (str, Path)) else None),
+        )
+
+
+def _remove_file(path: str) -> None:
+    """Delete a spill file, ignoring files that are already gone."""
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+class CapturedStream:
+    """
+    Output of one stream, held in memory up to a limit and on disk beyond it.
+
+    Line endings are normalized as chunks arrive, the way ``subprocess``
+    text mode does. The spill file is deleted by ``close`` or when the
+    stream is garbage collected.
+    """
+
+    def __init__(self, name: str, limits: Optional[OutputLimits] = None):
+        """
+        Initialize an empty stream.
+
+        Args:
+            name: Stream name, used in the spill file name
+            limits: Memory bounds, None to keep everything in memory
+        """
+        self.name = name
+        self.limits = limits
+        self.size = 0
+        self.spill_path: Optional[str] = None
+        self._chunks: List[str] = []
+        self._head = ''
+        self._tail = ''
+        self._spill: Optional[TextIO] = None
+        self._dropped = False
+        self._pending_cr = False
+        self._finalizer: Optional[weakref.finalize] = None
+
+    @property
+    def truncated(self) -> bool:
+        """Whether the in-memory text is only the head and tail."""
+        return self.spill_path is not None or self._dropped
+
+    def write(self, text: str) -> None:
+        """Append a chunk of output."""
+        # Hold back a trailing CR in case the next chunk starts with LF
+        if self._pending_cr:
+            text = '\r' + text
+            self._pending_cr = False
+        if text.endswith('\r'):
+            text = text[:-1]
+            self._pending_cr = True
+        if text:
+            self._append(normalize_newlines(text))
+
+    def __call__(self, stream: str, text: str) -> None:
+        """Append a chunk; usable directly as an output callback."""
+        self.write(text)
+
+    def finish(self) -> None:
+        """Flush pending data once the stream has closed."""
+        if self._pending_cr:
+            self._pending_cr = False
+            self._append('\n')
+        if self._spill is not None:
+            self._spill.flush()
+
+    def _append(self, text: str) -> None:
+        self.size += len(text)
+        if not self.truncated:
+            self._chunks.append(text)
+            if self.limits is not None and self.size > self._memory_limit():
+                self._spill_to_disk()
+            return
+
+        if self._spill is not None:
+            self._spill.write(text)
+        if len(self._head) < self.limits.head_size:
+            self._head += text[:self.limits.head_size - len(self._head)]
+        if self.limits.tail_size:
+            self._tail = (self._tail + text)[-self.limits.tail_size:]
+
+    def _memory_limit(self) -> int:
+        # Head and tail must never overlap in the preview
+        return max(self.limits.memory_limit,
+                   self.limits.head_size + self.limits.tail_size)
+
+    def _spill_to_disk(self) -> None:
+        """Move buffered output to a temporary file, keeping head and tail."""
+        text = ''.join(self._chunks)
+        self._chunks = []
+        self._head = text[:self.limits.head_size]
+        self._tail = text[-self.limits.tail_size:] if self.limits.tail_size else ''
+
+        spill_dir = self.limits.spill_dir
+        try:
+            if spill_dir is not None:
+                spill_dir.mkdir(parents=True, exist_ok=True)
+            fd, path = tempfile.mkstemp(prefix=f'{self.name}-', suffix='.log',
+                                        dir=str(spill_dir) if spill_dir else None)
+            self._spill = os.fdopen(fd, 'w', encoding='utf-8')
+            self._spill.write(text)
+        except OSError as e:
+            logger.warning(f"Cannot spill {self.name} to disk, keeping head and "
+                           f"tail only: {e}")
+            self._dropped = True
+            return
+
+        self.spill_path = path
+        self._finalizer = weakref.finalize(self, _remove_file, path)
+        logger.debug(f"Spilled {self.name} to {path} after {self.size} characters")
+
+    def preview(self) -> str:
+        """
+        Get the output as held in memory.
+
+        Returns:
+            Full text, or head and tail around an omission marker if the
+            output exceeded the memory limit
+        """
+        if not self.truncated:
+            return ''.join(self._chunks)
+
+        omitted = self.size - len(self._head) - len(self._tail)
+        location = f", full output in {self.spill_path}" if self.spill_path else ""
+        return (f"{self._head}\n... [{omitted} characters omitted{location}] ...\n"
+                f"{self._tail}")
+
+    def open(self) -> TextIO:
+        """
+        Open the complete output for reading.
+
+        Returns:
+            Text file object positioned at the start of the output
+        """
+        if self.spill_path is None:
+            return io.StringIO(self.preview())
+        self._spill.flush()
+        return open(self.spill_path, 'r', encoding='utf-8')
+
+    def read(self) -> str:
+        """Read the complete output, loading spilled data from disk."""
+        with self.open() as f:
+            return f.read()
+
+    def close(self) -> None:
+        """Release the spill file."""
+        if self._spill is not None:
+            self._spill.close()
+            self._spill = None
+        if self._finalizer is not None:
+            self._finalizer()
+
+
+class OutputCapture:
+    """Collects streamed output chunks per stream."""
+
+    def __init__(self, limits: Optional[OutputLimits] = None):
+        """
+        Initialize empty stdout and stderr captures.
+
+        Args:
+            limits: Memory bounds, None to keep all output in memory
+        """
+        self.streams: Dict[str, CapturedStream] = {
+            'stdout': CapturedStream('stdout', limits),
+            'stderr': CapturedStream('stderr', limits),
+        }
+
+    def __call__(self, stream: str, text: str) -> None:
+        """Append a chunk; usable directly as an output callback."""
+        self.streams[stream].write(text)
+
+    def finish(self) -> None:
+        """Flush both streams once the process has exited."""
+        for captured in self.streams.values():
+            captured.finish()
+
+    def get_text(self, stream: str) -> str:
+        """
+        Get the in-memory text of a stream.
+
+        Args:
+            stream: 'stdout' or 'stderr'
+
+        Returns:
+            Captured text, reduced to head and tail if it was spilled
+        """
+        captured = self.streams[stream]
+        captured.finish()
+        return captured.preview()
+
+    @property
+    def stdout(self) -> str:
+        """Captured standard output."""
+        return self.get_text('stdout')
+
+    @property
+    def stderr(self) -> str:
+        """Captured standard error."""
+        return self.get_text('stderr')
+
+
+def dispatch_output(callbacks: List[OutputCallback], stream: str, text: str) -> None:
+    """
+    Deliver a chunk to every callback.
+
+    A failing callback is logged and skipped so it cannot break execution.
+    """
+    for callback in callbacks:
+        try:
+            callback(stream, text)
+        except Exception as e:
+            logger.warning(f"Output callback {callback!r} failed: {e}")
+
+
+def pump_output(process: subprocess.Popen, on_output: OutputCallback,
+                timeout: Optional[float] = None,
+                stop: Optional[Callable[[], bool]] = None) -> str:
+    """
+    Read a child's stdout and stderr pipes until both close.
+
+    Both pipes are multiplexed with ``selectors`` and read without blocking,
+    so each chunk reaches ``on_output`` as soon as the child writes it.
+    Chunks are decoded incrementally, so multi-byte characters split across
+    reads are delivered whole.
+
+    Args:
+        process: Child started with ``stdout=PIPE`` and ``stderr=PIPE``
+        on_output: Called with (stream name, text) for every chunk
+        timeout: Seconds to wait for the child to finish, None for no limit
+        stop: Polled while waiting; returning True ends the wait early
+
+    Returns:
+        PUMP_EXITED, PUMP_TIMEOUT or PUMP_STOPPED. The child is left running
+        on timeout or stop; the caller decides how to end it.
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    encoding = locale.getpreferredencoding(False)
+    decoders = {}
+
+    def wait_time() -> Optional[float]:
+        """Seconds to block for, bounded by the deadline and stop polling."""
+        remaining = None if deadline is None else deadline - time.monotonic()
+        if stop is not None:
+            remaining = STOP_POLL_INTERVAL if remaining is None else min(
+                remaining, STOP_POLL_INTERVAL)
+        return remaining
+
+    def expired() -> bool:
+        return deadline is not None and time.monotonic() >= deadline
+
+    with selectors.DefaultSelector() as selector:
+        for name, pipe in (('stdout', process.stdout), ('stderr', process.stderr)):
+            os.set_blocking(pipe.fileno(), False)
+            selector.register(pipe, selectors.EVENT_READ, name)
+            decoders[name] = codecs.getincrementaldecoder(encoding)(errors='replace')
+
+        while selector.get_map():
+            if expired():
+                return PUMP_TIMEOUT
+            if stop is not None and stop():
+                return PUMP_STOPPED
+
+            for key, _ in selector.select(wait_time()):
+                name = key.data
+                try:
+                    data = os.read(key.fd, READ_CHUNK_SIZE)
+                except BlockingIOError:
+                    continue
+
+                if data:
+                    text = decoders[name].decode(data)
+                else:
+                    selector.unregister(key.fileobj)
+                    text = decoders[name].decode(b'', final=True)
+
+                if text:
+                    on_output(name, text)
+
+    # Pipes are closed; the child may still be running with them detached
+    while True:
+        if wait_process(process, wait_time()):
+            return PUMP_EXITED
+        if expired():
+            return PUMP_TIMEOUT
+        if stop is not None and stop():
+            return PUMP_STOPPED
+
+
+def kill_process(process: subprocess.Popen) -> None:
+    """
+    Kill a child and wait for it.
+
+    A child started in its own session is killed together with its
+    process group, so helpers it spawned do not outlive it. Handles from
+    execution backends know how to kill their own job and are only asked to.
+    The child is reaped with ``wait_process``, so its resource usage is kept.
+    """
+    popen = isinstance(process, subprocess.Popen) and STREAMING_SUPPORTED
+    # Popen.poll would reap the child and lose its resource usage
+    if (process.returncode if popen else process.poll()) is not None:
+        return
+    try:
+        if popen and os.getpgid(process.pid) == process.pid:
+            os.killpg(process.pid, signal.SIGKILL)
+        elif popen:
+            os.kill(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except (ProcessLookupError, PermissionError):
+        pass
+    wait_process(process)
+
+
+async def pump_output_async(process: "asyncio.subprocess.Process", on_output: OutputCallback,
+                            timeout: Optional[float] = None,
+                            stop: Optional[Callable[[], bool]] = None) -> str:
+    """
+    Async counterpart of ``pump_output`` for ``asyncio`` subprocesses.
+
+    Args:
+        process: Child from ``asyncio.create_subprocess_exec`` with piped
+            stdout and stderr
+        on_output: Called with (stream name, text) for every chunk
+        timeout: Seconds to wait for the child to finish, None for no limit
+        stop: Polled while waiting; returning True ends the wait early
+
+    Returns:
+        PUMP_EXITED, PUMP_TIMEOUT or PUMP_STOPPED. The child is left running
+        on timeout, stop or cancellation; the caller decides how to end it.
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    encoding = locale.getpreferredencoding(False)
+
+    async def read_stream(name: str, reader: asyncio.StreamReader) -> None:
+        decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+        while True:
+            data = await reader.read(READ_CHUNK_SIZE)
+            text = decoder.decode(data, final=not data)
+            if text:
+                on_output(name, text)
+            if not data:
+                return
+
+    async def run() -> None:
+        await asyncio.gather(read_stream('stdout', process.stdout),
+                             read_stream('stderr', process.stderr))
+        await process.wait()
+
+    task = asyncio.ensure_future(run())
+    try:
+        while True:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if stop is not None:
+                remaining = STOP_POLL_INTERVAL if remaining is None else min(
+                    remaining, STOP_POLL_INTERVAL)
+            done, _ = await asyncio.wait(
+                {task}, timeout=None if remaining is None else max(0.0, remaining))
+            if task in done:
+                task.result()
+                return PUMP_EXITED
+            if deadline is not None and time.monotonic() >= deadline:
+                return PUMP_TIMEOUT
+            if stop is not None and stop():
+                return PUMP_STOPPED
+    finally:
+        if not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+
+async def kill_process_async(process: "asyncio.subprocess.Process") -> None:
+    """
+    Kill an ``asyncio`` child, with its process group when it leads one, and wait.
+    """
+    if process.returncode is not None:
+        return
+    try:
+        if STREAMING_SUPPORTED and os.getpgid(process.pid) == process.pid:
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except (ProcessLookupError, PermissionError):
+        pass
+    await process.wait()
@@ -0,0 +1,347 @@
+"""
+LLM provider health tracking for AIRun.
+"""
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+HEALTH_PROBE = 'probe'
+HEALTH_REQUEST = 'request'
+
+
+@dataclass
+class ProviderHealth:
+    """Last known status of one provider."""
+    available: bool
+    checked_at: float
+    source: str
+    error: Optional[str] = None
+
+
+class ProviderHealthRegistry:
+    """
+    TTL-cached availability of LLM providers.
+
+    Status comes from two places: explicit probes (``probe``, and the
+    optional background refresh) and the outcome of real requests
+    (``record_success``/``record_failure``). A status older than ``ttl``
+    seconds is treated as unknown, so routing can try the provider again
+    without probing it first. All methods may be called from any thread.
+    """
+
+    DEFAULT_TTL = 60.0
+
+    def __init__(self, ttl: float = DEFAULT_TTL,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the registry.
+
+        Args:
+            ttl: Seconds a recorded status is trusted
+            clock: Monotonic time source
+        """
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: Dict[str, ProviderHealth] = {}
+        self._lock = threading.Lock()
+        self._refresh_thread: Optional[threading.Thread] = None
+        self._stop_refresh = threading.Event()
+
+    def get(self, name: str) -> Optional[ProviderHealth]:
+        """
+        Get a provider's status if it is still fresh.
+
+        Args:
+            name: Provider name
+
+        Returns:
+            Last recorded status, or None if unknown or expired
+        """
+        with self._lock:
+            entry = self._entries.get(name)
+        if entry is None or self._clock() - entry.checked_at >= self.ttl:
+            return None
+        return entry
+
+    def is_available(self, name: str) -> Optional[bool]:
+        """
+        Check a provider's cached availability without contacting it.
+
+        Args:
+            name: Provider name
+
+        Returns:
+            True or False when known, None when unknown or expired
+        """
+        entry = self.get(name)
+        return entry.available if entry is not None else None
+
+    def record(self, name: str, available: bool, source: str,
+               error: Optional[str] = None) -> None:
+        """
+        Record a provider's status.
+
+        Args:
+            name: Provider name
+            available: Whether the provider answered
+            source: ``HEALTH_PROBE`` or ``HEALTH_REQUEST``
+            error: Error seen when it did not
+        """
+        with self._lock:
+            self._entries[name] = ProviderHealth(available, self._clock(), source, error)
+
+    def record_success(self, name: str) -> None:
+        """Record a real request that the provider answered."""
+        self.record(name, True, HEALTH_REQUEST)
+
+    def record_failure(self, name: str, error: Any) -> None:
+        """Record a real request that failed."""
+        self.record(name, False, HEALTH_REQUEST, str(error))
+
+    def probe(self, name: str, provider: Any) -> bool:
+        """
+        Check a provider live and record the result.
+
+        Args:
+            name: Provider name
+            provider: Provider whose ``is_available`` is called
+
+        Returns:
+            Whether the provider is available
+        """
+        try:
+            available = bool(provider.is_available())
+            error = None if available else "availability check failed"
+        except Exception as e:
+            available, error = False, str(e)
+        self.record(name, available, HEALTH_PROBE, error)
+        return available
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Describe every recorded status.
+
+        Returns:
+            Status, age in seconds, source and error for each provider
+        """
+        now = self._clock()
+        with self._lock:
+            entries = dict(self._entries)
+        return {
+            name: {
+                'available': entry.available,
+                'age': now - entry.checked_at,
+                'fresh': now - entry.checked_at < self.ttl,
+                'source': entry.source,
+                'error': entry.error,
+            }
+            for name, entry in entries.items()
+        }
+
+    def start_refresh(self, providers: Mapping[str, Any], interval: float) -> None:
+        """
+        Re-probe providers in a background thread.
+
+        Every ``interval`` seconds, providers with no status or one about to
+        expire are probed, so routing finds a fresh status instead of
+        having to find out from a request.
+
+        Args:
+            providers: Providers by name
+            interval: Seconds between refresh passes
+        """
+        if self._refresh_thread is not None:
+            return
+        self._stop_refresh.clear()
+
+        def refresh() -> None:
+            while not self._stop_refresh.is_set():
+                for name, provider in list(providers.items()):
+                    with self._lock:
+                        entry = self._entries.get(name)
+                    if entry is None or self._clock() - entry.checked_at >= self.ttl - interval:
+                        self.probe(name, provider)
+                    if self._stop_refresh.is_set():
+                        return
+                self._stop_refresh.wait(interval)
+
+        self._refresh_thread = threading.Thread(target=refresh, name='airun-llm-health',
+                                                daemon=True)
+        self._refresh_thread.start()
+
+    def stop_refresh(self) -> None:
+        """Stop the background refresh, waiting for a probe in progress."""
+        thread, self._refresh_thread = self._refresh_thread, None
+        if thread is not None:
+            self._stop_refresh.set()
+            thread.join()
+
+
+CIRCUIT_CLOSED = 'closed'
+CIRCUIT_OPEN = 'open'
+CIRCUIT_HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """
+    Per-provider circuit breaker with exponential backoff.
+
+    The circuit opens after ``failure_threshold`` consecutive failed
+    requests; while it is open, requests are refused without contacting the
+    provider. Once the backoff has passed it is half-open and lets a single
+    trial request through: success closes it, failure opens it again with
+    the backoff doubled, up to ``backoff_max``. Each backoff is shortened by
+    a random fraction of up to ``backoff_jitter`` so that many clients do
+    not retry at the same moment. All methods may be called from any thread.
+    """
+
+    DEFAULT_FAILURE_THRESHOLD = 3
+    DEFAULT_BACKOFF_BASE = 10.0
+    DEFAULT_BACKOFF_MAX = 300.0
+    DEFAULT_BACKOFF_JITTER = 0.5
+    # Doublings after which the backoff stops growing, well past any backoff_max
+    MAX_BACKOFF_DOUBLINGS = 32
+
+    def __init__(self, failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+                 backoff_base: float = DEFAULT_BACKOFF_BASE,
+                 backoff_max: float = DEFAULT_BACKOFF_MAX,
+                 backoff_jitter: float = DEFAULT_BACKOFF_JITTER,
+                 clock: Callable[[], float] = time.monotonic,
+                 rand: Callable[[], float] = random.random):
+        """
+        Initialize the circuit breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            backoff_base: Seconds the circuit first stays open
+            backoff_max: Longest time the circuit stays open
+            backoff_jitter: Largest fraction taken off each backoff
+            clock: Monotonic time source
+            rand: Source of uniform random numbers in [0, 1)
+        """
+        self.failure_threshold = max(1, failure_threshold)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.backoff_jitter = min(max(backoff_jitter, 0.0), 1.0)
+        self._clock = clock
+        self._random = rand
+        self._lock = threading.Lock()
+        self._state = CIRCUIT_CLOSED
+        self._failures = 0
+        self._opens = 0
+        self._open_until = 0.0
+        self._trial_in_flight = False
+
+    @classmethod
+    def from_config(cls, routing: Mapping[str, Any], **kwargs) -> "CircuitBreaker":
+        """
+        Create a breaker from the ``llm_routing`` configuration section.
+
+        Args:
+            routing: Routing settings
+            **kwargs: Extra constructor arguments
+
+        Returns:
+            Configured CircuitBreaker
+        """
+        return cls(
+            failure_threshold=routing.get('failure_threshold', cls.DEFAULT_FAILURE_THRESHOLD),
+            backoff_base=routing.get('backoff_base', cls.DEFAULT_BACKOFF_BASE),
+            backoff_max=routing.get('backoff_max', cls.DEFAULT_BACKOFF_MAX),
+            backoff_jitter=routing.get('backoff_jitter', cls.DEFAULT_BACKOFF_JITTER),
+            **kwargs
+        )
+
+    @property
+    def state(self) -> str:
+        """Current state; an open circuit whose backoff has passed reports half-open."""
+        with self._lock:
+            if self._state == CIRCUIT_OPEN and self._clock() >= self._open_until:
+                return CIRCUIT_HALF_OPEN
+            return self._state
+
+    def is_open(self) -> bool:
+        """Check whether a request would be refused right now, without claiming a trial."""
+        with self._lock:
+            if self._state == CIRCUIT_OPEN:
+                return self._clock() < self._open_until
+            return self._state == CIRCUIT_HALF_OPEN and self._trial_in_flight
+
+    def allow_request(self) -> bool:
+        """
+        Ask to send a request.
+
+        In the half-open state only the first caller is allowed, as the
+        trial request; its outcome must be recorded.
+
+        Returns:
+            True if the request may be sent
+        """
+        with self._lock:
+            if self._state == CIRCUIT_CLOSED:
+                return True
+            if self._state == CIRCUIT_OPEN:
+                if self._clock() < self._open_until:
+                    return False
+                self._state = CIRCUIT_HALF_OPEN
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        """Record a request the provider answered, closing the circuit."""
+        with self._lock:
+            self._state = CIRCUIT_CLOSED
+            self._failures = 0
+            self._opens = 0
+            self._trial_in_flight = False
+
+    def abandon(self) -> None:
+        """Give up on a request without an outcome, freeing the half-open trial."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Record a failed request, opening the circuit if it is due."""
+        with self._lock:
+            if self._state == CIRCUIT_HALF_OPEN:
+                self._open()
+            elif self._state == CIRCUIT_CLOSED:
+                self._failures += 1
+                if self._failures >= self.failure_threshold:
+                    self._open()
+
+    def _open(self) -> None:
+        """Open the circuit for the next backoff; the lock must be held."""
+        self._opens += 1
+        doublings = min(self._opens - 1, self.MAX_BACKOFF_DOUBLINGS)
+        delay = min(self.backoff_max, self.backoff_base * 2 ** doublings)
+        delay *= 1.0 - self.backoff_jitter * self._random()
+        self._state = CIRCUIT_OPEN
+        self._open_until = self._clock() + delay
+        self._trial_in_flight = False
+        logger.info(f"Circuit opened for {delay:.1f}s ({self._opens} time(s) in a row)")
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Describe the circuit.
+
+        Returns:
+            State, consecutive failures, times opened in a row and seconds
+            until a trial request is allowed
+        """
+        state = self.state
+        with self._lock:
+            retry_in = max(0.0, self._open_until - self._clock()) if state == CIRCUIT_OPEN else 0.0
+            return {
+                'state': state,
+                'failures': self._failures,
+                'opens': self._opens,
+                'retry_in': retry_in,
+            }
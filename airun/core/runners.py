@@ -1,20 +1,112 @@
 """
 Script execution runners for AIRun.
 """
+import asyncio
+import io
+import json
+import logging
+import re
 import subprocess
+import sys
 import time
 import os
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from typing import Dict, List, Optional, Any
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Any, TextIO, Tuple
 from pathlib import Path
 
-from .detector import ScriptType
+from .backends import (
+    BackendUnavailable,
+    ExecutionBackend,
+    ForkServerBackend,
+    get_fork_server,
+)
+from .detector import ScriptType, Shebang
+from .error_watcher import ErrorWatcher, ErrorWatchSettings
+from .process import (
+    PUMP_STOPPED,
+    PUMP_TIMEOUT,
+    STREAMING_SUPPORTED,
+    CapturedStream,
+    OutputCallback,
+    OutputCapture,
+    OutputLimits,
+    RLIMITS_SUPPORTED,
+    ResourceLimits,
+    ResourceUsage,
+    dispatch_output,
+    echo_to_terminal,
+    get_resource_usage,
+    kill_process,
+    kill_process_async,
+    pump_output,
+    pump_output_async,
+)
+from .probe_cache import ExecutableProbe, ProbeCache, probe_executable, resolve_executable
+from .syntax_cache import PATH_MARKER, SyntaxCache, SyntaxCheck, content_digest, parse_python
+from .worker_pool import PythonWorkerPool, get_worker_pool
+
+logger = logging.getLogger(__name__)
+
+POOL_SUPPORTED = STREAMING_SUPPORTED and hasattr(os, 'fork')
+FORK_SERVER_SUPPORTED = STREAMING_SUPPORTED and hasattr(os, 'mkfifo')
+
+# Seconds allowed for one syntax check, plus a little per file when batched
+SYNTAX_CHECK_TIMEOUT = 10
+SYNTAX_CHECK_TIMEOUT_PER_FILE = 0.05
+# Files passed to one ``php -l``, keeping the command line short
+PHP_LINT_BATCH_SIZE = 100
+
+# Reads a JSON list of paths on stdin and prints one JSON result per file.
+# A hashbang is blanked rather than removed so line numbers stay right.
+_NODE_SYNTAX_CHECK = r"""
+const fs = require('fs');
+const vm = require('vm');
+const MODULE_ERRORS = [/outside a module/, /Unexpected token 'export'/];
+const paths = JSON.parse(fs.readFileSync(0, 'utf8'));
+for (const path of paths) {
+  const result = {path: path, ok: true};
+  try {
+    let source = fs.readFileSync(path, 'utf8');
+    if (source.startsWith('#!')) source = '//' + source.slice(2);
+    if (path.endsWith('.mjs')) {
+      result.module = true;
+    } else {
+      vm.compileFunction(source, ['exports', 'require', 'module', '__filename', '__dirname'],
+                         {filename: path});
+    }
+  } catch (error) {
+    if (error.name !== 'SyntaxError') {
+      result.failed = String(error.message);
+    } else if (MODULE_ERRORS.some((pattern) => pattern.test(error.message))) {
+      result.module = true;
+    } else {
+      const lines = String(error.stack).split('\n');
+      const end = lines.findIndex((line) => line.startsWith('SyntaxError'));
+      const at = /:(\d+)$/.exec(lines[0]);
+      result.ok = false;
+      result.detail = lines.slice(0, end + 1).join('\n');
+      if (at) result.line = Number(at[1]);
+      if (lines[2] && lines[2].includes('^')) result.column = lines[2].indexOf('^') + 1;
+    }
+  }
+  process.stdout.write(JSON.stringify(result) + '\n');
+}
+"""
 
 
 @dataclass
 class ExecutionResult:
-    """Result of script execution."""
+    """
+    Result of script execution.
+
+    ``stdout`` and ``stderr`` are always held in memory. When the runner
+    bounds its output, a stream that outgrew the limit holds only its head
+    and tail there; use ``read_output`` or ``open_output`` to get the
+    complete text from disk.
+    """
     exit_code: int
     stdout: str
     stderr: str
@@ -22,6 +114,85 @@ class ExecutionResult:
     error_detected: bool = False
     script_path: str = ""
     script_type: Optional[ScriptType] = None
+    streamed: bool = False  # Output was already echoed to the terminal
+    early_error: Optional[str] = None  # Error line spotted in the live output
+    error_detected_after: Optional[float] = None  # Seconds from start to early_error
+    cpu_time: Optional[float] = None  # User plus system CPU seconds, when measured
+    peak_rss: Optional[int] = None  # Peak resident set size in bytes, when measured
+    resource_usage: Optional[ResourceUsage] = None  # Full rusage, when measured
+    captures: Dict[str, CapturedStream] = field(default_factory=dict,
+                                                repr=False, compare=False)
+
+    @property
+    def cpu_utilization(self) -> Optional[float]:
+        """
+        CPU seconds per wall-clock second, when measured.
+
+        Close to 1 (or above, with several threads) for CPU-bound scripts;
+        near 0 for scripts that mostly wait on I/O.
+        """
+        if self.cpu_time is None or self.execution_time <= 0:
+            return None
+        return self.cpu_time / self.execution_time
+
+    @property
+    def output_truncated(self) -> bool:
+        """Whether ``stdout`` or ``stderr`` holds only part of the output."""
+        return any(captured.truncated for captured in self.captures.values())
+
+    def open_output(self, stream: str = 'stdout') -> TextIO:
+        """
+        Open the complete output of a stream for reading.
+
+        Args:
+            stream: 'stdout' or 'stderr'
+
+        Returns:
+            Text file object over the full output
+        """
+        captured = self.captures.get(stream)
+        if captured is None:
+            return io.StringIO(getattr(self, stream))
+        return captured.open()
+
+    def read_output(self, stream: str = 'stdout') -> str:
+        """
+        Read the complete output of a stream, loading it from disk if spilled.
+
+        Args:
+            stream: 'stdout' or 'stderr'
+
+        Returns:
+            Full output text
+        """
+        with self.open_output(stream) as f:
+            return f.read()
+
+    def close(self) -> None:
+        """Delete any spill files backing this result."""
+        for captured in self.captures.values():
+            captured.close()
+
+
+@dataclass(frozen=True)
+class ExecutionTemplate:
+    """
+    Everything about launching a script that does not depend on the script.
+
+    Built once per runner, so each launch only appends the script path and
+    arguments instead of re-reading the configuration and copying the
+    environment.
+    """
+    executable: str
+    flags: Tuple[str, ...]
+    env: Optional[Mapping[str, str]]  # Read-only merged environment; None inherits ours
+
+    def command(self, script_path: str, args: Optional[List[str]] = None) -> List[str]:
+        """Build the command line for a script."""
+        cmd = [self.executable, *self.flags, script_path]
+        if args:
+            cmd.extend(args)
+        return cmd
 
 
 class ExecutionError(Exception):
@@ -35,15 +206,121 @@ class ExecutionError(Exception):
 class BaseRunner(ABC):
     """Abstract base class for script runners."""
 
-    def __init__(self, config: Dict[str, Any]):
+    # Script type handled by the runner; its value keys the runner's config section
+    SCRIPT_TYPE: ScriptType = ScriptType.UNKNOWN
+    # Interpreter and flags used when the runner's config section sets none
+    DEFAULT_EXECUTABLE = ''
+    DEFAULT_FLAGS: Tuple[str, ...] = ()
+
+    def __init__(self, config: Dict[str, Any], shebang: Optional[Shebang] = None,
+                 stream_output: bool = False,
+                 output_limits: Optional[OutputLimits] = None,
+                 error_watch: Optional[ErrorWatchSettings] = None,
+                 probe_cache: Optional[ProbeCache] = None,
+                 syntax_cache: Optional[SyntaxCache] = None):
         """
         Initialize the runner.
 
         Args:
             config: Runner configuration
+            shebang: Parsed shebang of the script. Its interpreter and flags
+                are used when the runner's config sets ``use_shebang``.
+            stream_output: Echo output to the terminal while the script runs
+            output_limits: Bound the output kept in memory, spilling the
+                rest to disk; None keeps all output in memory
+            error_watch: Watch live output for this language's fatal
+                errors, and optionally stop the script once one appears
+            probe_cache: Remember interpreter availability across runs
+            syntax_cache: Remember syntax check results by file content
         """
+        self._template: Optional[ExecutionTemplate] = None
         self.config = config
         self.timeout = config.get('timeout', 300)  # 5 minutes default
+        self.stream_output = stream_output
+        self.output_limits = output_limits
+        self.error_watch = error_watch
+        self.probe_cache = probe_cache
+        self.syntax_cache = syntax_cache
+        self.output_callbacks: List[OutputCallback] = []
+
+        runner_config = config.get(self.SCRIPT_TYPE.value, {})
+        self.limits = ResourceLimits.from_config(runner_config)
+        if self.limits is not None and not (RLIMITS_SUPPORTED and STREAMING_SUPPORTED):
+            logger.warning("Resource limits are not supported on this platform")
+            self.limits = None
+
+        if (shebang is not None and shebang.script_type == self.SCRIPT_TYPE
+                and runner_config.get('use_shebang', False)):
+            self.shebang = shebang
+        else:
+            self.shebang = None
+
+    @property
+    def config(self) -> Dict[str, Any]:
+        """Runner configuration; assigning a new one rebuilds the execution template."""
+        return self._config
+
+    @config.setter
+    def config(self, config: Dict[str, Any]) -> None:
+        self._config = config
+        self._template = None
+
+    @property
+    def template(self) -> ExecutionTemplate:
+        """
+        Execution template built from the configuration on first use.
+
+        The merged environment is a snapshot: when ``env_vars`` is set,
+        later changes to ``os.environ`` are not seen until the template is
+        rebuilt. Without ``env_vars`` scripts inherit ``os.environ`` as is.
+        """
+        if self._template is None:
+            self._template = self._build_template()
+        return self._template
+
+    def refresh_template(self) -> None:
+        """Rebuild the execution template after changing the config in place."""
+        self._template = None
+
+    @staticmethod
+    def _merge_flags(first: List[str], second: List[str]) -> List[str]:
+        """
+        Append ``second`` to ``first``, skipping options ``first`` already sets.
+
+        An option is a token starting with '-' plus the value tokens that
+        follow it, so ``-X dev`` and ``-X utf8`` are kept as distinct options
+        while a repeated ``-u`` is passed once.
+        """
+        def options(flags: List[str]) -> List[Tuple[str, ...]]:
+            grouped: List[List[str]] = []
+            for flag in flags:
+                if flag.startswith('-') or not grouped:
+                    grouped.append([flag])
+                else:
+                    grouped[-1].append(flag)
+            return [tuple(option) for option in grouped]
+
+        merged = options(list(first))
+        seen = set(merged)
+        for option in options(list(second)):
+            if option not in seen:
+                seen.add(option)
+                merged.append(option)
+        return [flag for option in merged for flag in option]
+
+    def _build_template(self) -> ExecutionTemplate:
+        runner_config = self.config.get(self.SCRIPT_TYPE.value, {})
+        if self.shebang is not None:
+            executable = self.shebang.interpreter
+            flags = self._merge_flags(self.shebang.flags,
+                                      runner_config.get('flags', self.DEFAULT_FLAGS))
+        else:
+            executable = runner_config.get('executable', self.DEFAULT_EXECUTABLE)
+            flags = runner_config.get('flags', self.DEFAULT_FLAGS)
+
+        env_vars = self.config.get('env_vars', {})
+        env = MappingProxyType(dict(os.environ, **env_vars)) if env_vars else None
+        return ExecutionTemplate(executable, tuple(flags), env)
 
     @abstractmethod
     def get_command(self, script_path: str, args: List[str] = None) -> List[str]:
@@ -59,27 +336,136 @@ class BaseRunner(ABC):
         """
         pass
 
+    def add_output_callback(self, callback: OutputCallback) -> None:
+        """
+        Register a callback for live output.
+
+        The callback receives ``(stream, text)`` for every chunk the script
+        writes, where ``stream`` is 'stdout' or 'stderr'.
+
+        Args:
+            callback: Function called with each output chunk
+        """
+        self.output_callbacks.append(callback)
+
+    def remove_output_callback(self, callback: OutputCallback) -> None:
+        """Unregister a callback added with ``add_output_callback``."""
+        if callback in self.output_callbacks:
+            self.output_callbacks.remove(callback)
+
     def execute(self, script_path: str, args: List[str] = None,
-                cwd: Optional[str] = None) -> ExecutionResult:
+                cwd: Optional[str] = None,
+                stream: Optional[bool] = None) -> ExecutionResult:
         """
         Execute the script.
 
+        On POSIX the script runs in its own session with the runner's
+        resource limits applied, and a timeout kills every process it started.
+
         Args:
             script_path: Path to the script
             args: Additional arguments
             cwd: Working directory
+            stream: Echo output to the terminal as it arrives; defaults to
+                the runner's ``stream_output`` setting
 
         Returns:
             Execution result
         """
         cmd = self.get_command(script_path, args)
+        echo = self.stream_output if stream is None else stream
+
+        if STREAMING_SUPPORTED:
+            callbacks = list(self.output_callbacks)
+            if echo:
+                callbacks.insert(0, echo_to_terminal)
+            result = self._run_streaming(cmd, cwd, script_path, callbacks, args=args)
+            result.streamed = echo
+            return result
+
+        if (echo or self.output_callbacks or self.output_limits is not None
+                or self.error_watch is not None or self._uses_backend()):
+            logger.debug("Streaming capture is not supported on this platform")
         return self._run_subprocess(cmd, cwd, script_path)
 
+    def _get_environment(self) -> Dict[str, str]:
+        """Complete child environment, for backends that need it spelled out."""
+        env = self.template.env
+        return dict(os.environ if env is None else env)
+
+    def _uses_backend(self) -> bool:
+        """Whether scripts run through a backend other than a plain subprocess."""
+        return False
+
+    def get_backend(self) -> Optional[ExecutionBackend]:
+        """
+        Get the execution backend for this runner, if one is enabled.
+
+        Returns:
+            Backend to start scripts with, or None for a plain subprocess
+        """
+        return None
+
+    def _get_fork_server(self, language: str) -> Optional[ForkServerBackend]:
+        """Get the shared fork server when ``fork_server`` is enabled for the language."""
+        runner_config = self.config.get(language, {})
+        if not runner_config.get('fork_server', False) or not FORK_SERVER_SUPPORTED:
+            return None
+
+        # Interpreter flags are applied to the server and so to every job
+        return get_fork_server(language, [self.get_executable(), *self.template.flags])
+
+    def _spawn(self, cmd: List[str], script_path: str, args: Optional[List[str]],
+               cwd: Optional[str], env: Optional[Mapping[str, str]],
+               new_session: bool) -> subprocess.Popen:
+        """
+        Start the script with piped stdout and stderr.
+
+        Uses the runner's execution backend when it has one and falls back
+        to ``subprocess.Popen`` if the backend cannot take the job. Scripts
+        with resource limits always get a fresh process.
+
+        Args:
+            cmd: Command to execute
+            script_path: Script being run
+            args: Script arguments
+            cwd: Resolved working directory
+            env: Child environment; None inherits ours
+            new_session: Start the child in its own session and process group
+
+        Returns:
+            Handle of the running script
+        """
+        backend = self.get_backend() if self.limits is None else None
+        if backend is not None:
+            try:
+                return backend.spawn(script_path, args, cwd, self._get_environment())
+            except BackendUnavailable as e:
+                logger.warning(f"Execution backend unavailable, using a subprocess: {e}")
+        return subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            cwd=cwd,
+            env=env,
+            start_new_session=new_session,
+            preexec_fn=self.limits.apply if self.limits is not None else None
+        )
+
+    @staticmethod
+    def _get_working_directory(cwd: Optional[str], script_path: str) -> Optional[str]:
+        """Resolve the child's working directory."""
+        return cwd or os.path.dirname(script_path) if script_path else None
+
     def _run_subprocess(self, cmd: List[str], cwd: Optional[str] = None,
                        script_path: str = "") -> ExecutionResult:
         """
         Execute command using subprocess.
 
+        Portable fallback for platforms without process groups. On timeout
+        ``subprocess.run`` kills only the direct child, and since it also
+        reaps the child, only wall time is recorded.
+
         Args:
             cmd: Command to execute
             cwd: Working directory
@@ -88,23 +474,19 @@ class BaseRunner(ABC):
         Returns:
             Execution result
         """
-        start_time = time.time()
+        start_time = time.perf_counter()
 
         try:
-            # Prepare environment
-            env = os.environ.copy()
-            env.update(self.config.get('env_vars', {}))
-
             result = subprocess.run(
                 cmd,
                 capture_output=True,
                 text=True,
-                cwd=cwd or os.path.dirname(script_path) if script_path else None,
+                cwd=self._get_working_directory(cwd, script_path),
                 timeout=self.timeout,
-                env=env
+                env=self.template.env
             )
 
-            execution_time = time.time() - start_time
+            execution_time = time.perf_counter() - start_time
 
             return ExecutionResult(
                 exit_code=result.returncode,
@@ -116,7 +498,7 @@ class BaseRunner(ABC):
             )
 
         except subprocess.TimeoutExpired:
-            execution_time = time.time() - start_time
+            execution_time = time.perf_counter() - start_time
             return ExecutionResult(
                 exit_code=-1,
                 stdout="",
@@ -126,7 +508,7 @@ class BaseRunner(ABC):
                 script_path=script_path
             )
         except FileNotFoundError as e:
-            execution_time = time.time() - start_time
+            execution_time = time.perf_counter() - start_time
             return ExecutionResult(
                 exit_code=-2,
                 stdout="",
@@ -136,7 +518,7 @@ class BaseRunner(ABC):
                 script_path=script_path
             )
         except Exception as e:
-            execution_time = time.time() - start_time
+            execution_time = time.perf_counter() - start_time
             return ExecutionResult(
                 exit_code=-3,
                 stdout="",
@@ -146,18 +528,341 @@ class BaseRunner(ABC):
                 script_path=script_path
             )
 
+    def _run_streaming(self, cmd: List[str], cwd: Optional[str],
+                       script_path: str, callbacks: List[OutputCallback],
+                       args: Optional[List[str]] = None) -> ExecutionResult:
+        """
+        Execute command, delivering output to callbacks as it is written.
+
+        Output is also captured, within ``output_limits``, so the result
+        matches ``_run_subprocess``; on timeout the partial output is kept
+        and the child's whole process group is killed. With ``error_watch`` set, an error spotted
+        in the output is recorded on the result and may stop the child early.
+        A subprocess is reaped with ``os.wait4`` where available, so the
+        result carries its CPU time, peak RSS and other resource usage.
+
+        Args:
+            cmd: Command to execute
+            cwd: Working directory
+            script_path: Original script path for logging
+            callbacks: Output callbacks, called in order for each chunk
+            args: Script arguments, as already included in ``cmd``
+
+        Returns:
+            Execution result
+        """
+        start_time = time.perf_counter()
+        capture, watcher, stop, callbacks = self._prepare_capture(callbacks)
+
+        try:
+            process = self._spawn(
+                cmd, script_path, args,
+                cwd=self._get_working_directory(cwd, script_path),
+                env=self.template.env,
+                # Own session and process group, so a timeout or early stop
+                # kills the helpers the script started along with it
+                new_session=True
+            )
+        except Exception as e:
+            return self._spawn_failure(e, start_time, script_path)
+
+        try:
+            outcome = pump_output(
+                process,
+                lambda stream, text: dispatch_output(callbacks, stream, text),
+                timeout=self.timeout,
+                stop=stop
+            )
+        finally:
+            # Also reached on KeyboardInterrupt: never leave the child behind
+            kill_process(process)
+            process.stdout.close()
+            process.stderr.close()
+
+        return self._streamed_result(script_path, start_time, outcome,
+                                     process.returncode, capture, watcher,
+                                     usage=get_resource_usage(process))
+
+    async def execute_async(self, script_path: str, args: List[str] = None,
+                            cwd: Optional[str] = None,
+                            stream: Optional[bool] = None) -> ExecutionResult:
+        """
+        Execute the script without blocking the event loop.
+
+        Runs the script with ``asyncio.create_subprocess_exec`` in its own
+        process group. Output reaches callbacks live and is captured as in
+        ``execute``. On timeout, early error stop or cancellation of the
+        awaiting task, the whole process group is killed; cancellation is
+        then re-raised. Execution backends are not used by this path, and
+        since asyncio reaps the child, no resource usage is recorded.
+
+        Args:
+            script_path: Path to the script
+            args: Additional arguments
+            cwd: Working directory
+            stream: Echo output to the terminal as it arrives; defaults to
+                the runner's ``stream_output`` setting
+
+        Returns:
+            Execution result
+        """
+        cmd = self.get_command(script_path, args)
+        echo = self.stream_output if stream is None else stream
+        callbacks = list(self.output_callbacks)
+        if echo:
+            callbacks.insert(0, echo_to_terminal)
+
+        start_time = time.perf_counter()
+        capture, watcher, stop, callbacks = self._prepare_capture(callbacks)
+
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=self._get_working_directory(cwd, script_path),
+                env=self.template.env,
+                start_new_session=STREAMING_SUPPORTED,
+                preexec_fn=self.limits.apply if self.limits is not None else None
+            )
+        except Exception as e:
+            return self._spawn_failure(e, start_time, script_path)
+
+        try:
+            outcome = await pump_output_async(
+                process,
+                lambda stream, text: dispatch_output(callbacks, stream, text),
+                timeout=self.timeout,
+                stop=stop
+            )
+        finally:
+            await kill_process_async(process)
+
+        result = self._streamed_result(script_path, start_time, outcome,
+                                       process.returncode, capture, watcher)
+        result.streamed = echo
+        return result
+
+    def _prepare_capture(self, callbacks: List[OutputCallback]):
+        """
+        Set up output capture and error watching for a streamed run.
+
+        Args:
+            callbacks: Caller's output callbacks
+
+        Returns:
+            Tuple of (capture, error watcher or None, stop predicate or None,
+            all callbacks to dispatch output to)
+        """
+        capture = OutputCapture(self.output_limits)
+        callbacks = [capture] + callbacks
+
+        watcher = None
+        stop = None
+        if self.error_watch is not None:
+            watcher = ErrorWatcher(self.SCRIPT_TYPE, self.error_watch)
+            callbacks.append(watcher)
+            if self.error_watch.kill:
+                stop = watcher.should_stop
+        return capture, watcher, stop, callbacks
+
+    @staticmethod
+    def _spawn_failure(error: Exception, start_time: float,
+                       script_path: str) -> ExecutionResult:
+        """Build the result for a script that could not be started."""
+        if isinstance(error, FileNotFoundError):
+            exit_code, stderr = -2, f"Command not found: {error}"
+        else:
+            exit_code, stderr = -3, f"Execution error: {str(error)}"
+        return ExecutionResult(
+            exit_code=exit_code,
+            stdout="",
+            stderr=stderr,
+            execution_time=time.perf_counter() - start_time,
+            error_detected=True,
+            script_path=script_path
+        )
+
+    def _streamed_result(self, script_path: str, start_time: float, outcome: str,
+                         returncode: Optional[int], capture: OutputCapture,
+                         watcher: Optional[ErrorWatcher],
+                         usage: Optional[ResourceUsage] = None) -> ExecutionResult:
+        """Build the result of a streamed run from how the pump ended."""
+        execution_time = time.perf_counter() - start_time
+
+        if outcome == PUMP_STOPPED:
+            logger.info(f"Stopped {script_path} {execution_time:.2f}s in, after "
+                        f"detecting: {watcher.error_line}")
+
+        if outcome == PUMP_TIMEOUT:
+            message = f"Execution timeout exceeded ({self.timeout}s)"
+            if capture.streams['stderr'].size:
+                message = "\n" + message
+            capture('stderr', message)
+            exit_code = -1
+        else:
+            exit_code = returncode
+        capture.finish()
+
+        early_error = watcher.error_line if watcher is not None else None
+        return ExecutionResult(
+            exit_code=exit_code,
+            stdout=capture.stdout,
+            stderr=capture.stderr,
+            execution_time=execution_time,
+            error_detected=exit_code != 0 or outcome == PUMP_STOPPED,
+            script_path=script_path,
+            captures=capture.streams,
+            early_error=early_error,
+            error_detected_after=watcher.detected_after if early_error else None,
+            cpu_time=usage.cpu_time if usage is not None else None,
+            peak_rss=usage.max_rss if usage is not None else None,
+            resource_usage=usage
+        )
+
+    def probe_executable(self) -> ExecutableProbe:
+        """
+        Check the interpreter, using the probe cache when the runner has one.
+
+        Returns:
+            Availability and version of the interpreter
+        """
+        executable = self.get_executable()
+        if self.probe_cache is not None:
+            return self.probe_cache.probe(executable)
+        return probe_executable(executable)
+
     def validate_executable(self) -> bool:
         """Check if the required executable is available."""
-        executable = self.get_executable()
+        return self.probe_executable().available
+
+    def validate_syntax(self, script_path: str) -> Optional[str]:
+        """
+        Validate script syntax without executing it.
+
+        Args:
+            script_path: Path to the script
+
+        Returns:
+            Error message if syntax is invalid, None otherwise
+        """
+        return self.check_syntax(script_path).message(script_path)
+
+    def check_syntax(self, script_path: str) -> SyntaxCheck:
+        """
+        Check one script's syntax, using the syntax cache when the runner has one.
+
+        Args:
+            script_path: Path to the script
+
+        Returns:
+            Syntax check result
+        """
+        if self.syntax_cache is None:
+            return self._check_syntax(script_path)
+        return self.check_syntax_many([script_path])[script_path]
+
+    def check_syntax_many(self, script_paths: List[str]) -> Dict[str, SyntaxCheck]:
+        """
+        Check the syntax of many scripts of this runner's language.
+
+        Files whose content is already in the syntax cache are answered from
+        it; the rest are checked together, so languages with a batch checker
+        start one interpreter for all of them.
+
+        Args:
+            script_paths: Paths to the scripts
+
+        Returns:
+            Syntax check result for each path
+        """
+        script_paths = list(dict.fromkeys(script_paths))
+        checker = self._syntax_checker_id() if self.syntax_cache is not None else None
+        if checker is None:
+            return self._check_syntax_batch(script_paths) if script_paths else {}
+
+        results: Dict[str, SyntaxCheck] = {}
+        digests: Dict[str, str] = {}
+        for script_path in script_paths:
+            try:
+                with open(script_path, 'rb') as f:
+                    digests[script_path] = content_digest(f.read())
+            except OSError as e:
+                results[script_path] = SyntaxCheck.failed(f"Error reading {script_path}: {e}")
+
+        cached = self.syntax_cache.get_many(digests.values(), checker)
+        misses = []
+        for script_path, digest in digests.items():
+            if digest in cached:
+                results[script_path] = cached[digest]
+            else:
+                misses.append(script_path)
+
+        if misses:
+            checked = self._check_syntax_batch(misses)
+            self.syntax_cache.put_many({digests[path]: checked[path] for path in misses},
+                                       checker)
+            results.update(checked)
+
+        return {script_path: results[script_path] for script_path in script_paths}
+
+    def _syntax_checker_id(self) -> Optional[str]:
+        """
+        Fingerprint of the syntax checker, keying cached results.
+
+        Returns:
+            Interpreter path and mtime, or None if it cannot be found
+        """
+        resolved = resolve_executable(self.get_executable())
+        if resolved is None:
+            return None
+        return f"{self.SCRIPT_TYPE.value}:{resolved[0]}:{resolved[1]}"
+
+    def _check_syntax(self, script_path: str) -> SyntaxCheck:
+        """Check one script; runners without a syntax checker accept everything."""
+        return SyntaxCheck(ok=True, cacheable=False)
+
+    def _check_syntax_batch(self, script_paths: List[str]) -> Dict[str, SyntaxCheck]:
+        """Check several scripts; one at a time unless the runner can batch."""
+        return {script_path: self._check_syntax(script_path) for script_path in script_paths}
+
+    def _run_syntax_tool(self, cmd: List[str], script_path: str,
+                         line_pattern: str) -> SyntaxCheck:
+        """
+        Check one script with an interpreter's lint command.
+
+        Args:
+            cmd: Lint command, which exits non-zero on a syntax error
+            script_path: Path to the script
+            line_pattern: Regex whose first group is the error line number
+
+        Returns:
+            Syntax check result
+        """
         try:
             result = subprocess.run(
-                [executable, '--version'],
+                cmd,
                 capture_output=True,
-                timeout=5
+                text=True,
+                timeout=SYNTAX_CHECK_TIMEOUT
             )
-            return result.returncode == 0
-        except (subprocess.TimeoutExpired, FileNotFoundError, subprocess.SubprocessError):
-            return False
+        except Exception as e:
+            return SyntaxCheck.failed(f"Error validating {script_path}: {e}")
+
+        if result.returncode == 0:
+            return SyntaxCheck(ok=True)
+        output = result.stderr.strip() or (result.stdout or '').strip()
+        return self._syntax_error(script_path, output, line_pattern)
+
+    @staticmethod
+    def _syntax_error(script_path: str, output: str, line_pattern: str) -> SyntaxCheck:
+        """Build a failed result from checker output, keeping it path independent."""
+        match = re.search(line_pattern, output, re.MULTILINE)
+        return SyntaxCheck(
+            ok=False,
+            line=int(match.group(1)) if match else None,
+            detail=output.replace(script_path, PATH_MARKER)
+        )
 
     @abstractmethod
     def get_executable(self) -> str:
@@ -168,177 +873,296 @@ class BaseRunner(ABC):
 class PythonRunner(BaseRunner):
     """Python script runner."""
 
+    SCRIPT_TYPE = ScriptType.PYTHON
+    DEFAULT_EXECUTABLE = 'python3'
+    DEFAULT_FLAGS = ('-u',)
+
     def get_executable(self) -> str:
         """Get Python executable."""
-        return self.config.get('python', {}).get('executable', 'python3')
+        return self.template.executable
 
     def get_command(self, script_path: str, args: List[str] = None) -> List[str]:
         """Build Python execution command."""
-        executable = self.get_executable()
-        flags = self.config.get('python', {}).get('flags', ['-u'])
+        return self.template.command(script_path, args)
 
-        cmd = [executable] + flags + [script_path]
-        if args:
-            cmd.extend(args)
+    def get_worker_pool(self) -> Optional[PythonWorkerPool]:
+        """
+        Get the warm worker pool for this runner, if it can be used.
 
-        return cmd
+        The pool is used when ``warm_pool`` is enabled in the python runner
+        config. Interpreter flags other than ``-u`` cannot be applied to a
+        forked worker, so any other flag disables the pool.
 
-    def validate_syntax(self, script_path: str) -> Optional[str]:
+        Returns:
+            Shared worker pool, or None to run scripts as subprocesses
+        """
+        python_config = self.config.get('python', {})
+        if not python_config.get('warm_pool', False) or not POOL_SUPPORTED:
+            return None
+
+        flags = self.template.flags
+        if any(flag != '-u' for flag in flags):
+            logger.debug(f"Warm pool skipped for interpreter flags {flags}")
+            return None
+
+        return get_worker_pool(
+            self.get_executable(),
+            size=python_config.get('pool_size', 4),
+            recycle_after=python_config.get('pool_recycle_after', 100),
+            preload=python_config.get('pool_preload')
+        )
+
+    def _uses_backend(self) -> bool:
+        """Scripts run in the warm pool when it is enabled."""
+        return self.config.get('python', {}).get('warm_pool', False) and POOL_SUPPORTED
+
+    def get_backend(self) -> Optional[ExecutionBackend]:
+        """The warm worker pool, if enabled."""
+        return self.get_worker_pool()
+
+    def _syntax_checker_id(self) -> Optional[str]:
+        """Python is checked in-process, so results depend on this interpreter."""
+        return f"python-ast:{sys.implementation.cache_tag}"
+
+    def _check_syntax(self, script_path: str) -> SyntaxCheck:
         """
-        Validate Python syntax without executing.
+        Validate Python syntax in-process without executing.
+
+        The parse tree is kept for reuse by the AI fixer, then compiled so
+        errors found after parsing (such as a misplaced ``return``) are
+        reported too.
 
         Args:
             script_path: Path to Python script
 
         Returns:
-            Error message if syntax is invalid, None otherwise
+            Syntax check result
         """
         try:
             with open(script_path, 'r', encoding='utf-8') as f:
                 source = f.read()
+        except Exception as e:
+            return SyntaxCheck.failed(f"Error reading {script_path}: {e}")
 
-            compile(source, script_path, 'exec')
-            return None
-
+        try:
+            tree = parse_python(source, script_path)
+            compile(tree, script_path, 'exec', dont_inherit=True)
         except SyntaxError as e:
-            return f"Syntax error in {script_path}:{e.lineno}: {e.msg}"
-        except Exception as e:
-            return f"Error reading {script_path}: {e}"
+            return SyntaxCheck(ok=False, line=e.lineno, column=e.offset, detail=e.msg)
+        except ValueError as e:
+            # Null bytes in the source
+            return SyntaxCheck(ok=False, detail=str(e))
+        return SyntaxCheck(ok=True)
 
 
 class ShellRunner(BaseRunner):
     """Shell script runner."""
 
+    SCRIPT_TYPE = ScriptType.SHELL
+    DEFAULT_EXECUTABLE = 'bash'
+
     def get_executable(self) -> str:
         """Get shell executable."""
-        return self.config.get('shell', {}).get('executable', 'bash')
+        return self.template.executable
 
     def get_command(self, script_path: str, args: List[str] = None) -> List[str]:
         """Build shell execution command."""
-        executable = self.get_executable()
-        flags = self.config.get('shell', {}).get('flags', [])
-
-        cmd = [executable] + flags + [script_path]
-        if args:
-            cmd.extend(args)
+        return self.template.command(script_path, args)
 
-        return cmd
-
-    def validate_syntax(self, script_path: str) -> Optional[str]:
+    def _check_syntax(self, script_path: str) -> SyntaxCheck:
         """
-        Validate shell script syntax.
+        Validate shell script syntax with ``-n``.
+
+        The shell reads one script per invocation, so shell scripts are not
+        batched.
 
         Args:
             script_path: Path to shell script
 
         Returns:
-            Error message if syntax is invalid, None otherwise
+            Syntax check result
         """
-        try:
-            result = subprocess.run(
-                [self.get_executable(), '-n', script_path],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-
-            if result.returncode != 0:
-                return f"Syntax error in {script_path}: {result.stderr}"
-
-            return None
-
-        except Exception as e:
-            return f"Error validating {script_path}: {e}"
+        return self._run_syntax_tool([self.get_executable(), '-n', script_path],
+                                     script_path, r': line (\d+):')
 
 
 class NodeJSRunner(BaseRunner):
     """Node.js script runner."""
 
+    SCRIPT_TYPE = ScriptType.NODEJS
+    DEFAULT_EXECUTABLE = 'node'
+
     def get_executable(self) -> str:
         """Get Node.js executable."""
-        return self.config.get('nodejs', {}).get('executable', 'node')
+        return self.template.executable
 
     def get_command(self, script_path: str, args: List[str] = None) -> List[str]:
         """Build Node.js execution command."""
-        executable = self.get_executable()
-        flags = self.config.get('nodejs', {}).get('flags', [])
+        return self.template.command(script_path, args)
 
-        cmd = [executable] + flags + [script_path]
-        if args:
-            cmd.extend(args)
+    def _uses_backend(self) -> bool:
+        """Scripts run in the fork server when it is enabled."""
+        return (self.config.get('nodejs', {}).get('fork_server', False)
+                and FORK_SERVER_SUPPORTED)
 
-        return cmd
+    def get_backend(self) -> Optional[ExecutionBackend]:
+        """The Node.js fork server, if enabled."""
+        return self._get_fork_server('nodejs')
 
-    def validate_syntax(self, script_path: str) -> Optional[str]:
+    def _check_syntax(self, script_path: str) -> SyntaxCheck:
         """
-        Validate JavaScript syntax.
+        Validate JavaScript syntax with ``--check``.
 
         Args:
             script_path: Path to JavaScript file
 
         Returns:
-            Error message if syntax is invalid, None otherwise
+            Syntax check result
+        """
+        return self._run_syntax_tool([self.get_executable(), '--check', script_path],
+                                     script_path, r'^\S.*:(\d+)$')
+
+    def _check_syntax_batch(self, script_paths: List[str]) -> Dict[str, SyntaxCheck]:
         """
+        Validate many JavaScript files in one Node.js process.
+
+        Each file is compiled as a CommonJS function body, as the module
+        loader does. ES modules, and any file the batch could not answer
+        for, are checked with ``--check`` instead.
+
+        Args:
+            script_paths: Paths to JavaScript files
+
+        Returns:
+            Syntax check result for each path
+        """
+        if len(script_paths) < 2:
+            return super()._check_syntax_batch(script_paths)
+
+        results: Dict[str, SyntaxCheck] = {}
         try:
-            result = subprocess.run(
-                [self.get_executable(), '--check', script_path],
+            completed = subprocess.run(
+                [self.get_executable(), '-e', _NODE_SYNTAX_CHECK],
+                input=json.dumps(script_paths),
                 capture_output=True,
                 text=True,
-                timeout=10
+                timeout=SYNTAX_CHECK_TIMEOUT + SYNTAX_CHECK_TIMEOUT_PER_FILE * len(script_paths)
             )
+            lines = completed.stdout.splitlines()
+        except (subprocess.SubprocessError, OSError) as e:
+            logger.debug(f"Batched JavaScript syntax check failed: {e}")
+            lines = []
 
-            if result.returncode != 0:
-                return f"Syntax error in {script_path}: {result.stderr}"
-
-            return None
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            script_path = entry.get('path')
+            if script_path not in script_paths or entry.get('module'):
+                continue
+            if 'failed' in entry:
+                results[script_path] = SyntaxCheck.failed(
+                    f"Error validating {script_path}: {entry['failed']}")
+            elif entry.get('ok'):
+                results[script_path] = SyntaxCheck(ok=True)
+            else:
+                results[script_path] = SyntaxCheck(
+                    ok=False,
+                    line=entry.get('line'),
+                    column=entry.get('column'),
+                    detail=str(entry.get('detail', '')).replace(script_path, PATH_MARKER)
+                )
 
-        except Exception as e:
-            return f"Error validating {script_path}: {e}"
+        remaining = [path for path in script_paths if path not in results]
+        results.update(super()._check_syntax_batch(remaining))
+        return results
 
 
 class PHPRunner(BaseRunner):
     """PHP script runner."""
 
+    SCRIPT_TYPE = ScriptType.PHP
+    DEFAULT_EXECUTABLE = 'php'
+
     def get_executable(self) -> str:
         """Get PHP executable."""
-        return self.config.get('php', {}).get('executable', 'php')
+        return self.template.executable
 
     def get_command(self, script_path: str, args: List[str] = None) -> List[str]:
         """Build PHP execution command."""
-        executable = self.get_executable()
-        flags = self.config.get('php', {}).get('flags', [])
+        return self.template.command(script_path, args)
 
-        cmd = [executable] + flags + [script_path]
-        if args:
-            cmd.extend(args)
+    def _uses_backend(self) -> bool:
+        """Scripts run in the fork server when it is enabled."""
+        return (self.config.get('php', {}).get('fork_server', False)
+                and FORK_SERVER_SUPPORTED)
 
-        return cmd
+    def get_backend(self) -> Optional[ExecutionBackend]:
+        """The PHP fork server, if enabled."""
+        return self._get_fork_server('php')
 
-    def validate_syntax(self, script_path: str) -> Optional[str]:
+    def _check_syntax(self, script_path: str) -> SyntaxCheck:
         """
-        Validate PHP syntax.
+        Validate PHP syntax with ``-l``.
 
         Args:
             script_path: Path to PHP file
 
         Returns:
-            Error message if syntax is invalid, None otherwise
+            Syntax check result
         """
-        try:
-            result = subprocess.run(
-                [self.get_executable(), '-l', script_path],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
+        return self._run_syntax_tool([self.get_executable(), '-l', script_path],
+                                     script_path, r'on line (\d+)')
 
-            if result.returncode != 0:
-                return f"Syntax error in {script_path}: {result.stderr}"
+    def _check_syntax_batch(self, script_paths: List[str]) -> Dict[str, SyntaxCheck]:
+        """
+        Validate many PHP files with one ``php -l`` per chunk.
 
-            return None
+        Linting several files in one call needs PHP 8.3; older versions,
+        and any file the combined output does not account for, are checked
+        one at a time.
 
-        except Exception as e:
-            return f"Error validating {script_path}: {e}"
+        Args:
+            script_paths: Paths to PHP files
+
+        Returns:
+            Syntax check result for each path
+        """
+        version = re.match(r'PHP (\d+)\.(\d+)', self.probe_executable().version or '')
+        if (len(script_paths) < 2 or version is None
+                or (int(version.group(1)), int(version.group(2))) < (8, 3)):
+            return super()._check_syntax_batch(script_paths)
+
+        results: Dict[str, SyntaxCheck] = {}
+        for start in range(0, len(script_paths), PHP_LINT_BATCH_SIZE):
+            chunk = script_paths[start:start + PHP_LINT_BATCH_SIZE]
+            try:
+                completed = subprocess.run(
+                    [self.get_executable(), '-l', *chunk],
+                    capture_output=True,
+                    text=True,
+                    timeout=SYNTAX_CHECK_TIMEOUT + SYNTAX_CHECK_TIMEOUT_PER_FILE * len(chunk)
+                )
+            except (subprocess.SubprocessError, OSError) as e:
+                logger.debug(f"Batched PHP syntax check failed: {e}")
+                continue
+
+            output = f"{completed.stdout}\n{completed.stderr}"
+            for script_path in chunk:
+                if f"No syntax errors detected in {script_path}" in output:
+                    results[script_path] = SyntaxCheck(ok=True)
+                    continue
+                error = re.search(
+                    r'(?:PHP )?(?:Parse|Fatal) error:.*? in ' + re.escape(script_path)
+                    + r' on line (\d+)', output)
+                if error and f"Errors parsing {script_path}" in output:
+                    results[script_path] = self._syntax_error(
+                        script_path, error.group(0), r'on line (\d+)')
+
+        remaining = [path for path in script_paths if path not in results]
+        results.update(super()._check_syntax_batch(remaining))
+        return results
 
 
 class RunnerFactory:
@@ -352,13 +1176,25 @@ class RunnerFactory:
     }
 
     @classmethod
-    def create_runner(cls, script_type: ScriptType, config: Dict[str, Any]) -> BaseRunner:
+    def create_runner(cls, script_type: ScriptType, config: Dict[str, Any],
+                      shebang: Optional[Shebang] = None,
+                      stream_output: bool = False,
+                      output_limits: Optional[OutputLimits] = None,
+                      error_watch: Optional[ErrorWatchSettings] = None,
+                      probe_cache: Optional[ProbeCache] = None,
+                      syntax_cache: Optional[SyntaxCache] = None) -> BaseRunner:
         """
         Create a runner for the given script type.
 
         Args:
             script_type: Type of script
             config: Runner configuration
+            shebang: Parsed shebang, reused as the interpreter when enabled
+            stream_output: Echo output to the terminal while scripts run
+            output_limits: Bound the output kept in memory
+            error_watch: Watch live output for fatal errors
+            probe_cache: Remember interpreter availability across runs
+            syntax_cache: Remember syntax check results by file content
 
         Returns:
             Appropriate runner instance
@@ -370,7 +1206,9 @@ class RunnerFactory:
             raise ValueError(f"Unsupported script type: {script_type}")
 
         runner_class = cls._RUNNERS[script_type]
-        return runner_class(config)
+        return runner_class(config, shebang=shebang, stream_output=stream_output,
+                            output_limits=output_limits, error_watch=error_watch,
+                            probe_cache=probe_cache, syntax_cache=syntax_cache)
 
     @classmethod
     def get_supported_types(cls) -> List[ScriptType]:
@@ -378,26 +1216,30 @@ class RunnerFactory:
         return list(cls._RUNNERS.keys())
 
     @classmethod
-    def validate_all_executables(cls, config: Dict[str, Any]) -> Dict[ScriptType, bool]:
+    def validate_all_executables(cls, config: Dict[str, Any],
+                                 probe_cache: Optional[ProbeCache] = None) -> Dict[ScriptType, bool]:
         """
         Validate that all required executables are available.
 
+        The interpreters are probed in parallel.
+
         Args:
             config: Runner configuration
+            probe_cache: Remember interpreter availability across runs
 
         Returns:
             Dictionary mapping script types to availability status
         """
-        results = {}
-
-        for script_type in cls._RUNNERS:
+        def validate(script_type: ScriptType) -> bool:
             try:
-                runner = cls.create_runner(script_type, config)
-                results[script_type] = runner.validate_executable()
+                runner = cls.create_runner(script_type, config, probe_cache=probe_cache)
+                return runner.validate_executable()
             except Exception:
-                results[script_type] = False
+                return False
 
-        return results
+        script_types = list(cls._RUNNERS)
+        with ThreadPoolExecutor(max_workers=len(script_types)) as executor:
+            return dict(zip(script_types, executor.map(validate, script_types)))
 
 
 class ExecutionContext:
@@ -0,0 +1,387 @@
+"""
+Syntax check cache for AIRun.
+"""
+import ast
+import atexit
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+
+from .detection_cache import CACHE_ERRORS
+
+logger = logging.getLogger(__name__)
+
+# Stands in for the script path inside cached error text, so one entry can
+# answer for every file with the same content
+PATH_MARKER = '\ue000'
+
+# Python parse trees kept in memory for reuse by the AI fixer
+PARSE_TREE_CACHE_SIZE = 32
+
+
+@dataclass
+class SyntaxCheck:
+    """Outcome of checking one file's syntax."""
+    ok: bool
+    line: Optional[int] = None
+    column: Optional[int] = None
+    detail: Optional[str] = None
+    # False when the check itself failed (unreadable file, missing
+    # interpreter); such results are reported but never cached
+    cacheable: bool = True
+
+    @classmethod
+    def failed(cls, detail: str) -> "SyntaxCheck":
+        """Result for a check that could not be carried out."""
+        return cls(ok=False, detail=detail, cacheable=False)
+
+    def message(self, script_path: str) -> Optional[str]:
+        """
+        Format the error for a file.
+
+        Args:
+            script_path: File the result is reported for
+
+        Returns:
+            Error message, or None if the syntax is valid
+        """
+        if self.ok:
+            return None
+        detail = (self.detail or '').replace(PATH_MARKER, script_path)
+        if not self.cacheable:
+            return detail
+        location = f"{script_path}:{self.line}" if self.line else script_path
+        return f"Syntax error in {location}: {detail}"
+
+
+def content_digest(data: bytes) -> str:
+    """Hash file content for use as a cache key."""
+    return hashlib.blake2b(data, digest_size=20).hexdigest()
+
+
+_parse_trees: "OrderedDict[str, ast.Module]" = OrderedDict()
+_parse_trees_lock = threading.Lock()
+
+
+def parse_python(source: str, filename: str = '<unknown>') -> ast.Module:
+    """
+    Parse Python source, reusing the tree of recently parsed content.
+
+    Syntax checking and the AI fixer both need the tree of the same file, so
+    the last few trees are kept in memory keyed by content. The returned
+    tree is shared and must not be modified.
+
+    Args:
+        source: Python source code
+        filename: File name used in syntax errors
+
+    Returns:
+        Parsed module
+
+    Raises:
+        SyntaxError: If the source does not parse
+    """
+    digest = content_digest(source.encode('utf-8', errors='surrogatepass'))
+    with _parse_trees_lock:
+        tree = _parse_trees.get(digest)
+        if tree is not None:
+            _parse_trees.move_to_end(digest)
+            return tree
+
+    tree = ast.parse(source, filename)
+
+    with _parse_trees_lock:
+        _parse_trees[digest] = tree
+        while len(_parse_trees) > PARSE_TREE_CACHE_SIZE:
+            _parse_trees.popitem(last=False)
+    return tree
+
+
+# Caches with an open connection, flushed and closed at interpreter exit
+_open_caches: "weakref.WeakSet[SyntaxCache]" = weakref.WeakSet()
+
+
+@atexit.register
+def _close_open_caches() -> None:
+    """Flush and close every syntax cache still open at exit."""
+    for cache in list(_open_caches):
+        cache.close()
+
+
+class SyntaxCache:
+    """
+    On-disk cache of syntax check results keyed by file content.
+
+    Entries are keyed by a hash of the file's bytes plus a checker
+    fingerprint (interpreter path and mtime, or the Python version for
+    in-process checks), so any edit or interpreter upgrade misses while
+    unchanged files are answered without running a checker. Like the
+    detection cache this is a SQLite database in WAL mode, and any database
+    error degrades to a cache miss; a cache that cannot be opened is
+    disabled. Lookups are plain reads, with LRU timestamps buffered until
+    the next store, ``FLUSH_INTERVAL`` hits, or ``close``. One instance may
+    be shared by threads.
+    """
+
+    DEFAULT_FILENAME = "syntax.sqlite3"
+    DEFAULT_MAX_ENTRIES = 50000
+    # Buffered LRU touches written out in one transaction
+    FLUSH_INTERVAL = 256
+    # Stores between re-reading the entry count written by other processes
+    RECOUNT_INTERVAL = 64
+
+    def __init__(self, cache_dir: Union[str, Path],
+                 max_entries: int = DEFAULT_MAX_ENTRIES,
+                 filename: str = DEFAULT_FILENAME):
+        """
+        Initialize the syntax cache.
+
+        Args:
+            cache_dir: Directory holding the cache database
+            max_entries: Maximum number of entries kept before LRU eviction
+            filename: Database file name inside ``cache_dir``
+        """
+        self.path = Path(cache_dir) / filename
+        self.max_entries = max_entries
+        self._connection: Optional[sqlite3.Connection] = None
+        self._disabled = False
+        self._lock = threading.Lock()
+        self._pending_touches: Dict[Tuple[str, str], float] = {}
+        # Running entry count, re-read from the database periodically
+        self._entry_count: Optional[int] = None
+        self._puts_since_recount = 0
+
+    @classmethod
+    def from_config(cls, config: Any) -> Optional["SyntaxCache"]:
+        """
+        Create the cache configured by ``syntax_cache`` and ``cache_dir``.
+
+        Args:
+            config: Configuration object
+
+        Returns:
+            SyntaxCache instance, or None when disabled
+        """
+        cache_dir = getattr(config, 'cache_dir', None)
+        if not getattr(config, 'syntax_cache', True) or not isinstance(cache_dir, (str, Path)):
+            return None
+        return cls(cache_dir)
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Open the database lazily and create the schema if needed.
+
+        Raises:
+            sqlite3.Error, OSError: If the database cannot be opened; the
+                cache is then disabled and later calls fail immediately
+        """
+        if self._connection is None:
+            if self._disabled:
+                raise sqlite3.OperationalError(f"Syntax cache disabled: {self.path}")
+            connection = None
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                connection = sqlite3.connect(str(self.path), timeout=5.0,
+                                             isolation_level=None,
+                                             check_same_thread=False)
+                self._create_schema(connection)
+            except CACHE_ERRORS as e:
+                self._disabled = True
+                if connection is not None:
+                    connection.close()
+                logger.debug(f"Syntax cache unavailable, disabling it: {e}")
+                raise
+            self._connection = connection
+            _open_caches.add(self)
+        return self._connection
+
+    @staticmethod
+    def _create_schema(connection: sqlite3.Connection) -> None:
+        """Configure the connection and create the table if needed."""
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute("""
+            CREATE TABLE IF NOT EXISTS syntax_checks (
+                digest TEXT NOT NULL,
+                checker TEXT NOT NULL,
+                ok INTEGER NOT NULL,
+                line INTEGER,
+                col INTEGER,
+                detail TEXT,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (digest, checker)
+            )
+        """)
+        connection.execute(
+            "CREATE INDEX IF NOT EXISTS syntax_checks_last_used "
+            "ON syntax_checks (last_used)"
+        )
+
+    def get_many(self, digests: Iterable[str], checker: str) -> Dict[str, SyntaxCheck]:
+        """
+        Look up cached results.
+
+        Args:
+            digests: Content digests from ``content_digest``
+            checker: Checker fingerprint
+
+        Returns:
+            Cached results by digest; misses are left out
+        """
+        found: Dict[str, SyntaxCheck] = {}
+        digests = list(dict.fromkeys(digests))
+        try:
+            with self._lock:
+                connection = self._connect()
+                # Stay well below SQLite's bound parameter limit
+                for start in range(0, len(digests), 500):
+                    chunk = digests[start:start + 500]
+                    placeholders = ', '.join('?' * len(chunk))
+                    rows = connection.execute(
+                        "SELECT digest, ok, line, col, detail FROM syntax_checks "
+                        f"WHERE checker = ? AND digest IN ({placeholders})",
+                        (checker, *chunk)
+                    ).fetchall()
+                    for digest, ok, line, column, detail in rows:
+                        found[digest] = SyntaxCheck(ok=bool(ok), line=line,
+                                                    column=column, detail=detail)
+        except CACHE_ERRORS as e:
+            logger.debug(f"Syntax cache lookup failed: {e}")
+            return {}
+
+        if found:
+            now = time.time()
+            with self._lock:
+                for digest in found:
+                    self._pending_touches[(digest, checker)] = now
+                flush = len(self._pending_touches) >= self.FLUSH_INTERVAL
+            if flush:
+                self.flush()
+        return found
+
+    def put_many(self, results: Dict[str, SyntaxCheck], checker: str) -> None:
+        """
+        Store results; those that are not cacheable are skipped.
+
+        Args:
+            results: Results by content digest
+            checker: Checker fingerprint
+        """
+        now = time.time()
+        rows = [(digest, checker, int(check.ok), check.line, check.column,
+                 check.detail, now)
+                for digest, check in results.items() if check.cacheable]
+        if not rows:
+            return
+        try:
+            with self._lock:
+                connection = self._connect()
+                with connection:
+                    connection.execute("BEGIN IMMEDIATE")
+                    self._write_pending(connection)
+                    # Results are keyed by content, so an existing entry
+                    # already holds the same result
+                    inserted = connection.executemany(
+                        "INSERT OR IGNORE INTO syntax_checks "
+                        "(digest, checker, ok, line, col, detail, last_used) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        rows
+                    ).rowcount
+                    if inserted < len(rows):
+                        connection.executemany(
+                            "UPDATE syntax_checks SET last_used = ? "
+                            "WHERE digest = ? AND checker = ?",
+                            [(now, row[0], checker) for row in rows]
+                        )
+                    self._evict(connection, inserted)
+        except CACHE_ERRORS as e:
+            self._entry_count = None
+            logger.debug(f"Syntax cache update failed: {e}")
+
+    def _evict(self, connection: sqlite3.Connection, inserted: int) -> None:
+        """Delete least recently used entries above ``max_entries``."""
+        self._puts_since_recount += 1
+        if self._entry_count is None or self._puts_since_recount >= self.RECOUNT_INTERVAL:
+            self._entry_count = connection.execute(
+                "SELECT COUNT(*) FROM syntax_checks"
+            ).fetchone()[0]
+            self._puts_since_recount = 0
+        else:
+            self._entry_count += inserted
+
+        excess = self._entry_count - self.max_entries
+        if excess > 0:
+            self._entry_count -= connection.execute(
+                "DELETE FROM syntax_checks WHERE rowid IN ("
+                "SELECT rowid FROM syntax_checks ORDER BY last_used LIMIT ?)",
+                (excess,)
+            ).rowcount
+
+    def _write_pending(self, connection: sqlite3.Connection) -> None:
+        """Write buffered LRU touches inside an open transaction; the lock must be held."""
+        if self._pending_touches:
+            connection.executemany(
+                "UPDATE syntax_checks SET last_used = MAX(last_used, ?) "
+                "WHERE digest = ? AND checker = ?",
+                [(used, digest, checker)
+                 for (digest, checker), used in self._pending_touches.items()]
+            )
+        self._pending_touches = {}
+
+    def flush(self) -> None:
+        """Write buffered LRU touches to the database."""
+        try:
+            with self._lock:
+                if not self._pending_touches:
+                    return
+                connection = self._connect()
+                with connection:
+                    connection.execute("BEGIN IMMEDIATE")
+                    self._write_pending(connection)
+        except CACHE_ERRORS as e:
+            with self._lock:
+                self._pending_touches = {}
+            logger.debug(f"Syntax cache flush failed: {e}")
+
+    def __len__(self) -> int:
+        try:
+            with self._lock:
+                return self._connect().execute(
+                    "SELECT COUNT(*) FROM syntax_checks"
+                ).fetchone()[0]
+        except CACHE_ERRORS as e:
+            logger.debug(f"Syntax cache size unavailable: {e}")
+            return 0
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        try:
+            with self._lock:
+                self._pending_touches = {}
+                connection = self._connect()
+                with connection:
+                    connection.execute("BEGIN IMMEDIATE")
+                    connection.execute("DELETE FROM syntax_checks")
+                self._entry_count = 0
+        except CACHE_ERRORS as e:
+            logger.debug(f"Syntax cache clear failed: {e}")
+
+    def close(self) -> None:
+        """Flush buffered updates and close the database connection."""
+        self.flush()
+        with self._lock:
+            if self._connection is not None:
+                _open_caches.discard(self)
+                try:
+                    self._connection.close()
+                except CACHE_ERRORS as e:
+                    logger.debug(f"Syntax cache close failed: {e}")
+                self._connection = None
+                self._entry_count = None
@@ -0,0 +1,360 @@
+"""
+Warm Python interpreter pool for AIRun.
+"""
+import array
+import atexit
+import json
+import logging
+import os
+import signal
+import socket
+import struct
+import subprocess
+import threading
+from pathlib import Path
+from typing import Any, Dict, IO, List, Optional, Tuple
+
+from .backends import BackendUnavailable, ExecutionBackend, MessageChannel
+
+logger = logging.getLogger(__name__)
+
+WORKER_SOURCE_PATH = Path(__file__).with_name('pool_worker.py')
+
+DEFAULT_PRELOAD = [
+    'argparse', 'collections', 'datetime', 'json', 'logging', 'pathlib',
+    're', 'subprocess', 'typing',
+]
+
+
+class WorkerUnavailable(BackendUnavailable):
+    """Raised when the pool cannot run a job; callers fall back to subprocess."""
+
+
+class _Worker:
+    """One pre-started interpreter serving jobs over a Unix socket."""
+
+    def __init__(self, executable: str, preload: List[str], start_timeout: float):
+        """
+        Start the worker and wait until its preload imports are done.
+
+        Raises:
+            WorkerUnavailable: If the worker cannot be started
+        """
+        self.runs = 0
+        ours, theirs = socket.socketpair()
+        self.sock = ours
+        self.channel = MessageChannel(ours)
+        try:
+            source = WORKER_SOURCE_PATH.read_text(encoding='utf-8')
+            self.process = subprocess.Popen(
+                [executable, '-c', source, str(theirs.fileno()), json.dumps(preload)],
+                pass_fds=(theirs.fileno(),),
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                # Terminal signals are for the scripts, not the pool
+                start_new_session=True
+            )
+        except OSError as e:
+            ours.close()
+            raise WorkerUnavailable(f"Cannot start Python worker: {e}")
+        finally:
+            theirs.close()
+
+        try:
+            ready = self.read_message(start_timeout)
+        except (OSError, subprocess.TimeoutExpired) as e:
+            self.stop()
+            raise WorkerUnavailable(f"Python worker did not start: {e}")
+        if not ready or not ready.get('ready'):
+            self.stop()
+            raise WorkerUnavailable("Python worker exited during startup")
+        logger.debug(f"Started Python worker {self.process.pid} with "
+                     f"{ready.get('preloaded')} preloaded")
+
+    @property
+    def alive(self) -> bool:
+        """Whether the worker process is still running."""
+        return self.process.poll() is None
+
+    def read_message(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Read the next JSON line from the worker.
+
+        Returns:
+            Decoded message, or None if the worker closed the connection
+
+        Raises:
+            subprocess.TimeoutExpired: If no full message arrives in time
+        """
+        return self.channel.read(timeout)
+
+    def submit(self, job: Dict[str, Any], fds: Tuple[int, int, int]) -> int:
+        """
+        Send a job with its stdin, stdout and stderr descriptors.
+
+        Returns:
+            Pid of the forked child running the job
+
+        Raises:
+            WorkerUnavailable: If the worker did not accept the job
+        """
+        payload = json.dumps(job).encode('utf-8')
+        try:
+            self.sock.sendmsg(
+                [struct.pack('>I', len(payload))],
+                [(socket.SOL_SOCKET, socket.SCM_RIGHTS, array.array('i', fds))]
+            )
+            self.sock.sendall(payload)
+            started = self.read_message(timeout=10.0)
+        except (OSError, subprocess.TimeoutExpired) as e:
+            raise WorkerUnavailable(f"Python worker rejected job: {e}")
+        if not started or 'pid' not in started:
+            raise WorkerUnavailable("Python worker exited before starting the job")
+        self.runs += 1
+        return started['pid']
+
+    def stop(self) -> None:
+        """Shut the worker down; closing the socket makes it exit."""
+        self.sock.close()
+        try:
+            self.process.wait(timeout=1.0)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+
+
+class PooledProcess:
+    """
+    ``subprocess.Popen`` look-alike for a script running in a pool worker.
+
+    Provides the subset used by the runners: ``pid``, ``stdout``,
+    ``stderr``, ``returncode``, ``poll``, ``wait`` and ``kill``.
+    """
+
+    def __init__(self, pool: "PythonWorkerPool", worker: _Worker, pid: int,
+                 stdout: IO[bytes], stderr: IO[bytes]):
+        self.args = ['<python worker>']
+        self.pid = pid
+        self.stdout = stdout
+        self.stderr = stderr
+        self.returncode: Optional[int] = None
+        self._pool = pool
+        self._worker = worker
+
+    def poll(self) -> Optional[int]:
+        """Return the exit code if the script has finished, else None."""
+        if self.returncode is None:
+            try:
+                self.wait(timeout=0)
+            except subprocess.TimeoutExpired:
+                pass
+        return self.returncode
+
+    def wait(self, timeout: Optional[float] = None) -> int:
+        """Wait for the script to finish and return its exit code."""
+        if self.returncode is not None:
+            return self.returncode
+
+        try:
+            message = self._worker.read_message(timeout)
+        except OSError:
+            message = None
+
+        if message is None or 'returncode' not in message:
+            # The worker died under the job; make sure the job dies too
+            logger.warning(f"Python worker lost while running pid {self.pid}")
+            self._signal(signal.SIGKILL)
+            self.returncode = -signal.SIGKILL
+            self._pool.release(self._worker, broken=True)
+        else:
+            self.returncode = message['returncode']
+            self._pool.release(self._worker)
+        return self.returncode
+
+    def kill(self) -> None:
+        """Kill the script and anything it started."""
+        if self.returncode is None:
+            self._signal(signal.SIGKILL)
+
+    def terminate(self) -> None:
+        """Ask the script to stop."""
+        if self.returncode is None:
+            self._signal(signal.SIGTERM)
+
+    def _signal(self, signum: int) -> None:
+        try:
+            os.killpg(self.pid, signum)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+
+class PythonWorkerPool(ExecutionBackend):
+    """
+    Pool of warm Python interpreters.
+
+    Each worker imports the preload modules once and then forks a fresh
+    child per script, so scripts start without interpreter boot or stdlib
+    import cost but still cannot see each other's state. Workers are
+    replaced after ``recycle_after`` runs to bound memory drift. At most
+    ``size`` scripts run through the pool at once.
+    """
+
+    def __init__(self, executable: str, size: int = 4, recycle_after: int = 100,
+                 preload: Optional[List[str]] = None, start_timeout: float = 10.0):
+        """
+        Initialize the pool.
+
+        Args:
+            executable: Python interpreter for the workers
+            size: Number of workers
+            recycle_after: Runs after which a worker is replaced, 0 for never
+            preload: Modules imported by each worker before serving jobs
+            start_timeout: Seconds to wait for a worker to become ready
+        """
+        self.executable = executable
+        self.size = max(1, size)
+        self.recycle_after = recycle_after
+        self.preload = list(DEFAULT_PRELOAD if preload is None else preload)
+        self.start_timeout = start_timeout
+
+        self._idle: List[_Worker] = []
+        self._busy = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+    def start(self) -> None:
+        """Pre-start every worker so the first runs are already warm."""
+        started = []
+        for _ in range(self.size - len(self._idle) - self._busy):
+            try:
+                started.append(_Worker(self.executable, self.preload,
+                                       self.start_timeout))
+            except WorkerUnavailable as e:
+                logger.warning(f"Python worker pool degraded: {e}")
+                break
+        with self._condition:
+            self._idle.extend(started)
+            self._condition.notify_all()
+
+    def _acquire(self) -> _Worker:
+        """Take an idle worker, starting one if the pool has room."""
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise WorkerUnavailable("Python worker pool is closed")
+                while self._idle:
+                    worker = self._idle.pop()
+                    if worker.alive:
+                        self._busy += 1
+                        return worker
+                    worker.stop()
+                if len(self._idle) + self._busy < self.size:
+                    self._busy += 1
+                    break
+                self._condition.wait()
+
+        try:
+            return _Worker(self.executable, self.preload, self.start_timeout)
+        except WorkerUnavailable:
+            with self._condition:
+                self._busy -= 1
+                self._condition.notify()
+            raise
+
+    def release(self, worker: _Worker, broken: bool = False) -> None:
+        """Return a worker after its job has finished."""
+        recycle = (broken or not worker.alive
+                   or (self.recycle_after and worker.runs >= self.recycle_after))
+        with self._condition:
+            self._busy -= 1
+            if not recycle and not self._closed:
+                self._idle.append(worker)
+            self._condition.notify()
+        if recycle or self._closed:
+            worker.stop()
+
+    def spawn(self, script_path: str, args: List[str], cwd: Optional[str],
+              env: Dict[str, str]) -> PooledProcess:
+        """
+        Run a script in a forked child of a warm worker.
+
+        The child's stdout and stderr are pipes read through the returned
+        handle, exactly as with ``subprocess.Popen(stdout=PIPE, stderr=PIPE)``.
+
+        Raises:
+            WorkerUnavailable: If no worker could take the job
+        """
+        worker = self._acquire()
+        stdout_read, stdout_write = os.pipe()
+        stderr_read, stderr_write = os.pipe()
+        job = {
+            'script': os.path.abspath(script_path),
+            'argv0': script_path,
+            'args': list(args or []),
+            'cwd': cwd or os.getcwd(),
+            'env': env,
+        }
+        try:
+            pid = worker.submit(job, (0, stdout_write, stderr_write))
+        except WorkerUnavailable:
+            os.close(stdout_read)
+            os.close(stderr_read)
+            self.release(worker, broken=True)
+            raise
+        finally:
+            os.close(stdout_write)
+            os.close(stderr_write)
+
+        return PooledProcess(self, worker, pid,
+                             open(stdout_read, 'rb', buffering=0),
+                             open(stderr_read, 'rb', buffering=0))
+
+    def close(self) -> None:
+        """Stop all idle workers; busy ones stop when their job ends."""
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._condition.notify_all()
+        for worker in idle:
+            worker.stop()
+
+
+_pools: Dict[Tuple[Any, ...], PythonWorkerPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_worker_pool(executable: str, size: int = 4, recycle_after: int = 100,
+                    preload: Optional[List[str]] = None) -> PythonWorkerPool:
+    """
+    Get the process-wide pool for these settings, starting it on first use.
+
+    Args:
+        executable: Python interpreter for the workers
+        size: Number of workers
+        recycle_after: Runs after which a worker is replaced
+        preload: Modules imported by each worker
+
+    Returns:
+        Shared, started worker pool
+    """
+    key = (executable, size, recycle_after,
+           tuple(DEFAULT_PRELOAD if preload is None else preload))
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = PythonWorkerPool(executable, size=size,
+                                    recycle_after=recycle_after, preload=preload)
+            pool.start()
+            _pools[key] = pool
+    return pool
+
+
+@atexit.register
+def shutdown_worker_pools() -> None:
+    """Stop every shared pool."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
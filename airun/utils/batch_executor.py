@@ -1,26 +1,437 @@
 """
-Batch execution utility (minimal implementation).
+Batch execution utility.
 """
-from typing import List
-from airun.core.runners import ExecutionResult
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Union
+
+from airun.core.ai_fixer import AIFixer
+from airun.core.config import get_config
+from airun.core.detector import ScriptDetector, ScriptType
+from airun.core.process import OutputLimits
+from airun.core.probe_cache import ProbeCache
+from airun.core.runners import ExecutionResult, RunnerFactory
+from airun.utils.batch_manifest import BatchManifest
+from airun.utils.batch_report import BatchReportWriter
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one script in a batch."""
+    index: int
+    script_path: str
+    script_type: ScriptType
+    result: ExecutionResult
+    fix_attempts: int = 0
+
+
+NODE_SUCCEEDED = 'succeeded'
+NODE_FAILED = 'failed'
+NODE_CANCELLED = 'cancelled'
+
+
+@dataclass
+class NodeOutcome:
+    """Outcome of one script of a manifest run; times are seconds from the run's start."""
+    name: str
+    script_path: str
+    status: str
+    result: Optional[ExecutionResult] = None
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    cancelled_by: Optional[str] = None
+    fix_attempts: int = 0
+
+    @property
+    def duration(self) -> float:
+        """Seconds the script ran, 0 if it never started."""
+        if self.started is None or self.finished is None:
+            return 0.0
+        return self.finished - self.started
+
+
+@dataclass
+class DagReport:
+    """Results and timing of a manifest run."""
+    manifest: BatchManifest
+    outcomes: Dict[str, NodeOutcome]
+    wall_time: float
+    critical_path: List[str] = field(default_factory=list)
+
+    @property
+    def succeeded(self) -> bool:
+        """Whether every script ran and succeeded."""
+        return all(outcome.status == NODE_SUCCEEDED for outcome in self.outcomes.values())
+
+    def count(self, status: str) -> int:
+        """Number of scripts that ended with ``status``."""
+        return sum(1 for outcome in self.outcomes.values() if outcome.status == status)
+
+    def format(self) -> str:
+        """
+        Render the run as text, including where the wall time went.
+
+        The critical path is the chain that ended last: starting from the
+        last script to finish, each step goes back to the dependency that
+        finished last, i.e. the one its start was waiting for. Time between
+        that dependency finishing and the script starting was spent waiting
+        for a free worker.
+        """
+        lines = [
+            f"Batch run: {len(self.outcomes)} scripts, {self.count(NODE_SUCCEEDED)} succeeded, "
+            f"{self.count(NODE_FAILED)} failed, {self.count(NODE_CANCELLED)} cancelled "
+            f"in {self.wall_time:.2f}s",
+        ]
+        width = max(len(name) for name in self.outcomes)
+        for name in self.manifest.topological_order():
+            outcome = self.outcomes[name]
+            if outcome.status == NODE_CANCELLED:
+                lines.append(f"  {name:<{width}}  cancelled ({outcome.cancelled_by} failed)")
+            else:
+                lines.append(f"  {name:<{width}}  {outcome.status:<9}  "
+                             f"{outcome.started:7.2f}s -> {outcome.finished:7.2f}s  "
+                             f"({outcome.duration:.2f}s)")
+
+        if self.critical_path:
+            lines.append("")
+            lines.append(f"Critical path ({self.outcomes[self.critical_path[-1]].finished:.2f}s "
+                         f"of {self.wall_time:.2f}s wall time):")
+            previous_finish = 0.0
+            for name in self.critical_path:
+                outcome = self.outcomes[name]
+                share = outcome.duration / self.wall_time * 100 if self.wall_time else 0.0
+                line = f"  {name:<{width}}  {outcome.duration:7.2f}s  {share:5.1f}%"
+                waited = outcome.started - previous_finish
+                if waited >= 0.01:
+                    line += f"  (waited {waited:.2f}s for a worker)"
+                lines.append(line)
+                previous_finish = outcome.finished
+        return "\n".join(lines)
+
+
+def critical_path(manifest: BatchManifest, outcomes: Dict[str, NodeOutcome]) -> List[str]:
+    """
+    Find the chain of scripts that determined when a manifest run ended.
+
+    Args:
+        manifest: Manifest that was run
+        outcomes: Outcomes by script name
+
+    Returns:
+        Script names from the first to the last script of the chain
+    """
+    ran = {name: outcome for name, outcome in outcomes.items() if outcome.finished is not None}
+    if not ran:
+        return []
+
+    name = max(ran, key=lambda candidate: ran[candidate].finished)
+    path = [name]
+    while True:
+        dependencies = [dependency for dependency in manifest.nodes[name].depends_on
+                        if dependency in ran]
+        if not dependencies:
+            break
+        name = max(dependencies, key=lambda candidate: ran[candidate].finished)
+        path.append(name)
+    return list(reversed(path))
+
 
 class BatchExecutor:
-    """Executes multiple scripts in batch."""
+    """
+    Executes multiple scripts in batch.
+
+    Each script is detected with ``ScriptDetector``, given a runner by
+    ``RunnerFactory`` and run on a bounded pool of worker threads. Every
+    worker only waits on its script's interpreter process, so ``max_workers``
+    scripts run on the CPUs at once. Paths are consumed lazily, one per
+    free worker, so very large batches use constant memory.
+    """
+
+    def __init__(self, config: Any = None, max_workers: Optional[int] = None,
+                 timeout: Optional[float] = None, fixer: Optional[AIFixer] = None,
+                 max_retries: Optional[int] = None):
+        """
+        Initialize the batch executor.
+
+        Args:
+            config: Configuration object; the global configuration if None
+            max_workers: Scripts run at once (defaults to the CPU count)
+            timeout: Per-script timeout in seconds (defaults to ``config.timeout``)
+            fixer: AI fixer to repair failing scripts with; None disables fixing
+            max_retries: Fix attempts per script (defaults to ``config.max_retries``)
+        """
+        self.config = config if config is not None else get_config()
+        self.fixer = fixer
+        self.max_retries = (max_retries if max_retries is not None
+                            else getattr(self.config, 'max_retries', 3))
+        self.max_workers = max(1, max_workers or os.cpu_count() or 1)
+        self.timeout = timeout if timeout is not None else getattr(self.config, 'timeout', 300)
+        self._local = threading.local()
+        self.output_limits = OutputLimits.from_config(self.config)
+        self.probe_cache = ProbeCache.from_config(self.config)
+
+    @property
+    def detector(self) -> ScriptDetector:
+        """This thread's detector; detection cache connections are per thread."""
+        detector = getattr(self._local, 'detector', None)
+        if detector is None:
+            detector = ScriptDetector.from_config(self.config)
+            self._local.detector = detector
+        return detector
+
+    def _runner_config(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        runners = getattr(self.config, 'runners', None)
+        return dict(runners if isinstance(runners, dict) else {},
+                    timeout=self.timeout if timeout is None else timeout)
+
+    def run_script(self, script_path: str, timeout: Optional[float] = None) -> BatchResult:
+        """
+        Detect and run a single script.
+
+        Args:
+            script_path: Script to run
+            timeout: Timeout for this script, overriding the batch timeout
+
+        Returns:
+            Batch result; index is 0
+        """
+        start_time = time.perf_counter()
+        try:
+            detector = self.detector
+            script_type = detector.detect_type(script_path)
+            if script_type == ScriptType.UNKNOWN:
+                return BatchResult(0, script_path, script_type, ExecutionResult(
+                    exit_code=-3,
+                    stdout="",
+                    stderr="Unable to determine script type",
+                    execution_time=time.perf_counter() - start_time,
+                    error_detected=True,
+                    script_path=script_path
+                ))
+
+            runner = RunnerFactory.create_runner(
+                script_type, self._runner_config(timeout),
+                shebang=detector.detect_shebang(script_path),
+                output_limits=self.output_limits,
+                probe_cache=self.probe_cache
+            )
+            # Runners start scripts in their own directory, so the path must not be relative
+            absolute_path = os.path.abspath(script_path)
+            result = runner.execute(absolute_path)
+            fix_attempts = 0
+            while (self.fixer is not None and result.error_detected
+                   and fix_attempts < self.max_retries):
+                fix_attempts += 1
+                if not self.fixer.fix_script_error(script_path, script_type, result):
+                    break
+                result.close()
+                result = runner.execute(absolute_path)
+
+            result.script_type = script_type
+            return BatchResult(0, script_path, script_type, result, fix_attempts)
+
+        except Exception as e:
+            logger.error(f"Batch execution of {script_path} failed: {e}")
+            return BatchResult(0, script_path, ScriptType.UNKNOWN, ExecutionResult(
+                exit_code=-3,
+                stdout="",
+                stderr=f"Execution error: {e}",
+                execution_time=time.perf_counter() - start_time,
+                error_detected=True,
+                script_path=script_path
+            ))
+
+    def iter_batch(self, script_paths: Iterable[str], stop_on_error: bool = False,
+                   max_workers: Optional[int] = None) -> Iterator[BatchResult]:
+        """
+        Run scripts, yielding each result as soon as its script finishes.
+
+        Results arrive in completion order; ``BatchResult.index`` gives the
+        script's position in ``script_paths``. With ``stop_on_error``, no
+        new script is started after the first failure; scripts already
+        running are allowed to finish and are still yielded.
+
+        Args:
+            script_paths: Scripts to run
+            stop_on_error: Stop scheduling after the first failed script
+            max_workers: Scripts run at once, overriding the executor's setting
+
+        Yields:
+            Batch results
+        """
+        workers = max_workers or self.max_workers
+        indexes: Dict[Future, int] = {}
+        pending: Set[Future] = set()
+        paths = iter(enumerate(script_paths))
+        failed = False
+
+        executor = ThreadPoolExecutor(max_workers=workers,
+                                      thread_name_prefix='airun-batch')
+        try:
+            while True:
+                # One script per worker: nothing waits in a queue, so paths are read
+                # lazily and stop_on_error never starts an already-queued script
+                while not failed and len(pending) < workers:
+                    item = next(paths, None)
+                    if item is None:
+                        break
+                    index, path = item
+                    future = executor.submit(self.run_script, path)
+                    indexes[future] = index
+                    pending.add(future)
+
+                if not pending:
+                    break
+
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    batch_result = future.result()
+                    batch_result.index = indexes.pop(future)
+                    if stop_on_error and batch_result.result.error_detected:
+                        failed = True
+                    yield batch_result
+        finally:
+            # Reached on stop, error or when the consumer stops iterating
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+    def execute_batch(self, script_paths: List[str], parallel: bool = True,
+                      stop_on_error: bool = False,
+                      on_result: Optional[Callable[[BatchResult], None]] = None
+                      ) -> List[ExecutionResult]:
+        """
+        Execute multiple scripts.
+
+        Args:
+            script_paths: Scripts to run
+            parallel: Run up to ``max_workers`` scripts at once; one at a time if False
+            stop_on_error: Stop starting scripts after the first failure
+            on_result: Called with each result as soon as its script finishes
+
+        Returns:
+            Results in the order of ``script_paths``; scripts never started
+            because of ``stop_on_error`` are left out
+        """
+        results: Dict[int, ExecutionResult] = {}
+        for batch_result in self.iter_batch(script_paths, stop_on_error=stop_on_error,
+                                            max_workers=None if parallel else 1):
+            results[batch_result.index] = batch_result.result
+            if on_result is not None:
+                on_result(batch_result)
+
+        return [results[index] for index in sorted(results)]
+
+    def execute_manifest(self, manifest: BatchManifest,
+                         on_result: Optional[Callable[[NodeOutcome], None]] = None,
+                         stop_on_error: bool = False) -> DagReport:
+        """
+        Run the scripts of a manifest in dependency order.
+
+        A script starts as soon as all of its dependencies have succeeded
+        and a worker is free, so independent branches run in parallel up
+        to ``max_workers``. When a script fails, only the scripts that
+        depend on it, directly or transitively, are cancelled; the rest of
+        the graph keeps running. With ``stop_on_error`` every script not yet
+        started is cancelled instead, and scripts already running finish.
+
+        Args:
+            manifest: Scripts and their dependencies
+            on_result: Called with each outcome as soon as it is known,
+                including cancellations
+            stop_on_error: Start no further scripts after the first failure
+
+        Returns:
+            Report with every outcome and the critical path
+        """
+        order = manifest.topological_order()
+        children = manifest.dependents()
+        waiting = {name: set(node.depends_on) for name, node in manifest.nodes.items()}
+        ready = deque(name for name in order if not waiting[name])
+        outcomes: Dict[str, NodeOutcome] = {}
+        running: Dict[Future, str] = {}
+        start = time.monotonic()
+
+        def settle(outcome: NodeOutcome) -> None:
+            outcomes[outcome.name] = outcome
+            if on_result is not None:
+                on_result(outcome)
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                      thread_name_prefix='airun-batch')
+        try:
+            while ready or running:
+                while ready and len(running) < self.max_workers:
+                    node = manifest.nodes[ready.popleft()]
+                    outcomes[node.name] = NodeOutcome(node.name, node.path, NODE_SUCCEEDED,
+                                                      started=time.monotonic() - start)
+                    running[executor.submit(self.run_script, node.path, node.timeout)] = node.name
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    outcome = outcomes[name]
+                    batch_result = future.result()
+                    outcome.result = batch_result.result
+                    outcome.fix_attempts = batch_result.fix_attempts
+                    outcome.finished = time.monotonic() - start
+
+                    if outcome.result.error_detected:
+                        outcome.status = NODE_FAILED
+                        settle(outcome)
+                        if stop_on_error:
+                            cancelled = set(order)
+                            ready.clear()
+                        else:
+                            cancelled = manifest.descendants(name)
+                        for descendant in order:
+                            if descendant in cancelled and descendant not in outcomes:
+                                settle(NodeOutcome(descendant, manifest.nodes[descendant].path,
+                                                   NODE_CANCELLED, cancelled_by=name))
+                        continue
+
+                    settle(outcome)
+                    for child in children[name]:
+                        waiting[child].discard(name)
+                        if not waiting[child] and child not in outcomes and child not in ready:
+                            ready.append(child)
+        finally:
+            executor.shutdown(wait=True)
+
+        return DagReport(
+            manifest=manifest,
+            outcomes={name: outcomes[name] for name in order},
+            wall_time=time.monotonic() - start,
+            critical_path=critical_path(manifest, outcomes)
+        )
 
-    def execute_batch(self, script_paths: List[str], parallel: bool = False,
-                     stop_on_error: bool = False) -> List[ExecutionResult]:
-        """Execute multiple scripts."""
-        import click
-        click.echo("⚠️  Batch execution feature coming in future release!")
+    def generate_report(self, results: Iterable[Union[BatchResult, ExecutionResult]],
+                        output_path: str, report_format: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Write a JSON or HTML report of batch results.
 
-        # Return mock results for now
-        return [ExecutionResult(0, f"Would execute: {path}", "", 0.1)
-                for path in script_paths]
+        Results are written one at a time, so a generator such as
+        ``iter_batch`` can be reported without holding the whole batch.
 
-    def generate_report(self, results: List[ExecutionResult], output_path: str):
-        """Generate batch execution report."""
-        with open(output_path, 'w') as f:
-            f.write("Batch Execution Report\n")
-            f.write("=" * 50 + "\n")
-            f.write("⚠️  Full reporting feature coming soon!\n")
+        Args:
+            results: Batch or execution results
+            output_path: Report file to create
+            report_format: 'json' or 'html'; taken from the extension if None
 
+        Returns:
+            The report summary
+        """
+        with BatchReportWriter(output_path, report_format) as writer:
+            for item in results:
+                if isinstance(item, BatchResult):
+                    writer.add(item.result, item.fix_attempts)
+                else:
+                    writer.add(item)
+        return writer.summary()
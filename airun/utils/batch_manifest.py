@@ -0,0 +1,180 @@
+"""
+Batch manifests declaring dependencies between scripts.
+
+A manifest lives next to a project's ``.airunner.yaml``::
+
+    # .airunner-batch.yaml
+    scripts:
+      migrate: db/migrate.py
+      seed:
+        path: db/seed.py
+        depends_on: [migrate]
+      report:
+        path: reports/build.sh
+        depends_on: [seed]
+        timeout: 600
+
+Paths are relative to the manifest's directory.
+"""
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Union
+
+import yaml
+
+MANIFEST_FILENAME = ".airunner-batch.yaml"
+
+
+class ManifestError(ValueError):
+    """Raised for an invalid batch manifest."""
+
+
+@dataclass
+class BatchNode:
+    """One script in a batch manifest."""
+    name: str
+    path: str
+    depends_on: List[str] = field(default_factory=list)
+    timeout: Optional[float] = None
+
+
+@dataclass
+class BatchManifest:
+    """Scripts of a batch and the dependencies between them."""
+    nodes: Dict[str, BatchNode]
+    source: Optional[Path] = None
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "BatchManifest":
+        """
+        Load and validate a manifest file.
+
+        Args:
+            path: Manifest file, or a project directory containing one
+
+        Returns:
+            Parsed manifest
+
+        Raises:
+            ManifestError: If the file is missing or invalid
+        """
+        path = Path(path)
+        if path.is_dir():
+            path = path / MANIFEST_FILENAME
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = yaml.safe_load(f) or {}
+        except (OSError, yaml.YAMLError) as e:
+            raise ManifestError(f"Cannot read batch manifest {path}: {e}")
+
+        return cls.from_dict(data, base_dir=path.parent, source=path)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], base_dir: Union[str, Path] = '.',
+                  source: Optional[Path] = None) -> "BatchManifest":
+        """
+        Build a manifest from parsed YAML.
+
+        Args:
+            data: Mapping with a ``scripts`` section
+            base_dir: Directory script paths are relative to
+            source: File the data came from, for messages
+
+        Returns:
+            Validated manifest
+
+        Raises:
+            ManifestError: If the data is invalid or has a dependency cycle
+        """
+        scripts = data.get('scripts') if isinstance(data, dict) else None
+        if not isinstance(scripts, dict) or not scripts:
+            raise ManifestError("Batch manifest needs a non-empty 'scripts' mapping")
+
+        nodes = {}
+        for name, spec in scripts.items():
+            name = str(name)
+            if isinstance(spec, str):
+                spec = {'path': spec}
+            if not isinstance(spec, dict) or not spec.get('path'):
+                raise ManifestError(f"Script '{name}' needs a path")
+
+            depends_on = spec.get('depends_on', [])
+            if isinstance(depends_on, str):
+                depends_on = [depends_on]
+            nodes[name] = BatchNode(
+                name=name,
+                path=str(Path(base_dir) / spec['path']),
+                depends_on=[str(dependency) for dependency in depends_on],
+                timeout=spec.get('timeout')
+            )
+
+        for node in nodes.values():
+            for dependency in node.depends_on:
+                if dependency not in nodes:
+                    raise ManifestError(
+                        f"Script '{node.name}' depends on unknown script '{dependency}'")
+
+        manifest = cls(nodes=nodes, source=source)
+        manifest.topological_order()
+        return manifest
+
+    def dependents(self) -> Dict[str, List[str]]:
+        """Map each script to the scripts that depend on it directly."""
+        children: Dict[str, List[str]] = {name: [] for name in self.nodes}
+        for node in self.nodes.values():
+            for dependency in node.depends_on:
+                children[dependency].append(node.name)
+        return children
+
+    def topological_order(self) -> List[str]:
+        """
+        Order scripts so that every script follows its dependencies.
+
+        Returns:
+            Script names in a valid run order
+
+        Raises:
+            ManifestError: If the dependencies contain a cycle
+        """
+        remaining = {name: len(set(node.depends_on)) for name, node in self.nodes.items()}
+        children = self.dependents()
+        ready = [name for name, count in remaining.items() if count == 0]
+        order = []
+        while ready:
+            name = ready.pop()
+            order.append(name)
+            for child in set(children[name]):
+                remaining[child] -= 1
+                if remaining[child] == 0:
+                    ready.append(child)
+
+        if len(order) != len(self.nodes):
+            cycle = sorted(name for name in self.nodes if name not in order)
+            raise ManifestError(f"Dependency cycle between scripts: {', '.join(cycle)}")
+        return order
+
+    def descendants(self, name: str) -> Set[str]:
+        """All scripts that depend on ``name``, directly or transitively."""
+        children = self.dependents()
+        found: Set[str] = set()
+        stack = list(children[name])
+        while stack:
+            child = stack.pop()
+            if child not in found:
+                found.add(child)
+                stack.extend(children[child])
+        return found
+
+
+def find_manifest(project_dir: Union[str, Path] = '.') -> Optional[Path]:
+    """
+    Find the batch manifest of a project.
+
+    Args:
+        project_dir: Project directory
+
+    Returns:
+        Path of the manifest, or None if the project has none
+    """
+    path = Path(project_dir) / MANIFEST_FILENAME
+    return path if path.is_file() else None
@@ -0,0 +1,335 @@
+"""
+Incremental JSON and HTML reports for batch runs.
+
+Each result is written to the report as soon as it arrives; only
+aggregates (latency histograms, the slowest scripts and per-language
+totals) stay in memory, so the size of a batch does not affect memory use.
+"""
+import heapq
+import html
+import itertools
+import json
+import math
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, TextIO, Tuple, Union
+
+from airun.core.runners import ExecutionResult
+
+REPORT_FORMATS = ('json', 'html')
+
+
+class LatencyHistogram:
+    """
+    Log-bucketed latency histogram.
+
+    Buckets grow by a factor of ``2 ** (1 / 8)`` from one millisecond, so
+    percentiles are accurate to within about 9% whatever the number of
+    samples, while memory stays bounded by the range of latencies seen.
+    """
+
+    MIN_VALUE = 0.001
+    SUBBUCKETS = 8  # Buckets per doubling
+
+    def __init__(self):
+        """Initialize an empty histogram."""
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def _index(self, value: float) -> int:
+        if value <= self.MIN_VALUE:
+            return 0
+        return math.ceil(math.log2(value / self.MIN_VALUE) * self.SUBBUCKETS)
+
+    def _upper(self, index: int) -> float:
+        return self.MIN_VALUE * 2 ** (index / self.SUBBUCKETS)
+
+    def record(self, value: float) -> None:
+        """Add one latency in seconds."""
+        index = self._index(value)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """
+        Estimate a percentile.
+
+        Args:
+            fraction: Percentile as a fraction, e.g. 0.99
+
+        Returns:
+            Latency in seconds, or None if the histogram is empty
+        """
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(fraction * self.count))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(max(self._upper(index), self.min), self.max)
+        return self.max
+
+    def doublings(self) -> List[Tuple[float, float, int]]:
+        """
+        Counts per doubling of latency, for display.
+
+        Returns:
+            ``(low, high, count)`` tuples in seconds, lowest first
+        """
+        counts: Dict[int, int] = {}
+        for index, count in self.buckets.items():
+            doubling = max(0, (index - 1) // self.SUBBUCKETS)
+            counts[doubling] = counts.get(doubling, 0) + count
+        return [(0.0 if doubling == 0 else self.MIN_VALUE * 2 ** doubling,
+                 self.MIN_VALUE * 2 ** (doubling + 1), counts[doubling])
+                for doubling in sorted(counts)]
+
+    def summary(self) -> Dict[str, Any]:
+        """Count, mean and p50/p90/p99/max latency."""
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else None,
+            'p50': self.percentile(0.50),
+            'p90': self.percentile(0.90),
+            'p99': self.percentile(0.99),
+            'max': self.max,
+        }
+
+
+class _LanguageStats:
+    """Running totals for the scripts of one language."""
+
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.failed = 0
+        self.cpu_time = 0.0
+        self.fix_attempts = 0
+
+    def summary(self) -> Dict[str, Any]:
+        return dict(self.latency.summary(), failed=self.failed,
+                    cpu_time=self.cpu_time, fix_attempts=self.fix_attempts)
+
+
+class BatchReportWriter:
+    """
+    Write a batch report entry by entry.
+
+    Use as a context manager, or call ``close`` when the batch is done;
+    the report is complete only once closed.
+    """
+
+    def __init__(self, path: Union[str, Path], report_format: Optional[str] = None,
+                 slowest: int = 10):
+        """
+        Open the report and write its header.
+
+        Args:
+            path: Report file to create
+            report_format: 'json' or 'html'; taken from the file
+                extension if None
+            slowest: Number of slowest scripts to list
+        """
+        self.path = Path(path)
+        self.format = (report_format or self.path.suffix.lstrip('.') or 'json').lower()
+        if self.format == 'htm':
+            self.format = 'html'
+        if self.format not in REPORT_FORMATS:
+            raise ValueError(f"Unsupported report format: {self.format}")
+
+        self.slowest = slowest
+        self.latency = LatencyHistogram()
+        self.failed = 0
+        self.languages: Dict[str, _LanguageStats] = {}
+        self._slowest: List[Tuple[float, int, Dict[str, Any]]] = []
+        self._sequence = itertools.count()
+        self._started = time.time()
+        self._file: Optional[TextIO] = open(self.path, 'w', encoding='utf-8')
+        self._write_header()
+
+    def __enter__(self) -> "BatchReportWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    @staticmethod
+    def entry(result: ExecutionResult, fix_attempts: int = 0) -> Dict[str, Any]:
+        """Report entry for one script."""
+        return {
+            'script': result.script_path,
+            'language': result.script_type.value if result.script_type else 'unknown',
+            'exit_code': result.exit_code,
+            'failed': result.error_detected,
+            'wall_time': result.execution_time,
+            'cpu_time': result.cpu_time,
+            'peak_rss': result.peak_rss,
+            'fix_attempts': fix_attempts,
+        }
+
+    def add(self, result: ExecutionResult, fix_attempts: int = 0) -> None:
+        """
+        Write one script's result to the report.
+
+        Args:
+            result: Execution result of the script
+            fix_attempts: AI fix attempts made for the script
+        """
+        entry = self.entry(result, fix_attempts)
+        sequence = next(self._sequence)
+
+        self.latency.record(entry['wall_time'])
+        language = self.languages.setdefault(entry['language'], _LanguageStats())
+        language.latency.record(entry['wall_time'])
+        language.cpu_time += entry['cpu_time'] or 0.0
+        language.fix_attempts += fix_attempts
+        if entry['failed']:
+            self.failed += 1
+            language.failed += 1
+
+        item = (entry['wall_time'], sequence, entry)
+        if len(self._slowest) < self.slowest:
+            heapq.heappush(self._slowest, item)
+        elif self.slowest:
+            heapq.heappushpop(self._slowest, item)
+
+        if self.format == 'json':
+            separator = ',\n' if sequence else ''
+            self._file.write(f"{separator}    {json.dumps(entry)}")
+        else:
+            self._file.write(self._html_row(entry))
+        self._file.flush()
+
+    def summary(self) -> Dict[str, Any]:
+        """Aggregate statistics of the results written so far."""
+        return {
+            'scripts': self.latency.count,
+            'failed': self.failed,
+            'latency': self.latency.summary(),
+            'histogram': [{'low': low, 'high': high, 'count': count}
+                          for low, high, count in self.latency.doublings()],
+            'slowest': [entry for _, _, entry in sorted(self._slowest, reverse=True)],
+            'languages': {name: stats.summary()
+                          for name, stats in sorted(self.languages.items())},
+        }
+
+    def close(self) -> Dict[str, Any]:
+        """
+        Write the summary and close the report.
+
+        Returns:
+            The report summary
+        """
+        summary = self.summary()
+        if self._file is None:
+            return summary
+        try:
+            if self.format == 'json':
+                self._file.write(f"\n  ],\n  \"summary\": "
+                                 f"{json.dumps(summary, indent=2).replace(chr(10), chr(10) + '  ')}"
+                                 f"\n}}\n")
+            else:
+                self._file.write(self._html_footer(summary))
+        finally:
+            self._file.close()
+            self._file = None
+        return summary
+
+    def _write_header(self) -> None:
+        generated = time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(self._started))
+        if self.format == 'json':
+            self._file.write(f"{{\n  \"generated_at\": \"{generated}\",\n  \"scripts\": [\n")
+        else:
+            self._file.write(_HTML_HEADER.format(generated=generated))
+
+    @staticmethod
+    def _html_row(entry: Dict[str, Any]) -> str:
+        cells = [
+            html.escape(entry['script']),
+            html.escape(entry['language']),
+            str(entry['exit_code']),
+            _seconds(entry['wall_time']),
+            _seconds(entry['cpu_time']),
+            _megabytes(entry['peak_rss']),
+            str(entry['fix_attempts']),
+        ]
+        row_class = ' class="failed"' if entry['failed'] else ''
+        return f"<tr{row_class}>" + "".join(f"<td>{cell}</td>" for cell in cells) + "</tr>\n"
+
+    def _html_footer(self, summary: Dict[str, Any]) -> str:
+        latency = summary['latency']
+        parts = ["</tbody></table>\n",
+                 "<h2>Summary</h2>\n<table><tr><th>Scripts</th><th>Failed</th><th>Mean</th>"
+                 "<th>p50</th><th>p90</th><th>p99</th><th>Max</th></tr>\n",
+                 f"<tr><td>{summary['scripts']}</td><td>{summary['failed']}</td>"
+                 f"<td>{_seconds(latency['mean'])}</td><td>{_seconds(latency['p50'])}</td>"
+                 f"<td>{_seconds(latency['p90'])}</td><td>{_seconds(latency['p99'])}</td>"
+                 f"<td>{_seconds(latency['max'])}</td></tr>\n</table>\n",
+                 "<h2>Wall time histogram</h2>\n<table>\n"]
+
+        largest = max((bucket['count'] for bucket in summary['histogram']), default=0)
+        for bucket in summary['histogram']:
+            width = 100 * bucket['count'] / largest if largest else 0
+            parts.append(f"<tr><td>{_seconds(bucket['low'])} &ndash; "
+                         f"{_seconds(bucket['high'])}</td><td>{bucket['count']}</td>"
+                         f"<td class=\"bar\"><div style=\"width: {width:.1f}%\"></div></td></tr>\n")
+        parts.append("</table>\n")
+
+        parts.append(f"<h2>Slowest {len(summary['slowest'])} scripts</h2>\n<table>"
+                     "<tr><th>Script</th><th>Language</th><th>Exit</th><th>Wall</th>"
+                     "<th>CPU</th><th>Peak RSS</th><th>Fixes</th></tr>\n")
+        parts.extend(self._html_row(entry) for entry in summary['slowest'])
+        parts.append("</table>\n")
+
+        parts.append("<h2>By language</h2>\n<table><tr><th>Language</th><th>Scripts</th>"
+                     "<th>Failed</th><th>p50</th><th>p90</th><th>p99</th><th>CPU</th>"
+                     "<th>Fixes</th></tr>\n")
+        for name, stats in summary['languages'].items():
+            parts.append(f"<tr><td>{html.escape(name)}</td><td>{stats['count']}</td>"
+                         f"<td>{stats['failed']}</td><td>{_seconds(stats['p50'])}</td>"
+                         f"<td>{_seconds(stats['p90'])}</td><td>{_seconds(stats['p99'])}</td>"
+                         f"<td>{_seconds(stats['cpu_time'])}</td>"
+                         f"<td>{stats['fix_attempts']}</td></tr>\n")
+        parts.append("</table>\n</body>\n</html>\n")
+        return "".join(parts)
+
+
+def _seconds(value: Optional[float]) -> str:
+    if value is None:
+        return "&ndash;"
+    return f"{value * 1000:.0f} ms" if value < 1 else f"{value:.2f} s"
+
+
+def _megabytes(value: Optional[int]) -> str:
+    return "&ndash;" if value is None else f"{value / (1024 * 1024):.1f} MB"
+
+
+_HTML_HEADER = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>AIRun batch report</title>
+<style>
+body {{ font-family: sans-serif; margin: 2em; }}
+table {{ border-collapse: collapse; margin-bottom: 2em; }}
+th, td {{ border: 1px solid #ccc; padding: 0.3em 0.6em; text-align: left; }}
+tr.failed td {{ background: #fdecea; }}
+td.bar {{ width: 20em; }}
+td.bar div {{ background: #4a90d9; height: 1em; }}
+</style>
+</head>
+<body>
+<h1>AIRun batch report</h1>
+<p>Generated {generated}</p>
+<h2>Scripts</h2>
+<table>
+<thead><tr><th>Script</th><th>Language</th><th>Exit</th><th>Wall</th><th>CPU</th>
+<th>Peak RSS</th><th>Fixes</th></tr></thead>
+<tbody>
+"""
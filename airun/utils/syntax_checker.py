@@ -0,0 +1,150 @@
+"""
+Repository-wide syntax checking utility.
+"""
+import logging
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
+
+from airun.core.config import get_config
+from airun.core.detector import ScriptDetector, ScriptType
+from airun.core.probe_cache import ProbeCache
+from airun.core.runners import BaseRunner, RunnerFactory
+from airun.core.syntax_cache import SyntaxCache, SyntaxCheck
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class FileCheck:
+    """Syntax check outcome of one file."""
+    path: str
+    script_type: ScriptType
+    check: SyntaxCheck
+
+    @property
+    def ok(self) -> bool:
+        """Whether the file's syntax is valid."""
+        return self.check.ok
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Build the JSON line reported for this file."""
+        entry: Dict[str, Any] = {
+            'path': self.path,
+            'type': self.script_type.value,
+            'ok': self.check.ok,
+        }
+        if not self.check.ok:
+            entry['line'] = self.check.line
+            entry['column'] = self.check.column
+            entry['error'] = self.check.message(self.path)
+        return entry
+
+
+class SyntaxChecker:
+    """
+    Checks the syntax of many scripts without running them.
+
+    Files are detected with ``ScriptDetector`` and grouped by language into
+    chunks of ``chunk_size``. Each chunk goes to its runner's
+    ``check_syntax_many`` on a pool of ``max_workers`` threads, so a chunk
+    costs one interpreter launch where the linter accepts many files, and
+    chunks of different languages are checked side by side. Results are
+    shared through the syntax cache, so unchanged files are not checked
+    again on the next run.
+    """
+
+    DEFAULT_CHUNK_SIZE = 100
+
+    def __init__(self, config: Any = None, max_workers: Optional[int] = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        Initialize the syntax checker.
+
+        Args:
+            config: Configuration object; the global configuration if None
+            max_workers: Chunks checked at once (defaults to the CPU count)
+            chunk_size: Files of one language handed to a runner at once
+        """
+        self.config = config if config is not None else get_config()
+        self.max_workers = max(1, max_workers or os.cpu_count() or 1)
+        self.chunk_size = max(1, chunk_size)
+        self.detector = ScriptDetector.from_config(self.config)
+        self.probe_cache = ProbeCache.from_config(self.config)
+        self.syntax_cache = SyntaxCache.from_config(self.config)
+        self._runners: Dict[ScriptType, BaseRunner] = {}
+        self._runners_lock = threading.Lock()
+
+    def get_runner(self, script_type: ScriptType) -> BaseRunner:
+        """Get the runner shared by all chunks of a language."""
+        with self._runners_lock:
+            runner = self._runners.get(script_type)
+            if runner is None:
+                runners = getattr(self.config, 'runners', None)
+                runner = RunnerFactory.create_runner(
+                    script_type, runners if isinstance(runners, dict) else {},
+                    probe_cache=self.probe_cache,
+                    syntax_cache=self.syntax_cache
+                )
+                self._runners[script_type] = runner
+            return runner
+
+    def _check_chunk(self, script_type: ScriptType, paths: List[str]) -> List[FileCheck]:
+        """Check one chunk of files of a language."""
+        try:
+            checks = self.get_runner(script_type).check_syntax_many(paths)
+        except Exception as e:
+            logger.error(f"Syntax check of {len(paths)} {script_type.value} files failed: {e}")
+            checks = {path: SyntaxCheck.failed(f"Error validating {path}: {e}")
+                      for path in paths}
+        return [FileCheck(path, script_type, checks[path]) for path in paths]
+
+    def iter_checks(self, paths: Iterable[str]) -> Iterator[FileCheck]:
+        """
+        Check many files, yielding each outcome as its chunk finishes.
+
+        Files of unknown type are skipped. Outcomes are not yielded in
+        input order.
+
+        Args:
+            paths: Files to check
+
+        Yields:
+            Outcome of each file
+        """
+        buffers: Dict[ScriptType, List[str]] = {}
+        pending: Set[Future] = set()
+
+        def drain(block: bool) -> Iterator[FileCheck]:
+            if not pending:
+                return
+            done, _ = wait(pending, timeout=None if block else 0,
+                           return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.discard(future)
+                yield from future.result()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers,
+                                thread_name_prefix='airun-check') as pool:
+            for path, script_type in self.detector.detect_many(paths, workers=self.max_workers):
+                if script_type == ScriptType.UNKNOWN:
+                    continue
+                buffer = buffers.setdefault(script_type, [])
+                buffer.append(path)
+                if len(buffer) >= self.chunk_size:
+                    pending.add(pool.submit(self._check_chunk, script_type, buffer))
+                    buffers[script_type] = []
+                    yield from drain(block=False)
+
+            for script_type, buffer in buffers.items():
+                if buffer:
+                    pending.add(pool.submit(self._check_chunk, script_type, buffer))
+            while pending:
+                yield from drain(block=True)
+
+    def close(self) -> None:
+        """Close the caches held by the checker."""
+        if self.syntax_cache is not None:
+            self.syntax_cache.close()
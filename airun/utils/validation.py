@@ -145,7 +145,7 @@ def validate_executable_name(executable: str) -> bool:
         return False
 
     # Allow alphanumeric, dash, underscore, dot, slash (for paths)
-    if not re.match(r'^[a-zA-Z0-9_./:-]+, executable):
+    if not re.match(r'^[a-zA-Z0-9_./:-]+$', executable):
         return False
 
     # Must not be empty after stripping
@@ -184,7 +184,8 @@ def validate_url(url: str) -> bool:
         r'(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)*'  # domain
         r'[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?'  # host
         r'(?::\d+)?'  # optional port
-        r'(?:/?|[/?]\S+), re.IGNORECASE  # path
+        r'(?:/?|[/?]\S+)$',  # path
+        re.IGNORECASE
     )
 
     return bool(url_pattern.match(url))
@@ -208,7 +209,7 @@ def validate_api_key(api_key: str) -> bool:
         return False
 
     # Check for reasonable API key pattern
-    if not re.match(r'^[a-zA-Z0-9_.-]+, api_key):
+    if not re.match(r'^[a-zA-Z0-9_.-]+$', api_key):
         return False
 
     return True
@@ -264,7 +265,7 @@ def validate_environment_variables(env_vars: dict) -> bool:
             return False
 
         # Environment variable names should be valid
-        if not re.match(r'^[A-Z_][A-Z0-9_]*, key):
+        if not re.match(r'^[A-Z_][A-Z0-9_]*$', key):
             return False
 
     return True
@@ -401,7 +402,7 @@ def validate_model_name(model_name: str) -> bool:
         return False
 
     # Model names can contain letters, numbers, hyphens, underscores, dots, colons
-    if not re.match(r'^[a-zA-Z0-9_.-]+(?::[a-zA-Z0-9_.-]+)*, model_name):
+    if not re.match(r'^[a-zA-Z0-9_.-]+(?::[a-zA-Z0-9_.-]+)*$', model_name):
         return False
 
     # Must not be empty after stripping
@@ -458,7 +459,7 @@ def validate_semantic_version(version: str) -> bool:
         r'\.(?P<minor>0|[1-9]\d*)'
         r'\.(?P<patch>0|[1-9]\d*)'
         r'(?:-(?P<prerelease>(?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*)(?:\.(?:0|[1-9]\d*|\d*[a-zA-Z-][0-9a-zA-Z-]*))*))?'
-        r'(?:\+(?P<buildmetadata>[0-9a-zA-Z-]+(?:\.[0-9a-zA-Z-]+)*))?
+        r'(?:\+(?P<buildmetadata>[0-9a-zA-Z-]+(?:\.[0-9a-zA-Z-]+)*))?$'
     )
 
     return bool(semver_pattern.match(version))
@@ -0,0 +1,93 @@
+"""
+Micro-benchmark for per-launch runner overhead.
+
+Compares runners that rebuild their command and environment on every
+launch, as they used to, against the cached ``ExecutionTemplate``. The
+preparation step is timed on its own for many launches; optionally, trivial
+shell scripts are also run end to end.
+
+Usage:
+    python scripts/bench_launch_overhead.py [--launches 10000] [--spawn 1000]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from airun.core.runners import ExecutionTemplate, ShellRunner  # noqa: E402
+
+
+class RebuildingShellRunner(ShellRunner):
+    """Shell runner that rebuilds its template on every launch, like before."""
+
+    @property
+    def template(self) -> ExecutionTemplate:
+        return self._build_template()
+
+
+def prepare(runner: ShellRunner, script_path: str, launches: int) -> float:
+    """Time building the command and environment ``launches`` times."""
+    start = time.perf_counter()
+    for _ in range(launches):
+        runner.get_command(script_path)
+        runner.template.env
+    return time.perf_counter() - start
+
+
+def spawn(runner: ShellRunner, script_path: str, launches: int) -> float:
+    """Time running a trivial script ``launches`` times."""
+    start = time.perf_counter()
+    for _ in range(launches):
+        result = runner.execute(script_path)
+        if result.exit_code != 0:
+            raise RuntimeError(f"Trivial script failed: {result.stderr}")
+    return time.perf_counter() - start
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--launches', type=int, default=10000,
+                        help='Launches to prepare (default: 10000)')
+    parser.add_argument('--spawn', type=int, default=0,
+                        help='Trivial scripts to also run end to end (default: 0)')
+    parser.add_argument('--env-vars', type=int, default=4,
+                        help='Configured env_vars, so the environment is merged (default: 4)')
+    args = parser.parse_args()
+
+    config = {
+        'timeout': 30,
+        'shell': {'executable': 'bash', 'flags': []},
+        'env_vars': {f'AIRUN_BENCH_{i}': str(i) for i in range(args.env_vars)},
+    }
+    runners = [('rebuilt', RebuildingShellRunner(config)), ('template', ShellRunner(config))]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        script_path = os.path.join(temp_dir, 'trivial.sh')
+        with open(script_path, 'w', encoding='utf-8') as f:
+            f.write(":\n")
+
+        print(f"environment: {len(os.environ)} variables, {args.env_vars} configured")
+        print(f"{'runner':>10} {'prepare (s)':>12} {'per launch (us)':>16}")
+        timings = {}
+        for name, runner in runners:
+            timings[name] = prepare(runner, script_path, args.launches)
+            print(f"{name:>10} {timings[name]:>12.4f} "
+                  f"{timings[name] / args.launches * 1e6:>16.2f}")
+        if timings['template']:
+            print(f"speedup: {timings['rebuilt'] / timings['template']:.1f}x")
+
+        if args.spawn:
+            print(f"\n{'runner':>10} {'run (s)':>12} {'per launch (ms)':>16}")
+            for name, runner in runners:
+                elapsed = spawn(runner, script_path, args.spawn)
+                print(f"{name:>10} {elapsed:>12.3f} {elapsed / args.spawn * 1e3:>16.3f}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
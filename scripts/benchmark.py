@@ -1,4 +1,325 @@
 """
-benchmark.py
+Benchmark suite for script type detection.
+
+Generates a corpus of Python, Shell, Node.js and PHP files at several sizes,
+with and without extensions and shebangs, and measures ``detect_type`` and
+``get_confidence_scores`` from ``airun.core.detector``:
+
+* per-file latency (mean, p50, p95, max)
+* throughput in files per second
+* peak RSS of the measuring process
+
+Each (size, function) group runs in a freshly spawned process so peak RSS
+is not polluted by earlier groups. Results are written as JSON; pass a
+previous results file with ``--baseline`` to fail on regressions.
+
+Usage:
+    python scripts/benchmark.py --output results.json
+    python scripts/benchmark.py --sizes 1K,1M --baseline results.json
 """
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from airun import __version__  # noqa: E402
+from airun.core.detector import ScriptDetector  # noqa: E402
+
+DEFAULT_SIZES = "1K,10K,100K,1M,10M,100M"
+FUNCTIONS = ("detect_type", "get_confidence_scores")
+
+# Per-language extension, shebang and a body repeated up to the target size
+LANGUAGES = {
+    'python': ('.py', '#!/usr/bin/env python3', '''import os
+from pathlib import Path
+
+def handler(event, context=None):
+    path = Path(os.environ.get("DATA_DIR", "/tmp"))
+    print(f"processing {event} in {path}")
+    return {"status": "ok"}
+
+class Worker(object):
+    pass
+'''),
+    'shell': ('.sh', '#!/bin/bash', '''export DATA_DIR=/var/lib/app
+mkdir -p "${DATA_DIR}"
+cd "${DATA_DIR}"
+for file in *.log; do
+    echo "rotating ${file}"
+    chmod 0640 "${file}"
+done
+'''),
+    'nodejs': ('.js', '#!/usr/bin/env node', '''const fs = require('fs');
+let total = 0;
+function handle(event) {
+    console.log(`event ${event.id}`);
+    return event.items.map((item) => { total += item; return total; });
+}
+var done = true;
+'''),
+    'php': ('.php', '#!/usr/bin/env php', '''<?php
+$name = $_GET['name'];
+$mode = $_POST['mode'];
+function greet($who) {
+    echo "Hello $who\\n";
+    return $who->length;
+}
+'''),
+}
+
+# (variant name, has extension, has shebang)
+VARIANTS = (
+    ('ext+shebang', True, True),
+    ('ext', True, False),
+    ('shebang', False, True),
+    ('bare', False, False),
+)
+
+
+def parse_size(text: str) -> int:
+    """Parse sizes like ``64K`` or ``100M`` into bytes."""
+    units = {'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}
+    text = text.strip().upper()
+    if text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
+
+
+def write_script(path: Path, size: int, shebang: Optional[str], body: str) -> None:
+    """Write a script of exactly ``size`` bytes, streaming the body."""
+    chunk = body.encode('utf-8') * max(1, (1024 * 1024) // len(body))
+    with open(path, 'wb') as f:
+        written = 0
+        if shebang:
+            header = (shebang + '\n').encode('utf-8')[:size]
+            f.write(header)
+            written = len(header)
+        while written < size:
+            piece = chunk[:size - written]
+            f.write(piece)
+            written += len(piece)
+
+
+def generate_corpus(directory: Path, size: int, copies: int) -> Dict[str, List[str]]:
+    """
+    Generate the corpus for one size.
+
+    Returns:
+        Mapping of variant name to generated file paths
+    """
+    corpus: Dict[str, List[str]] = {variant: [] for variant, _, _ in VARIANTS}
+    for language, (extension, shebang, body) in LANGUAGES.items():
+        for variant, with_extension, with_shebang in VARIANTS:
+            for copy in range(copies):
+                name = f"{language}_{variant.replace('+', '_')}_{copy}"
+                path = directory / (name + (extension if with_extension else ''))
+                write_script(path, size, shebang if with_shebang else None, body)
+                corpus[variant].append(str(path))
+    return corpus
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def measure_group(function: str, corpus: Dict[str, List[str]], repeat: int,
+                  detector_options: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Measure one detector function over every variant of a corpus.
+
+    Runs in a spawned child process; peak RSS is that child's high-water mark.
+    """
+    baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    detector = ScriptDetector(**detector_options)
+    method = getattr(detector, function)
+
+    results = []
+    for variant, paths in corpus.items():
+        latencies = []
+        started = time.perf_counter()
+        for path in paths:
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                method(path)
+                timings.append(time.perf_counter() - start)
+            latencies.append(min(timings))
+        elapsed = time.perf_counter() - started
+
+        results.append({
+            'variant': variant,
+            'files': len(paths),
+            'latency_ms': {
+                'mean': statistics.mean(latencies) * 1000,
+                'p50': percentile(latencies, 0.50) * 1000,
+                'p95': percentile(latencies, 0.95) * 1000,
+                'max': max(latencies) * 1000,
+            },
+            'throughput_files_per_s': len(paths) * repeat / elapsed if elapsed else None,
+        })
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        # macOS reports bytes, Linux kilobytes
+        peak_rss //= 1024
+        baseline_rss //= 1024
+    for result in results:
+        result['peak_rss_kb'] = peak_rss
+        result['rss_growth_kb'] = peak_rss - baseline_rss
+    return results
+
+
+def run_benchmarks(args: argparse.Namespace) -> Dict[str, Any]:
+    """Generate the corpus size by size and measure every function."""
+    detector_options = {'full_scan': args.full_scan}
+    context = multiprocessing.get_context('spawn')
+    corpus_root = Path(args.corpus_dir or tempfile.mkdtemp(prefix='airun_bench_'))
+    corpus_root.mkdir(parents=True, exist_ok=True)
+
+    results = []
+    try:
+        for size_text in args.sizes.split(','):
+            size = parse_size(size_text)
+            directory = corpus_root / size_text.strip()
+            directory.mkdir(exist_ok=True)
+            corpus = generate_corpus(directory, size, args.copies)
+
+            for function in FUNCTIONS:
+                with context.Pool(1) as pool:
+                    group = pool.apply(measure_group,
+                                       (function, corpus, args.repeat, detector_options))
+                for result in group:
+                    result.update({'function': function, 'size': size_text.strip(),
+                                   'size_bytes': size})
+                    results.append(result)
+                    print(f"{function:>22} {size_text:>6} {result['variant']:>12} "
+                          f"p50 {result['latency_ms']['p50']:9.3f} ms "
+                          f"{result['throughput_files_per_s']:10.1f} files/s "
+                          f"rss {result['peak_rss_kb']:>8} KB")
+
+            if not args.keep_corpus:
+                shutil.rmtree(directory, ignore_errors=True)
+    finally:
+        if not args.keep_corpus and not args.corpus_dir:
+            shutil.rmtree(corpus_root, ignore_errors=True)
+
+    return {
+        'meta': {
+            'airun_version': __version__,
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'sizes': args.sizes,
+            'copies': args.copies,
+            'repeat': args.repeat,
+            'full_scan': args.full_scan,
+        },
+        'results': results,
+    }
+
+
+def result_key(result: Dict[str, Any]) -> str:
+    """Key identifying a measurement across runs."""
+    return f"{result['function']}/{result['size']}/{result['variant']}"
+
+
+def find_regressions(current: Dict[str, Any], baseline: Dict[str, Any],
+                     threshold: float, min_delta_ms: float) -> List[str]:
+    """
+    Compare p50 latency and peak RSS against a baseline run.
+
+    Latency regressions smaller than ``min_delta_ms`` are ignored as noise.
+
+    Returns:
+        Human-readable regression descriptions
+    """
+    previous = {result_key(result): result for result in baseline.get('results', [])}
+    regressions = []
+
+    for result in current['results']:
+        old = previous.get(result_key(result))
+        if old is None:
+            continue
+
+        old_p50 = old['latency_ms']['p50']
+        new_p50 = result['latency_ms']['p50']
+        if new_p50 > old_p50 * (1 + threshold) and new_p50 - old_p50 > min_delta_ms:
+            regressions.append(
+                f"{result_key(result)}: p50 {old_p50:.3f} ms -> {new_p50:.3f} ms "
+                f"(+{(new_p50 / old_p50 - 1) * 100:.0f}%)"
+            )
+
+        old_rss = old.get('peak_rss_kb')
+        new_rss = result.get('peak_rss_kb')
+        if old_rss and new_rss and new_rss > old_rss * (1 + threshold):
+            regressions.append(
+                f"{result_key(result)}: peak RSS {old_rss} KB -> {new_rss} KB "
+                f"(+{(new_rss / old_rss - 1) * 100:.0f}%)"
+            )
+
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark airun script type detection.")
+    parser.add_argument('--sizes', default=DEFAULT_SIZES,
+                        help=f'Comma-separated file sizes (default: {DEFAULT_SIZES})')
+    parser.add_argument('--copies', type=int, default=3,
+                        help='Files per language, variant and size (default: 3)')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Timed calls per file; the fastest is kept (default: 3)')
+    parser.add_argument('--full-scan', action='store_true',
+                        help='Benchmark whole-file content analysis')
+    parser.add_argument('--corpus-dir',
+                        help='Directory for the generated corpus (default: temporary)')
+    parser.add_argument('--keep-corpus', action='store_true',
+                        help='Keep the generated corpus after the run')
+    parser.add_argument('--output', '-o', default='benchmark_results.json',
+                        help='JSON results file (default: benchmark_results.json)')
+    parser.add_argument('--baseline',
+                        help='Previous results file to compare against')
+    parser.add_argument('--threshold', type=float, default=0.20,
+                        help='Allowed relative slowdown before failing (default: 0.20)')
+    parser.add_argument('--min-delta-ms', type=float, default=0.05,
+                        help='Ignore latency changes smaller than this (default: 0.05)')
+    args = parser.parse_args()
+
+    report = run_benchmarks(args)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = find_regressions(report, baseline, args.threshold, args.min_delta_ms)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) against {args.baseline}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print(f"No regressions against {args.baseline}")
+
+    return 0
+
 
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,217 @@
+"""
+Unit tests for the asyncio runner and fixing APIs.
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from airun.core.ai_fixer import AIFixer
+from airun.core.detector import ScriptType
+from airun.core.error_watcher import ErrorWatchSettings
+from airun.core.llm_router import CodeFix, LLMProvider, LLMRouter
+from airun.core.process import STREAMING_SUPPORTED
+from airun.core.runners import PythonRunner
+
+pytestmark = pytest.mark.skipif(not STREAMING_SUPPORTED,
+                                reason="process groups need POSIX")
+
+
+class TestExecuteAsync:
+    """Test cases for BaseRunner.execute_async."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.config = {'timeout': 30, 'python': {'executable': sys.executable, 'flags': ['-u']}}
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def create_script(self, content: str, name: str = 'script.py') -> str:
+        """Create a Python script with given content."""
+        filepath = os.path.join(self.temp_dir, name)
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return filepath
+
+    def test_matches_sync_result(self):
+        """Test exit code and both streams match the synchronous path."""
+        script = self.create_script(
+            "import sys\nprint(sys.argv[1])\nprint('warn', file=sys.stderr)\nsys.exit(2)\n")
+        runner = PythonRunner(self.config)
+
+        result = asyncio.run(runner.execute_async(script, ['arg']))
+
+        assert result.exit_code == 2
+        assert result.stdout == "arg\n"
+        assert result.stderr == "warn\n"
+        assert result.error_detected
+
+    def test_callbacks_receive_live_output(self):
+        """Test callbacks see output before the script exits."""
+        script = self.create_script(
+            "import time\nprint('first', flush=True)\ntime.sleep(0.5)\nprint('second')\n")
+        runner = PythonRunner(self.config)
+        seen = []
+        runner.add_output_callback(lambda stream, text: seen.append((time.monotonic(), text)))
+
+        result = asyncio.run(runner.execute_async(script))
+        finished = time.monotonic()
+
+        assert result.stdout == "first\nsecond\n"
+        assert seen[0][1].startswith("first")
+        assert seen[0][0] < finished - 0.3
+
+    def test_runs_concurrently(self):
+        """Test several scripts share one thread without serialising."""
+        script = self.create_script("import time\ntime.sleep(0.5)\nprint('done')\n")
+        runner = PythonRunner(self.config)
+
+        async def run_all():
+            return await asyncio.gather(*(runner.execute_async(script) for _ in range(5)))
+
+        start = time.monotonic()
+        results = asyncio.run(run_all())
+
+        assert time.monotonic() - start < 2.0
+        assert all(result.stdout == "done\n" for result in results)
+
+    def test_timeout_kills_process_group(self):
+        """Test a timeout kills the script and the children it started."""
+        marker = os.path.join(self.temp_dir, 'child-alive')
+        child = self.create_script(
+            f"import time\ntime.sleep(1.5)\nopen({marker!r}, 'w').close()\n", name='child.py')
+        script = self.create_script(
+            "import subprocess, sys, time\n"
+            f"subprocess.Popen([sys.executable, {child!r}])\n"
+            "print('up', flush=True)\n"
+            "time.sleep(30)\n"
+        )
+        runner = PythonRunner(dict(self.config, timeout=0.5))
+
+        result = asyncio.run(runner.execute_async(script))
+        time.sleep(1.5)
+
+        assert result.exit_code == -1
+        assert result.stdout == "up\n"
+        assert "Execution timeout exceeded" in result.stderr
+        assert not os.path.exists(marker)
+
+    def test_cancellation_kills_script(self):
+        """Test cancelling the awaiting task kills the script and propagates."""
+        pid_file = os.path.join(self.temp_dir, 'pid')
+        script = self.create_script(
+            "import os, time\n"
+            f"open({pid_file!r}, 'w').write(str(os.getpid()))\n"
+            "time.sleep(30)\n"
+        )
+        runner = PythonRunner(self.config)
+
+        async def run_and_cancel():
+            task = asyncio.ensure_future(runner.execute_async(script))
+            while not os.path.exists(pid_file) or not open(pid_file).read():
+                await asyncio.sleep(0.05)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(run_and_cancel())
+
+        pid = int(open(pid_file).read())
+        with pytest.raises(ProcessLookupError):
+            os.kill(pid, 0)
+
+    def test_early_error_stop(self):
+        """Test the error watcher stops a script that hangs after failing."""
+        script = self.create_script(
+            "import sys, threading, time\n"
+            "threading.Thread(target=lambda: 1 / 0).start()\n"
+            "time.sleep(30)\n"
+        )
+        runner = PythonRunner(self.config,
+                              error_watch=ErrorWatchSettings(kill=True, settle_time=0.2))
+
+        start = time.monotonic()
+        result = asyncio.run(runner.execute_async(script))
+
+        assert time.monotonic() - start < 10
+        assert result.error_detected
+        assert result.early_error is not None
+
+    def test_missing_interpreter(self):
+        """Test a missing interpreter gives the same result as execute."""
+        runner = PythonRunner({'python': {'executable': 'airun-no-such-python'}})
+
+        result = asyncio.run(runner.execute_async(self.create_script("print(1)\n")))
+
+        assert result.exit_code == -2
+        assert "Command not found" in result.stderr
+
+
+class StaticProvider(LLMProvider):
+    """Provider returning a fixed fix, for tests."""
+
+    def __init__(self, fixed_code: str):
+        super().__init__({})
+        self.fixed_code = fixed_code
+        self.calls = 0
+
+    def generate_fix(self, error_context):
+        self.calls += 1
+        return CodeFix(fixed_code=self.fixed_code, explanation="fixed",
+                       confidence=0.9, changes_made=["fix"])
+
+    def is_available(self):
+        return True
+
+
+class TestAsyncFixing:
+    """Test cases for the async LLMRouter and AIFixer path."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.config = Mock(llm_providers={}, default_llm='static:model', max_retries=2,
+                           interactive_mode=False, backup_enabled=False,
+                           min_confidence_threshold=0.5)
+        self.router = LLMRouter(self.config)
+        self.provider = StaticProvider("print('fixed')\n")
+        self.router.providers['static'] = self.provider
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_fix_error_async(self):
+        """Test the async router returns the provider's fix."""
+        from airun.core.llm_router import create_error_context
+        context = create_error_context(ScriptType.PYTHON, "NameError", "x", "s.py")
+
+        fix = asyncio.run(self.router.fix_error_async(context))
+
+        assert fix.fixed_code == "print('fixed')\n"
+        assert self.provider.calls == 1
+
+    def test_run_with_fixing_async(self):
+        """Test a failing script is fixed and re-run to success."""
+        script = os.path.join(self.temp_dir, 'broken.py')
+        with open(script, 'w', encoding='utf-8') as f:
+            f.write("print(undefined_name)\n")
+        runner = PythonRunner({'timeout': 30, 'python': {'executable': sys.executable}})
+        fixer = AIFixer(self.router, self.config)
+
+        result = asyncio.run(fixer.run_with_fixing_async(runner, script, ScriptType.PYTHON,
+                                                         retry_delay=0))
+
+        assert result.exit_code == 0
+        assert result.stdout == "fixed\n"
+        assert self.provider.calls == 1
+        assert fixer.get_fix_statistics()['successful_fixes'] == 1
@@ -0,0 +1,106 @@
+"""
+Unit tests for the batch executor.
+"""
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from airun.core.config import Config
+from airun.core.detector import ScriptType
+from airun.utils.batch_executor import BatchExecutor
+
+
+class TestBatchExecutor:
+    """Test cases for BatchExecutor."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.config = Config()
+        self.config.cache_dir = Path(self.temp_dir) / 'cache'
+        self.config.detection = {'cache': True}
+        self.config.runners = {
+            'python': {'executable': sys.executable, 'flags': ['-u']},
+            'shell': {'executable': 'bash', 'flags': []},
+        }
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def create_script(self, filename: str, content: str) -> str:
+        """Create a script file with given content."""
+        filepath = os.path.join(self.temp_dir, filename)
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return filepath
+
+    def test_runs_each_script_with_its_runner(self):
+        """Test scripts are detected and run with the right interpreter."""
+        python_script = self.create_script('a.py', "print('python')\n")
+        shell_script = self.create_script('b.sh', "echo shell\n")
+
+        results = BatchExecutor(self.config, max_workers=2).execute_batch(
+            [python_script, shell_script])
+
+        assert [result.stdout for result in results] == ["python\n", "shell\n"]
+        assert results[0].script_type == ScriptType.PYTHON
+        assert results[1].script_type == ScriptType.SHELL
+
+    def test_runs_in_parallel(self):
+        """Test scripts overlap up to max_workers."""
+        scripts = [self.create_script(f's{i}.py', "import time\ntime.sleep(0.5)\n")
+                   for i in range(4)]
+
+        start = time.monotonic()
+        results = BatchExecutor(self.config, max_workers=4).execute_batch(scripts)
+
+        assert time.monotonic() - start < 1.5
+        assert all(result.exit_code == 0 for result in results)
+
+    def test_results_stream_in_completion_order(self):
+        """Test a fast script is reported before a slow one finishes."""
+        slow = self.create_script('slow.py', "import time\ntime.sleep(1)\n")
+        fast = self.create_script('fast.py', "print('fast')\n")
+        reported = []
+
+        results = BatchExecutor(self.config, max_workers=2).execute_batch(
+            [slow, fast], on_result=lambda batch_result: reported.append(batch_result))
+
+        assert [item.script_path for item in reported] == [fast, slow]
+        assert [item.index for item in reported] == [1, 0]
+        assert results[1].stdout == "fast\n"
+
+    def test_per_script_timeout(self):
+        """Test the batch timeout applies to every script."""
+        script = self.create_script('hang.py', "import time\ntime.sleep(30)\n")
+
+        results = BatchExecutor(self.config, timeout=1).execute_batch([script])
+
+        assert results[0].exit_code == -1
+        assert "timeout" in results[0].stderr.lower()
+
+    def test_stop_on_error(self):
+        """Test no new scripts start after a failure."""
+        scripts = [self.create_script('fail.py', "raise SystemExit(3)\n")]
+        scripts += [self.create_script(f'ok{i}.py', "print('ok')\n") for i in range(5)]
+
+        results = BatchExecutor(self.config, max_workers=1).execute_batch(
+            scripts, stop_on_error=True)
+
+        assert len(results) == 1
+        assert results[0].exit_code == 3
+
+    def test_unknown_script_type(self):
+        """Test undetectable files fail without stopping the batch."""
+        unknown = self.create_script('data.bin', "\x00\x01\x02")
+        script = self.create_script('ok.py', "print('ok')\n")
+
+        results = BatchExecutor(self.config).execute_batch([unknown, script])
+
+        assert results[0].error_detected
+        assert "Unable to determine script type" in results[0].stderr
+        assert results[1].stdout == "ok\n"
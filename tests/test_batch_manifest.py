@@ -0,0 +1,233 @@
+"""
+Unit tests for batch manifests and dependency-aware batch runs.
+"""
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pytest
+
+from airun.core.config import Config
+from airun.utils.batch_executor import (
+    NODE_CANCELLED, NODE_FAILED, NODE_SUCCEEDED, BatchExecutor
+)
+from airun.utils.batch_manifest import (
+    MANIFEST_FILENAME, BatchManifest, ManifestError, find_manifest
+)
+
+
+class TestBatchManifest:
+    """Test cases for BatchManifest."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_load_from_project_dir(self):
+        """Test loading the manifest found in a project directory."""
+        with open(os.path.join(self.temp_dir, MANIFEST_FILENAME), 'w') as f:
+            f.write("scripts:\n"
+                    "  build: build.py\n"
+                    "  test:\n"
+                    "    path: test.sh\n"
+                    "    depends_on: build\n"
+                    "    timeout: 60\n")
+
+        assert find_manifest(self.temp_dir) == Path(self.temp_dir) / MANIFEST_FILENAME
+        manifest = BatchManifest.load(self.temp_dir)
+
+        assert manifest.nodes['build'].path == str(Path(self.temp_dir) / 'build.py')
+        assert manifest.nodes['test'].depends_on == ['build']
+        assert manifest.nodes['test'].timeout == 60
+
+    def test_find_manifest_missing(self):
+        """Test a project without a manifest."""
+        assert find_manifest(self.temp_dir) is None
+
+    def test_topological_order(self):
+        """Test every script comes after its dependencies."""
+        manifest = BatchManifest.from_dict({'scripts': {
+            'report': {'path': 'r.py', 'depends_on': ['seed', 'lint']},
+            'seed': {'path': 's.py', 'depends_on': ['migrate']},
+            'migrate': 'm.py',
+            'lint': 'l.py',
+        }})
+
+        order = manifest.topological_order()
+
+        assert order.index('migrate') < order.index('seed') < order.index('report')
+        assert order.index('lint') < order.index('report')
+        assert manifest.descendants('migrate') == {'seed', 'report'}
+
+    def test_cycle_rejected(self):
+        """Test dependency cycles are reported."""
+        with pytest.raises(ManifestError, match="cycle"):
+            BatchManifest.from_dict({'scripts': {
+                'a': {'path': 'a.py', 'depends_on': ['b']},
+                'b': {'path': 'b.py', 'depends_on': ['a']},
+                'c': 'c.py',
+            }})
+
+    def test_unknown_dependency_rejected(self):
+        """Test dependencies must name scripts in the manifest."""
+        with pytest.raises(ManifestError, match="unknown script 'missing'"):
+            BatchManifest.from_dict({'scripts': {
+                'a': {'path': 'a.py', 'depends_on': ['missing']},
+            }})
+
+    def test_invalid_manifest(self):
+        """Test manifests without scripts or paths are rejected."""
+        with pytest.raises(ManifestError):
+            BatchManifest.from_dict({})
+        with pytest.raises(ManifestError, match="needs a path"):
+            BatchManifest.from_dict({'scripts': {'a': {'depends_on': []}}})
+
+
+class TestExecuteManifest:
+    """Test cases for BatchExecutor.execute_manifest."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.config = Config()
+        self.config.cache_dir = Path(self.temp_dir) / 'cache'
+        self.config.detection = {'cache': True}
+        self.config.runners = {
+            'python': {'executable': sys.executable, 'flags': ['-u']},
+        }
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def create_script(self, filename: str, content: str) -> str:
+        """Create a script file with given content."""
+        filepath = os.path.join(self.temp_dir, filename)
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return filepath
+
+    def sleeper(self, name: str, seconds: float) -> str:
+        """Create a script that sleeps and prints its name."""
+        return self.create_script(f'{name}.py',
+                                  f"import time\ntime.sleep({seconds})\nprint({name!r})\n")
+
+    def manifest(self, scripts: dict) -> BatchManifest:
+        """Build a manifest relative to the temp directory."""
+        return BatchManifest.from_dict({'scripts': scripts}, base_dir=self.temp_dir)
+
+    def test_dependencies_run_first(self):
+        """Test a script starts only after its dependencies finished."""
+        self.sleeper('a', 0.3)
+        self.sleeper('b', 0)
+        manifest = self.manifest({'a': 'a.py', 'b': {'path': 'b.py', 'depends_on': ['a']}})
+
+        report = BatchExecutor(self.config, max_workers=4).execute_manifest(manifest)
+
+        assert report.succeeded
+        assert report.outcomes['b'].started >= report.outcomes['a'].finished
+        assert report.outcomes['b'].result.stdout == "b\n"
+
+    def test_independent_branches_run_in_parallel(self):
+        """Test scripts without dependencies between them overlap."""
+        for name in ('a', 'b', 'c'):
+            self.sleeper(name, 0.5)
+        manifest = self.manifest({'a': 'a.py', 'b': 'b.py', 'c': 'c.py'})
+
+        start = time.monotonic()
+        report = BatchExecutor(self.config, max_workers=3).execute_manifest(manifest)
+
+        assert time.monotonic() - start < 1.3
+        assert report.count(NODE_SUCCEEDED) == 3
+
+    def test_failure_cancels_only_descendants(self):
+        """Test a failure skips its dependents while other branches finish."""
+        self.create_script('bad.py', "raise SystemExit(2)\n")
+        for name in ('after', 'later', 'other', 'sibling'):
+            self.sleeper(name, 0)
+        manifest = self.manifest({
+            'bad': 'bad.py',
+            'after': {'path': 'after.py', 'depends_on': ['bad']},
+            'later': {'path': 'later.py', 'depends_on': ['after', 'other']},
+            'other': 'other.py',
+            'sibling': {'path': 'sibling.py', 'depends_on': ['other']},
+        })
+        reported = []
+
+        report = BatchExecutor(self.config, max_workers=2).execute_manifest(
+            manifest, on_result=lambda outcome: reported.append(outcome.name))
+
+        assert not report.succeeded
+        assert report.outcomes['bad'].status == NODE_FAILED
+        assert report.outcomes['after'].status == NODE_CANCELLED
+        assert report.outcomes['after'].cancelled_by == 'bad'
+        assert report.outcomes['later'].status == NODE_CANCELLED
+        assert report.outcomes['other'].status == NODE_SUCCEEDED
+        assert report.outcomes['sibling'].status == NODE_SUCCEEDED
+        assert sorted(reported) == sorted(manifest.nodes)
+
+    def test_stop_on_error_cancels_pending_scripts(self):
+        """Test stop_on_error cancels every script not yet started."""
+        self.create_script('bad.py', "raise SystemExit(2)\n")
+        self.sleeper('slow', 0.5)
+        for name in ('other', 'after'):
+            self.sleeper(name, 0)
+        manifest = self.manifest({
+            'bad': 'bad.py',
+            'slow': 'slow.py',
+            'other': {'path': 'other.py', 'depends_on': ['slow']},
+            'after': {'path': 'after.py', 'depends_on': ['other']},
+        })
+
+        report = BatchExecutor(self.config, max_workers=2).execute_manifest(
+            manifest, stop_on_error=True)
+
+        assert report.outcomes['bad'].status == NODE_FAILED
+        assert report.outcomes['slow'].status == NODE_SUCCEEDED
+        assert report.outcomes['other'].status == NODE_CANCELLED
+        assert report.outcomes['after'].status == NODE_CANCELLED
+        assert report.outcomes['after'].cancelled_by == 'bad'
+        assert "cancelled" in report.format()
+
+    def test_critical_path(self):
+        """Test the report names the chain that bounded the wall time."""
+        self.sleeper('setup', 0.2)
+        self.sleeper('slow', 0.6)
+        self.sleeper('fast', 0)
+        self.sleeper('final', 0)
+        manifest = self.manifest({
+            'setup': 'setup.py',
+            'slow': {'path': 'slow.py', 'depends_on': ['setup']},
+            'fast': {'path': 'fast.py', 'depends_on': ['setup']},
+            'final': {'path': 'final.py', 'depends_on': ['slow', 'fast']},
+        })
+
+        report = BatchExecutor(self.config, max_workers=4).execute_manifest(manifest)
+        text = report.format()
+
+        assert report.critical_path == ['setup', 'slow', 'final']
+        assert "Critical path" in text
+        assert "slow" in text
+
+    def test_per_node_timeout(self):
+        """Test a node's own timeout overrides the batch timeout."""
+        self.sleeper('hang', 30)
+        self.sleeper('next', 0)
+        manifest = self.manifest({
+            'hang': {'path': 'hang.py', 'timeout': 1},
+            'next': {'path': 'next.py', 'depends_on': ['hang']},
+        })
+
+        report = BatchExecutor(self.config, timeout=60).execute_manifest(manifest)
+
+        assert report.outcomes['hang'].status == NODE_FAILED
+        assert report.outcomes['hang'].result.exit_code == -1
+        assert report.outcomes['next'].status == NODE_CANCELLED
@@ -0,0 +1,177 @@
+"""
+Unit tests for batch reports.
+"""
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+from airun.core.config import Config
+from airun.core.detector import ScriptType
+from airun.core.runners import ExecutionResult
+from airun.utils.batch_executor import BatchExecutor
+from airun.utils.batch_report import BatchReportWriter, LatencyHistogram
+
+
+def make_result(path: str, seconds: float, script_type: ScriptType = ScriptType.PYTHON,
+                exit_code: int = 0) -> ExecutionResult:
+    """Create an execution result for reporting."""
+    return ExecutionResult(exit_code=exit_code, stdout="", stderr="",
+                           execution_time=seconds, error_detected=exit_code != 0,
+                           script_path=path, script_type=script_type,
+                           cpu_time=seconds / 2, peak_rss=10 * 1024 * 1024)
+
+
+class TestLatencyHistogram:
+    """Test cases for LatencyHistogram."""
+
+    def test_percentiles_within_bucket_error(self):
+        """Test percentiles are close to the exact values."""
+        histogram = LatencyHistogram()
+        for millis in range(1, 1001):
+            histogram.record(millis / 1000)
+
+        assert histogram.count == 1000
+        assert histogram.percentile(0.5) == pytest.approx(0.5, rel=0.1)
+        assert histogram.percentile(0.9) == pytest.approx(0.9, rel=0.1)
+        assert histogram.percentile(0.99) == pytest.approx(0.99, rel=0.1)
+        assert histogram.percentile(1.0) == 1.0
+
+    def test_single_value(self):
+        """Test percentiles never leave the observed range."""
+        histogram = LatencyHistogram()
+        histogram.record(0.3)
+
+        assert histogram.percentile(0.5) == 0.3
+        assert histogram.summary()['mean'] == 0.3
+
+    def test_empty(self):
+        """Test an empty histogram has no percentiles."""
+        assert LatencyHistogram().percentile(0.5) is None
+
+    def test_memory_is_bounded(self):
+        """Test buckets do not grow with the number of samples."""
+        histogram = LatencyHistogram()
+        for i in range(20000):
+            histogram.record(0.1 + (i % 100) / 1000)
+
+        assert len(histogram.buckets) < 20
+        assert sum(count for _, _, count in histogram.doublings()) == 20000
+
+
+class TestBatchReportWriter:
+    """Test cases for BatchReportWriter."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_json_report(self):
+        """Test the JSON report lists every script and the aggregates."""
+        path = os.path.join(self.temp_dir, 'report.json')
+        with BatchReportWriter(path, slowest=2) as writer:
+            writer.add(make_result('a.py', 0.1))
+            writer.add(make_result('b.sh', 2.0, ScriptType.SHELL, exit_code=1), fix_attempts=2)
+            writer.add(make_result('c.py', 0.5))
+
+        with open(path) as f:
+            report = json.load(f)
+
+        assert [entry['script'] for entry in report['scripts']] == ['a.py', 'b.sh', 'c.py']
+        assert report['scripts'][1]['fix_attempts'] == 2
+        assert report['scripts'][1]['cpu_time'] == 1.0
+        assert report['scripts'][1]['peak_rss'] == 10 * 1024 * 1024
+        summary = report['summary']
+        assert summary['scripts'] == 3
+        assert summary['failed'] == 1
+        assert summary['latency']['max'] == 2.0
+        assert [entry['script'] for entry in summary['slowest']] == ['b.sh', 'c.py']
+        assert summary['languages']['python']['count'] == 2
+        assert summary['languages']['shell']['fix_attempts'] == 2
+
+    def test_entries_written_as_they_arrive(self):
+        """Test results reach the file before the report is closed."""
+        path = os.path.join(self.temp_dir, 'report.json')
+        writer = BatchReportWriter(path)
+        writer.add(make_result('a.py', 0.1))
+
+        assert 'a.py' in Path(path).read_text()
+        writer.close()
+
+    def test_html_report(self):
+        """Test the HTML report escapes paths and includes the summary."""
+        path = os.path.join(self.temp_dir, 'report.html')
+        with BatchReportWriter(path) as writer:
+            writer.add(make_result('<odd>.py', 0.2))
+
+        text = Path(path).read_text()
+        assert '&lt;odd&gt;.py' in text
+        assert 'Wall time histogram' in text
+        assert text.rstrip().endswith('</html>')
+
+    def test_unknown_format(self):
+        """Test unsupported formats are rejected."""
+        with pytest.raises(ValueError):
+            BatchReportWriter(os.path.join(self.temp_dir, 'report.txt'))
+
+
+class TestBatchExecutorReport:
+    """Test cases for reporting from BatchExecutor."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.config = Config()
+        self.config.cache_dir = Path(self.temp_dir) / 'cache'
+        self.config.detection = {'cache': True}
+        self.config.runners = {'python': {'executable': sys.executable, 'flags': ['-u']}}
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def create_script(self, filename: str, content: str) -> str:
+        """Create a script file with given content."""
+        filepath = os.path.join(self.temp_dir, filename)
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return filepath
+
+    def test_generate_report_from_iter_batch(self):
+        """Test streaming batch results straight into a report."""
+        scripts = [self.create_script(f's{i}.py', "print('ok')\n") for i in range(3)]
+        executor = BatchExecutor(self.config, max_workers=2)
+        path = os.path.join(self.temp_dir, 'report.json')
+
+        summary = executor.generate_report(executor.iter_batch(scripts), path)
+
+        assert summary['scripts'] == 3
+        with open(path) as f:
+            assert len(json.load(f)['scripts']) == 3
+
+    def test_fix_attempts_counted(self):
+        """Test failing scripts are fixed and re-run."""
+        script = self.create_script('broken.py', "raise SystemExit(1)\n")
+
+        def fix(script_path, script_type, execution_result):
+            with open(script_path, 'w') as f:
+                f.write("print('fixed')\n")
+            return True
+
+        fixer = Mock(fix_script_error=Mock(side_effect=fix))
+        executor = BatchExecutor(self.config, fixer=fixer, max_retries=3)
+
+        batch_result = executor.run_script(script)
+
+        assert batch_result.fix_attempts == 1
+        assert batch_result.result.stdout == "fixed\n"
@@ -0,0 +1,67 @@
+"""
+Unit tests for the compiled content classifier.
+"""
+import re
+
+from airun.core.detector import ContentClassifier, ScriptDetector, ScriptType
+
+
+def reference_scores(content: str):
+    """Scores computed the original way, one IGNORECASE findall per pattern."""
+    line_count = max(len(content.split('\n')), 1)
+    return {
+        script_type: sum(
+            len(re.findall(pattern, content, re.MULTILINE | re.IGNORECASE))
+            for pattern in patterns
+        ) / line_count
+        for script_type, patterns in ScriptDetector.CONTENT_PATTERNS.items()
+    }
+
+
+class TestContentClassifier:
+    """Test cases for ContentClassifier."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.classifier = ContentClassifier(ScriptDetector.CONTENT_PATTERNS)
+
+    def test_scores_match_reference(self, sample_scripts, broken_scripts):
+        """Test scores are identical to per-pattern findall scoring."""
+        for path in list(sample_scripts.values()) + list(broken_scripts.values()):
+            with open(path, 'r', encoding='utf-8') as f:
+                content = f.read()
+            assert self.classifier.score(content) == reference_scores(content)
+
+    def test_case_insensitive_matching(self):
+        """Test upper-case keywords and superglobals are still matched."""
+        content = "IMPORT os\nEcho hi\n$_get['x']\nFUNCTION foo() {}\n"
+        assert self.classifier.score(content) == reference_scores(content)
+        assert self.classifier.count_matches(content)[ScriptType.PHP] > 0
+
+    def test_non_ascii_content(self):
+        """Test non-ASCII content, including case aliases of ASCII letters."""
+        samples = [
+            "# café\nimport os\nprint('żółw')\n",
+            "claſſ Foo(object):\n    pass\n",
+            "İMPORT os\nKEY=1\n",
+        ]
+        for content in samples:
+            assert self.classifier.score(content) == reference_scores(content)
+
+    def test_shared_patterns_credit_every_type(self):
+        """Test a pattern used by several types is counted for each of them."""
+        counts = self.classifier.count_matches("echo one\necho two\n")
+
+        assert counts[ScriptType.SHELL] == 2
+        assert counts[ScriptType.PHP] == 2
+
+    def test_empty_content(self):
+        """Test empty content scores zero for every type."""
+        scores = self.classifier.score("")
+
+        assert set(scores) == set(ScriptDetector.CONTENT_PATTERNS)
+        assert all(score == 0.0 for score in scores.values())
+
+    def test_detector_shares_classifier(self):
+        """Test detector instances reuse the compiled classifier."""
+        assert ScriptDetector().classifier is ScriptDetector().classifier
@@ -0,0 +1,111 @@
+"""
+Unit tests for bulk script detection.
+"""
+import os
+import tempfile
+from unittest.mock import patch
+
+from airun.core.detector import ScriptDetector, ScriptType, iter_files
+
+
+class TestDetectMany:
+    """Test cases for ScriptDetector.detect_many and iter_files."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.detector = ScriptDetector()
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def create_test_file(self, relpath: str, content: str) -> str:
+        """Create a test file (and parent directories) with given content."""
+        filepath = os.path.join(self.temp_dir, relpath)
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return filepath
+
+    def test_iter_files_walks_tree(self):
+        """Test every regular file is yielded, skipping excluded directories."""
+        expected = {
+            self.create_test_file('a.py', 'print(1)'),
+            self.create_test_file('sub/b.sh', 'echo 1'),
+            self.create_test_file('sub/deeper/c', 'echo 1'),
+        }
+        self.create_test_file('.git/config', '[core]')
+        self.create_test_file('.hidden.sh', 'echo 1')
+        self.create_test_file('__pycache__/a.pyc', '')
+
+        assert set(iter_files(self.temp_dir)) == expected
+
+    def test_iter_files_options(self):
+        """Test hidden files and custom exclusions."""
+        hidden = self.create_test_file('.hidden.sh', 'echo 1')
+        self.create_test_file('node_modules/x.js', 'var a = 1;')
+
+        files = set(iter_files(self.temp_dir, exclude_dirs={'node_modules'},
+                               include_hidden=True))
+        assert files == {hidden}
+
+    def test_iter_files_single_file(self):
+        """Test a file root is yielded as is."""
+        filepath = self.create_test_file('a.py', 'print(1)')
+
+        assert list(iter_files(filepath)) == [filepath]
+
+    def test_extension_matches_need_no_io(self):
+        """Test files with known extensions are classified without reading them."""
+        paths = [os.path.join(self.temp_dir, name) for name in ('a.py', 'b.sh', 'c.js')]
+
+        with patch.object(ScriptDetector, 'detect_type') as detect_type:
+            results = dict(self.detector.detect_many(paths))
+
+        detect_type.assert_not_called()
+        assert results == {
+            paths[0]: ScriptType.PYTHON,
+            paths[1]: ScriptType.SHELL,
+            paths[2]: ScriptType.NODEJS,
+        }
+
+    def test_small_batches_run_in_process(self):
+        """Test a few ambiguous files are sniffed without starting a pool."""
+        hook = self.create_test_file('hook', '#!/bin/bash\necho hi\n')
+
+        with patch('airun.core.detector.ProcessPoolExecutor') as pool:
+            results = dict(self.detector.detect_many([hook], chunk_size=10))
+
+        pool.assert_not_called()
+        assert results == {hook: ScriptType.SHELL}
+
+    def test_serial_results_stream(self):
+        """Test one worker yields each file before reading the next path."""
+        hooks = [self.create_test_file(f'hook{i}', '#!/bin/bash\necho hi\n')
+                 for i in range(3)]
+        consumed = []
+
+        def paths():
+            for hook in hooks:
+                consumed.append(hook)
+                yield hook
+
+        results = self.detector.detect_many(paths(), workers=1)
+        for index, (path, script_type) in enumerate(results):
+            assert path == hooks[index]
+            assert script_type == ScriptType.SHELL
+            assert consumed == hooks[:index + 1]
+
+    def test_process_pool_results(self):
+        """Test ambiguous files sniffed on the pool match serial detection."""
+        paths = []
+        for i in range(40):
+            content = '#!/usr/bin/env node\nconsole.log(1);\n' if i % 2 else '<?php\necho "hi";\n'
+            paths.append(self.create_test_file(f'tool{i}', content))
+        paths.append(self.create_test_file('known.py', 'print(1)'))
+
+        results = dict(self.detector.detect_many(paths, workers=2, chunk_size=8))
+
+        assert results == {path: self.detector.detect_type(path) for path in paths}
@@ -0,0 +1,250 @@
+"""
+Unit tests for the persistent detection cache.
+"""
+import os
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+from airun.core.config import Config
+from airun.core.detection_cache import CachedDetection, DetectionCache
+from airun.core.detector import FileProbe, ScriptDetector, ScriptType
+
+
+class TestDetectionCache:
+    """Test cases for DetectionCache."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = DetectionCache(Path(self.temp_dir) / "cache", max_entries=3)
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        import shutil
+        self.cache.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_miss_then_hit(self):
+        """Test stored entries are returned and counters are updated."""
+        key = (1, 2, 3, 4)
+        assert self.cache.get(key) is None
+
+        self.cache.put(key, CachedDetection(script_type='python', shebang='#!/usr/bin/python3'))
+        cached = self.cache.get(key)
+
+        assert cached.script_type == 'python'
+        assert cached.shebang == '#!/usr/bin/python3'
+        assert cached.confidence_scores is None
+
+        stats = self.cache.get_stats()
+        assert stats == {'entries': 1, 'hits': 1, 'misses': 1}
+
+    def test_put_merges_fields(self):
+        """Test a partial update keeps previously cached fields."""
+        key = (1, 2, 3, 4)
+        self.cache.put(key, CachedDetection(script_type='shell'))
+        self.cache.put(key, CachedDetection(confidence_scores={'shell': 0.5}))
+
+        cached = self.cache.get(key)
+        assert cached.script_type == 'shell'
+        assert cached.confidence_scores == {'shell': 0.5}
+
+    def test_variants_are_separate(self):
+        """Test entries for different detector settings do not collide."""
+        key = (1, 2, 3, 4)
+        self.cache.put(key, CachedDetection(script_type='shell'), variant='a')
+
+        assert self.cache.get(key, variant='b') is None
+        assert self.cache.get(key, variant='a').script_type == 'shell'
+
+    def test_lru_eviction(self):
+        """Test least recently used entries are evicted first."""
+        with patch('airun.core.detection_cache.time.time', side_effect=range(100)):
+            for ino in range(3):
+                self.cache.put((1, ino, 0, 0), CachedDetection(script_type='php'))
+            self.cache.get((1, 0, 0, 0))
+            self.cache.put((1, 3, 0, 0), CachedDetection(script_type='php'))
+
+        assert self.cache.get_stats()['entries'] == 3
+        assert self.cache.get((1, 0, 0, 0)) is not None
+        assert self.cache.get((1, 1, 0, 0)) is None
+
+    def test_get_does_not_take_write_lock(self):
+        """Test lookups succeed while another connection holds the write lock."""
+        self.cache.put((1, 2, 3, 4), CachedDetection(script_type='nodejs'))
+        writer = DetectionCache(self.cache.path.parent)
+        connection = writer._connect()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            assert self.cache.get((1, 2, 3, 4)).script_type == 'nodejs'
+            assert self.cache.get((9, 9, 9, 9)) is None
+        finally:
+            connection.execute("ROLLBACK")
+            writer.close()
+
+        assert self.cache.get_stats() == {'entries': 1, 'hits': 1, 'misses': 1}
+
+    def test_counters_flushed_on_close(self):
+        """Test buffered counters reach the database when the cache closes."""
+        self.cache.put((1, 2, 3, 4), CachedDetection(script_type='nodejs'))
+        self.cache.get((1, 2, 3, 4))
+        self.cache.close()
+
+        other = DetectionCache(self.cache.path.parent)
+        try:
+            assert other.get_stats()['hits'] == 1
+        finally:
+            other.close()
+
+    def test_eviction_keeps_running_count(self):
+        """Test stores only count the table when the running count is unknown."""
+        for ino in range(10):
+            self.cache.put((1, ino, 0, 0), CachedDetection(script_type='php'))
+        # Updating an existing entry does not grow the cache
+        self.cache.put((1, 9, 0, 0), CachedDetection(shebang='#!/usr/bin/php'))
+
+        assert self.cache._entry_count == 3
+        assert self.cache.get_stats()['entries'] == 3
+
+    def test_shared_between_instances(self):
+        """Test separate cache instances see each other's entries."""
+        self.cache.put((1, 2, 3, 4), CachedDetection(script_type='nodejs'))
+        other = DetectionCache(self.cache.path.parent, max_entries=3)
+        try:
+            assert other.get((1, 2, 3, 4)).script_type == 'nodejs'
+        finally:
+            other.close()
+
+    def test_clear(self):
+        """Test clearing removes entries and resets counters."""
+        self.cache.put((1, 2, 3, 4), CachedDetection(script_type='nodejs'))
+        self.cache.get((1, 2, 3, 4))
+        self.cache.clear()
+
+        assert self.cache.get_stats() == {'entries': 0, 'hits': 0, 'misses': 0}
+
+    def test_database_errors_degrade_to_miss(self):
+        """Test an unusable database behaves like an empty cache."""
+        cache_path = Path(self.temp_dir) / "broken"
+        cache_path.mkdir()
+        (cache_path / DetectionCache.DEFAULT_FILENAME).mkdir()
+        cache = DetectionCache(cache_path)
+
+        assert cache.get((1, 2, 3, 4)) is None
+        cache.put((1, 2, 3, 4), CachedDetection(script_type='php'))
+        assert cache.get_stats() == {'entries': 0, 'hits': 0, 'misses': 0}
+
+
+    def test_unusable_directory_disables_cache(self):
+        """Test a cache directory that cannot be created degrades to misses."""
+        blocker = Path(self.temp_dir) / "file"
+        blocker.write_text("not a directory")
+        cache = DetectionCache(blocker / "cache")
+
+        assert cache.get((1, 2, 3, 4)) is None
+        cache.put((1, 2, 3, 4), CachedDetection(script_type='php'))
+        assert cache.get_stats() == {'entries': 0, 'hits': 0, 'misses': 0}
+        assert cache._disabled
+
+        script = Path(self.temp_dir) / "hook"
+        script.write_text("#!/bin/bash\necho hi\n")
+        detector = ScriptDetector(cache=cache)
+        assert detector.detect_type(str(script)) == ScriptType.SHELL
+
+    def test_open_cache_not_kept_alive(self):
+        """Test an open cache can be garbage collected before exit."""
+        import gc
+        import weakref
+        cache = DetectionCache(Path(self.temp_dir) / "other")
+        cache.get((1, 2, 3, 4))
+        ref = weakref.ref(cache)
+
+        del cache
+        gc.collect()
+
+        assert ref() is None
+
+
+class TestDetectorCaching:
+    """Test cases for ScriptDetector integration with DetectionCache."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = DetectionCache(Path(self.temp_dir) / "cache")
+        self.detector = ScriptDetector(cache=self.cache)
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        import shutil
+        self.cache.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def create_test_file(self, filename: str, content: str) -> str:
+        """Create a test file with given content."""
+        filepath = os.path.join(self.temp_dir, filename)
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return filepath
+
+    def test_detect_type_uses_cache(self):
+        """Test a second detection is served from the cache."""
+        filepath = self.create_test_file('hook', '#!/bin/bash\necho hi\n')
+
+        assert self.detector.detect_type(filepath) == ScriptType.SHELL
+        with patch.object(FileProbe, 'load') as load:
+            assert self.detector.detect_type(filepath) == ScriptType.SHELL
+            load.assert_not_called()
+
+        assert self.cache.get_stats()['hits'] == 1
+
+    def test_extension_detection_skips_cache(self):
+        """Test files detected by extension never touch the cache."""
+        filepath = self.create_test_file('script.py', 'print(1)\n')
+
+        assert self.detector.detect_type(filepath) == ScriptType.PYTHON
+        assert self.cache.get_stats() == {'entries': 0, 'hits': 0, 'misses': 0}
+
+    def test_modified_file_misses(self):
+        """Test changing a file invalidates its cached type."""
+        filepath = self.create_test_file('hook', '#!/bin/bash\necho hi\n')
+        assert self.detector.detect_type(filepath) == ScriptType.SHELL
+
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write('#!/usr/bin/env node\nconsole.log("hi");\n')
+        future = time.time() + 10
+        os.utime(filepath, (future, future))
+
+        assert self.detector.detect_type(filepath) == ScriptType.NODEJS
+
+    def test_confidence_scores_cached(self):
+        """Test cached confidence scores equal freshly computed ones."""
+        filepath = self.create_test_file('tool', '#!/usr/bin/env python3\nimport os\nprint(os.name)\n')
+        uncached = ScriptDetector().get_confidence_scores(filepath)
+
+        assert self.detector.get_confidence_scores(filepath) == uncached
+        with patch.object(FileProbe, 'load') as load:
+            assert self.detector.get_confidence_scores(filepath) == uncached
+            load.assert_not_called()
+
+    def test_from_config_creates_cache(self):
+        """Test the cache is created under cache_dir when enabled."""
+        config = Config()
+        config.cache_dir = Path(self.temp_dir) / "configured"
+        config.detection = {'cache': True, 'cache_max_entries': 42}
+
+        detector = ScriptDetector.from_config(config)
+
+        assert detector.cache.path.parent == config.cache_dir
+        assert detector.cache.max_entries == 42
+
+    def test_from_config_cache_enabled_by_default(self):
+        """Test the cache defaults to on and can be disabled."""
+        config = Config()
+        config.cache_dir = Path(self.temp_dir) / "configured"
+
+        assert ScriptDetector.from_config(config).cache is not None
+        config.detection = {'cache': False}
+        assert ScriptDetector.from_config(config).cache is None
@@ -0,0 +1,105 @@
+"""
+Unit tests for bounded content sampling in script detection.
+"""
+import os
+import tempfile
+
+from airun.core.config import Config
+from airun.core.detector import ScriptDetector, ScriptType
+
+
+class TestContentSampling:
+    """Test cases for ScriptDetector content sampling."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def create_test_file(self, filename: str, content: str) -> str:
+        """Create a test file with given content."""
+        filepath = os.path.join(self.temp_dir, filename)
+        with open(filepath, 'w', encoding='utf-8', newline='') as f:
+            f.write(content)
+        return filepath
+
+    def test_sample_is_bounded(self):
+        """Test only the configured head window is read."""
+        filepath = self.create_test_file('big', 'a' * 100 + 'b' * 100)
+        detector = ScriptDetector(sniff_bytes=100)
+
+        assert detector._read_sample(filepath) == 'a' * 100
+
+    def test_small_file_is_read_whole(self):
+        """Test files smaller than the window are read entirely."""
+        filepath = self.create_test_file('small', 'import os\nprint(os.name)\n')
+        detector = ScriptDetector(sniff_bytes=1024, tail_bytes=1024)
+
+        assert detector._read_sample(filepath) == 'import os\nprint(os.name)\n'
+
+    def test_tail_sample(self):
+        """Test the tail window is appended without its partial first line."""
+        content = 'head\n' + 'x' * 200 + '\npartial line\nlast line\n'
+        filepath = self.create_test_file('tail', content)
+        detector = ScriptDetector(sniff_bytes=5, tail_bytes=20)
+
+        assert detector._read_sample(filepath) == 'head\n\nlast line\n'
+
+    def test_adjacent_tail_is_not_split(self):
+        """Test a tail window that starts right after the head is kept whole."""
+        filepath = self.create_test_file('adjacent', 'abcdefgh')
+        detector = ScriptDetector(sniff_bytes=4, tail_bytes=10)
+
+        assert detector._read_sample(filepath) == 'abcdefgh'
+
+    def test_full_scan(self):
+        """Test full scan ignores the sniff window."""
+        filepath = self.create_test_file('full', 'a' * 500)
+        detector = ScriptDetector(sniff_bytes=10, full_scan=True)
+
+        assert detector._read_sample(filepath) == 'a' * 500
+
+    def test_newlines_are_normalised(self):
+        """Test CRLF and CR line endings are normalised like text mode reads."""
+        filepath = self.create_test_file('crlf', 'echo one\r\necho two\recho three\n')
+        detector = ScriptDetector()
+
+        assert detector._read_sample(filepath) == 'echo one\necho two\necho three\n'
+
+    def test_detection_uses_sample(self):
+        """Test content detection only sees the sampled prefix."""
+        content = "echo 'start'\n" * 50 + "import os\nprint(os.name)\n" * 5000
+        filepath = self.create_test_file('mixed', content)
+
+        assert ScriptDetector(sniff_bytes=256).detect_type(filepath) == ScriptType.SHELL
+        assert ScriptDetector(full_scan=True).detect_type(filepath) == ScriptType.PYTHON
+
+    def test_unreadable_file(self):
+        """Test missing files produce no sample."""
+        detector = ScriptDetector()
+
+        assert detector._read_sample(os.path.join(self.temp_dir, 'missing')) is None
+        assert detector._detect_by_content(os.path.join(self.temp_dir, 'missing')) == ScriptType.UNKNOWN
+
+    def test_from_config(self):
+        """Test detector settings are read from the detection config section."""
+        config = Config()
+        config.detection = {'sniff_bytes': 1024, 'tail_bytes': 512}
+
+        detector = ScriptDetector.from_config(config, full_scan=True)
+
+        assert detector.sniff_bytes == 1024
+        assert detector.tail_bytes == 512
+        assert detector.full_scan is True
+
+    def test_from_config_defaults(self):
+        """Test defaults are used when the config has no detection section."""
+        detector = ScriptDetector.from_config(object())
+
+        assert detector.sniff_bytes == ScriptDetector.DEFAULT_SNIFF_BYTES
+        assert detector.tail_bytes == ScriptDetector.DEFAULT_TAIL_BYTES
+        assert detector.full_scan is False
@@ -0,0 +1,223 @@
+"""
+Unit tests for early error detection.
+"""
+import os
+import sys
+import tempfile
+import time
+from unittest.mock import Mock
+
+from airun.core.detector import ScriptType
+from airun.core.error_watcher import ErrorWatcher, ErrorWatchSettings
+from airun.core.runners import PythonRunner
+
+
+class TestErrorWatcher:
+    """Test cases for ErrorWatcher."""
+
+    def test_python_traceback(self):
+        """Test a Python traceback header triggers the watcher."""
+        watcher = ErrorWatcher(ScriptType.PYTHON)
+        watcher('stderr', 'warming up\n')
+        assert not watcher.triggered
+
+        watcher('stderr', 'Traceback (most recent call last):\n  File "x.py", line 1\n')
+        assert watcher.triggered
+        assert watcher.error_line == 'Traceback (most recent call last):'
+        assert watcher.detected_after is not None
+
+    def test_line_split_across_chunks(self):
+        """Test a pattern split over two chunks is still matched."""
+        watcher = ErrorWatcher(ScriptType.PHP)
+        watcher('stdout', 'PHP Fatal ')
+        assert not watcher.triggered
+        watcher('stdout', 'error: Uncaught Exception in /x.php:3\n')
+        assert watcher.triggered
+
+    def test_language_patterns(self):
+        """Test the Node.js, shell and PHP patterns."""
+        cases = [
+            (ScriptType.NODEJS, 'stderr', 'TypeError: x is not a function\n'),
+            (ScriptType.NODEJS, 'stderr', 'Error [ERR_MODULE_NOT_FOUND]: Cannot find\n'),
+            (ScriptType.SHELL, 'stderr', 'run.sh: line 3: foo: command not found\n'),
+            (ScriptType.PHP, 'stdout', 'Parse error: syntax error in x.php\n'),
+        ]
+        for script_type, stream, line in cases:
+            watcher = ErrorWatcher(script_type)
+            watcher(stream, line)
+            assert watcher.triggered, line
+
+    def test_unwatched_stream_ignored(self):
+        """Test stdout is not watched for Python."""
+        watcher = ErrorWatcher(ScriptType.PYTHON)
+        watcher('stdout', 'Traceback (most recent call last):\n')
+        assert not watcher.triggered
+
+    def test_should_stop_waits_for_quiet_output(self):
+        """Test stopping waits for the settle time and honours kill."""
+        traceback = ('Traceback (most recent call last):\n'
+                     '  File "x.py", line 1, in <module>\n'
+                     'ZeroDivisionError: division by zero\n')
+        watcher = ErrorWatcher(ScriptType.PYTHON,
+                               ErrorWatchSettings(kill=True, settle_time=0.2))
+        watcher('stderr', traceback)
+        assert not watcher.should_stop()
+        time.sleep(0.25)
+        assert watcher.should_stop()
+
+        passive = ErrorWatcher(ScriptType.PYTHON, ErrorWatchSettings(settle_time=0))
+        passive('stderr', traceback)
+        assert not passive.should_stop()
+
+    def test_only_fatal_lines_allow_stopping(self):
+        """Test non-fatal error lines are recorded but never stop the script."""
+        settings = ErrorWatchSettings(kill=True, settle_time=0)
+        cases = [
+            (ScriptType.PYTHON, 'stderr', 'Traceback (most recent call last):\n'),
+            (ScriptType.NODEJS, 'stderr', 'Error: retrying\n'),
+            (ScriptType.SHELL, 'stderr', 'run.sh: line 12: foo: command not found\n'),
+        ]
+        for script_type, stream, line in cases:
+            watcher = ErrorWatcher(script_type, settings)
+            watcher(stream, line)
+            assert watcher.triggered, line
+            assert not watcher.should_stop(), line
+
+        node = ErrorWatcher(ScriptType.NODEJS, settings)
+        node('stderr', 'TypeError: x is not a function\n    at main (/x.js:1:1)\n'
+                       '\nNode.js v18.19.0\n')
+        assert node.should_stop()
+
+    def test_php_uncaught_exception_report(self):
+        """Test the stack trace after a PHP uncaught exception keeps it fatal."""
+        watcher = ErrorWatcher(ScriptType.PHP, ErrorWatchSettings(kill=True, settle_time=0))
+        watcher('stderr', "PHP Fatal error:  Uncaught Exception: boom in /tmp/x.php:3\n"
+                          "Stack trace:\n"
+                          "#0 /tmp/x.php(7): load('config.ini')\n"
+                          "#1 {main}\n"
+                          "  thrown in /tmp/x.php on line 3\n")
+        watcher('stdout', "\nFatal error: Uncaught Exception: boom in /tmp/x.php:3\n"
+                          "Stack trace:\n"
+                          "#0 /tmp/x.php(7): load('config.ini')\n"
+                          "#1 {main}\n"
+                          "  thrown in /tmp/x.php on line 3\n")
+
+        assert watcher.error_line == "PHP Fatal error:  Uncaught Exception: boom in /tmp/x.php:3"
+        assert watcher.fatal_line == "Fatal error: Uncaught Exception: boom in /tmp/x.php:3"
+        assert watcher.should_stop()
+
+        watcher('stdout', 'Sta')
+        assert not watcher.should_stop()
+        watcher('stdout', 'rting over\n')
+        assert watcher.fatal_line is None
+
+    def test_later_output_cancels_stop(self):
+        """Test output after a fatal line means the script recovered."""
+        watcher = ErrorWatcher(ScriptType.PYTHON,
+                               ErrorWatchSettings(kill=True, settle_time=0))
+        watcher('stderr', 'Traceback (most recent call last):\n'
+                          '  File "x.py", line 1, in <module>\n'
+                          'ValueError: bad input\n')
+        assert watcher.should_stop()
+
+        watcher('stdout', 'retrying\n')
+        assert not watcher.should_stop()
+        assert watcher.error_line == 'Traceback (most recent call last):'
+
+    def test_settings_from_config(self):
+        """Test settings are read from the early_error section."""
+        settings = ErrorWatchSettings.from_config(
+            Mock(early_error={'enabled': True, 'kill': True, 'settle_time': 0.5}))
+        assert settings == ErrorWatchSettings(kill=True, settle_time=0.5)
+
+        settings = ErrorWatchSettings.from_config(Mock(early_error={'enabled': True}))
+        assert settings == ErrorWatchSettings(kill=False)
+
+        assert ErrorWatchSettings.from_config(Mock(early_error={'enabled': False})) is None
+        assert ErrorWatchSettings.from_config(Mock(early_error={})) is None
+        assert ErrorWatchSettings.from_config(Mock()) is None
+
+
+class TestEarlyStop:
+    """Test cases for runners stopping scripts on detected errors."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.config = {
+            'timeout': 30,
+            'python': {'executable': sys.executable, 'flags': ['-u']},
+        }
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def create_script(self, content: str) -> str:
+        """Create a Python script with given content."""
+        filepath = os.path.join(self.temp_dir, 'script.py')
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return filepath
+
+    def test_hanging_script_stopped_after_traceback(self):
+        """Test a script hanging after a traceback is stopped early."""
+        script = self.create_script(
+            "import sys, time, traceback\n"
+            "try:\n"
+            "    1 / 0\n"
+            "except ZeroDivisionError:\n"
+            "    traceback.print_exc()\n"
+            "    sys.stderr.flush()\n"
+            "time.sleep(30)\n"
+        )
+        runner = PythonRunner(self.config,
+                              error_watch=ErrorWatchSettings(kill=True, settle_time=0.3))
+
+        result = runner.execute(script)
+
+        assert result.execution_time < 10
+        assert result.error_detected
+        assert result.exit_code != 0
+        assert result.early_error == 'Traceback (most recent call last):'
+        assert 'ZeroDivisionError' in result.stderr
+
+    def test_recovering_script_not_stopped(self):
+        """Test a script that keeps running after a handled traceback is not killed."""
+        script = self.create_script(
+            "import logging, time\n"
+            "try:\n"
+            "    1 / 0\n"
+            "except ZeroDivisionError:\n"
+            "    logging.exception('retrying')\n"
+            "for _ in range(4):\n"
+            "    time.sleep(0.2)\n"
+            "    print('working', flush=True)\n"
+        )
+        runner = PythonRunner(self.config,
+                              error_watch=ErrorWatchSettings(kill=True, settle_time=0.5))
+
+        result = runner.execute(script)
+
+        assert result.exit_code == 0
+        assert not result.error_detected
+        assert result.stdout == 'working\n' * 4
+        assert result.early_error == 'Traceback (most recent call last):'
+
+    def test_detection_without_kill(self):
+        """Test kill=False records the error but lets the script finish."""
+        script = self.create_script(
+            "import sys\n"
+            "print('Traceback (most recent call last):', file=sys.stderr)\n"
+            "print('done')\n"
+        )
+        runner = PythonRunner(self.config,
+                              error_watch=ErrorWatchSettings(kill=False))
+
+        result = runner.execute(script)
+
+        assert result.exit_code == 0
+        assert not result.error_detected
+        assert result.stdout == 'done\n'
+        assert result.early_error is not None
@@ -0,0 +1,107 @@
+"""
+Unit tests for runner execution templates.
+"""
+import os
+import sys
+import tempfile
+from unittest.mock import patch
+
+import pytest
+
+from airun.core.detector import ScriptType, Shebang
+from airun.core.runners import NodeJSRunner, PHPRunner, PythonRunner, ShellRunner
+
+
+class TestExecutionTemplate:
+    """Test cases for BaseRunner.template."""
+
+    @pytest.mark.parametrize('runner_class, expected', [
+        (PythonRunner, ['python3', '-u', 's', 'a']),
+        (ShellRunner, ['bash', 's', 'a']),
+        (NodeJSRunner, ['node', 's', 'a']),
+        (PHPRunner, ['php', 's', 'a']),
+    ])
+    def test_default_commands(self, runner_class, expected):
+        """Test each runner's defaults when its config section is empty."""
+        assert runner_class({}).get_command('s', ['a']) == expected
+
+    def test_configured_executable_and_flags(self):
+        """Test the runner's config section sets the interpreter and flags."""
+        runner = PythonRunner({'python': {'executable': '/opt/py', 'flags': ['-O', '-u']}})
+
+        assert runner.get_executable() == '/opt/py'
+        assert runner.get_command('s.py') == ['/opt/py', '-O', '-u', 's.py']
+
+    def test_shebang_flags_come_first(self):
+        """Test shebang interpreter and flags are used when enabled."""
+        shebang = Shebang(line='#!/usr/bin/python3 -B', interpreter='/usr/bin/python3',
+                          interpreter_name='python3', flags=['-B'],
+                          script_type=ScriptType.PYTHON)
+        runner = PythonRunner({'python': {'use_shebang': True}}, shebang=shebang)
+
+        assert runner.get_command('s.py') == ['/usr/bin/python3', '-B', '-u', 's.py']
+
+    def test_shebang_flags_not_repeated(self):
+        """Test a flag set by both the shebang and the config is passed once."""
+        shebang = Shebang(line='#!/usr/bin/env -S python3 -u -B', interpreter='python3',
+                          interpreter_name='python3', flags=['-u', '-B'],
+                          script_type=ScriptType.PYTHON)
+        runner = PythonRunner({'python': {'use_shebang': True,
+                                          'flags': ['-B', '-X', 'dev', '-X', 'utf8']}},
+                              shebang=shebang)
+
+        assert runner.get_command('s.py') == [
+            'python3', '-u', '-B', '-X', 'dev', '-X', 'utf8', 's.py']
+        assert PythonRunner({'python': {'use_shebang': True}},
+                            shebang=shebang).get_command('s.py') == [
+            'python3', '-u', '-B', 's.py']
+
+    def test_template_is_reused(self):
+        """Test repeated launches share one template."""
+        runner = ShellRunner({'env_vars': {'A': '1'}})
+
+        assert runner.template is runner.template
+
+    def test_environment_inherited_without_env_vars(self):
+        """Test no environment copy is made when nothing is added."""
+        assert ShellRunner({}).template.env is None
+
+    def test_environment_is_frozen(self):
+        """Test the merged environment cannot be changed by a launch."""
+        with patch.dict(os.environ, {'AIRUN_TEMPLATE_TEST': 'outer'}):
+            env = ShellRunner({'env_vars': {'A': '1'}}).template.env
+
+        assert env['A'] == '1'
+        assert env['AIRUN_TEMPLATE_TEST'] == 'outer'
+        with pytest.raises(TypeError):
+            env['A'] = '2'
+
+    def test_config_change_rebuilds(self):
+        """Test assigning a config, or refreshing, rebuilds the template."""
+        runner = ShellRunner({'shell': {'executable': 'bash'}})
+        assert runner.get_executable() == 'bash'
+
+        runner.config = {'shell': {'executable': 'zsh'}}
+        assert runner.get_executable() == 'zsh'
+
+        runner.config['shell']['executable'] = 'dash'
+        assert runner.get_executable() == 'zsh'
+        runner.refresh_template()
+        assert runner.get_executable() == 'dash'
+
+    def test_env_vars_reach_script(self):
+        """Test configured variables are seen by the script."""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            script = os.path.join(temp_dir, 'env.py')
+            with open(script, 'w', encoding='utf-8') as f:
+                f.write("import os\nprint(os.environ['AIRUN_VALUE'])\n")
+            runner = PythonRunner({'python': {'executable': sys.executable},
+                                   'env_vars': {'AIRUN_VALUE': 'from-config'}})
+
+            result = runner.execute(script)
+
+            assert result.stdout == "from-config\n"
+        finally:
+            import shutil
+            shutil.rmtree(temp_dir, ignore_errors=True)
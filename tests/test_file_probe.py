@@ -0,0 +1,112 @@
+"""
+Unit tests for FileProbe and single-read file inspection.
+"""
+import builtins
+import os
+import tempfile
+from unittest.mock import patch
+
+from airun.core.detector import FileProbe, ScriptDetector, ScriptType
+
+
+class TestFileProbe:
+    """Test cases for FileProbe."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.detector = ScriptDetector()
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def create_test_file(self, filename: str, content: str, executable: bool = False) -> str:
+        """Create a test file with given content."""
+        filepath = os.path.join(self.temp_dir, filename)
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write(content)
+        if executable:
+            os.chmod(filepath, 0o755)
+        return filepath
+
+    def test_probe_is_lazy(self):
+        """Test creating a probe performs no I/O."""
+        with patch('airun.core.detector.os.stat') as stat, \
+                patch.object(builtins, 'open') as mock_open:
+            FileProbe(os.path.join(self.temp_dir, 'anything'))
+
+        stat.assert_not_called()
+        mock_open.assert_not_called()
+
+    def test_probe_facts(self):
+        """Test a probe reports shebang, content and permissions."""
+        filepath = self.create_test_file('hook', '#!/bin/bash\necho hi\n', executable=True)
+        probe = FileProbe(filepath)
+
+        assert probe.exists is True
+        assert probe.size == len('#!/bin/bash\necho hi\n')
+        assert probe.is_executable is True
+        assert probe.first_line == '#!/bin/bash'
+        assert probe.shebang == '#!/bin/bash'
+        assert probe.content == '#!/bin/bash\necho hi\n'
+
+    def test_probe_without_shebang(self):
+        """Test a regular first line is not reported as a shebang."""
+        probe = FileProbe(self.create_test_file('plain', 'echo hi\n'))
+
+        assert probe.first_line == 'echo hi'
+        assert probe.shebang is None
+        assert probe.is_executable is False
+
+    def test_missing_file(self):
+        """Test a probe of a missing file reports nothing."""
+        probe = FileProbe(os.path.join(self.temp_dir, 'missing'))
+
+        assert probe.exists is False
+        assert probe.size == 0
+        assert probe.is_executable is False
+        assert probe.content is None
+        assert probe.shebang is None
+
+    def test_directory_is_not_executable(self):
+        """Test directories are never reported as executable scripts."""
+        probe = FileProbe(self.temp_dir)
+
+        assert probe.exists is True
+        assert probe.is_executable is False
+        assert probe.content is None
+
+    def test_get_file_info_single_open_and_stat(self):
+        """Test dry-run file info opens the file once and never stats it by path."""
+        filepath = self.create_test_file('tool', '#!/usr/bin/env python3\nimport os\nprint(os.name)\n',
+                                         executable=True)
+        real_open = builtins.open
+        opened = []
+
+        def counting_open(file, *args, **kwargs):
+            if str(file) == filepath:
+                opened.append(file)
+            return real_open(file, *args, **kwargs)
+
+        with patch.object(builtins, 'open', side_effect=counting_open), \
+                patch('airun.core.detector.os.stat', side_effect=os.stat) as stat:
+            info = self.detector.get_file_info(filepath)
+
+        assert len(opened) == 1
+        stat.assert_not_called()
+        assert info['exists'] is True
+        assert info['is_executable'] is True
+        assert info['detected_type'] == ScriptType.PYTHON
+        assert info['shebang'] == '#!/usr/bin/env python3'
+        assert info['confidence_scores'] == self.detector.get_confidence_scores(filepath)
+
+    def test_get_file_info_missing_file(self):
+        """Test file info for a missing file does not raise."""
+        info = self.detector.get_file_info(os.path.join(self.temp_dir, 'missing'))
+
+        assert info['exists'] is False
+        assert info['size'] == 0
+        assert info['shebang'] is None
+        assert info['detected_type'] == ScriptType.UNKNOWN
@@ -0,0 +1,181 @@
+"""
+Unit tests for the fork-server execution backend.
+"""
+import os
+import shutil
+import tempfile
+import time
+from unittest.mock import patch
+
+import pytest
+
+from airun.core.backends import (
+    BackendUnavailable,
+    ForkServerBackend,
+    FORK_SERVER_SOURCES,
+    shutdown_fork_servers,
+)
+from airun.core.detector import ScriptType, Shebang
+from airun.core.runners import FORK_SERVER_SUPPORTED, NodeJSRunner, PHPRunner
+
+NODE = shutil.which('node')
+
+pytestmark = pytest.mark.skipif(not FORK_SERVER_SUPPORTED,
+                                reason="fork servers need FIFOs and Unix sockets")
+
+
+@pytest.mark.skipif(NODE is None, reason="node is not installed")
+class TestNodeForkServer:
+    """Test cases for the Node.js fork server."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.config = {
+            'timeout': 30,
+            'nodejs': {'executable': NODE, 'flags': [], 'fork_server': True},
+        }
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        shutdown_fork_servers()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def create_script(self, content: str, name: str = 'script.js') -> str:
+        """Create a JavaScript file with given content."""
+        filepath = os.path.join(self.temp_dir, name)
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return filepath
+
+    def test_runs_script_like_node(self):
+        """Test argv, cwd, environment, exit code and both streams."""
+        script = self.create_script(
+            "console.log(process.argv.slice(2).join(','), process.cwd(), process.env.AIRUN_TEST);\n"
+            "console.error('oops');\n"
+            "process.exitCode = 3;\n"
+        )
+        runner = NodeJSRunner(dict(self.config, env_vars={'AIRUN_TEST': 'forked'}))
+
+        assert runner.get_backend() is not None
+        result = runner.execute(script, args=['a', 'b'], cwd=self.temp_dir)
+
+        assert result.exit_code == 3
+        assert result.stdout == f"a,b {self.temp_dir} forked\n"
+        assert result.stderr == "oops\n"
+
+    def test_runs_are_isolated(self):
+        """Test globals set by one script are not visible to the next."""
+        script = self.create_script(
+            "console.log(globalThis.airunMarker || 'clean');\n"
+            "globalThis.airunMarker = 'dirty';\n"
+        )
+        runner = NodeJSRunner(self.config)
+
+        assert runner.execute(script).stdout == "clean\n"
+        assert runner.execute(script).stdout == "clean\n"
+
+    def test_uncaught_exception(self):
+        """Test an uncaught error is reported on stderr with exit code 1."""
+        script = self.create_script("function f() { throw new TypeError('bad'); }\nf();\n")
+
+        result = NodeJSRunner(self.config).execute(script)
+
+        assert result.exit_code == 1
+        assert result.stderr.startswith(f"{script}:1\n")
+        assert "\nTypeError: bad\n" in result.stderr
+        assert result.error_detected
+
+    def test_timeout_kills_job_not_server(self):
+        """Test a timed-out job is killed and the server keeps serving."""
+        hanging = self.create_script("console.log('up');\nsetInterval(() => {}, 1000);\n",
+                                     name='hang.js')
+        quick = self.create_script("console.log('next');\n")
+
+        start = time.monotonic()
+        result = NodeJSRunner(dict(self.config, timeout=1)).execute(hanging)
+
+        assert time.monotonic() - start < 10
+        assert result.exit_code == -1
+        assert result.stdout == "up\n"
+        assert NodeJSRunner(self.config).execute(quick).stdout == "next\n"
+
+    def test_server_is_reused(self):
+        """Test consecutive runs share one server but get their own processes."""
+        script = self.create_script("console.log(process.pid);\n")
+        runner = NodeJSRunner(self.config)
+
+        first = runner.execute(script).stdout
+        server = runner.get_backend()._process.pid
+        second = runner.execute(script).stdout
+
+        assert first != second
+        assert runner.get_backend()._process.pid == server
+        assert runner.get_backend().healthy
+
+    def test_job_owns_its_process(self):
+        """Test jobs may change directory, read stdin and run in different cwds."""
+        other = os.path.join(self.temp_dir, 'other')
+        os.mkdir(other)
+        script = self.create_script(
+            "process.chdir('..');\n"
+            "const input = require('fs').readFileSync(0, 'utf8');\n"
+            "console.log(process.ppid, process.cwd(), input.length);\n"
+        )
+        runner = NodeJSRunner(self.config)
+
+        first = runner.execute(script, cwd=other)
+        second = runner.execute(script, cwd=self.temp_dir)
+
+        server = runner.get_backend()._process.pid
+        assert first.stdout == f"{server} {self.temp_dir} 0\n"
+        assert second.stdout == f"{server} {os.path.dirname(self.temp_dir)} 0\n"
+
+    def test_unavailable_server_falls_back(self):
+        """Test a server that cannot start falls back to a subprocess."""
+        config = dict(self.config, nodejs=dict(self.config['nodejs'],
+                                               executable='airun-no-such-node'))
+
+        result = NodeJSRunner(config).execute(self.create_script("console.log(1);\n"))
+
+        assert result.exit_code == -2
+        assert "Command not found" in result.stderr
+
+
+class TestForkServerBackend:
+    """Test cases for ForkServerBackend failure handling."""
+
+    def test_failed_start_raises_and_backs_off(self):
+        """Test a server that never becomes ready is not retried at once."""
+        backend = ForkServerBackend('test', ['false'], start_timeout=1.0)
+
+        with pytest.raises(BackendUnavailable):
+            backend.spawn(__file__, [], None, {})
+        with pytest.raises(BackendUnavailable, match="recently failed"):
+            backend.spawn(__file__, [], None, {})
+        backend.close()
+
+    def test_disabled_by_default(self):
+        """Test runners use plain subprocesses unless fork_server is set."""
+        assert NodeJSRunner({'nodejs': {'executable': 'node'}}).get_backend() is None
+        assert PHPRunner({'php': {'executable': 'php'}}).get_backend() is None
+
+    def test_server_command_merges_shebang_flags(self):
+        """Test flags set by both the shebang and the config reach the server once."""
+        shebang = Shebang(line='#!/usr/bin/env -S node --no-warnings', interpreter='node',
+                          interpreter_name='node', flags=['--no-warnings'],
+                          script_type=ScriptType.NODEJS)
+        runner = NodeJSRunner({'nodejs': {'executable': 'node', 'use_shebang': True,
+                                          'flags': ['--no-warnings', '--trace-uncaught'],
+                                          'fork_server': True}}, shebang=shebang)
+
+        with patch('airun.core.runners.get_fork_server') as mock_get:
+            runner.get_backend()
+
+        mock_get.assert_called_once_with(
+            'nodejs', ['node', '--no-warnings', '--trace-uncaught'])
+
+    def test_sources_are_shipped(self):
+        """Test the server scripts are installed next to the backend."""
+        for path in FORK_SERVER_SOURCES.values():
+            assert path.is_file()
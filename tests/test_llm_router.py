@@ -1,4 +1,449 @@
 """
-test_llm_router.py
+Unit tests for the LLM router and its providers.
 """
+import asyncio
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
 
+import pytest
+
+from airun.core.detector import ScriptType
+from airun.core.llm_router import (
+    ClaudeProvider, CodeFix, ErrorContext, LLMProvider, LLMRouter, OllamaProvider,
+    OpenAIProvider
+)
+from airun.core.provider_health import (
+    CIRCUIT_CLOSED, CIRCUIT_HALF_OPEN, CIRCUIT_OPEN, HEALTH_PROBE, HEALTH_REQUEST,
+    CircuitBreaker, ProviderHealthRegistry
+)
+
+
+def make_context() -> ErrorContext:
+    """Build a small error context."""
+    return ErrorContext(script_type=ScriptType.PYTHON, error_message="NameError: x",
+                        code_snippet="print(x)", file_path="script.py")
+
+
+class FakeOllamaHandler(BaseHTTPRequestHandler):
+    """Answers Ollama API calls over keep-alive connections, recording each connection."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        self.server.connections.append(self.client_address)
+
+    def _reply(self, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        self._reply({'models': []})
+
+    def do_POST(self):
+        self.server.requests.append(self.path)
+        self.rfile.read(int(self.headers['Content-Length']))
+        self._reply({'response': "FIXED_CODE:\n```\nx = 1\nprint(x)\n```\n"})
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestProviderClients:
+    """Test cases for pooled provider HTTP clients."""
+
+    def setup_method(self):
+        """Start a local Ollama stand-in."""
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), FakeOllamaHandler)
+        self.server.connections = []
+        self.server.requests = []
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def teardown_method(self):
+        """Stop the server."""
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_ollama_reuses_connection(self):
+        """Test repeated fixes share one keep-alive connection."""
+        provider = OllamaProvider({'base_url': self.base_url})
+        try:
+            for _ in range(3):
+                fix = provider.generate_fix(make_context())
+                assert fix.fixed_code == "x = 1\nprint(x)"
+        finally:
+            provider.close()
+
+        assert len(self.server.connections) == 1
+        assert self.server.requests == ['/api/generate'] * 3
+
+    def test_close_opens_new_client(self):
+        """Test a closed provider opens a fresh session on the next request."""
+        provider = OllamaProvider({'base_url': self.base_url, 'pool_size': 2})
+        session = provider.client
+        assert provider.client is session
+        assert session.get_adapter(self.base_url)._pool_maxsize == 2
+
+        provider.close()
+
+        assert provider.client is not session
+        provider.close()
+
+    def test_sdk_client_built_once(self):
+        """Test cloud SDK clients are created once with a pooled HTTP client."""
+        openai = MagicMock()
+        httpx = MagicMock()
+        response = openai.OpenAI.return_value.chat.completions.create.return_value
+        response.choices = [SimpleNamespace(message=SimpleNamespace(content="x = 1"))]
+
+        with patch.dict(sys.modules, {'openai': openai, 'httpx': httpx}):
+            provider = OpenAIProvider({'api_key': 'k', 'pool_size': 8, 'connect_timeout': 2})
+            provider.generate_fix(make_context())
+            provider.generate_fix(make_context())
+            provider.close()
+
+        openai.OpenAI.assert_called_once()
+        assert openai.OpenAI.call_args.kwargs['http_client'] is httpx.Client.return_value
+        httpx.Limits.assert_called_once_with(max_connections=8, max_keepalive_connections=8)
+        httpx.Timeout.assert_called_once_with(30, connect=2)
+        openai.OpenAI.return_value.close.assert_called_once()
+
+    def test_ollama_async_uses_native_client(self):
+        """Test concurrent async fixes share one loop and pooled async client."""
+        provider = OllamaProvider({'base_url': self.base_url, 'pool_size': 2})
+
+        async def fix_many():
+            loop = asyncio.get_running_loop()
+            with patch.object(loop, 'run_in_executor') as run_in_executor:
+                fixes = await asyncio.gather(
+                    *(provider.generate_fix_async(make_context()) for _ in range(4)))
+                run_in_executor.assert_not_called()
+            client = provider.async_client
+            await provider.aclose()
+            return fixes, client
+
+        fixes, client = asyncio.run(fix_many())
+
+        assert [fix.fixed_code for fix in fixes] == ["x = 1\nprint(x)"] * 4
+        assert client.is_closed
+        assert len(self.server.connections) <= 2
+        assert self.server.requests == ['/api/generate'] * 4
+
+    def test_ollama_async_falls_back_without_httpx(self):
+        """Test a requests-only install runs async fixes in the executor."""
+        provider = OllamaProvider({'base_url': self.base_url})
+        try:
+            with patch.dict(sys.modules, {'httpx': None}):
+                fix = asyncio.run(provider.generate_fix_async(make_context()))
+        finally:
+            provider.close()
+
+        assert fix.fixed_code == "x = 1\nprint(x)"
+        assert provider._async_client is None
+
+    def test_async_client_per_event_loop(self):
+        """Test each event loop gets its own async client."""
+        provider = OllamaProvider({'base_url': self.base_url})
+
+        async def get_client():
+            return provider.async_client
+
+        first = asyncio.run(get_client())
+        second = asyncio.run(get_client())
+        provider.close()
+
+        assert first is not second
+
+    def test_sdk_async_client(self):
+        """Test cloud SDK providers await their async clients."""
+        anthropic = MagicMock()
+        httpx = MagicMock()
+        response = SimpleNamespace(content=[SimpleNamespace(text="x = 1")])
+
+        async def create(**kwargs):
+            return response
+        anthropic.AsyncAnthropic.return_value.messages.create = create
+
+        with patch.dict(sys.modules, {'anthropic': anthropic, 'httpx': httpx}):
+            provider = ClaudeProvider({'api_key': 'k'})
+            fix = asyncio.run(provider.generate_fix_async(make_context()))
+
+        assert fix.fixed_code == "x = 1"
+        assert (anthropic.AsyncAnthropic.call_args.kwargs['http_client']
+                is httpx.AsyncClient.return_value)
+        anthropic.Anthropic.assert_not_called()
+
+    def test_router_close(self):
+        """Test closing the router closes every provider's client."""
+        router = LLMRouter(SimpleNamespace(llm_providers={
+            'ollama': {'base_url': self.base_url},
+            'claude': {'api_key': 'k'},
+        }))
+        session = router.providers['ollama'].client
+        with patch.object(session, 'close') as mock_close:
+            router.close()
+
+        mock_close.assert_called_once()
+        assert router.providers['claude']._client is None
+        assert isinstance(router.providers['claude'], ClaudeProvider)
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class CountingProvider(LLMProvider):
+    """Provider that counts probes and requests, failing on demand."""
+
+    def __init__(self, fail: bool = False):
+        super().__init__({})
+        self.fail = fail
+        self.probes = 0
+        self.requests = 0
+
+    def is_available(self):
+        self.probes += 1
+        return not self.fail
+
+    def generate_fix(self, error_context):
+        self.requests += 1
+        if self.fail:
+            raise RuntimeError("connection refused")
+        return CodeFix(fixed_code="x = 1", explanation="", confidence=0.9, changes_made=[])
+
+
+class TestProviderHealthRegistry:
+    """Test cases for ProviderHealthRegistry."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.clock = FakeClock()
+        self.registry = ProviderHealthRegistry(ttl=30, clock=self.clock)
+
+    def test_status_expires(self):
+        """Test a recorded status is forgotten after the TTL."""
+        assert self.registry.is_available('ollama') is None
+
+        self.registry.record_failure('ollama', RuntimeError("timed out"))
+        assert self.registry.is_available('ollama') is False
+        assert self.registry.get('ollama').source == HEALTH_REQUEST
+
+        self.clock.now += 30
+        assert self.registry.is_available('ollama') is None
+        assert self.registry.snapshot()['ollama']['fresh'] is False
+
+    def test_probe_records_errors(self):
+        """Test a probe that raises is recorded as unavailable."""
+        provider = CountingProvider()
+        provider.is_available = lambda: 1 / 0
+
+        assert self.registry.probe('broken', provider) is False
+        entry = self.registry.get('broken')
+        assert entry.source == HEALTH_PROBE
+        assert 'division by zero' in entry.error
+
+    def test_background_refresh(self):
+        """Test the refresh thread probes providers with no status."""
+        registry = ProviderHealthRegistry(ttl=30)
+        provider = CountingProvider()
+
+        registry.start_refresh({'local': provider}, interval=0.01)
+        try:
+            deadline = time.monotonic() + 5
+            while registry.is_available('local') is None and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            registry.stop_refresh()
+
+        assert registry.is_available('local') is True
+        assert provider.probes == 1
+
+
+class TestRouterHealth:
+    """Test cases for health-aware routing."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.router = LLMRouter(SimpleNamespace(llm_providers={}, default_llm='primary:m',
+                                                llm_routing={'health_ttl': 30}))
+        self.router.health._clock = self.clock = FakeClock()
+        self.primary = CountingProvider()
+        self.fallback = CountingProvider()
+        self.router.providers = {'primary': self.primary, 'fallback': self.fallback}
+
+    def test_fix_does_not_probe(self):
+        """Test fixing sends only the real request."""
+        self.router.fix_error(make_context())
+        self.router.fix_error(make_context())
+
+        assert self.primary.requests == 2
+        assert self.primary.probes == 0
+        assert self.router.get_provider_info()['primary']['health']['source'] == HEALTH_REQUEST
+
+    def test_failed_probe_routes_to_fallback_until_expiry(self):
+        """Test a failed live check keeps the provider out of routing for the TTL."""
+        self.primary.fail = True
+        self.router.test_providers()
+        assert self.router.get_available_providers() == ['fallback']
+
+        self.router.fix_error(make_context())
+        assert (self.primary.requests, self.fallback.requests) == (0, 1)
+
+        self.primary.fail = False
+        self.clock.now += 30
+        self.router.fix_error(make_context())
+        assert self.primary.requests == 1
+
+    def test_failed_request_falls_back(self):
+        """Test a failed request moves on to the fallback in the same call."""
+        self.primary.fail = True
+
+        fix = self.router.fix_error(make_context())
+
+        assert fix.fixed_code == "x = 1"
+        assert (self.primary.requests, self.fallback.requests) == (1, 1)
+
+    def test_open_circuit_fails_fast(self):
+        """Test a provider that keeps failing is skipped without being contacted."""
+        self.primary.fail = True
+        for _ in range(5):
+            self.router.fix_error(make_context())
+
+        assert self.primary.requests == 3
+        assert self.fallback.requests == 5
+        circuit = self.router.get_provider_info()['primary']['circuit']
+        assert circuit['state'] == 'open'
+        assert 5 <= circuit['retry_in'] <= 10
+
+    def test_all_providers_failing(self):
+        """Test the error names every provider that failed."""
+        self.primary.fail = self.fallback.fail = True
+
+        with pytest.raises(RuntimeError, match="primary: connection refused"):
+            self.router.fix_error(make_context())
+
+        self.router.providers = {}
+        with pytest.raises(RuntimeError, match="No LLM providers are available"):
+            self.router.fix_error(make_context())
+
+    def test_unconfigured_provider_skipped(self):
+        """Test providers missing an API key are never routed to."""
+        self.router.providers['openai'] = OpenAIProvider({})
+
+        assert 'openai' not in self.router.get_available_providers()
+        with pytest.raises(ValueError):
+            self.router.get_provider('openai')
+
+    def test_check_provider_probes(self):
+        """Test explicit checks contact the provider and update its status."""
+        self.fallback.fail = True
+
+        with pytest.raises(ValueError):
+            self.router.check_provider('fallback')
+
+        assert self.fallback.probes == 1
+        assert self.router.get_provider_info()['fallback']['available'] is False
+
+
+class TestCircuitBreaker:
+    """Test cases for CircuitBreaker."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker(failure_threshold=2, backoff_base=10, backoff_max=25,
+                                      backoff_jitter=0.5, clock=self.clock, rand=lambda: 0.0)
+
+    def fail(self, times: int) -> None:
+        """Send and fail ``times`` requests."""
+        for _ in range(times):
+            assert self.breaker.allow_request()
+            self.breaker.record_failure()
+
+    def test_opens_after_threshold(self):
+        """Test consecutive failures open the circuit, and success resets the count."""
+        self.fail(1)
+        self.breaker.record_success()
+        self.fail(1)
+        assert self.breaker.state == CIRCUIT_CLOSED
+
+        self.fail(1)
+
+        assert self.breaker.state == CIRCUIT_OPEN
+        assert not self.breaker.allow_request()
+
+    def test_half_open_allows_one_trial(self):
+        """Test only one trial request goes through once the backoff has passed."""
+        self.fail(2)
+        self.clock.now += 10
+
+        assert self.breaker.state == CIRCUIT_HALF_OPEN
+        assert self.breaker.allow_request()
+        assert self.breaker.is_open()
+        assert not self.breaker.allow_request()
+
+        self.breaker.record_success()
+        assert self.breaker.state == CIRCUIT_CLOSED
+        assert self.breaker.snapshot()['opens'] == 0
+
+    def test_backoff_doubles_up_to_max(self):
+        """Test each failed trial reopens the circuit for longer, up to the maximum."""
+        self.fail(2)
+        waits = []
+        for _ in range(3):
+            waits.append(self.breaker.snapshot()['retry_in'])
+            self.clock.now += waits[-1]
+            self.fail(1)
+
+        assert waits == [10, 20, 25]
+
+    def test_many_failed_trials_keep_backoff_bounded(self):
+        """Test thousands of failed trials neither overflow nor wedge the circuit."""
+        self.fail(2)
+        for _ in range(2000):
+            self.clock.now += self.breaker.snapshot()['retry_in']
+            self.fail(1)
+
+        assert self.breaker.state == CIRCUIT_OPEN
+        assert self.breaker.snapshot()['retry_in'] == 25
+
+        self.clock.now += 25
+        assert self.breaker.allow_request()
+        self.breaker.record_success()
+        assert self.breaker.state == CIRCUIT_CLOSED
+
+    def test_jitter_shortens_backoff(self):
+        """Test jitter takes up to its fraction off the backoff."""
+        breaker = CircuitBreaker(failure_threshold=1, backoff_base=10, backoff_jitter=0.5,
+                                 clock=self.clock, rand=lambda: 0.999)
+        breaker.record_failure()
+
+        assert 5 <= breaker.snapshot()['retry_in'] < 5.01
+
+    def test_abandoned_trial_is_freed(self):
+        """Test a cancelled trial lets the next request try again."""
+        self.fail(2)
+        self.clock.now += 10
+        assert self.breaker.allow_request()
+
+        self.breaker.abandon()
+
+        assert self.breaker.allow_request()
@@ -0,0 +1,181 @@
+"""
+Unit tests for bounded output capture.
+"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+from unittest.mock import Mock
+
+from airun.core.process import CapturedStream, OutputCapture, OutputLimits
+from airun.core.runners import PythonRunner
+
+
+class TestCapturedStream:
+    """Test cases for CapturedStream."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.limits = OutputLimits(memory_limit=100, head_size=10, tail_size=20,
+                                   spill_dir=Path(self.temp_dir) / 'output')
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_small_output_stays_in_memory(self):
+        """Test output under the limit is kept whole without a spill file."""
+        stream = CapturedStream('stdout', self.limits)
+        stream.write("hello\n")
+        stream.finish()
+
+        assert not stream.truncated
+        assert stream.spill_path is None
+        assert stream.preview() == stream.read() == "hello\n"
+
+    def test_large_output_spills_with_head_and_tail(self):
+        """Test output over the limit spills to disk keeping head and tail."""
+        stream = CapturedStream('stdout', self.limits)
+        text = ''.join(f"line {i:03d}\n" for i in range(50))
+        for start in range(0, len(text), 7):
+            stream.write(text[start:start + 7])
+        stream.finish()
+
+        assert stream.truncated
+        assert stream.spill_path.startswith(str(self.limits.spill_dir))
+        preview = stream.preview()
+        assert preview.startswith(text[:10])
+        assert preview.endswith(text[-20:])
+        assert f"{len(text) - 30} characters omitted" in preview
+        assert stream.read() == text
+
+    def test_close_removes_spill_file(self):
+        """Test the spill file is deleted on close."""
+        stream = CapturedStream('stderr', self.limits)
+        stream.write('x' * 500)
+        stream.finish()
+        path = stream.spill_path
+
+        assert os.path.exists(path)
+        stream.close()
+        assert not os.path.exists(path)
+
+    def test_crlf_split_across_chunks(self):
+        """Test line endings are normalized even when split between chunks."""
+        stream = CapturedStream('stdout')
+        for chunk in ("a\r", "\nb\r", "c\r"):
+            stream.write(chunk)
+        stream.finish()
+
+        assert stream.read() == "a\nb\nc\n"
+
+    def test_unwritable_spill_dir_keeps_head_and_tail(self):
+        """Test spilling degrades to head and tail when the disk is unusable."""
+        blocker = Path(self.temp_dir) / 'file'
+        blocker.write_text('')
+        limits = OutputLimits(memory_limit=100, head_size=10, tail_size=20,
+                              spill_dir=blocker / 'output')
+        stream = CapturedStream('stdout', limits)
+        stream.write('a' * 10 + 'b' * 200 + 'c' * 20)
+        stream.finish()
+
+        assert stream.truncated
+        assert stream.spill_path is None
+        assert stream.preview().startswith('a' * 10)
+        assert stream.preview().endswith('c' * 20)
+
+    def test_output_capture_callback(self):
+        """Test OutputCapture routes chunks to the right stream."""
+        capture = OutputCapture(self.limits)
+        capture('stdout', 'out')
+        capture('stderr', 'err')
+
+        assert capture.stdout == 'out'
+        assert capture.stderr == 'err'
+
+
+class TestOutputLimits:
+    """Test cases for OutputLimits.from_config."""
+
+    def test_from_config(self):
+        """Test limits are read from the output section."""
+        config = Mock(output={'memory_limit': 1000, 'tail_size': 50},
+                      cache_dir=Path('/tmp/airun-cache'))
+
+        limits = OutputLimits.from_config(config)
+
+        assert limits.memory_limit == 1000
+        assert limits.head_size == OutputLimits.head_size
+        assert limits.tail_size == 50
+        assert limits.spill_dir == Path('/tmp/airun-cache/output')
+
+    def test_disabled_or_missing(self):
+        """Test no limits are returned when unset or disabled."""
+        assert OutputLimits.from_config(Mock(output={'memory_limit': 0})) is None
+        assert OutputLimits.from_config(Mock()) is None
+
+
+class TestBoundedExecution:
+    """Test cases for runners with bounded output."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.config = {
+            'timeout': 30,
+            'python': {'executable': sys.executable, 'flags': ['-u']},
+        }
+        self.limits = OutputLimits(memory_limit=4096, head_size=100, tail_size=200,
+                                   spill_dir=Path(self.temp_dir) / 'output')
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def create_script(self, content: str) -> str:
+        """Create a Python script with given content."""
+        filepath = os.path.join(self.temp_dir, 'script.py')
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return filepath
+
+    def test_chatty_script_is_bounded(self):
+        """Test a script's large output is spilled and readable on demand."""
+        script = self.create_script(
+            "import sys\n"
+            "print('START')\n"
+            "for i in range(20000):\n"
+            "    print(f'noise {i}')\n"
+            "print('Traceback: the end', file=sys.stderr)\n"
+            "print('END')\n"
+        )
+        runner = PythonRunner(self.config, output_limits=self.limits)
+
+        result = runner.execute(script)
+
+        assert result.exit_code == 0
+        assert result.output_truncated
+        assert len(result.stdout) < 400
+        assert result.stdout.startswith('START\n')
+        assert result.stdout.endswith('END\n')
+        assert result.stderr == 'Traceback: the end\n'
+
+        full = result.read_output('stdout')
+        assert full.count('\n') == 20002
+        with result.open_output('stdout') as f:
+            assert f.readline() == 'START\n'
+
+        spill_path = result.captures['stdout'].spill_path
+        result.close()
+        assert not os.path.exists(spill_path)
+
+    def test_unbounded_result_accessors(self):
+        """Test lazy accessors work for results without captures."""
+        runner = PythonRunner(self.config)
+        result = runner.execute(self.create_script("print('hi')\n"))
+
+        assert not result.output_truncated
+        assert result.read_output('stdout') == 'hi\n'
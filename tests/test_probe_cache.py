@@ -0,0 +1,148 @@
+"""
+Unit tests for the interpreter probe cache.
+"""
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from unittest.mock import Mock, patch
+
+import pytest
+
+from airun.core.probe_cache import ProbeCache, probe_executable
+from airun.core.runners import PythonRunner, RunnerFactory
+from airun.core.detector import ScriptType
+
+
+@pytest.mark.skipif(os.name != 'posix', reason="uses a shell script as interpreter")
+class TestProbeCache:
+    """Test cases for ProbeCache."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = ProbeCache(self.temp_dir)
+        self.interpreter = os.path.join(self.temp_dir, 'fake-interpreter')
+        self.write_interpreter('Fake 1.0')
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def write_interpreter(self, version: str, mtime_ns: int = 1_000_000_000) -> None:
+        """Create an executable that prints a version string."""
+        with open(self.interpreter, 'w') as f:
+            f.write(f"#!/bin/sh\necho '{version}'\n")
+        os.chmod(self.interpreter, 0o755)
+        os.utime(self.interpreter, ns=(mtime_ns, mtime_ns))
+
+    def test_probe_reports_version(self):
+        """Test a probe records availability and the version line."""
+        probe = self.cache.probe(self.interpreter)
+
+        assert probe.available
+        assert probe.version == 'Fake 1.0'
+        assert probe.path == os.path.realpath(self.interpreter)
+
+    def test_warm_cache_skips_spawn(self):
+        """Test a cached interpreter is not run again."""
+        self.cache.probe(self.interpreter)
+
+        with patch('subprocess.run') as mock_run:
+            probe = ProbeCache(self.temp_dir).probe(self.interpreter)
+
+        mock_run.assert_not_called()
+        assert probe.available
+        assert probe.version == 'Fake 1.0'
+
+    def test_changed_interpreter_is_probed_again(self):
+        """Test replacing the interpreter invalidates its entry."""
+        self.cache.probe(self.interpreter)
+        self.write_interpreter('Fake 2.0', mtime_ns=2_000_000_000)
+
+        assert self.cache.probe(self.interpreter).version == 'Fake 2.0'
+        assert self.cache.get(self.interpreter).version == 'Fake 2.0'
+
+    def test_missing_interpreter_not_cached(self):
+        """Test an interpreter that cannot be found is unavailable and uncached."""
+        missing = os.path.join(self.temp_dir, 'missing')
+
+        with patch('subprocess.run') as mock_run:
+            assert not self.cache.probe(missing).available
+
+        mock_run.assert_not_called()
+        assert not self.cache.path.exists()
+
+    def test_timeout_not_cached(self):
+        """Test a timed-out probe does not stop a later healthy probe."""
+        timeout = subprocess.TimeoutExpired(self.interpreter, 5)
+        with patch('subprocess.run', side_effect=timeout):
+            assert not self.cache.probe(self.interpreter).available
+
+        assert self.cache.get(self.interpreter) is None
+        probe = ProbeCache(self.temp_dir).probe(self.interpreter)
+        assert probe.available
+        assert probe.version == 'Fake 1.0'
+
+    def test_stale_failure_entry_is_ignored(self):
+        """Test failure entries written by older versions are probed again."""
+        self.cache.probe(self.interpreter)
+        entries = json.loads(self.cache.path.read_text())
+        for entry in entries.values():
+            entry['available'] = False
+        self.cache.path.write_text(json.dumps(entries))
+
+        assert self.cache.probe(self.interpreter).available
+
+    def test_corrupt_cache_is_ignored(self):
+        """Test an unreadable cache file behaves like an empty one."""
+        self.cache.path.write_text("not json")
+
+        assert self.cache.probe(self.interpreter).available
+
+    def test_from_config(self):
+        """Test the cache follows probe_cache and cache_dir."""
+        assert ProbeCache.from_config(Mock(cache_dir=self.temp_dir, probe_cache=True)) is not None
+        assert ProbeCache.from_config(Mock(cache_dir=self.temp_dir, probe_cache=False)) is None
+        assert ProbeCache.from_config(Mock(cache_dir=None, probe_cache=True)) is None
+
+
+class TestRunnerProbes:
+    """Test cases for runners using the probe cache."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.config = {'python': {'executable': sys.executable}}
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_probe_executable_without_cache(self):
+        """Test the uncached probe still runs the interpreter."""
+        probe = probe_executable(sys.executable)
+
+        assert probe.available
+        assert probe.version.startswith('Python')
+
+    def test_runner_uses_cache(self):
+        """Test validate_executable answers from a warm cache."""
+        cache = ProbeCache(self.temp_dir)
+        assert PythonRunner(self.config, probe_cache=cache).validate_executable()
+
+        with patch('subprocess.run') as mock_run:
+            assert PythonRunner(self.config, probe_cache=cache).validate_executable()
+        mock_run.assert_not_called()
+
+    def test_validate_all_executables_parallel(self):
+        """Test every script type is validated and cached."""
+        cache = ProbeCache(self.temp_dir)
+
+        results = RunnerFactory.validate_all_executables(self.config, probe_cache=cache)
+
+        assert set(results) == set(RunnerFactory.get_supported_types())
+        assert results[ScriptType.PYTHON] is True
+        assert cache.get(sys.executable).available
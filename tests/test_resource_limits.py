@@ -0,0 +1,131 @@
+"""
+Unit tests for runner resource limits and process-group handling.
+"""
+import os
+import sys
+import tempfile
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from airun.core.config import Config
+from airun.core.process import RLIMITS_SUPPORTED, STREAMING_SUPPORTED, ResourceLimits
+from airun.core.runners import PythonRunner, ShellRunner
+
+posix_only = pytest.mark.skipif(not (RLIMITS_SUPPORTED and STREAMING_SUPPORTED),
+                                reason="resource limits and sessions need POSIX")
+
+
+class TestResourceLimitsConfig:
+    """Test cases for ResourceLimits.from_config."""
+
+    def test_no_limits(self):
+        """Test runners without a limits section get none."""
+        assert ResourceLimits.from_config({'executable': 'python3'}) is None
+        assert ResourceLimits.from_config({'limits': {}}) is None
+
+    def test_limits(self):
+        """Test each configured limit is read."""
+        limits = ResourceLimits.from_config(
+            {'limits': {'memory': 1 << 30, 'cpu_time': 60, 'open_files': 256}})
+
+        assert limits == ResourceLimits(memory=1 << 30, cpu_time=60, open_files=256)
+
+    @pytest.mark.parametrize('value', [0, -1, 1.5, '1G', True])
+    def test_invalid_limit(self, value):
+        """Test limits must be positive integers."""
+        with pytest.raises(ValueError, match="limits.memory"):
+            ResourceLimits.from_config({'limits': {'memory': value}})
+
+    def test_config_validation(self):
+        """Test Config.validate reports invalid limits."""
+        config = Config()
+        config.runners = {'python': {'executable': 'python3', 'limits': {'cpu_time': -5}}}
+
+        with pytest.raises(ValueError, match="runner 'python' limits.cpu_time"):
+            config.validate()
+
+
+@posix_only
+class TestRunnerLimits:
+    """Test cases for limits and process groups during execution."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def create_script(self, content: str, name: str = 'script.py') -> str:
+        """Create a script with given content."""
+        filepath = os.path.join(self.temp_dir, name)
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return filepath
+
+    def python_runner(self, timeout: float = 30, **limits) -> PythonRunner:
+        """Create a Python runner with the given limits."""
+        return PythonRunner({'timeout': timeout,
+                             'python': {'executable': sys.executable, 'limits': limits}})
+
+    def test_open_files_limit(self):
+        """Test a script cannot exceed its open file limit."""
+        script = self.create_script(
+            "import os\n"
+            "files = [open(os.devnull) for _ in range(100)]\n"
+        )
+
+        result = self.python_runner(open_files=32).execute(script)
+
+        assert result.exit_code != 0
+        assert "Too many open files" in result.stderr
+
+    def test_memory_limit(self):
+        """Test allocations beyond the memory limit fail."""
+        script = self.create_script("data = bytearray(1024 * 1024 * 1024)\n")
+
+        result = self.python_runner(memory=512 * 1024 * 1024).execute(script)
+
+        assert result.exit_code != 0
+        assert "MemoryError" in result.stderr
+
+    def test_cpu_time_limit(self):
+        """Test a busy loop is stopped by its CPU limit before the timeout."""
+        script = self.create_script("while True:\n    pass\n")
+
+        start = time.monotonic()
+        result = self.python_runner(cpu_time=1).execute(script)
+
+        assert time.monotonic() - start < 10
+        assert result.exit_code < 0
+        assert result.error_detected
+
+    def test_limits_bypass_backend(self):
+        """Test limited scripts never run in a shared warm interpreter."""
+        runner = self.python_runner(open_files=64)
+        runner.get_backend = Mock()
+
+        result = runner.execute(self.create_script("print('ok')\n"))
+
+        assert result.stdout == "ok\n"
+        runner.get_backend.assert_not_called()
+
+    def test_timeout_kills_grandchildren(self):
+        """Test a timeout kills background jobs a shell script started."""
+        marker = os.path.join(self.temp_dir, 'survived')
+        script = self.create_script(
+            f"(sleep 1; touch '{marker}') &\n"
+            "sleep 30\n",
+            name='script.sh'
+        )
+        runner = ShellRunner({'timeout': 0.5, 'shell': {'executable': 'bash'}})
+
+        result = runner.execute(script)
+        time.sleep(1.5)
+
+        assert result.exit_code == -1
+        assert not os.path.exists(marker)
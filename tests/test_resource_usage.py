@@ -0,0 +1,130 @@
+"""
+Unit tests for per-run resource accounting.
+"""
+import os
+import subprocess
+import sys
+import tempfile
+from unittest.mock import patch
+
+import pytest
+
+from airun.core.process import (
+    RUSAGE_SUPPORTED, get_resource_usage, kill_process, wait_process
+)
+from airun.core.runners import ExecutionResult, PythonRunner
+
+pytestmark = pytest.mark.skipif(not RUSAGE_SUPPORTED, reason="os.wait4 is POSIX only")
+
+
+class TestWaitProcess:
+    """Test cases for wait_process and kill_process."""
+
+    def test_records_usage_and_exit_code(self):
+        """Test a reaped child has its return code and rusage."""
+        process = subprocess.Popen([sys.executable, '-c', 'raise SystemExit(3)'])
+
+        assert wait_process(process)
+
+        assert process.returncode == 3
+        usage = get_resource_usage(process)
+        assert usage is not None
+        assert usage.cpu_time > 0
+        assert usage.max_rss > 1024 * 1024
+
+    def test_timeout(self):
+        """Test a running child is left alone when the timeout passes."""
+        process = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)'])
+        try:
+            assert not wait_process(process, timeout=0.1)
+            assert process.returncode is None
+        finally:
+            kill_process(process)
+
+        assert process.returncode == -9
+        assert get_resource_usage(process) is not None
+
+    def test_unknown_handle(self):
+        """Test handles that were not reaped have no usage."""
+        assert get_resource_usage(object()) is None
+
+
+class TestRunnerResourceUsage:
+    """Test cases for resource usage on execution results."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.config = {'timeout': 30, 'python': {'executable': sys.executable}}
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def create_script(self, content: str) -> str:
+        """Create a Python script with given content."""
+        filepath = os.path.join(self.temp_dir, 'script.py')
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return filepath
+
+    def run(self, content: str) -> ExecutionResult:
+        """Run a script on the streaming path."""
+        runner = PythonRunner(self.config)
+        runner.add_output_callback(lambda stream, text: None)
+        return runner.execute(self.create_script(content))
+
+    def test_cpu_bound_script(self):
+        """Test a busy loop is reported as CPU-bound."""
+        result = self.run(
+            "import time\n"
+            "end = time.perf_counter() + 0.5\n"
+            "while time.perf_counter() < end:\n"
+            "    pass\n"
+        )
+
+        assert result.exit_code == 0
+        assert result.cpu_time == pytest.approx(result.resource_usage.cpu_time)
+        assert result.cpu_utilization > 0.5
+        assert result.peak_rss == result.resource_usage.max_rss
+
+    def test_sleeping_script(self):
+        """Test a waiting script is reported as mostly idle."""
+        result = self.run("import time\ntime.sleep(0.5)\n")
+
+        assert result.execution_time >= 0.5
+        assert result.cpu_utilization < 0.5
+        assert result.resource_usage.voluntary_switches > 0
+
+    def test_memory_peak(self):
+        """Test peak RSS reflects memory the script touched."""
+        result = self.run("data = bytearray(64 * 1024 * 1024)\n")
+
+        assert result.peak_rss > 64 * 1024 * 1024
+
+    def test_timeout_still_measured(self):
+        """Test a killed script still reports its usage."""
+        runner = PythonRunner(dict(self.config, timeout=0.3))
+        runner.add_output_callback(lambda stream, text: None)
+
+        result = runner.execute(self.create_script("import time\ntime.sleep(30)\n"))
+
+        assert result.exit_code == -1
+        assert result.resource_usage is not None
+
+    def test_plain_execute_is_measured(self):
+        """Test a runner without callbacks still records usage."""
+        result = PythonRunner(self.config).execute(self.create_script("print('hi')\n"))
+
+        assert result.stdout == "hi\n"
+        assert result.resource_usage is not None
+
+    @patch('airun.core.runners.STREAMING_SUPPORTED', False)
+    def test_plain_subprocess_has_no_usage(self):
+        """Test the portable subprocess.run fallback leaves usage unset."""
+        result = PythonRunner(self.config).execute(self.create_script("print('hi')\n"))
+
+        assert result.stdout == "hi\n"
+        assert result.resource_usage is None
+        assert result.cpu_utilization is None
@@ -93,6 +93,7 @@ class TestBaseRunner:
         runner = MockRunner({})
         assert runner.timeout == 300  # Default 5 minutes
 
+    @patch('airun.core.runners.STREAMING_SUPPORTED', False)
     @patch('subprocess.run')
     def test_successful_execution(self, mock_run):
         """Test successful script execution."""
@@ -111,6 +112,7 @@ class TestBaseRunner:
         assert result.error_detected is False
         assert result.execution_time > 0
 
+    @patch('airun.core.runners.STREAMING_SUPPORTED', False)
     @patch('subprocess.run')
     def test_failed_execution(self, mock_run):
         """Test failed script execution."""
@@ -128,6 +130,7 @@ class TestBaseRunner:
         assert result.stderr == "Error occurred"
         assert result.error_detected is True
 
+    @patch('airun.core.runners.STREAMING_SUPPORTED', False)
     @patch('subprocess.run')
     def test_timeout_handling(self, mock_run):
         """Test execution timeout handling."""
@@ -140,6 +143,7 @@ class TestBaseRunner:
         assert "timeout" in result.stderr.lower()
         assert result.error_detected is True
 
+    @patch('airun.core.runners.STREAMING_SUPPORTED', False)
     @patch('subprocess.run')
     def test_file_not_found_handling(self, mock_run):
         """Test handling of missing executable."""
@@ -151,6 +155,7 @@ class TestBaseRunner:
         assert "not found" in result.stderr.lower()
         assert result.error_detected is True
 
+    @patch('airun.core.runners.STREAMING_SUPPORTED', False)
     @patch('subprocess.run')
     def test_environment_variables(self, mock_run):
         """Test that environment variables are passed correctly."""
@@ -471,6 +476,7 @@ class TestExecutionContext:
             assert ctx.original_content is None
             assert ctx.backup_path is None
 
+    @patch('airun.core.runners.STREAMING_SUPPORTED', False)
     @patch('subprocess.run')
     def test_execute_within_context(self, mock_run):
         """Test executing script within context."""
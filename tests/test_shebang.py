@@ -0,0 +1,118 @@
+"""
+Unit tests for shebang parsing.
+"""
+import os
+import tempfile
+
+import pytest
+
+from airun.core.detector import ScriptDetector, ScriptType, parse_shebang
+from airun.core.runners import RunnerFactory
+
+
+class TestParseShebang:
+    """Test cases for parse_shebang."""
+
+    @pytest.mark.parametrize('line, interpreter, version, flags, script_type', [
+        ('#!/usr/bin/python3', '/usr/bin/python3', '3', [], ScriptType.PYTHON),
+        ('#!/usr/bin/python3.12', '/usr/bin/python3.12', '3.12', [], ScriptType.PYTHON),
+        ('#!/usr/bin/env python', 'python', None, [], ScriptType.PYTHON),
+        ('#!/usr/bin/env -S python3 -u', 'python3', '3', ['-u'], ScriptType.PYTHON),
+        ('#!/usr/bin/env -Spython3 -O', 'python3', '3', ['-O'], ScriptType.PYTHON),
+        ('#!/bin/sh -e', '/bin/sh', None, ['-e'], ScriptType.SHELL),
+        ('#!/bin/bash', '/bin/bash', None, [], ScriptType.SHELL),
+        ('#!/usr/bin/env zsh', 'zsh', None, [], ScriptType.SHELL),
+        ('#!/usr/local/bin/node', '/usr/local/bin/node', None, [], ScriptType.NODEJS),
+        ('#!/usr/bin/env -i node --harmony', 'node', None, ['--harmony'], ScriptType.NODEJS),
+        ('#! /usr/bin/env FOO=1 php8.2', 'php8.2', '8.2', [], ScriptType.PHP),
+        ('#!/usr/bin/ruby', '/usr/bin/ruby', None, [], ScriptType.UNKNOWN),
+    ])
+    def test_parse(self, line, interpreter, version, flags, script_type):
+        """Test interpreter, version, flags and type extraction."""
+        shebang = parse_shebang(line)
+
+        assert shebang.interpreter == interpreter
+        assert shebang.version == version
+        assert shebang.flags == flags
+        assert shebang.script_type == script_type
+        assert shebang.command == [interpreter] + flags
+
+    @pytest.mark.parametrize('line', [None, '', 'import os', '#!', '#!/usr/bin/env', '# comment'])
+    def test_not_a_shebang(self, line):
+        """Test lines without a usable shebang."""
+        assert parse_shebang(line) is None
+
+    def test_env_flag(self):
+        """Test env-based shebangs are flagged."""
+        assert parse_shebang('#!/usr/bin/env node').uses_env is True
+        assert parse_shebang('#!/usr/bin/node').uses_env is False
+
+
+class TestShebangIntegration:
+    """Test cases for shebang use in detection and runners."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.detector = ScriptDetector()
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def create_test_file(self, filename: str, content: str) -> str:
+        """Create a test file with given content."""
+        filepath = os.path.join(self.temp_dir, filename)
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return filepath
+
+    def test_detect_new_shebang_forms(self):
+        """Test shebang forms the old pattern table missed."""
+        cases = [
+            ('#!/usr/bin/env -S python3 -u\nx = 1\n', ScriptType.PYTHON),
+            ('#!/usr/local/bin/node\nx = 1\n', ScriptType.NODEJS),
+            ('#!/usr/bin/python3.12\nx = 1\n', ScriptType.PYTHON),
+        ]
+        for content, expected_type in cases:
+            filepath = self.create_test_file('tool', content)
+            assert self.detector.detect_type(filepath) == expected_type
+
+    def test_detect_shebang(self):
+        """Test parsing the shebang of a file."""
+        filepath = self.create_test_file('tool', '#!/usr/bin/env -S python3 -u\nx = 1\n')
+
+        shebang = self.detector.detect_shebang(filepath)
+
+        assert shebang.interpreter == 'python3'
+        assert shebang.flags == ['-u']
+        assert self.detector.get_file_info(filepath)['interpreter'] == 'python3'
+
+    def test_runner_uses_shebang_when_enabled(self):
+        """Test runners reuse the parsed interpreter only when configured."""
+        shebang = parse_shebang('#!/opt/python/bin/python3.12 -X dev')
+        config = {'python': {'executable': 'python3', 'flags': ['-u'], 'use_shebang': True}}
+
+        runner = RunnerFactory.create_runner(ScriptType.PYTHON, config, shebang=shebang)
+
+        assert runner.get_executable() == '/opt/python/bin/python3.12'
+        assert runner.get_command('s.py') == ['/opt/python/bin/python3.12', '-X', 'dev', '-u', 's.py']
+
+    def test_runner_ignores_shebang_by_default(self):
+        """Test the configured executable wins unless use_shebang is set."""
+        shebang = parse_shebang('#!/opt/python/bin/python3.12')
+        config = {'python': {'executable': 'python3', 'flags': ['-u']}}
+
+        runner = RunnerFactory.create_runner(ScriptType.PYTHON, config, shebang=shebang)
+
+        assert runner.get_command('s.py') == ['python3', '-u', 's.py']
+
+    def test_runner_ignores_mismatched_shebang(self):
+        """Test a shebang for another language is not used."""
+        shebang = parse_shebang('#!/usr/bin/env node')
+        config = {'python': {'use_shebang': True}}
+
+        runner = RunnerFactory.create_runner(ScriptType.PYTHON, config, shebang=shebang)
+
+        assert runner.get_executable() == 'python3'
@@ -0,0 +1,260 @@
+"""
+Unit tests for streaming script execution.
+"""
+import os
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+
+import pytest
+
+from airun.core.process import STREAMING_SUPPORTED, OutputCapture
+from airun.core.runners import PythonRunner
+
+
+class TestStreamingExecution:
+    """Test cases for BaseRunner streaming execution."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.config = {
+            'timeout': 30,
+            'python': {'executable': sys.executable, 'flags': ['-u']},
+        }
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def create_script(self, content: str) -> str:
+        """Create a Python script with given content."""
+        filepath = os.path.join(self.temp_dir, 'script.py')
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return filepath
+
+    def test_callbacks_receive_chunks_before_exit(self):
+        """Test output reaches callbacks while the script is still running."""
+        script = self.create_script(
+            "import sys, time\n"
+            "print('first')\n"
+            "time.sleep(0.5)\n"
+            "print('second')\n"
+        )
+        arrivals = []
+        runner = PythonRunner(self.config)
+        runner.add_output_callback(
+            lambda stream, text: arrivals.append((time.monotonic(), stream, text))
+        )
+
+        start = time.monotonic()
+        result = runner.execute(script)
+
+        assert result.exit_code == 0
+        assert result.stdout == "first\nsecond\n"
+        assert not result.streamed
+        first_at = next(at for at, _, text in arrivals if 'first' in text)
+        assert first_at - start < result.execution_time - 0.3
+
+    def test_stdout_and_stderr_are_separated(self):
+        """Test both pipes are read and attributed to the right stream."""
+        script = self.create_script(
+            "import sys\n"
+            "print('out')\n"
+            "print('err', file=sys.stderr)\n"
+            "sys.exit(3)\n"
+        )
+        capture = OutputCapture()
+        runner = PythonRunner(self.config)
+        runner.add_output_callback(capture)
+
+        result = runner.execute(script)
+
+        assert result.exit_code == 3
+        assert result.error_detected
+        assert result.stdout == capture.stdout == "out\n"
+        assert result.stderr == capture.stderr == "err\n"
+
+    def test_large_output_on_both_pipes(self):
+        """Test a child filling both pipes cannot deadlock."""
+        script = self.create_script(
+            "import sys\n"
+            "for i in range(2000):\n"
+            "    sys.stdout.write('o' * 100 + '\\n')\n"
+            "    sys.stderr.write('e' * 100 + '\\n')\n"
+        )
+        runner = PythonRunner(self.config)
+
+        result = runner.execute(script, stream=True)
+
+        assert result.exit_code == 0
+        assert result.stdout.count('\n') == 2000
+        assert result.stderr.count('\n') == 2000
+
+    def test_multibyte_characters_split_across_reads(self):
+        """Test incremental decoding keeps split UTF-8 sequences intact."""
+        script = self.create_script(
+            "import sys, time\n"
+            "data = 'héllo'.encode('utf-8')\n"
+            "sys.stdout.buffer.write(data[:2]); sys.stdout.flush()\n"
+            "time.sleep(0.2)\n"
+            "sys.stdout.buffer.write(data[2:]); sys.stdout.flush()\n"
+        )
+        runner = PythonRunner(self.config)
+        runner.add_output_callback(lambda stream, text: None)
+
+        result = runner.execute(script)
+
+        assert result.stdout == "héllo"
+
+    def test_stream_echoes_to_terminal(self, capfd):
+        """Test stream mode forwards output and marks the result as shown."""
+        script = self.create_script("print('live')\n")
+        runner = PythonRunner(self.config, stream_output=True)
+
+        result = runner.execute(script)
+
+        assert result.streamed
+        assert result.stdout == "live\n"
+        assert "live" in capfd.readouterr().out
+
+    def test_timeout_keeps_partial_output(self):
+        """Test a timed out script is killed and its output so far is kept."""
+        script = self.create_script(
+            "import time\n"
+            "print('started')\n"
+            "time.sleep(30)\n"
+        )
+        runner = PythonRunner(dict(self.config, timeout=1))
+        runner.add_output_callback(lambda stream, text: None)
+
+        start = time.monotonic()
+        result = runner.execute(script)
+
+        assert time.monotonic() - start < 10
+        assert result.exit_code == -1
+        assert result.stdout == "started\n"
+        assert "timeout" in result.stderr
+
+    def test_failing_callback_does_not_break_execution(self):
+        """Test callback errors are logged and execution continues."""
+        script = self.create_script("print('ok')\n")
+
+        def broken(stream, text):
+            raise RuntimeError("boom")
+
+        runner = PythonRunner(self.config)
+        runner.add_output_callback(broken)
+
+        result = runner.execute(script)
+
+        assert result.exit_code == 0
+        assert result.stdout == "ok\n"
+
+    def test_missing_executable(self):
+        """Test a missing interpreter is reported like the capture path."""
+        script = self.create_script("print('ok')\n")
+        config = dict(self.config, python={'executable': 'airun-no-such-python'})
+        runner = PythonRunner(config)
+
+        result = runner.execute(script, stream=True)
+
+        assert result.exit_code == -2
+        assert "Command not found" in result.stderr
+
+
+class TestExecutionPaths:
+    """Test cases for choosing between the streaming and capture-only paths."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.config = {
+            'timeout': 30,
+            'python': {'executable': sys.executable, 'flags': ['-u']},
+            'env_vars': {'AIRUN_PATH_TEST': 'set'},
+        }
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def create_script(self, content: str) -> str:
+        """Create a Python script with given content."""
+        filepath = os.path.join(self.temp_dir, 'script.py')
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return filepath
+
+    @pytest.mark.skipif(not STREAMING_SUPPORTED, reason="streaming needs POSIX pipes")
+    def test_streaming_path_when_supported(self):
+        """Test supported platforms never fall back to subprocess.run."""
+        script = self.create_script(
+            "import os, sys\n"
+            "print(os.environ['AIRUN_PATH_TEST'])\n"
+            "print('oops', file=sys.stderr)\n"
+            "sys.exit(3)\n"
+        )
+        runner = PythonRunner(self.config)
+
+        with patch.object(runner, '_run_subprocess') as run_subprocess:
+            result = runner.execute(script, stream=False)
+
+        run_subprocess.assert_not_called()
+        assert result.exit_code == 3
+        assert result.stdout == "set\n"
+        assert result.stderr == "oops\n"
+        assert result.error_detected
+        assert not result.streamed
+
+    @patch('airun.core.runners.STREAMING_SUPPORTED', False)
+    def test_capture_path_without_streaming_support(self):
+        """Test unsupported platforms capture output with subprocess.run."""
+        script = self.create_script(
+            "import os, sys\n"
+            "print(os.environ['AIRUN_PATH_TEST'])\n"
+            "print('oops', file=sys.stderr)\n"
+            "sys.exit(3)\n"
+        )
+        runner = PythonRunner(self.config)
+        chunks = []
+        runner.add_output_callback(lambda stream, text: chunks.append(text))
+
+        with patch.object(runner, '_run_streaming') as run_streaming:
+            result = runner.execute(script, stream=True)
+
+        run_streaming.assert_not_called()
+        assert chunks == []
+        assert result.exit_code == 3
+        assert result.stdout == "set\n"
+        assert result.stderr == "oops\n"
+        assert result.error_detected
+        assert not result.streamed
+
+    @patch('airun.core.runners.STREAMING_SUPPORTED', False)
+    def test_capture_path_timeout(self):
+        """Test the capture-only path reports a timeout."""
+        script = self.create_script("import time\ntime.sleep(30)\n")
+        runner = PythonRunner(dict(self.config, timeout=1))
+
+        result = runner.execute(script)
+
+        assert result.exit_code == -1
+        assert "timeout" in result.stderr.lower()
+        assert result.error_detected
+
+    @patch('airun.core.runners.STREAMING_SUPPORTED', False)
+    def test_capture_path_missing_executable(self):
+        """Test the capture-only path reports a missing interpreter."""
+        script = self.create_script("print('ok')\n")
+        runner = PythonRunner(dict(self.config, python={'executable': 'airun-no-such-python'}))
+
+        result = runner.execute(script)
+
+        assert result.exit_code == -2
+        assert "not found" in result.stderr.lower()
+        assert result.error_detected
@@ -0,0 +1,289 @@
+"""
+Unit tests for the syntax check cache and batched syntax checks.
+"""
+import os
+import shutil
+import subprocess
+import tempfile
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import pytest
+
+from airun.core.ai_fixer import AIFixer
+from airun.core.detector import ScriptType
+from airun.core.probe_cache import ExecutableProbe
+from airun.core.runners import NodeJSRunner, PHPRunner, PythonRunner
+from airun.core.syntax_cache import (
+    SyntaxCache, SyntaxCheck, content_digest, parse_python
+)
+
+
+class TestSyntaxCache:
+    """Test cases for SyntaxCache."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = SyntaxCache(self.temp_dir)
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        self.cache.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_round_trip(self):
+        """Test stored results come back for the same checker only."""
+        digest = content_digest(b"x = (\n")
+        self.cache.put_many({digest: SyntaxCheck(ok=False, line=1, column=5,
+                                                 detail="'(' was never closed")}, 'py')
+
+        assert self.cache.get_many([digest], 'py') == {
+            digest: SyntaxCheck(ok=False, line=1, column=5, detail="'(' was never closed")
+        }
+        assert self.cache.get_many([digest], 'other') == {}
+
+    def test_failed_checks_not_stored(self):
+        """Test results of checks that could not run are never cached."""
+        self.cache.put_many({'d': SyntaxCheck.failed("Error validating x: timed out")}, 'c')
+
+        assert len(self.cache) == 0
+
+    def test_eviction(self):
+        """Test least recently used entries are evicted."""
+        cache = SyntaxCache(self.temp_dir, max_entries=2, filename='small.sqlite3')
+        try:
+            for digest in ('a', 'b', 'c'):
+                cache.put_many({digest: SyntaxCheck(ok=True)}, 'c')
+            assert len(cache) == 2
+            assert 'a' not in cache.get_many(['a', 'b', 'c'], 'c')
+        finally:
+            cache.close()
+
+    def test_lookup_does_not_take_write_lock(self):
+        """Test lookups succeed while another connection holds the write lock."""
+        self.cache.put_many({'a': SyntaxCheck(ok=True)}, 'c')
+        writer = SyntaxCache(self.temp_dir)
+        connection = writer._connect()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            assert self.cache.get_many(['a', 'b'], 'c') == {'a': SyntaxCheck(ok=True)}
+        finally:
+            connection.execute("ROLLBACK")
+            writer.close()
+
+    def test_eviction_keeps_running_count(self):
+        """Test re-storing existing entries does not grow the running count."""
+        cache = SyntaxCache(self.temp_dir, max_entries=3, filename='count.sqlite3')
+        try:
+            for _ in range(3):
+                cache.put_many({d: SyntaxCheck(ok=True) for d in 'abcde'}, 'c')
+            assert cache._entry_count == 3
+            assert len(cache) == 3
+        finally:
+            cache.close()
+
+    def test_unusable_directory_disables_cache(self):
+        """Test a cache directory that cannot be created degrades to misses."""
+        blocker = os.path.join(self.temp_dir, 'file')
+        with open(blocker, 'w') as f:
+            f.write('not a directory')
+        cache = SyntaxCache(os.path.join(blocker, 'cache'))
+        script = os.path.join(self.temp_dir, 'ok.py')
+        with open(script, 'w') as f:
+            f.write("x = 1\n")
+
+        assert PythonRunner({}, syntax_cache=cache).validate_syntax(script) is None
+        assert cache.get_many(['a'], 'c') == {}
+        assert len(cache) == 0
+        assert cache._disabled
+        cache.close()
+
+    def test_from_config(self):
+        """Test the cache can be disabled in the configuration."""
+        assert SyntaxCache.from_config(SimpleNamespace(cache_dir=self.temp_dir)) is not None
+        assert SyntaxCache.from_config(SimpleNamespace(cache_dir=self.temp_dir,
+                                                       syntax_cache=False)) is None
+
+    def test_message_names_the_reported_file(self):
+        """Test one cached error is reported against each file sharing the content."""
+        check = PHPRunner._syntax_error('/a/x.php', "Parse error in /a/x.php on line 3",
+                                        r'on line (\d+)')
+
+        assert check.line == 3
+        assert check.message('/b/y.php') == (
+            "Syntax error in /b/y.php:3: Parse error in /b/y.php on line 3")
+        assert SyntaxCheck(ok=True).message('/b/y.php') is None
+
+
+class TestRunnerSyntaxChecks:
+    """Test cases for cached and batched runner syntax checks."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = SyntaxCache(os.path.join(self.temp_dir, 'cache'))
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        self.cache.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def create_script(self, name: str, content: str) -> str:
+        """Create a script with given content."""
+        filepath = os.path.join(self.temp_dir, name)
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return filepath
+
+    def test_python_compile_errors(self):
+        """Test errors found after parsing are reported with their location."""
+        script = self.create_script('ret.py', "def f():\n    pass\nreturn 1\n")
+
+        check = PythonRunner({}).check_syntax(script)
+
+        assert not check.ok
+        assert check.line == 3
+        assert "outside function" in check.detail
+
+    def test_python_cache_hit_skips_parsing(self):
+        """Test unchanged content is answered from the cache."""
+        script = self.create_script('ok.py', "print('cached')\n")
+        runner = PythonRunner({}, syntax_cache=self.cache)
+        assert runner.validate_syntax(script) is None
+
+        with patch('airun.core.runners.parse_python') as mock_parse:
+            assert runner.validate_syntax(script) is None
+            mock_parse.assert_not_called()
+
+    def test_edit_misses(self):
+        """Test an edited file is checked again."""
+        script = self.create_script('edit.py', "x = 1\n")
+        runner = PythonRunner({}, syntax_cache=self.cache)
+        assert runner.validate_syntax(script) is None
+
+        self.create_script('edit.py', "x = (\n")
+
+        assert "syntax error" in runner.validate_syntax(script).lower()
+
+    def test_unreadable_file(self):
+        """Test a missing file is reported rather than cached."""
+        runner = PythonRunner({}, syntax_cache=self.cache)
+        missing = os.path.join(self.temp_dir, 'missing.py')
+
+        assert runner.validate_syntax(missing).startswith("Error reading")
+        assert len(self.cache) == 0
+
+    @pytest.mark.skipif(shutil.which('node') is None, reason="node is not installed")
+    def test_nodejs_batch_uses_one_process(self):
+        """Test many JavaScript files are checked by one node process."""
+        paths = [
+            self.create_script('good.js', "console.log(1);\n"),
+            self.create_script('bad.js', "#!/usr/bin/env node\nconst a = 1;\nfoo(\n"),
+            self.create_script('hashbang.js', "#!/usr/bin/env node\nreturn;\n"),
+        ]
+        runner = NodeJSRunner({})
+
+        with patch('airun.core.runners.subprocess.run', wraps=subprocess.run) as mock_run:
+            results = runner.check_syntax_many(paths)
+
+        assert mock_run.call_count == 1
+        assert results[paths[0]].ok
+        assert not results[paths[1]].ok
+        assert results[paths[1]].line == 4
+        assert results[paths[2]].ok
+
+    @pytest.mark.skipif(shutil.which('node') is None, reason="node is not installed")
+    def test_nodejs_modules_fall_back(self):
+        """Test ES modules are checked with node --check."""
+        paths = [
+            self.create_script('plain.js', "module.exports = 1;\n"),
+            self.create_script('esm.mjs', "export const a = 1;\n"),
+        ]
+
+        with patch('airun.core.runners.subprocess.run', wraps=subprocess.run) as mock_run:
+            results = NodeJSRunner({}).check_syntax_many(paths)
+
+        assert all(check.ok for check in results.values())
+        assert mock_run.call_args[0][0][1:] == ['--check', paths[1]]
+
+    def php_runner(self, version: str) -> PHPRunner:
+        """Create a PHP runner reporting the given interpreter version."""
+        runner = PHPRunner({})
+        runner.probe_executable = Mock(return_value=ExecutableProbe(
+            available=True, version=version))
+        return runner
+
+    @patch('airun.core.runners.subprocess.run')
+    def test_php_batch_on_83(self, mock_run):
+        """Test PHP 8.3 lints many files in one call."""
+        mock_run.return_value = Mock(
+            returncode=255,
+            stdout=("No syntax errors detected in a.php\n"
+                    "PHP Parse error:  syntax error, unexpected end of file in b.php on line 4\n"
+                    "Errors parsing b.php\n"),
+            stderr=""
+        )
+
+        results = self.php_runner("PHP 8.3.6 (cli)").check_syntax_many(['a.php', 'b.php'])
+
+        assert mock_run.call_count == 1
+        assert mock_run.call_args[0][0][1:] == ['-l', 'a.php', 'b.php']
+        assert results['a.php'].ok
+        assert results['b.php'].line == 4
+
+    @patch('airun.core.runners.subprocess.run')
+    def test_php_one_file_per_call_before_83(self, mock_run):
+        """Test older PHP versions lint one file per call."""
+        mock_run.return_value = Mock(returncode=0, stdout="", stderr="")
+
+        results = self.php_runner("PHP 8.2.1 (cli)").check_syntax_many(['a.php', 'b.php'])
+
+        assert mock_run.call_count == 2
+        assert all(check.ok for check in results.values())
+
+
+class TestParseTreeReuse:
+    """Test cases for parse tree reuse by the AI fixer."""
+
+    SOURCE = (
+        "import os\n"
+        "\n"
+        "class Loader:\n"
+        "    def load(self, path):\n"
+        "        with open(path) as f:\n"
+        "            data = f.read()\n"
+        "        lines = data.splitlines()\n"
+        "        header = lines[0]\n"
+        "        body = lines[1:]\n"
+        "        total = 0\n"
+        "        for line in body:\n"
+        "            total += int(line)\n"
+        "        return header, total\n"
+    )
+
+    def test_tree_is_reused(self):
+        """Test the same content parses to the same tree object."""
+        assert parse_python(self.SOURCE) is parse_python(self.SOURCE)
+
+    def test_snippet_covers_enclosing_function(self):
+        """Test the fixer's snippet is widened to the failing function."""
+        fixer = AIFixer(Mock(), SimpleNamespace())
+
+        scope = fixer._find_python_scope(self.SOURCE, 'loader.py', 12)
+        snippet = fixer._get_relevant_code_snippet(self.SOURCE, 12, context_lines=2,
+                                                   scope=scope)
+
+        assert scope == (4, 13)
+        assert "def load(self, path)" in snippet
+        assert ">>>  12:" in snippet
+        assert fixer._find_python_scope(self.SOURCE, 'loader.py', 1) is None
+
+    def test_error_context_for_unparsable_script(self):
+        """Test scripts with syntax errors keep the plain window."""
+        fixer = AIFixer(Mock(), SimpleNamespace())
+        result = Mock(stderr='  File "x.py", line 2\nSyntaxError: invalid syntax')
+
+        context = fixer._create_error_context(ScriptType.PYTHON, 'x.py', "a = 1\nb = (\n", result)
+
+        assert ">>>   2: b = (" in context.code_snippet
@@ -0,0 +1,115 @@
+"""
+Unit tests for repository-wide syntax checking.
+"""
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from click.testing import CliRunner
+
+from airun.cli import cli
+from airun.core.config import Config
+from airun.core.detector import ScriptType
+from airun.core.runners import PythonRunner
+from airun.utils.syntax_checker import SyntaxChecker
+
+
+class TestSyntaxChecker:
+    """Test cases for SyntaxChecker."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.tree = os.path.join(self.temp_dir, 'repo')
+        self.config = Config()
+        self.config.cache_dir = Path(self.temp_dir) / 'cache'
+        self.config.detection = {'cache': False}
+        self.config.runners = {}
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def create_file(self, name: str, content: str) -> str:
+        """Create a file in the checked tree."""
+        filepath = os.path.join(self.tree, name)
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return filepath
+
+    def check(self, paths, **kwargs):
+        """Run the checker and index the outcomes by path."""
+        checker = SyntaxChecker(self.config, **kwargs)
+        try:
+            return {outcome.path: outcome for outcome in checker.iter_checks(paths)}
+        finally:
+            checker.close()
+
+    def test_groups_by_language(self):
+        """Test every file is checked by its language's runner."""
+        good_py = self.create_file('good.py', "print('ok')\n")
+        bad_py = self.create_file('pkg/bad.py', "def f(:\n    pass\n")
+        good_sh = self.create_file('good.sh', "#!/bin/bash\necho ok\n")
+        bad_sh = self.create_file('bad.sh', "#!/bin/bash\nif true; then\n")
+        notes = self.create_file('notes.txt', "just text\n")
+
+        outcomes = self.check([good_py, bad_py, good_sh, bad_sh, notes], max_workers=2)
+
+        assert set(outcomes) == {good_py, bad_py, good_sh, bad_sh}
+        assert outcomes[good_py].ok and outcomes[good_sh].ok
+        assert outcomes[bad_sh].script_type == ScriptType.SHELL
+        entry = outcomes[bad_py].to_dict()
+        assert entry['ok'] is False
+        assert entry['line'] == 1
+        assert entry['error'].startswith(f"Syntax error in {bad_py}:1")
+
+    def test_chunks_of_one_language(self):
+        """Test a language's files are handed to its runner in chunks."""
+        paths = [self.create_file(f'm{i}.py', f"x = {i}\n") for i in range(7)]
+
+        with patch.object(PythonRunner, 'check_syntax_many',
+                          autospec=True,
+                          side_effect=PythonRunner.check_syntax_many) as mock_check:
+            outcomes = self.check(paths, chunk_size=3)
+
+        assert len(outcomes) == 7
+        assert sorted(len(call[0][1]) for call in mock_check.call_args_list) == [1, 3, 3]
+
+    def test_runner_failure_is_reported(self):
+        """Test a chunk whose check raises reports each of its files as failed."""
+        path = self.create_file('a.py', "x = 1\n")
+
+        with patch.object(PythonRunner, 'check_syntax_many', side_effect=RuntimeError('boom')):
+            outcomes = self.check([path])
+
+        assert not outcomes[path].ok
+        assert 'boom' in outcomes[path].to_dict()['error']
+
+    def test_check_command(self):
+        """Test the check command streams JSON lines and fails on errors."""
+        self.create_file('good.py', "print('ok')\n")
+        bad = self.create_file('bad.py', "x = (\n")
+
+        with patch('airun.cli.Config.load', return_value=self.config):
+            result = CliRunner().invoke(cli, ['check', self.tree])
+
+        lines = [json.loads(line) for line in result.stdout.splitlines()
+                 if line.startswith('{')]
+        assert result.exit_code == 1
+        assert {entry['path']: entry['ok'] for entry in lines} == {
+            os.path.join(self.tree, 'good.py'): True,
+            bad: False,
+        }
+
+    def test_check_command_passes(self):
+        """Test the check command exits zero when every file is valid."""
+        self.create_file('good.py', "print('ok')\n")
+
+        with patch('airun.cli.Config.load', return_value=self.config):
+            result = CliRunner().invoke(cli, ['check', self.tree])
+
+        assert result.exit_code == 0
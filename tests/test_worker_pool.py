@@ -0,0 +1,203 @@
+"""
+Unit tests for the warm Python worker pool.
+"""
+import os
+import sys
+import tempfile
+import time
+
+import pytest
+
+from airun.core.detector import ScriptType, Shebang
+from airun.core.runners import POOL_SUPPORTED, PythonRunner
+from airun.core.worker_pool import (
+    PythonWorkerPool,
+    WorkerUnavailable,
+    shutdown_worker_pools,
+)
+
+pytestmark = pytest.mark.skipif(not POOL_SUPPORTED,
+                                reason="warm pool needs fork and Unix sockets")
+
+
+class TestPythonWorkerPool:
+    """Test cases for PythonWorkerPool."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.pools = []
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        import shutil
+        for pool in self.pools:
+            pool.close()
+        shutdown_worker_pools()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def create_script(self, content: str, name: str = 'script.py') -> str:
+        """Create a Python script with given content."""
+        filepath = os.path.join(self.temp_dir, name)
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return filepath
+
+    def make_pool(self, **kwargs) -> PythonWorkerPool:
+        """Create a started pool that is closed after the test."""
+        pool = PythonWorkerPool(sys.executable, **kwargs)
+        pool.start()
+        self.pools.append(pool)
+        return pool
+
+    def run(self, pool: PythonWorkerPool, script: str, args=None):
+        """Run a script in the pool and collect its output and exit code."""
+        process = pool.spawn(script, args or [], self.temp_dir, dict(os.environ))
+        stdout = process.stdout.read().decode()
+        stderr = process.stderr.read().decode()
+        returncode = process.wait()
+        process.stdout.close()
+        process.stderr.close()
+        return returncode, stdout, stderr
+
+    def test_runs_script_like_interpreter(self):
+        """Test argv, cwd, exit code and both streams match a plain run."""
+        script = self.create_script(
+            "import os, sys\n"
+            "print(sys.argv[1:], os.getcwd() == sys.argv[1])\n"
+            "print('oops', file=sys.stderr)\n"
+            "sys.exit(4)\n"
+        )
+        pool = self.make_pool(size=1)
+
+        returncode, stdout, stderr = self.run(pool, script, [self.temp_dir])
+
+        assert returncode == 4
+        assert stdout == f"[{self.temp_dir!r}] True\n"
+        assert stderr == "oops\n"
+
+    def test_runs_are_isolated(self):
+        """Test state set by one script is not visible to the next."""
+        script = self.create_script(
+            "import json\n"
+            "print(getattr(json, 'airun_marker', 'clean'))\n"
+            "json.airun_marker = 'dirty'\n"
+        )
+        pool = self.make_pool(size=1)
+
+        assert self.run(pool, script)[1] == "clean\n"
+        assert self.run(pool, script)[1] == "clean\n"
+
+    def test_uncaught_exception_traceback(self):
+        """Test tracebacks show only the script's frames."""
+        script = self.create_script("def f():\n    1 / 0\nf()\n")
+        pool = self.make_pool(size=1)
+
+        returncode, _, stderr = self.run(pool, script)
+
+        assert returncode == 1
+        assert stderr.startswith("Traceback (most recent call last):\n"
+                                 f'  File "{script}", line 3')
+        assert "ZeroDivisionError" in stderr
+        assert "runpy" not in stderr
+
+    def test_workers_recycled(self):
+        """Test a worker is replaced after recycle_after runs."""
+        script = self.create_script("import os\nprint(os.getppid())\n")
+        pool = self.make_pool(size=1, recycle_after=2)
+
+        parents = [self.run(pool, script)[1] for _ in range(3)]
+
+        assert parents[0] == parents[1]
+        assert parents[2] != parents[1]
+
+    def test_missing_interpreter(self):
+        """Test a pool that cannot start reports WorkerUnavailable."""
+        pool = PythonWorkerPool('airun-no-such-python', size=1)
+        self.pools.append(pool)
+
+        with pytest.raises(WorkerUnavailable):
+            pool.spawn(self.create_script("print(1)\n"), [], None, {})
+
+
+class TestPythonRunnerWarmPool:
+    """Test cases for PythonRunner using the warm pool."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.config = {
+            'timeout': 30,
+            'python': {'executable': sys.executable, 'flags': ['-u'],
+                       'warm_pool': True, 'pool_size': 1},
+        }
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        import shutil
+        shutdown_worker_pools()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def create_script(self, content: str) -> str:
+        """Create a Python script with given content."""
+        filepath = os.path.join(self.temp_dir, 'script.py')
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return filepath
+
+    def test_execute_through_pool(self):
+        """Test execute returns a normal ExecutionResult from the pool."""
+        script = self.create_script("import os\nprint(os.environ['AIRUN_TEST'])\n")
+        runner = PythonRunner(dict(self.config, env_vars={'AIRUN_TEST': 'pooled'}))
+
+        assert runner.get_worker_pool() is not None
+        result = runner.execute(script)
+
+        assert result.exit_code == 0
+        assert result.stdout == "pooled\n"
+        assert not result.error_detected
+
+    def test_timeout_kills_pooled_script(self):
+        """Test the timeout still applies to pooled scripts."""
+        script = self.create_script("import time\nprint('up')\ntime.sleep(30)\n")
+        runner = PythonRunner(dict(self.config, timeout=1))
+
+        start = time.monotonic()
+        result = runner.execute(script)
+
+        assert time.monotonic() - start < 10
+        assert result.exit_code == -1
+        assert result.stdout == "up\n"
+
+    def test_other_flags_disable_pool(self):
+        """Test flags a forked worker cannot honour fall back to subprocess."""
+        config = dict(self.config, python=dict(self.config['python'], flags=['-O']))
+        runner = PythonRunner(config)
+
+        assert runner.get_worker_pool() is None
+        result = runner.execute(self.create_script("print(__debug__)\n"))
+        assert result.stdout == "False\n"
+
+    def test_shebang_and_config_flags_share_pool(self):
+        """Test a shebang -u plus a configured -u runs pooled without repeating the flag."""
+        shebang = Shebang(line=f'#!{sys.executable} -u', interpreter=sys.executable,
+                          interpreter_name='python3', flags=['-u'],
+                          script_type=ScriptType.PYTHON)
+        config = dict(self.config, python=dict(self.config['python'], use_shebang=True))
+        runner = PythonRunner(config, shebang=shebang)
+
+        assert runner.template.flags == ('-u',)
+        assert runner.get_worker_pool() is PythonRunner(self.config).get_worker_pool()
+        result = runner.execute(self.create_script("print('pooled')\n"))
+        assert result.stdout == "pooled\n"
+
+    def test_unavailable_pool_falls_back(self):
+        """Test a pool that cannot start falls back to a subprocess."""
+        config = dict(self.config, python=dict(self.config['python'],
+                                               executable='airun-no-such-python'))
+        runner = PythonRunner(config)
+
+        result = runner.execute(self.create_script("print(1)\n"))
+
+        assert result.exit_code == -2
+        assert "Command not found" in result.stderr